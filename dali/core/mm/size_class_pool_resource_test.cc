@@ -0,0 +1,200 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <algorithm>
+#include <random>
+#include <thread>
+#include <vector>
+#include "dali/core/mm/mm_test_utils.h"
+#include "dali/core/mm/malloc_resource.h"
+#include "dali/core/mm/size_class_pool_resource.h"
+
+namespace dali {
+namespace mm {
+namespace test {
+
+using host_size_class_pool = size_class_pool_resource<memory_kind::host, allocation_order::host>;
+
+TEST(MMSizeClassPoolResource, SizeClasses) {
+  EXPECT_EQ(host_size_class_pool::size_class(1), 256u);
+  EXPECT_EQ(host_size_class_pool::size_class(256), 256u);
+  EXPECT_EQ(host_size_class_pool::size_class(257), 320u);
+  EXPECT_EQ(host_size_class_pool::size_class(320), 320u);
+  EXPECT_EQ(host_size_class_pool::size_class(321), 384u);
+  EXPECT_EQ(host_size_class_pool::size_class(512), 512u);
+  EXPECT_EQ(host_size_class_pool::size_class(513), 640u);
+  EXPECT_EQ(host_size_class_pool::size_class(1000000), 1048576u);
+  for (size_t size = 1; size < (1 << 20); size = size * 3 / 2 + 1) {
+    size_t cls = host_size_class_pool::size_class(size);
+    EXPECT_GE(cls, size);
+    EXPECT_EQ(host_size_class_pool::size_class(cls), cls);
+    EXPECT_LE(cls, std::max<size_t>(256, size + size / 4));
+  }
+}
+
+TEST(MMSizeClassPoolResource, ReuseAndStats) {
+  test_host_resource upstream;
+  {
+    host_size_class_pool pool(&upstream, default_host_pool_opts());
+    void *a = pool.allocate(1000, 64);
+    ASSERT_NE(a, nullptr);
+    EXPECT_TRUE(detail::is_aligned(a, 64));
+    memset(a, 0xaa, 1000);
+    pool_stats stats = pool.get_stats();
+    EXPECT_EQ(stats.allocations, 1u);
+    EXPECT_EQ(stats.deallocations, 0u);
+    EXPECT_EQ(stats.bytes_in_use, host_size_class_pool::size_class(1000));
+    EXPECT_EQ(stats.upstream_blocks, 1u);
+    size_t upstream_bytes = stats.upstream_bytes;
+    EXPECT_GE(upstream_bytes, stats.bytes_in_use);
+
+    pool.deallocate(a, 1000, 64);
+    // a slightly different size falls into the same class and reuses the block
+    void *b = pool.allocate(990, 64);
+    EXPECT_EQ(b, a);
+    pool.deallocate(b, 990, 64);
+
+    stats = pool.get_stats();
+    EXPECT_EQ(stats.allocations, 2u);
+    EXPECT_EQ(stats.deallocations, 2u);
+    EXPECT_EQ(stats.bytes_in_use, 0u);
+    EXPECT_EQ(stats.peak_bytes_in_use, host_size_class_pool::size_class(1000));
+    EXPECT_EQ(stats.upstream_blocks, 1u);
+    EXPECT_EQ(stats.upstream_bytes, upstream_bytes);
+  }
+  upstream.check_leaks();
+}
+
+TEST(MMSizeClassPoolResource, RandomAllocations) {
+  test_host_resource upstream;
+  {
+    host_size_class_pool pool(&upstream, default_host_pool_opts());
+    std::mt19937_64 rng(12345);
+    std::bernoulli_distribution is_free(0.4);
+    std::uniform_int_distribution<int> align_dist(0, 8);
+    std::lognormal_distribution<> size_dist(8, 2);
+    struct allocation {
+      void *ptr;
+      size_t size, alignment;
+      size_t fill;
+    };
+    std::vector<allocation> allocs;
+    for (int i = 0; i < 10000; i++) {
+      if (is_free(rng) && !allocs.empty()) {
+        auto idx = rng() % allocs.size();
+        allocation a = allocs[idx];
+        CheckFill(a.ptr, a.size, a.fill);
+        pool.deallocate(a.ptr, a.size, a.alignment);
+        std::swap(allocs[idx], allocs.back());
+        allocs.pop_back();
+      } else {
+        allocation a;
+        a.size = std::max<size_t>(1, std::min<double>(size_dist(rng), 1 << 24));
+        a.alignment = 1 << align_dist(rng);
+        a.fill = rng();
+        a.ptr = pool.allocate(a.size, a.alignment);
+        ASSERT_TRUE(detail::is_aligned(a.ptr, a.alignment));
+        Fill(a.ptr, a.size, a.fill);
+        allocs.push_back(a);
+      }
+    }
+    size_t in_use = 0;
+    for (auto &a : allocs)
+      in_use += host_size_class_pool::size_class(a.size);
+    pool_stats stats = pool.get_stats();
+    EXPECT_EQ(stats.bytes_in_use, in_use);
+    EXPECT_EQ(stats.allocations - stats.deallocations, allocs.size());
+    EXPECT_LE(stats.peak_bytes_in_use, stats.upstream_bytes);
+
+    for (auto &a : allocs) {
+      CheckFill(a.ptr, a.size, a.fill);
+      pool.deallocate(a.ptr, a.size, a.alignment);
+    }
+    EXPECT_EQ(pool.get_stats().bytes_in_use, 0u);
+  }
+  upstream.check_leaks();
+}
+
+TEST(MMSizeClassPoolResource, MultiThreaded) {
+  // the test upstream resource is not thread-safe
+  host_size_class_pool pool(&malloc_memory_resource::instance(), default_host_pool_opts());
+  const int kThreads = 8;
+  std::vector<std::thread> threads;
+  for (int t = 0; t < kThreads; t++) {
+    threads.emplace_back([&pool, t]() {
+      std::mt19937_64 rng(12345 + t);
+      std::bernoulli_distribution is_free(0.4);
+      std::uniform_int_distribution<int> align_dist(0, 8);
+      std::lognormal_distribution<> size_dist(8, 2);
+      struct allocation {
+        void *ptr;
+        size_t size, alignment;
+        size_t fill;
+      };
+      std::vector<allocation> allocs;
+      for (int i = 0; i < 5000; i++) {
+        if (is_free(rng) && !allocs.empty()) {
+          auto idx = rng() % allocs.size();
+          allocation a = allocs[idx];
+          CheckFill(a.ptr, a.size, a.fill);
+          pool.deallocate(a.ptr, a.size, a.alignment);
+          std::swap(allocs[idx], allocs.back());
+          allocs.pop_back();
+        } else {
+          allocation a;
+          a.size = std::max<size_t>(1, std::min<double>(size_dist(rng), 1 << 22));
+          a.alignment = 1 << align_dist(rng);
+          a.fill = rng();
+          a.ptr = pool.allocate(a.size, a.alignment);
+          ASSERT_TRUE(detail::is_aligned(a.ptr, a.alignment));
+          Fill(a.ptr, a.size, a.fill);
+          allocs.push_back(a);
+        }
+      }
+      for (auto &a : allocs) {
+        CheckFill(a.ptr, a.size, a.fill);
+        pool.deallocate(a.ptr, a.size, a.alignment);
+      }
+    });
+  }
+  for (auto &t : threads)
+    t.join();
+  pool_stats stats = pool.get_stats();
+  EXPECT_EQ(stats.bytes_in_use, 0u);
+  EXPECT_EQ(stats.allocations, stats.deallocations);
+  EXPECT_LE(stats.peak_bytes_in_use, stats.upstream_bytes);
+}
+
+TEST(MMMmapResource, AllocateAndFree) {
+  for (bool use_hugepages : { false, true }) {
+    mmap_memory_resource mr(use_hugepages);
+    EXPECT_EQ(mr.uses_hugepages(), use_hugepages);
+    size_t alignment = 4096;
+    if (use_hugepages)
+      alignment = mmap_memory_resource::kHugePageSize;
+    for (size_t size : { 1, 4096, 100000, 5 << 20 }) {
+      char *mem = static_cast<char *>(mr.allocate(size));
+      ASSERT_NE(mem, nullptr);
+      EXPECT_TRUE(detail::is_aligned(mem, alignment));
+      memset(mem, 0x55, size);
+      EXPECT_EQ(mem[size - 1], 0x55);
+      mr.deallocate(mem, size);
+    }
+  }
+}
+
+}  // namespace test
+}  // namespace mm
+}  // namespace dali
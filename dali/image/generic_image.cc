@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -23,10 +23,10 @@ GenericImage::GenericImage(const uint8_t *encoded_buffer, size_t length, DALIIma
 }
 
 
-std::pair<std::shared_ptr<uint8_t>, Image::Shape>
-GenericImage::DecodeImpl(DALIImageType image_type,
-                         const uint8_t *encoded_buffer,
-                         size_t length) const {
+Image::Shape GenericImage::DecodeImpl(DALIImageType image_type,
+                                      const uint8_t *encoded_buffer,
+                                      size_t length,
+                                      const OutputAllocator &allocate_output) const {
   // Decode image to tmp cv::Mat
   cv::Mat decoded_image = cv::imdecode(
     cv::Mat(1, length, CV_8UC1, (void *) (encoded_buffer)),         //NOLINT
@@ -37,10 +37,10 @@ GenericImage::DecodeImpl(DALIImageType image_type,
 
   DALI_ENFORCE(decoded_image.data != nullptr, "Unsupported image type.");
 
-  // If required, crop the image
+  // If required, crop the image - the crop is copied to the output along with
+  // the color conversion below
   auto crop_generator = GetCropWindowGenerator();
   if (crop_generator) {
-      cv::Mat decoded_image_roi;
       auto crop = crop_generator({H, W}, "HW");
       const int y = crop.anchor[0];
       const int x = crop.anchor[1];
@@ -49,34 +49,26 @@ GenericImage::DecodeImpl(DALIImageType image_type,
       DALI_ENFORCE(newW > 0 && newW <= W);
       DALI_ENFORCE(newH > 0 && newH <= H);
       cv::Rect roi(x, y, newW, newH);
-      decoded_image(roi).copyTo(decoded_image_roi);
-      decoded_image = decoded_image_roi;
+      decoded_image = decoded_image(roi);
       W = decoded_image.cols;
       H = decoded_image.rows;
       DALI_ENFORCE(W == newW);
       DALI_ENFORCE(H == newH);
   }
 
+  const int c = IsColor(image_type) ? 3 : 1;
+  uint8_t *output = allocate_output({H, W, c});
+  cv::Mat output_image(H, W, c == 3 ? CV_8UC3 : CV_8UC1, output);
+
   // if different image type needed (e.g. RGB), permute from BGR
   if (IsColor(image_type) && image_type != DALI_BGR) {
-    OpenCvColorConversion(DALI_BGR, decoded_image, image_type, decoded_image);
+    OpenCvColorConversion(DALI_BGR, decoded_image, image_type, output_image);
+  } else {
+    decoded_image.copyTo(output_image);
   }
+  DALI_ENFORCE(output_image.data == output, "The decoded image was not written to the output");
 
-  const int c = IsColor(image_type) ? 3 : 1;
-
-  std::shared_ptr<uint8_t> decoded_img_ptr(
-          decoded_image.ptr(),
-          [decoded_image](decltype(decoded_image.ptr()) ptr) {
-              // This is an empty lambda, which is a custom deleter for
-              // std::shared_ptr.
-              // While instantiating shared_ptr, also lambda is instantiated,
-              // making a copy of cv::Mat. This way, reference counter of cv::Mat
-              // is incremented. Therefore, for the duration of life cycle of
-              // underlying memory in shared_ptr, cv::Mat won't free its memory.
-              // It will be freed, when last shared_ptr is deleted.
-          });
-
-  return {decoded_img_ptr, {H, W, c}};
+  return {H, W, c};
 }
 
 
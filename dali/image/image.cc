@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -24,16 +24,22 @@ Image::Image(const uint8_t *encoded_buffer, size_t length, DALIImageType image_t
 }
 
 void Image::Decode() {
+  Decode([this](const Shape &shape) {
+    decoded_image_.reset(new uint8_t[volume(shape)], std::default_delete<uint8_t[]>());
+    return decoded_image_.get();
+  });
+}
+
+void Image::Decode(const OutputAllocator &allocate_output) {
   DALI_ENFORCE(!decoded_, "Called decode for already decoded image");
-  auto decoded = DecodeImpl(image_type_, encoded_image_, length_);
-  decoded_image_ = decoded.first;
-  shape_ = decoded.second;
+  shape_ = DecodeImpl(image_type_, encoded_image_, length_, allocate_output);
   decoded_ = true;
 }
 
 
 std::shared_ptr<uint8_t> Image::GetImage() const {
   DALI_ENFORCE(decoded_, "Image not decoded. Run Decode()");
+  DALI_ENFORCE(decoded_image_, "Image was decoded into an external buffer");
   return decoded_image_;
 }
 
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -34,12 +34,26 @@ class Image {
  public:
   using Shape = TensorShape<3>;
 
+  /**
+   * Allocates the memory for the decoded image of given shape.
+   * It may be called more than once if a decoder falls back to another one - only the memory
+   * returned by the last call is used.
+   */
+  using OutputAllocator = std::function<uint8_t *(const Shape &shape)>;
+
   /**
    * Perform image decoding. Actual implementation is defined
    * by DecodeImpl template method
    */
   DLL_PUBLIC void Decode();
 
+  /**
+   * Decodes the image directly into the memory obtained from `allocate_output`,
+   * e.g. into an output tensor, avoiding an intermediate buffer and a copy.
+   * GetImage(...) cannot be used after decoding this way.
+   */
+  DLL_PUBLIC void Decode(const OutputAllocator &allocate_output);
+
   /**
    * Returns pointer to decoded image. Decode(...) has to be called
    * prior to calling this function
@@ -105,6 +119,23 @@ class Image {
     return use_fast_idct_;
   }
 
+  /**
+   * Allows the decoders that support it (JPEG) to decode the image (or the crop window)
+   * at a reduced resolution, as long as it is at least `height` x `width`.
+   * Zero means no constraint on the dimension; if both are zero (default), the image
+   * is decoded at the full resolution.
+   */
+  inline void SetMinDecodedSize(int height, int width) {
+    min_decoded_size_ = {height, width};
+  }
+
+  /**
+   * @return [height, width]
+   */
+  inline const std::pair<int, int> &MinDecodedSize() const {
+    return min_decoded_size_;
+  }
+
   virtual ~Image() = default;
   DISABLE_COPY_MOVE_ASSIGN(Image);
 
@@ -114,10 +145,11 @@ class Image {
    * @param image_type
    * @param encoded_buffer encoded image data
    * @param length length of the encoded buffer
-   * @return [ptr to decoded image, Shape]
+   * @param allocate_output provides the memory for the decoded image
+   * @return Shape of the decoded image
    */
-  virtual std::pair<std::shared_ptr<uint8_t>, Shape>
-  DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const = 0;
+  virtual Shape DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length,
+                           const OutputAllocator &allocate_output) const = 0;
 
   /**
    * Template method. Reads image dimensions, without decoding the image
@@ -142,6 +174,7 @@ class Image {
   const DALIImageType image_type_;
   bool decoded_ = false;
   bool use_fast_idct_ = false;
+  std::pair<int, int> min_decoded_size_ = {0, 0};
   Shape shape_;
   CropWindowGenerator crop_window_generator_;
   std::shared_ptr<uint8_t> decoded_image_ = nullptr;
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include "dali/image/jpeg.h"
+#include <algorithm>
 #include <cmath>
 #include <memory>
 #include "dali/image/jpeg_mem.h"
@@ -27,6 +28,26 @@ JpegImage::JpegImage(const uint8_t *encoded_buffer,
   : GenericImage(encoded_buffer, length, image_type) {
 }
 
+namespace {
+
+/**
+ * @brief Selects the largest DCT scaling denominator (8, 4 or 2), for which the decoded region
+ *        is still at least min_h x min_w, or 1 if there is none
+ */
+int SelectDownscaleRatio(int64_t region_h, int64_t region_w, int min_h, int min_w) {
+  if (min_h <= 0 && min_w <= 0)
+    return 1;
+  min_h = std::max(min_h, 1);
+  min_w = std::max(min_w, 1);
+  for (int ratio = 8; ratio > 1; ratio /= 2) {
+    if (region_h / ratio >= min_h && region_w / ratio >= min_w)
+      return ratio;
+  }
+  return 1;
+}
+
+}  // namespace
+
 #ifndef DALI_USE_JPEG_TURBO
 bool get_jpeg_size(const uint8 *data, size_t data_size, int *height, int *width, int *nchannels) {
   unsigned int i = 0;
@@ -58,8 +79,8 @@ bool get_jpeg_size(const uint8 *data, size_t data_size, int *height, int *width,
 }
 #endif
 
-std::pair<std::shared_ptr<uint8_t>, Image::Shape>
-JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) const {
+Image::Shape JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length,
+                                   const OutputAllocator &allocate_output) const {
   const int c = IsColor(type) ? 3 : 1;
   const auto shape = PeekShapeImpl(jpeg, length);
   const auto h = shape[0];
@@ -73,7 +94,7 @@ JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) cons
 #ifdef DALI_USE_JPEG_TURBO
   // not supported by libjpeg-turbo
   if (type == DALI_YCbCr) {
-    return GenericImage::DecodeImpl(type, jpeg, length);
+    return GenericImage::DecodeImpl(type, jpeg, length, allocate_output);
   }
 
   jpeg::UncompressFlags flags;
@@ -83,44 +104,57 @@ JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) cons
   flags.components = c;
 
   flags.crop = false;
+  CropWindow crop;
   auto crop_window_generator = GetCropWindowGenerator();
   if (crop_window_generator) {
     flags.crop = true;
     TensorShape<> shape{static_cast<int>(h), static_cast<int>(w)};
-    auto crop = crop_window_generator(shape, "HW");
+    crop = crop_window_generator(shape, "HW");
     DALI_ENFORCE(crop.IsInRange(shape));
-    flags.crop_y = crop.anchor[0];
-    flags.crop_x = crop.anchor[1];
-    flags.crop_height = crop.shape[0];
-    flags.crop_width = crop.shape[1];
+  }
+
+  // Decode at a reduced resolution (libjpeg's DCT scaling) if the decoded region
+  // can be smaller than the original one
+  int64_t region_h = flags.crop ? crop.shape[0] : h;
+  int64_t region_w = flags.crop ? crop.shape[1] : w;
+  const auto &min_size = MinDecodedSize();
+  flags.ratio = SelectDownscaleRatio(region_h, region_w, min_size.first, min_size.second);
+
+  if (flags.crop) {
+    // the crop window is expressed in the coordinates of the scaled image
+    const int ratio = flags.ratio;
+    const int64_t scaled_h = div_ceil(h, ratio), scaled_w = div_ceil(w, ratio);
+    flags.crop_y = crop.anchor[0] / ratio;
+    flags.crop_x = crop.anchor[1] / ratio;
+    flags.crop_height = std::min(div_ceil(crop.anchor[0] + crop.shape[0], ratio), scaled_h)
+                      - flags.crop_y;
+    flags.crop_width = std::min(div_ceil(crop.anchor[1] + crop.shape[1], ratio), scaled_w)
+                     - flags.crop_x;
   }
 
   DALI_ENFORCE(type == DALI_RGB || type == DALI_BGR || type == DALI_GRAY,
                "Color space not supported by libjpeg-turbo");
   flags.color_space = type;
 
-  std::shared_ptr<uint8_t> decoded_image;
   int cropped_h = 0;
   int cropped_w = 0;
+  // libjpeg writes the decoded rows directly to the output
   uint8_t* result = jpeg::Uncompress(
     jpeg, length, flags, nullptr /* nwarn */,
-    [&decoded_image, &cropped_h, &cropped_w](int width, int height, int channels) -> uint8* {
-      decoded_image.reset(
-        new uint8_t[height * width * channels],
-        [](uint8_t* data){ delete [] data; } );
+    [&allocate_output, &cropped_h, &cropped_w](int width, int height, int channels) -> uint8* {
       cropped_h = height;
       cropped_w = width;
-      return decoded_image.get();
+      return allocate_output({height, width, channels});
     });
 
   if (result == nullptr) {
     // Failed to decode, fallback
-    return GenericImage::DecodeImpl(type, jpeg, length);
+    return GenericImage::DecodeImpl(type, jpeg, length, allocate_output);
   }
 
-  return {decoded_image, {cropped_h, cropped_w, c}};
+  return {cropped_h, cropped_w, c};
 #else  // DALI_USE_JPEG_TURBO
-  return GenericImage::DecodeImpl(type, jpeg, length);
+  return GenericImage::DecodeImpl(type, jpeg, length, allocate_output);
 #endif  // DALI_USE_JPEG_TURBO
 }
 
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -32,8 +32,8 @@ class JpegImage final : public GenericImage {
   ~JpegImage() override = default;
 
  protected:
-  std::pair<std::shared_ptr<uint8_t>, Shape>
-  DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const override;
+  Shape DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length,
+                   const OutputAllocator &allocate_output) const override;
 
   Shape PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const override;
 };
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -30,4 +30,8 @@ TYPED_TEST(JpegDecodeTest, DecodeJPEGHost) {
   this->RunTestDecode(this->jpegs_);
 }
 
+TYPED_TEST(JpegDecodeTest, DecodeJPEGHostInPlace) {
+  this->RunTestDecode(this->jpegs_, 5e-2, true);
+}
+
 }  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -269,14 +269,14 @@ Image::Shape TiffImage_Libtiff::PeekShapeImpl(const uint8_t *encoded_buffer,
   return shape_;
 }
 
-std::pair<std::shared_ptr<uint8_t>, Image::Shape>
-TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
-                              const uint8 *encoded_buffer,
-                              size_t length) const {
+Image::Shape TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
+                                            const uint8 *encoded_buffer,
+                                            size_t length,
+                                            const OutputAllocator &allocate_output) const {
   // This decoder only handles bitdepth=8, non-tiled and top-left orientation
   // Other cases go to OpenCV's based decoder
   if (!CanDecode(image_type)) {
-    return GenericImage::DecodeImpl(image_type, encoded_buffer, length);
+    return GenericImage::DecodeImpl(image_type, encoded_buffer, length, allocate_output);
   }
 
   const int64_t H = shape_[0], W = shape_[1], C = shape_[2];
@@ -311,11 +311,6 @@ TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
   }
 
   TensorShape<3> decoded_shape = {roi_h, roi_w, out_C};
-  const size_t decoded_size = volume(decoded_shape);
-  std::shared_ptr<uint8_t> decoded_img_ptr{
-    new uint8_t[decoded_size],
-    [](uint8_t* ptr){ delete [] ptr; }
-  };
 
   // TODO(janton): support different types in ImageDecoder
   using InType = uint8_t;
@@ -333,7 +328,8 @@ TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
 
   const int64_t out_row_stride = roi_w * out_C;
   InType * const row_in  = row_buf.get();
-  OutType * const img_out = decoded_img_ptr.get();
+  // the rows are converted directly into the output
+  OutType * const img_out = allocate_output(decoded_shape);
 
   // Need to read sequentially since not all the images support random access
 
@@ -362,7 +358,7 @@ TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
     detail::ConvertLine(row_out, out_C, row_in, C, roi_x, roi_w, image_type);
   }
 
-  return {decoded_img_ptr, decoded_shape};
+  return decoded_shape;
 }
 
 bool TiffImage_Libtiff::CanDecode(DALIImageType image_type) const {
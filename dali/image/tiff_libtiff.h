@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -30,8 +30,8 @@ class TiffImage_Libtiff : public GenericImage {
   bool CanDecode(DALIImageType image_type) const;
 
  protected:
-  std::pair<std::shared_ptr<uint8_t>, Image::Shape>
-  DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const override;
+  Shape DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length,
+                   const OutputAllocator &allocate_output) const override;
 
   Image::Shape PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const override;
 
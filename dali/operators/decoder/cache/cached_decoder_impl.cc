@@ -93,23 +93,18 @@ void CachedDecoderImpl::CacheStore(const std::string& file_name, const uint8_t *
 DALI_SCHEMA(CachedDecoderAttr)
   .DocStr(R"code(Attributes for cached decoder.)code")
   .AddOptionalArg("cache_size",
-      R"code(Applies **only** to the ``mixed`` backend type.
-
-Total size of the decoder cache in megabytes. When provided, the decoded images
-that are larger than ``cache_threshold`` will be cached in GPU memory.
+      R"code(Total size of the decoder cache in megabytes. When provided, the decoded images
+that are larger than ``cache_threshold`` will be cached in GPU memory for the ``mixed``
+backend type and in host memory for the ``cpu`` backend type.
 )code",
       0)
   .AddOptionalArg("cache_threshold",
-      R"code(Applies **only** to the ``mixed`` backend type.
-
-The size threshold, in bytes, for decoded images to be cached. When an image is cached, it no
+      R"code(The size threshold, in bytes, for decoded images to be cached. When an image is cached, it no
 longer needs to be decoded when it is encountered at the operator input saving processing time.
 )code",
       0)
   .AddOptionalArg("cache_debug",
-      R"code(Applies **only** to the ``mixed`` backend type.
-
-Prints the debug information about the decoder cache.)code",
+      R"code(Prints the debug information about the decoder cache.)code",
       false)
   .AddOptionalArg("cache_batch_copy",
       R"code(Applies **only** to the ``mixed`` backend type.
@@ -119,9 +114,7 @@ Otherwise, unless the order in the batch is the same as in the cache, each image
 copied with ``cudaMemcpy``.)code",
       true)
   .AddOptionalArg("cache_type",
-      R"code(Applies **only** to the ``mixed`` backend type.
-
-Here is a list of the available cache types:
+      R"code(Here is a list of the available cache types:
 
 * | ``threshold``: caches every image with a size that is larger than ``cache_threshold`` until
   | the cache is full.
@@ -129,11 +122,25 @@ Here is a list of the available cache types:
   The warm-up time for threshold policy is 1 epoch.
 * | ``largest``: stores the largest images that can fit in the cache.
   | The warm-up time for largest policy is 2 epochs
+* | ``lru``: applies **only** to the ``cpu`` backend type. Caches every image with a size that is
+  | larger than ``cache_threshold``, evicting the least recently used images when the cache
+  | is full.
+
+  Images cached with this policy cannot be skipped by the readers (``skip_cached_images``).
 
   .. note::
     To take advantage of caching, it is recommended to configure readers with `stick_to_shard=True`
     to limit the amount of unique images seen by each decoder instance in a multi node environment.
 )code",
+      std::string())
+  .AddOptionalArg("cache_shm_name",
+      R"code(Applies **only** to the ``cpu`` backend type.
+
+If not empty, the decoder cache is placed in a POSIX shared memory segment with the given name
+(for example, ``"/dali_cache"``), so the processes on the same node that use the same name share
+one cache. Only the ``threshold`` cache type is supported. The decoders sharing the segment must
+use the same ``output_type`` and ``min_decoded_size``. The segment is removed when the process
+that created it destroys its cache.)code",
       std::string());
 
 }  // namespace dali
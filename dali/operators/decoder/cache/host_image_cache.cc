@@ -0,0 +1,469 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/operators/decoder/cache/host_image_cache.h"
+#include <fcntl.h>
+#include <pthread.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <atomic>
+#include <cerrno>
+#include <chrono>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <stack>
+#include <thread>
+#include "dali/core/error_handling.h"
+#include "dali/core/format.h"
+
+namespace dali {
+
+/**
+ * @brief Insert-only hash table of images placed in a POSIX shared memory segment.
+ *
+ * The segment consists of the header, the table of slots (open addressing, linear probing) and
+ * the data area, where the keys and the images are allocated one after another. The entries are
+ * never removed, so the pointers to the data stay valid as long as the segment is mapped.
+ * All accesses are serialized with a robust, process-shared mutex.
+ */
+class HostImageCache::SharedSegment {
+ public:
+  SharedSegment(const std::string &name, std::size_t capacity, const std::string &image_format)
+      : name_(name) {
+    std::size_t num_slots = capacity / (16 << 10) + 1024;
+    std::size_t size = sizeof(Header) + num_slots * sizeof(Slot) + capacity;
+
+    int fd = shm_open(name.c_str(), O_RDWR | O_CREAT | O_EXCL, 0600);
+    owner_ = fd >= 0;
+    if (owner_) {
+      if (ftruncate(fd, size) != 0) {
+        close(fd);
+        shm_unlink(name.c_str());
+        DALI_FAIL(make_string("Failed to allocate the shared memory segment ", name, ": ",
+                              std::strerror(errno)));
+      }
+    } else {
+      DALI_ENFORCE(errno == EEXIST, make_string("Failed to create the shared memory segment ",
+                                                name, ": ", std::strerror(errno)));
+      fd = shm_open(name.c_str(), O_RDWR, 0600);
+      DALI_ENFORCE(fd >= 0, make_string("Failed to open the shared memory segment ", name, ": ",
+                                        std::strerror(errno)));
+      // wait for the creator to set the size of the segment
+      struct stat st;
+      int i = 0;
+      while (fstat(fd, &st) == 0 && st.st_size == 0 && ++i < kMaxWaitIters)
+        std::this_thread::sleep_for(std::chrono::milliseconds(1));
+      if (static_cast<std::size_t>(st.st_size) != size) {
+        close(fd);
+        DALI_FAIL(make_string("The shared memory segment ", name, " has the size ", st.st_size,
+                              " but a cache of ", capacity, " bytes needs ", size, " bytes."));
+      }
+    }
+
+    void *mem = mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (mem == MAP_FAILED) {
+      if (owner_)
+        shm_unlink(name.c_str());
+      DALI_FAIL(make_string("Failed to map the shared memory segment ", name));
+    }
+    mapping_ = std::shared_ptr<void>(mem, [size](void *p) { munmap(p, size); });
+
+    header_ = static_cast<Header *>(mem);
+    slots_ = reinterpret_cast<Slot *>(header_ + 1);
+    data_ = reinterpret_cast<uint8_t *>(slots_ + num_slots);
+
+    if (owner_) {
+      // the segment is zero-initialized by ftruncate
+      pthread_mutexattr_t attr;
+      pthread_mutexattr_init(&attr);
+      pthread_mutexattr_setpshared(&attr, PTHREAD_PROCESS_SHARED);
+      pthread_mutexattr_setrobust(&attr, PTHREAD_MUTEX_ROBUST);
+      pthread_mutex_init(&header_->mutex, &attr);
+      pthread_mutexattr_destroy(&attr);
+      header_->num_slots = num_slots;
+      header_->capacity = capacity;
+      header_->format_hash = Hash(image_format);
+      std::memcpy(header_->magic, kMagic, sizeof(kMagic));
+      header_->ready.store(1, std::memory_order_release);
+    } else {
+      int i = 0;
+      while (!header_->ready.load(std::memory_order_acquire)) {
+        DALI_ENFORCE(++i < kMaxWaitIters,
+                     make_string("The shared memory segment ", name, " was not initialized."));
+        std::this_thread::sleep_for(std::chrono::milliseconds(1));
+      }
+      DALI_ENFORCE(std::memcmp(header_->magic, kMagic, sizeof(kMagic)) == 0 &&
+                   header_->num_slots == num_slots && header_->capacity == capacity,
+                   make_string("The shared memory segment ", name,
+                               " holds a cache with different parameters."));
+      DALI_ENFORCE(header_->format_hash == Hash(image_format),
+                   make_string("The shared memory segment ", name, " holds images decoded "
+                               "with different parameters (e.g. a different output type) than "
+                               "the ones requested: ", image_format));
+    }
+  }
+
+  ~SharedSegment() {
+    if (owner_)
+      shm_unlink(name_.c_str());
+  }
+
+  bool Find(const ImageKey &key, CachedImage *image) const {
+    Lock lock(header_);
+    const Slot *slot = FindSlot(key, Hash(key));
+    if (!slot->used)
+      return false;
+    if (image) {
+      image->data = data_ + slot->data_offset;
+      image->shape = {slot->shape[0], slot->shape[1], slot->shape[2]};
+      image->owner = mapping_;
+    }
+    return true;
+  }
+
+  void Insert(const ImageKey &key, const uint8_t *data, const ImageShape &shape) {
+    std::size_t data_size = volume(shape);
+    std::size_t entry_size = align_up(key.size(), 8) + data_size;
+    uint64_t hash = Hash(key);
+    Lock lock(header_);
+    Slot *slot = FindSlot(key, hash);
+    if (slot->used || header_->num_entries + 1 >= header_->num_slots ||
+        header_->used + entry_size > header_->capacity)
+      return;
+    uint64_t key_offset = header_->used;
+    uint64_t data_offset = key_offset + align_up(key.size(), 8);
+    std::memcpy(data_ + key_offset, key.data(), key.size());
+    std::memcpy(data_ + data_offset, data, data_size);
+    slot->hash = hash;
+    slot->key_offset = key_offset;
+    slot->key_size = key.size();
+    slot->data_offset = data_offset;
+    for (int d = 0; d < 3; d++)
+      slot->shape[d] = shape[d];
+    header_->used += entry_size;
+    header_->num_entries++;
+    // the slot is published last, so that if the process dies before that, the entry is
+    // just lost instead of pointing to the data that would be overwritten
+    std::atomic_thread_fence(std::memory_order_release);
+    slot->used = 1;
+  }
+
+  std::size_t bytes_used() const {
+    Lock lock(header_);
+    return header_->used;
+  }
+
+ private:
+  static constexpr char kMagic[8] = {'D', 'A', 'L', 'I', 'H', 'I', 'C', '2'};
+  static constexpr int kMaxWaitIters = 10000;
+
+  struct Header {
+    char magic[8];
+    std::atomic<uint32_t> ready;
+    uint32_t num_slots;
+    uint64_t capacity;
+    uint64_t used;
+    uint64_t num_entries;
+    uint64_t format_hash;
+    pthread_mutex_t mutex;
+  };
+
+  struct Slot {
+    uint64_t hash;
+    uint64_t key_offset;
+    uint64_t key_size;
+    uint64_t data_offset;
+    int64_t shape[3];
+    uint64_t used;
+  };
+
+  class Lock {
+   public:
+    explicit Lock(Header *header) : mutex_(&header->mutex) {
+      int ret = pthread_mutex_lock(mutex_);
+      if (ret == EOWNERDEAD) {
+        // the previous owner died - the data written under the lock is consistent, because
+        // a slot is marked as used only after the entry is complete and the space it occupies
+        // is accounted for
+        pthread_mutex_consistent(mutex_);
+      } else {
+        DALI_ENFORCE(ret == 0, "Failed to lock the shared memory cache");
+      }
+    }
+    ~Lock() {
+      pthread_mutex_unlock(mutex_);
+    }
+
+   private:
+    pthread_mutex_t *mutex_;
+  };
+
+  static std::size_t align_up(std::size_t x, std::size_t alignment) {
+    return (x + alignment - 1) / alignment * alignment;
+  }
+
+  static uint64_t Hash(const ImageKey &key) {
+    // FNV-1a - the value must not depend on the process
+    uint64_t hash = 14695981039346656037ull;
+    for (unsigned char c : key) {
+      hash ^= c;
+      hash *= 1099511628211ull;
+    }
+    return hash;
+  }
+
+  Slot *FindSlot(const ImageKey &key, uint64_t hash) const {
+    std::size_t num_slots = header_->num_slots;
+    std::size_t i = hash % num_slots;
+    while (slots_[i].used) {
+      const Slot &slot = slots_[i];
+      if (slot.hash == hash && slot.key_size == key.size() &&
+          std::memcmp(data_ + slot.key_offset, key.data(), key.size()) == 0)
+        break;
+      i = (i + 1) % num_slots;
+    }
+    return &slots_[i];
+  }
+
+  std::string name_;
+  bool owner_ = false;
+  std::shared_ptr<void> mapping_;
+  Header *header_ = nullptr;
+  Slot *slots_ = nullptr;
+  uint8_t *data_ = nullptr;
+};
+
+constexpr char HostImageCache::SharedSegment::kMagic[8];
+
+HostImageCache::HostImageCache(std::size_t cache_size,
+                               const std::string &cache_policy,
+                               std::size_t image_size_threshold,
+                               bool stats_enabled,
+                               const std::string &shm_name,
+                               const std::string &image_format)
+    : cache_size_(cache_size)
+    , cache_policy_(cache_policy)
+    , image_size_threshold_(image_size_threshold)
+    , stats_enabled_(stats_enabled) {
+  DALI_ENFORCE(cache_policy == "threshold" || cache_policy == "largest" || cache_policy == "lru",
+               "unexpected cache policy `" + cache_policy + "`");
+  DALI_ENFORCE(image_size_threshold <= cache_size_, "Cache size should fit at least one image");
+  if (!shm_name.empty()) {
+    DALI_ENFORCE(cache_policy == "threshold",
+                 "The cache in shared memory supports only the `threshold` policy");
+    shared_ = std::make_unique<SharedSegment>(shm_name, cache_size, image_format);
+  }
+}
+
+HostImageCache::~HostImageCache() {
+  if (stats_enabled_)
+    print_stats();
+}
+
+bool HostImageCache::IsCached(const ImageKey &image_key) const {
+  if (shared_)
+    return shared_->Find(image_key, nullptr);
+  std::lock_guard<std::mutex> lock(mutex_);
+  return cache_.find(image_key) != cache_.end();
+}
+
+bool HostImageCache::IsCachedPermanently(const ImageKey &image_key) const {
+  return cache_policy_ != "lru" && IsCached(image_key);
+}
+
+HostImageCache::CachedImage HostImageCache::Get(const ImageKey &image_key) const {
+  CachedImage image;
+  if (shared_) {
+    bool found = shared_->Find(image_key, &image);
+    std::lock_guard<std::mutex> lock(mutex_);
+    (found ? hits_ : misses_)++;
+    return image;
+  }
+  std::lock_guard<std::mutex> lock(mutex_);
+  auto it = cache_.find(image_key);
+  if (it == cache_.end()) {
+    misses_++;
+    return image;
+  }
+  hits_++;
+  const auto &entry = it->second;
+  if (cache_policy_ == "lru") {
+    lru_.splice(lru_.begin(), lru_, entry.lru_pos);
+  }
+  image.data = entry.data->data();
+  image.shape = entry.shape;
+  image.owner = entry.data;
+  return image;
+}
+
+void HostImageCache::Add(const ImageKey &image_key, const uint8_t *data,
+                         const ImageShape &data_shape) {
+  DALI_ENFORCE(!image_key.empty());
+  const std::size_t data_size = volume(data_shape);
+  if (shared_) {
+    if (data_size >= image_size_threshold_)
+      shared_->Insert(image_key, data, data_shape);
+    return;
+  }
+
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (cache_.find(image_key) != cache_.end())
+    return;
+  if (cache_policy_ == "largest") {
+    if (!ShouldAddLargest(image_key, data_size))
+      return;
+  } else if (data_size < image_size_threshold_) {
+    return;
+  }
+  if (data_size > cache_size_)
+    return;
+
+  if (cache_policy_ == "lru") {
+    while (total_size_ + data_size > cache_size_) {
+      auto it = cache_.find(lru_.back());
+      total_size_ -= it->second.data->size();
+      cache_.erase(it);
+      lru_.pop_back();
+      evictions_++;
+    }
+  } else if (total_size_ + data_size > cache_size_) {
+    return;
+  }
+  Insert(image_key, data, data_shape);
+}
+
+void HostImageCache::Insert(const ImageKey &image_key, const uint8_t *data,
+                            const ImageShape &data_shape) {
+  const std::size_t data_size = volume(data_shape);
+  lru_.push_front(image_key);
+  auto &entry = cache_[image_key];
+  entry.shape = data_shape;
+  entry.data = std::make_shared<std::vector<uint8_t>>(data, data + data_size);
+  entry.lru_pos = lru_.begin();
+  total_size_ += data_size;
+}
+
+bool HostImageCache::ShouldAddLargest(const ImageKey &image_key, std::size_t data_size) {
+  // The same policy as in ImageCacheLargest: during the first epoch, remember the largest images
+  // that fit in the cache and cache them when they are seen again.
+  if (!start_caching_) {
+    start_caching_ = (images_.find(image_key) != images_.end());
+    if (start_caching_) {
+      images_.clear();
+      while (!biggest_images_.empty()) {
+        images_.insert(biggest_images_.top().second);
+        biggest_images_.pop();
+      }
+    } else {
+      images_.insert(image_key);
+      if (biggest_images_total_ + data_size <= cache_size_) {
+        biggest_images_.push({data_size, image_key});
+        biggest_images_total_ += data_size;
+      } else if (data_size <= cache_size_) {
+        std::stack<QueueElement> to_be_discarded;
+        while (!biggest_images_.empty()
+            && biggest_images_total_ + data_size > cache_size_
+            && biggest_images_.top().first < data_size) {
+          biggest_images_total_ -= biggest_images_.top().first;
+          to_be_discarded.push(biggest_images_.top());
+          biggest_images_.pop();
+        }
+        if (biggest_images_total_ + data_size <= cache_size_) {
+          biggest_images_.push({data_size, image_key});
+          biggest_images_total_ += data_size;
+        }
+        while (!to_be_discarded.empty()) {
+          if (biggest_images_total_ + to_be_discarded.top().first <= cache_size_) {
+            biggest_images_total_ += to_be_discarded.top().first;
+            biggest_images_.push(std::move(to_be_discarded.top()));
+          }
+          to_be_discarded.pop();
+        }
+      }
+    }
+  }
+  return start_caching_ && images_.find(image_key) != images_.end();
+}
+
+std::size_t HostImageCache::bytes_used() const {
+  if (shared_)
+    return shared_->bytes_used();
+  std::lock_guard<std::mutex> lock(mutex_);
+  return total_size_;
+}
+
+void HostImageCache::print_stats() const {
+  const char* log_filename = std::getenv("DALI_LOG_FILE");
+  std::ofstream log_file;
+  if (log_filename) log_file.open(log_filename);
+  std::ostream& out = log_filename ? log_file : std::cout;
+  out << "################# HOST CACHE STATS ##################" << std::endl;
+  out << "cache_policy: " << cache_policy_ << std::endl;
+  out << "cache_size: " << cache_size_ << std::endl;
+  out << "cache_threshold: " << image_size_threshold_ << std::endl;
+  out << "bytes_used: " << bytes_used() << std::endl;
+  out << "hits: " << hits_ << std::endl;
+  out << "misses: " << misses_ << std::endl;
+  out << "evictions: " << evictions_ << std::endl;
+  out << "#################### END   STATS ####################" << std::endl;
+}
+
+std::shared_ptr<HostImageCache> HostImageCacheFactory::Get(int device_id,
+                                                           const std::string& cache_policy,
+                                                           std::size_t cache_size,
+                                                           bool cache_debug,
+                                                           std::size_t cache_threshold,
+                                                           const std::string &shm_name,
+                                                           const std::string &image_format) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  const CacheParams params{cache_policy, cache_size, cache_debug, cache_threshold, shm_name,
+                           image_format};
+  auto &instance = caches_[device_id];
+  auto cache = instance.cache.lock();
+  if (!cache) {
+    cache = std::make_shared<HostImageCache>(cache_size, cache_policy, cache_threshold,
+                                             cache_debug, shm_name, image_format);
+    caches_[device_id] = {cache, params};
+    return cache;
+  }
+  DALI_ENFORCE(instance.params == params,
+     "Host cache for device " + std::to_string(device_id)
+     + " was already initialized with other parameters");
+  return cache;
+}
+
+std::shared_ptr<HostImageCache> HostImageCacheFactory::Get(int device_id) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  DALI_ENFORCE(CheckWeakPtr(device_id), "Cache does not exist");
+  return caches_[device_id].cache.lock();
+}
+
+bool HostImageCacheFactory::IsInitialized(int device_id) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return CheckWeakPtr(device_id);
+}
+
+bool HostImageCacheFactory::CheckWeakPtr(int device_id) {
+  auto it = caches_.find(device_id);
+  if (it != caches_.end() && it->second.cache.expired()) {
+    caches_.erase(it);
+    return false;
+  }
+  return it != caches_.end();
+}
+
+}  // namespace dali
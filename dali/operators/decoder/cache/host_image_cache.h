@@ -0,0 +1,203 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_DECODER_CACHE_HOST_IMAGE_CACHE_H_
+#define DALI_OPERATORS_DECODER_CACHE_HOST_IMAGE_CACHE_H_
+
+#include <functional>
+#include <list>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <queue>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+#include "dali/core/api_helper.h"
+#include "dali/core/common.h"
+#include "dali/core/tensor_shape.h"
+
+namespace dali {
+
+/**
+ * @brief Cache of decoded images in host memory, used by the CPU image decoder.
+ *
+ * Supported policies:
+ * - "threshold": caches every image larger than the threshold until the cache is full,
+ * - "largest": caches the largest images that fit in the cache, starting from the second epoch,
+ * - "lru": caches every image larger than the threshold, evicting the least recently used ones.
+ *
+ * If `shm_name` is not empty, the "threshold" cache is placed in a POSIX shared memory segment
+ * of that name, so that all the processes on a node using the same name share one cache.
+ * The process that creates the segment removes its name on destruction.
+ *
+ * The images are identified by their keys (the file names) only, so `image_format` describes
+ * how they were decoded (e.g. the output type); a shared segment can be used only by the caches
+ * with the same format.
+ */
+class DLL_PUBLIC HostImageCache {
+ public:
+  using ImageKey = std::string;
+  using ImageShape = TensorShape<3>;
+
+  struct CachedImage {
+    const uint8_t *data = nullptr;
+    ImageShape shape;
+    // keeps the data alive, even if the image is evicted from the cache
+    std::shared_ptr<const void> owner;
+  };
+
+  DLL_PUBLIC HostImageCache(std::size_t cache_size,
+                            const std::string &cache_policy,
+                            std::size_t image_size_threshold = 0,
+                            bool stats_enabled = false,
+                            const std::string &shm_name = "",
+                            const std::string &image_format = "");
+
+  DLL_PUBLIC ~HostImageCache();
+
+  DISABLE_COPY_MOVE_ASSIGN(HostImageCache);
+
+  /**
+   * @brief Check whether an image is present in the cache
+   */
+  DLL_PUBLIC bool IsCached(const ImageKey &image_key) const;
+
+  /**
+   * @brief Check whether an image is present in the cache and will not be evicted from it,
+   *        so the readers may skip loading it
+   */
+  DLL_PUBLIC bool IsCachedPermanently(const ImageKey &image_key) const;
+
+  /**
+   * @brief Get the cached image
+   * @return Pointer and shape of the cached image; if not found, data is null
+   */
+  DLL_PUBLIC CachedImage Get(const ImageKey &image_key) const;
+
+  /**
+   * @brief Try to add entry to cache.
+   * @remarks Whether the entry is registered or not depends on the policy and the state
+   *          of the cache
+   */
+  DLL_PUBLIC void Add(const ImageKey &image_key, const uint8_t *data,
+                      const ImageShape &data_shape);
+
+  DLL_PUBLIC std::size_t bytes_used() const;
+
+ private:
+  struct Entry {
+    ImageShape shape;
+    std::shared_ptr<std::vector<uint8_t>> data;
+    std::list<ImageKey>::iterator lru_pos;
+  };
+
+  bool ShouldAddLargest(const ImageKey &image_key, std::size_t data_size);
+  void Insert(const ImageKey &image_key, const uint8_t *data, const ImageShape &data_shape);
+  void print_stats() const;
+
+  std::size_t cache_size_;
+  std::string cache_policy_;
+  std::size_t image_size_threshold_;
+  bool stats_enabled_;
+
+  mutable std::mutex mutex_;
+  std::unordered_map<ImageKey, Entry> cache_;
+  mutable std::list<ImageKey> lru_;  // the most recently used images first
+  std::size_t total_size_ = 0;
+
+  // state of the "largest" policy - see ImageCacheLargest
+  using QueueElement = std::pair<std::size_t, ImageKey>;
+  std::priority_queue<QueueElement,
+      std::vector<QueueElement>,
+      std::greater<QueueElement>> biggest_images_;
+  std::unordered_set<ImageKey> images_;
+  bool start_caching_ = false;
+  std::size_t biggest_images_total_ = 0;
+
+  class SharedSegment;
+  std::unique_ptr<SharedSegment> shared_;
+
+  mutable std::size_t hits_ = 0, misses_ = 0, evictions_ = 0;
+};
+
+class DLL_PUBLIC HostImageCacheFactory {
+ public:
+  DLL_PUBLIC static HostImageCacheFactory& Instance() {
+    static HostImageCacheFactory instance;
+    return instance;
+  }
+
+  /**
+   * @brief Allocate and get cache
+   * Will return the previously allocated cached if the parameters
+   * are the same.
+   * Will fail if the cache was already allocated but with different
+   * parameters
+   */
+  DLL_PUBLIC std::shared_ptr<HostImageCache> Get(
+    int device_id,
+    const std::string& cache_policy,
+    std::size_t cache_size,
+    bool cache_debug = false,
+    std::size_t cache_threshold = 0,
+    const std::string &shm_name = "",
+    const std::string &image_format = "");
+
+  /**
+   * @brief Get the already allocated cache
+   * Will fail if cache was not allocated
+   */
+  DLL_PUBLIC std::shared_ptr<HostImageCache> Get(int device_id);
+
+  /**
+   * @brief Check whether the cache for a given device id is already initialized
+   */
+  DLL_PUBLIC bool IsInitialized(int device_id);
+
+ private:
+  bool CheckWeakPtr(int device_id);
+
+  mutable std::mutex mutex_;
+
+  struct CacheParams {
+    std::string cache_policy;
+    std::size_t cache_size;
+    bool cache_debug;
+    std::size_t cache_threshold;
+    std::string shm_name;
+    std::string image_format;
+
+    inline bool operator==(const CacheParams& oth) const {
+      return cache_policy == oth.cache_policy
+          && cache_size == oth.cache_size
+          && cache_debug == oth.cache_debug
+          && cache_threshold == oth.cache_threshold
+          && shm_name == oth.shm_name
+          && image_format == oth.image_format;
+    }
+  };
+
+  struct CacheInstance {
+    std::weak_ptr<HostImageCache> cache;
+    CacheParams params;
+  };
+  std::map<int, CacheInstance> caches_;
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_DECODER_CACHE_HOST_IMAGE_CACHE_H_
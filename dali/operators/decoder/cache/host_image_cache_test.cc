@@ -0,0 +1,138 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <unistd.h>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+#include "dali/operators/decoder/cache/host_image_cache.h"
+
+namespace dali {
+namespace testing {
+
+struct HostImageCacheTest : public ::testing::Test {
+  void SetUpImpl(std::size_t cache_size, const std::string &policy, std::size_t threshold = 0,
+                 const std::string &shm_name = "") {
+    cache_.reset(new HostImageCache(cache_size, policy, threshold, false, shm_name));
+    data_.clear();
+    for (std::size_t i = 0; i <= 10; i++) {
+      data_.push_back({std::to_string(i), std::vector<uint8_t>(i, i % 256)});
+    }
+  }
+
+  void AddImage(std::size_t i) {
+    cache_->Add(data_[i].first, data_[i].second.data(),
+                {static_cast<int64_t>(data_[i].second.size()), 1, 1});
+  }
+
+  bool IsCached(std::size_t i) { return cache_->IsCached(data_[i].first); }
+
+  void CheckImage(std::size_t i) {
+    auto img = cache_->Get(data_[i].first);
+    ASSERT_NE(img.data, nullptr);
+    EXPECT_EQ(img.shape, HostImageCache::ImageShape(static_cast<int64_t>(i), 1, 1));
+    for (std::size_t j = 0; j < i; j++)
+      EXPECT_EQ(img.data[j], data_[i].second[j]);
+  }
+
+  std::unique_ptr<HostImageCache> cache_;
+  std::vector<std::pair<std::string, std::vector<uint8_t>>> data_;
+};
+
+TEST_F(HostImageCacheTest, Threshold) {
+  SetUpImpl(10, "threshold", 2);
+  AddImage(1);
+  AddImage(3);
+  AddImage(4);
+  AddImage(5);
+  EXPECT_FALSE(IsCached(1));
+  EXPECT_TRUE(IsCached(3));
+  EXPECT_TRUE(IsCached(4));
+  EXPECT_FALSE(IsCached(5));
+  EXPECT_TRUE(cache_->IsCachedPermanently(data_[3].first));
+  CheckImage(3);
+  CheckImage(4);
+  EXPECT_EQ(cache_->Get(data_[5].first).data, nullptr);
+}
+
+TEST_F(HostImageCacheTest, Largest) {
+  SetUpImpl(9, "largest");
+  for (int epoch = 0; epoch < 2; epoch++) {
+    for (std::size_t i = 1; i <= 5; i++)
+      AddImage(i);
+  }
+  EXPECT_FALSE(IsCached(1));
+  EXPECT_FALSE(IsCached(2));
+  EXPECT_FALSE(IsCached(3));
+  EXPECT_TRUE(IsCached(4));
+  EXPECT_TRUE(IsCached(5));
+  CheckImage(5);
+}
+
+TEST_F(HostImageCacheTest, LRU) {
+  SetUpImpl(10, "lru");
+  AddImage(3);
+  AddImage(4);
+  auto held = cache_->Get(data_[4].first);
+  AddImage(2);
+  CheckImage(3);  // 4 is now the least recently used one
+  AddImage(5);
+  EXPECT_TRUE(IsCached(3));
+  EXPECT_FALSE(IsCached(4));
+  EXPECT_TRUE(IsCached(2));
+  EXPECT_TRUE(IsCached(5));
+  AddImage(4);  // evicts 2 and 3
+  EXPECT_FALSE(IsCached(2));
+  EXPECT_FALSE(IsCached(3));
+  EXPECT_TRUE(IsCached(4));
+  EXPECT_TRUE(IsCached(5));
+  EXPECT_FALSE(cache_->IsCachedPermanently(data_[5].first));
+  EXPECT_LE(cache_->bytes_used(), 10u);
+  // the data obtained before the eviction is still valid
+  ASSERT_NE(held.data, nullptr);
+  EXPECT_EQ(held.data[0], 4);
+}
+
+TEST_F(HostImageCacheTest, SharedMemory) {
+  std::string name = "/dali_host_image_cache_test_" + std::to_string(getpid());
+  SetUpImpl(1 << 10, "threshold", 0, name);
+  AddImage(3);
+  AddImage(7);
+  HostImageCache other(1 << 10, "threshold", 0, false, name);
+  EXPECT_TRUE(other.IsCached(data_[3].first));
+  EXPECT_TRUE(other.IsCached(data_[7].first));
+  EXPECT_FALSE(other.IsCached(data_[5].first));
+  other.Add(data_[5].first, data_[5].second.data(), {5, 1, 1});
+  EXPECT_TRUE(IsCached(5));
+  CheckImage(5);
+  CheckImage(7);
+  EXPECT_THROW(HostImageCache(1 << 11, "threshold", 0, false, name), std::runtime_error);
+  EXPECT_THROW(HostImageCache(1 << 10, "lru", 0, false, name), std::runtime_error);
+  // the images decoded with different parameters must not be shared
+  EXPECT_THROW(HostImageCache(1 << 10, "threshold", 0, false, name, "output_type=1"),
+               std::runtime_error);
+}
+
+TEST(HostImageCacheFactoryTest, DifferentImageFormat) {
+  auto &factory = HostImageCacheFactory::Instance();
+  auto cache = factory.Get(1234, "threshold", 1 << 10, false, 0, "", "output_type=0");
+  EXPECT_THROW(factory.Get(1234, "threshold", 1 << 10, false, 0, "", "output_type=1"),
+               std::runtime_error);
+  EXPECT_EQ(factory.Get(1234, "threshold", 1 << 10, false, 0, "", "output_type=0"), cache);
+}
+
+}  // namespace testing
+}  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -31,21 +31,37 @@ void HostDecoder::RunImpl(SampleWorkspace &ws) {
   DALI_ENFORCE(IsType<uint8>(input.type()),
                 "Input must be stored as uint8 data.");
 
+  if (cache_ && !file_name.empty()) {
+    auto cached = cache_->Get(file_name);
+    if (cached.data) {
+      output.Resize(cached.shape);
+      output.SetLayout("HWC");
+      std::memcpy(output.mutable_data<unsigned char>(), cached.data, volume(cached.shape));
+      return;
+    }
+  }
+  DALI_ENFORCE(!input.ShouldSkipSample(),
+               "Image `" + file_name + "` was skipped by the reader but it is not in the cache");
+
   std::unique_ptr<Image> img;
   try {
     img = ImageFactory::CreateImage(input.data<uint8>(), input.size(), output_type_);
     img->SetCropWindowGenerator(GetCropWindowGenerator(ws.data_idx()));
     img->SetUseFastIdct(use_fast_idct_);
-    img->Decode();
+    img->SetMinDecodedSize(min_decoded_size_.first, min_decoded_size_.second);
+    // decode directly into the output sample
+    img->Decode([&output](const Image::Shape &shape) {
+      output.Resize(shape);
+      return output.mutable_data<uint8_t>();
+    });
   } catch (std::exception &e) {
     DALI_FAIL(e.what() + ". File: " + file_name);
   }
-  const auto decoded = img->GetImage();
   const auto shape = img->GetShape();
-  output.Resize(shape);
   output.SetLayout("HWC");
-  unsigned char *out_data = output.mutable_data<unsigned char>();
-  std::memcpy(out_data, decoded.get(), volume(shape));
+
+  if (cache_ && !file_name.empty())
+    cache_->Add(file_name, output.data<uint8_t>(), shape);
 }
 
 DALI_REGISTER_OPERATOR(ImageDecoder, HostDecoder, CPU);
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -15,10 +15,14 @@
 #ifndef DALI_OPERATORS_DECODER_HOST_HOST_DECODER_H_
 #define DALI_OPERATORS_DECODER_HOST_HOST_DECODER_H_
 
+#include <memory>
+#include <string>
+#include <utility>
 #include <vector>
 
 #include "dali/core/common.h"
 #include "dali/core/error_handling.h"
+#include "dali/operators/decoder/cache/host_image_cache.h"
 #include "dali/pipeline/operator/operator.h"
 #include "dali/util/crop_window.h"
 
@@ -30,8 +34,37 @@ class HostDecoder : public Operator<CPUBackend> {
       Operator<CPUBackend>(spec),
       output_type_(spec.GetArgument<DALIImageType>("output_type")),
       c_(IsColor(output_type_) ? 3 : 1),
-      use_fast_idct_(spec.GetArgument<bool>("use_fast_idct"))
-  {}
+      use_fast_idct_(spec.GetArgument<bool>("use_fast_idct")) {
+    if (spec.HasArgument("min_decoded_size")) {
+      auto min_size = spec.GetRepeatedArgument<int>("min_decoded_size");
+      DALI_ENFORCE(min_size.size() == 1 || min_size.size() == 2, make_string(
+          "`min_decoded_size` must be given as (height, width) or as a single value. Got ",
+          min_size.size(), " values."));
+      min_decoded_size_ = {min_size[0], min_size.back()};
+      DALI_ENFORCE(min_decoded_size_.first >= 0 && min_decoded_size_.second >= 0,
+                   "`min_decoded_size` must not be negative.");
+    }
+    // Fused operators don't have cache options
+    if (spec.HasArgument("cache_size")) {
+      const std::size_t cache_size =
+        static_cast<std::size_t>(spec.GetArgument<int>("cache_size")) * 1024 * 1024;
+      const std::size_t cache_threshold =
+          static_cast<std::size_t>(spec.GetArgument<int>("cache_threshold"));
+      if (cache_size > 0 && cache_size >= cache_threshold) {
+        cache_ = HostImageCacheFactory::Instance().Get(
+          spec.GetArgument<int>("device_id"),
+          spec.GetArgument<std::string>("cache_type"),
+          cache_size,
+          spec.GetArgument<bool>("cache_debug"),
+          cache_threshold,
+          spec.GetArgument<std::string>("cache_shm_name"),
+          // the cached images are looked up by the file name, so the decoders sharing a cache
+          // must produce the same images
+          make_string("output_type=", static_cast<int>(output_type_), " min_decoded_size=",
+                      min_decoded_size_.first, "x", min_decoded_size_.second));
+      }
+    }
+  }
 
   inline ~HostDecoder() override = default;
   DISABLE_COPY_MOVE_ASSIGN(HostDecoder);
@@ -50,6 +83,8 @@ class HostDecoder : public Operator<CPUBackend> {
   DALIImageType output_type_;
   int c_;
   bool use_fast_idct_ = false;
+  std::pair<int, int> min_decoded_size_ = {0, 0};
+  std::shared_ptr<HostImageCache> cache_;
 };
 
 }  // namespace dali
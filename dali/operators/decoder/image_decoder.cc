@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -114,6 +114,23 @@ the GPU implementation.
 According to the libjpeg-turbo documentation, decompression performance is improved by up to 14%
 with little reduction in quality.)code",
       false)
+  .AddOptionalArg<std::vector<int>>("min_decoded_size",
+      R"code(Applies **only** to the ``cpu`` backend type.
+
+The minimum size of the decoded image, given as ``(height, width)`` or as a single value
+for both dimensions.
+
+If provided, JPEG images are decoded at a reduced resolution - 1/2, 1/4 or 1/8 of the original
+size, using the DCT scaling of *libjpeg-turbo* - choosing the smallest one that is still at least
+as large as ``min_decoded_size``. If the decoder crops the image, the size applies to the crop
+window. It is meant to be used when the decoded images are resized to a known size
+afterwards (for example, set it to the ``size`` or ``resize_shorter`` of the following
+:meth:`nvidia.dali.fn.resize`), which can make the decoding several times faster for
+high-resolution images. Note that the result of the resize is not identical to the one
+obtained from the full resolution image.
+
+The images in other formats are decoded at their original resolution.)code",
+      nullptr)
   .AddOptionalArg("memory_stats",
       R"code(Applies **only** to the ``mixed`` backend type.
 
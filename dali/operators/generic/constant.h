@@ -81,10 +81,10 @@ class Constant : public Operator<Backend> {
   bool SetupImpl(std::vector<OutputDesc> &output_desc, const Workspace &ws) override {
     output_desc.resize(1);
     auto curr_batch_size = ws.GetRequestedBatchSize(0);
-    DALI_ENFORCE(curr_batch_size == max_batch_size_,
-                 "This operator does not doesn't support batch smaller than maximum");
-    if (output_shape_.empty() || output_shape_.num_elements() != curr_batch_size) {
+    if (output_shape_.empty() || output_shape_.num_samples() != curr_batch_size) {
       output_shape_ = uniform_list_shape(curr_batch_size, shape_arg_);
+      // the batch size has changed - the constant output is filled again in RunImpl
+      output_.Reset();
     }
     output_desc[0] = {output_shape_, TypeTable::GetTypeInfo(output_type_)};
     return false;
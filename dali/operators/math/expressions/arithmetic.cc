@@ -12,6 +12,7 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <cstdint>
 #include <vector>
 
 #include "dali/kernels/type_tag.h"
@@ -25,15 +26,51 @@ void ArithmeticGenericOp<CPUBackend>::RunImpl(HostWorkspace &ws) {
                                    spec_);
   auto &pool = ws.GetThreadPool();
   ws.OutputRef<CPUBackend>(0).SetLayout(result_layout_);
+  if (exec_order_.size() == 1) {
+    for (size_t task_idx = 0; task_idx < tile_range_.size(); task_idx++) {
+      pool.AddWork([this, task_idx](int thread_idx) {
+        auto range = tile_range_[task_idx];
+        // Go over "tiles"
+        for (int extent_idx = range.begin; extent_idx < range.end; extent_idx++) {
+          exec_order_[0].impl->Execute(exec_order_[0].ctx, tiles_per_task_[0],
+                                       {extent_idx, extent_idx + 1});
+        }
+      }, -task_idx);  // FIFO order, since the work is already divided to similarly sized chunks
+    }
+    pool.RunAll();
+    return;
+  }
+
+  intermediate_buffers_.resize(pool.size());
+  for (auto &buffer : intermediate_buffers_) {
+    buffer.resize(intermediate_size_ + kIntermediateAlignment);
+  }
   for (size_t task_idx = 0; task_idx < tile_range_.size(); task_idx++) {
     pool.AddWork([this, task_idx](int thread_idx) {
+      auto &buffer = intermediate_buffers_[thread_idx];
+      auto *scratch = reinterpret_cast<uint8_t *>(
+          align_up(reinterpret_cast<uintptr_t>(buffer.data()), kIntermediateAlignment));
+      std::vector<ExtendedTileDesc> tile(1);
       auto range = tile_range_[task_idx];
       // Go over "tiles"
       for (int extent_idx = range.begin; extent_idx < range.end; extent_idx++) {
-        // Go over expression tree in some provided order
+        // Go over expression tree in post-order, so the intermediate results for the tile
+        // are computed before they are used
         for (size_t i = 0; i < exec_order_.size(); i++) {
-          exec_order_[i].impl->Execute(exec_order_[i].ctx, tiles_per_task_[i],
-                                       {extent_idx, extent_idx + 1});
+          const auto *node = exec_order_[i].ctx.node;
+          auto &func = dynamic_cast<const ExprFunc &>(*node);
+          tile[0] = tiles_per_task_[i][extent_idx];
+          if (node != expr_.get()) {
+            tile[0].output = scratch + intermediate_offsets_.at(node);
+            // a scalar-like subexpression is computed once and used as a constant
+            if (IsScalarLike(*node))
+              tile[0].desc.extent_size = 1;
+          }
+          for (int j = 0; j < func.GetSubexpressionCount(); j++) {
+            if (func[j].GetNodeType() == NodeType::Function)
+              tile[0].args[j] = scratch + intermediate_offsets_.at(&func[j]);
+          }
+          exec_order_[i].impl->Execute(exec_order_[i].ctx, tile, {0, 1});
         }
       }
     }, -task_idx);  // FIFO order, since the work is already divided to similarly sized chunks
@@ -65,7 +102,9 @@ More formally using BNF grammar::
 Examples::
 
   add(&0 mul(&1 $0:int8))
-  add(&0 rand()))code",
+  add(&0 rand())
+
+Nested expressions are supported only by the CPU operator.)code",
             DALIDataType::DALI_STRING, false)
     .AddOptionalArg("integer_constants", "", std::vector<int32_t>{}, true)
     .NumInput(1, 64)  // Some arbitrary number that needs to be validated in operator
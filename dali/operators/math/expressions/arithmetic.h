@@ -19,6 +19,7 @@
 #include <memory>
 #include <string>
 #include <tuple>
+#include <unordered_map>
 #include <vector>
 
 #include "dali/core/format.h"
@@ -26,6 +27,7 @@
 #include "dali/core/static_switch.h"
 #include "dali/core/tensor_shape.h"
 #include "dali/core/tensor_shape_print.h"
+#include "dali/core/util.h"
 #include "dali/kernels/type_tag.h"
 #include "dali/operators/math/expressions/arithmetic_meta.h"
 #include "dali/operators/math/expressions/expression_impl_factory.h"
@@ -287,7 +289,10 @@ inline void CheckAllowedOperations(ExprNode &expr) {
  * @brief Arithmetic operator capable of executing expression tree of element-wise
  *        arithmetic operations.
  *
- * Only expressions consisting of one function node with tensor inputs are now supported.
+ * The CPU backend supports nested expression trees - the intermediate results are computed
+ * tile by tile into a per-thread scratch buffer, so they are never materialized for the whole
+ * batch. The GPU backend supports only expressions consisting of one function node with tensor
+ * inputs.
  *
  * There are 3 levels for unit of work.
  * - Thread (CPUBackend) or CUDA kernel invokation (GPUBackend)
@@ -344,18 +349,40 @@ class ArithmeticGenericOp : public Operator<Backend> {
  private:
   void AllocateIntermediateNodes() {
     auto &expr = *expr_;
-    bool is_simple_expression = expr.GetNodeType() == NodeType::Function &&
-                                expr.GetSubexpressionCount() > 0 &&
-                                expr.GetSubexpressionCount() <= kMaxArity;
-    auto &func = dynamic_cast<ExprFunc &>(expr);
-    for (int i = 0; i < func.GetSubexpressionCount(); i++) {
-      is_simple_expression = is_simple_expression && func[i].GetNodeType() != NodeType::Function;
+    DALI_ENFORCE(expr.GetNodeType() == NodeType::Function && expr.GetSubexpressionCount() > 0 &&
+                 expr.GetSubexpressionCount() <= kMaxArity,
+                 "The expression must consist of a unary, binary or ternary function.");
+    if (!std::is_same<Backend, CPUBackend>::value) {
+      auto &func = dynamic_cast<ExprFunc &>(expr);
+      bool is_simple_expression = true;
+      for (int i = 0; i < func.GetSubexpressionCount(); i++) {
+        is_simple_expression = is_simple_expression && func[i].GetNodeType() != NodeType::Function;
+      }
+      DALI_ENFORCE(is_simple_expression,
+                   "Complex expression trees are not yet supported on GPU. Only expressions "
+                   "containing one function node with one or two inputs are supported.");
+      return;
     }
+    // Place the results of the intermediate function nodes of a single tile in a scratch buffer
+    intermediate_offsets_.clear();
+    intermediate_size_ = 0;
+    AssignIntermediateOffsets(expr);
+  }
 
-    DALI_ENFORCE(is_simple_expression,
-                 "Complex expression trees are not yet supported. Only expressions containing one "
-                 "function node with one or two inputs are supported.");
-    // TODO(klecki): allocate memory for intermediate results and point the threads to them
+  void AssignIntermediateOffsets(const ExprNode &expr) {
+    if (expr.GetNodeType() != NodeType::Function) {
+      return;
+    }
+    auto &func = dynamic_cast<const ExprFunc &>(expr);
+    for (int i = 0; i < func.GetSubexpressionCount(); i++) {
+      if (func[i].GetNodeType() != NodeType::Function) {
+        continue;
+      }
+      intermediate_size_ = align_up(intermediate_size_, kIntermediateAlignment);
+      intermediate_offsets_[&func[i]] = intermediate_size_;
+      intermediate_size_ += kTileSize * TypeTable::GetTypeInfo(func[i].GetTypeId()).size();
+      AssignIntermediateOffsets(func[i]);
+    }
   }
 
   std::unique_ptr<ExprNode> expr_;
@@ -369,6 +396,12 @@ class ArithmeticGenericOp : public Operator<Backend> {
   std::vector<std::vector<ExtendedTileDesc>> tiles_per_task_;
   ConstantStorage<Backend> constant_storage_;
   ExprImplCache cache_;
+  // Offsets of the results of intermediate function nodes within the scratch buffer
+  std::unordered_map<const ExprNode *, int64_t> intermediate_offsets_;
+  int64_t intermediate_size_ = 0;
+  // Scratch buffers for the intermediate results, one per thread
+  std::vector<std::vector<uint8_t>> intermediate_buffers_;
+  static constexpr int kIntermediateAlignment = 64;
   // For CPU we limit the tile size to limit the sizes of intermediate buffers
   // For GPU it's better to execute more at one time.
   static constexpr int kTileSize =
@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <algorithm>
 #include <string>
 #include <tuple>
 #include <utility>
@@ -459,6 +460,64 @@ TEST(ArithmeticOpsTest, ConstantsPipeline) {
   }
 }
 
+TEST(ArithmeticOpsTest, NestedExpressionPipeline) {
+  constexpr int magic_int = 42;
+  constexpr float magic_float = 0.5f;
+  constexpr int batch_size = 4;
+  constexpr int num_threads = 4;
+  // more than one tile per sample
+  constexpr int tensor_elements = 10000;
+  Pipeline pipe(batch_size, num_threads, 0);
+
+  pipe.AddExternalInput("data0");
+  pipe.AddExternalInput("data1");
+
+  pipe.AddOperator(OpSpec("ArithmeticGenericOp")
+                       .AddArg("device", "cpu")
+                       .AddArg("expression_desc", "mul(sub(&0 $0:int32) add(&1 $0:float32))")
+                       .AddArg("integer_constants", std::vector<int>{magic_int})
+                       .AddArg("real_constants", std::vector<float>{magic_float})
+                       .AddInput("data0", "cpu")
+                       .AddInput("data1", "cpu")
+                       .AddOutput("result0", "cpu"),
+                   "arithm_cpu_nested");
+
+  pipe.AddOperator(OpSpec("ArithmeticGenericOp")
+                       .AddArg("device", "cpu")
+                       .AddArg("expression_desc", "clamp(minus(sub(&0 &1)) $0:int32 $1:int32)")
+                       .AddArg("integer_constants", std::vector<int>{-10, 10})
+                       .AddInput("data0", "cpu")
+                       .AddInput("data1", "cpu")
+                       .AddOutput("result1", "cpu"),
+                   "arithm_cpu_nested_ternary");
+
+  vector<std::pair<string, string>> outputs = {{"result0", "cpu"}, {"result1", "cpu"}};
+
+  pipe.Build(outputs);
+
+  TensorList<CPUBackend> batch[2];
+  for (auto &b : batch) {
+    FillBatch<int>(b, uniform_list_shape(batch_size, {tensor_elements}));
+  }
+
+  pipe.SetExternalInput("data0", batch[0]);
+  pipe.SetExternalInput("data1", batch[1]);
+  pipe.RunCPU();
+  pipe.RunGPU();
+  DeviceWorkspace ws;
+  pipe.Outputs(&ws);
+
+  const auto *data0 = batch[0].data<int>();
+  const auto *data1 = batch[1].data<int>();
+  auto *result0 = ws.OutputRef<CPUBackend>(0).data<float>();
+  auto *result1 = ws.OutputRef<CPUBackend>(1).data<int32_t>();
+
+  for (int i = 0; i < batch_size * tensor_elements; i++) {
+    EXPECT_EQ(result0[i], (data0[i] - magic_int) * (data1[i] + magic_float));
+    EXPECT_EQ(result1[i], std::min(std::max(-(data0[i] - data1[i]), -10), 10));
+  }
+}
+
 using shape_sequence = std::vector<std::array<TensorListShape<>, 3>>;
 
 int GetBatchSize(const shape_sequence &seq) {
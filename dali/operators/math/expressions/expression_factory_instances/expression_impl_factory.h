@@ -43,7 +43,7 @@ std::unique_ptr<ExprImplBase> ExprImplFactoryUnOp(const ExprFunc &expr) {
   auto input_type = expr[0].GetTypeId();
   TYPE_SWITCH(input_type, type2id, Input_t, ARITHMETIC_ALLOWED_TYPES, (
     using Out_t = typename arithm_meta<op, Backend>::template result_t<Input_t>;
-    if (expr[0].GetNodeType() == NodeType::Tensor) {
+    if (expr[0].GetNodeType() != NodeType::Constant) {
       result.reset(new ImplTensor<op, Out_t, Input_t>());
     } else {
       DALI_FAIL("Expression cannot have a constant operand");
@@ -89,12 +89,13 @@ std::unique_ptr<ExprImplBase> ExprImplFactoryBinOp(const ExprFunc &expr) {
   TYPE_SWITCH(left_type, type2id, Left_t, ARITHMETIC_ALLOWED_TYPES, (
     TYPE_SWITCH(right_type, type2id, Right_t, ARITHMETIC_ALLOWED_TYPES, (
       using Out_t = typename arithm_meta<op, Backend>::template result_t<Left_t, Right_t>;
-      if (expr[0].GetNodeType() == NodeType::Tensor && IsScalarLike(expr[1])) {
+      // Function nodes (intermediate results of a nested expression) are treated as tensors
+      if (expr[0].GetNodeType() != NodeType::Constant && IsScalarLike(expr[1])) {
         result.reset(new ImplTensorConstant<op, Out_t, Left_t, Right_t>());
-      } else if (IsScalarLike(expr[0]) && expr[1].GetNodeType() == NodeType::Tensor) {
+      } else if (IsScalarLike(expr[0]) && expr[1].GetNodeType() != NodeType::Constant) {
         result.reset( new ImplConstantTensor<op, Out_t, Left_t, Right_t>());
-      } else if (expr[0].GetNodeType() == NodeType::Tensor &&
-                 expr[1].GetNodeType() == NodeType::Tensor) {
+      } else if (expr[0].GetNodeType() != NodeType::Constant &&
+                 expr[1].GetNodeType() != NodeType::Constant) {
         // Both are non-scalar tensors
         result.reset(new ImplTensorTensor<op, Out_t, Left_t, Right_t>());
       } else {
@@ -153,8 +153,12 @@ inline ArgPack GetArgPack(const ExprFunc &func, workspace_t<Backend> &ws,
   ArgPack result;
   result.resize(func.GetSubexpressionCount());
   for (int i = 0; i < func.GetSubexpressionCount(); i++) {
-    DALI_ENFORCE(func[i].GetNodeType() != NodeType::Function,
-                 "Function nodes are not supported as subexpressions");
+    if (func[i].GetNodeType() == NodeType::Function) {
+      // Intermediate results live in a scratch buffer - the pointer is filled when the tile
+      // is executed
+      result[i] = nullptr;
+      continue;
+    }
     if (IsScalarLike(func[i])) {
       if (func[i].GetNodeType() == NodeType::Constant) {
         const auto &constant = dynamic_cast<const ExprConstant &>(func[i]);
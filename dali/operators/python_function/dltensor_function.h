@@ -22,6 +22,7 @@
 #include <string>
 #include "dali/pipeline/operator/operator.h"
 #include "dali/pipeline/util/copy_with_stride.h"
+#include "dali/pipeline/util/profiler.h"
 
 namespace dali {
 
@@ -183,6 +184,17 @@ class DLTensorPythonFunctionImpl : public Operator<Backend> {
                              ") is greater than the number of outputs (=", num_outputs, ")."));
   }
 
+  ~DLTensorPythonFunctionImpl() override {
+    // The operator can be destroyed by a thread that doesn't hold the GIL (e.g. when the pipeline
+    // is destroyed with the GIL released), so it must be acquired to drop the function reference
+    if (!Py_IsInitialized()) {
+      python_function.release();
+      return;
+    }
+    py::gil_scoped_acquire interpreter_guard{};
+    python_function = py::object();
+  }
+
  protected:
   bool SetupImpl(std::vector<OutputDesc> &output_desc, const workspace_t<Backend> &ws) override {
     return false;
@@ -195,6 +207,7 @@ class DLTensorPythonFunctionImpl : public Operator<Backend> {
     py::object output_o = py::none();
     auto curr_batch_size = GetCurrBatchSize(ws);
     try {
+      ProfilerRange callback_time(ProfilerEventType::kCallback);
       detail::StreamSynchronizer<Backend> sync(ws, synchronize_stream_);
       if (batch_processing) {
         auto input = detail::PrepareDLTensorInputs<Backend>(ws);
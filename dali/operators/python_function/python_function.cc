@@ -40,10 +40,14 @@ as CuPy arrays for GPU operators. It is expected to return the results in the sa
 a more universal data format, see :meth:`nvidia.dali.ops.DLTensorPythonFunction`.
 The function should not modify input tensors.
 
-.. warning::
-  Currently, this operator can be used only in pipelines with the
-  ``exec_async=False`` and ``exec_pipelined=False`` values specified and should only be
-  used for prototyping and debugging.
+The function is run by the executor's thread with the Python GIL acquired, so it can be used
+in pipelines with any values of ``exec_async`` and ``exec_pipelined``, but it serializes with
+other Python code in the process.
+
+CPU-heavy per-sample functions can be offloaded to a pool of workers with the ``pool`` argument,
+which accepts an object with a ``map`` method compatible with ``concurrent.futures.Executor``,
+for example ``concurrent.futures.ProcessPoolExecutor``. The samples of the batch are then
+processed concurrently. When a process pool is used, the function must be picklable.
 
 .. warning::
   This operator is not compatible with TensorFlow integration.
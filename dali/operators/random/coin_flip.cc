@@ -19,7 +19,8 @@ namespace dali {
 
 void CoinFlip::RunImpl(HostWorkspace &ws) {
   auto &output = ws.OutputRef<CPUBackend>(0);
-  for (int i = 0; i < max_batch_size_; ++i) {
+  int batch_size = output.ntensor();
+  for (int i = 0; i < batch_size; ++i) {
     output[i].mutable_data<int>()[0] = dis_(rng_) ? 1 : 0;
   }
 }
@@ -149,6 +149,19 @@ preprocessed COCO annotations.)code",
     std::string())
   .DeprecateArgInFavorOf("dump_meta_files_path",
                          "save_preprocessed_annotations_dir")  // deprecated since 0.28dev
+  .AddOptionalArg("cache_annotations",
+      R"code(If set to True, the parsed annotations are stored in a binary cache file, which is
+memory-mapped instead of parsing the JSON annotations file again when the reader is created with
+the same ``annotations_file`` and options, also by other processes.
+
+The cache is rebuilt when the annotations file is modified. Failing to write the cache is not an
+error.)code",
+      true)
+  .AddOptionalArg("annotations_cache_dir",
+      R"code(Path to the directory in which the annotations cache is stored.
+
+If not set, the cache is stored next to ``annotations_file``.)code",
+      std::string())
   .AdditionalOutputsFn([](const OpSpec& spec) {
       return OutPolygonMasksEnabled(spec) * 2 +
              OutPixelwiseMasksEnabled(spec) +
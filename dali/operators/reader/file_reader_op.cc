@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -98,6 +98,13 @@ This argument is mutually exclusive with ``file_list``.)", nullptr)
 ``files`` argument.
 
 If not used, sequential 0-based indices are used as labels)", nullptr)
+  .AddOptionalArg("file_list_cache_dir",
+      R"(Path to a directory in which the list of the files found in ``file_root`` is cached.
+
+If specified, the list is reused by the subsequent runs (e.g. by the other ranks of a distributed
+job) as long as the modification times of ``file_root`` and of its subdirectories do not change,
+which happens when files are added, removed or renamed. This argument is ignored when file
+paths are taken from ``file_list`` or ``files``.)", std::string())
   .AddParent("LoaderBase");
 
 }  // namespace dali
@@ -12,14 +12,23 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <array>
+#include <cstdio>
+#include <cstring>
 #include <list>
 #include <map>
+#include <thread>
 #include <unordered_map>
 #include <iomanip>
 #include <iostream>
 #include <fstream>
 
 #include "dali/operators/reader/loader/coco_loader.h"
+#include "dali/operators/reader/loader/utils.h"
 #include "dali/pipeline/util/lookahead_parser.h"
 
 namespace dali {
@@ -409,8 +418,274 @@ void ParseJsonFile(const OpSpec &spec, std::vector<detail::ImageInfo> &image_inf
   }
 }
 
+constexpr std::array<char, 8> kAnnotationsCacheMagic = {{'D', 'A', 'L', 'I', 'C', 'O', 'C', 'O'}};
+constexpr uint64_t kAnnotationsCacheVersion = 1;
+// the arrays in the cache are aligned, so that they can be used directly from the mapped memory
+constexpr size_t kAnnotationsCacheAlignment = 8;
+
+class AnnotationsCacheWriter {
+ public:
+  explicit AnnotationsCacheWriter(const std::string &path)
+      : path_(path), file_(path, std::ios_base::binary | std::ios_base::out) {
+    DALI_ENFORCE(file_, "Could not open the file for writing: " + path);
+  }
+
+  template <typename T>
+  void Write(T value) {
+    detail::Write(file_, value, path_.c_str());
+    offset_ += sizeof(T);
+  }
+
+  template <typename T>
+  void WriteArray(span<const T> data) {
+    Write<uint64_t>(data.size());
+    detail::Write(file_, data, path_.c_str());
+    offset_ += data.size() * sizeof(T);
+    Pad();
+  }
+
+  void WriteStrings(const ImageIdPairs &image_id_pairs) {
+    Write<uint64_t>(image_id_pairs.size());
+    for (auto &p : image_id_pairs)
+      WriteArray(make_cspan(p.first.data(), p.first.size()));
+  }
+
+  void WriteRles(const std::vector<RLEMaskPtr> &rles) {
+    Write<uint64_t>(rles.size());
+    for (auto &rle : rles) {
+      Write<uint64_t>((*rle)->h);
+      Write<uint64_t>((*rle)->w);
+      WriteArray(span<const uint>{(*rle)->cnts, static_cast<ptrdiff_t>((*rle)->m)});
+    }
+  }
+
+  void Close() {
+    file_.close();
+    DALI_ENFORCE(!file_.fail(), "Error writing to path: " + path_);
+  }
+
+ private:
+  void Pad() {
+    static const char zeros[kAnnotationsCacheAlignment] = {};
+    size_t padding = (kAnnotationsCacheAlignment - offset_ % kAnnotationsCacheAlignment) %
+                     kAnnotationsCacheAlignment;
+    detail::Write(file_, span<const char>{zeros, static_cast<ptrdiff_t>(padding)},
+                  path_.c_str());
+    offset_ += padding;
+  }
+
+  const std::string &path_;
+  std::ofstream file_;
+  size_t offset_ = 0;
+};
+
+class AnnotationsCacheReader {
+ public:
+  AnnotationsCacheReader(const char *data, size_t size, const std::string &path)
+      : ptr_(data), end_(data + size), path_(path) {}
+
+  template <typename T>
+  T Read() {
+    T value;
+    Check(sizeof(T));
+    std::memcpy(&value, ptr_, sizeof(T));
+    ptr_ += sizeof(T);
+    return value;
+  }
+
+  template <typename T>
+  span<const T> ReadArray() {
+    uint64_t count = Read<uint64_t>();
+    DALI_ENFORCE(count <= static_cast<size_t>(end_ - ptr_) / sizeof(T),
+                 "The COCO annotations cache is truncated: " + path_);
+    span<const T> data{reinterpret_cast<const T *>(ptr_), static_cast<ptrdiff_t>(count)};
+    size_t bytes = count * sizeof(T);
+    bytes += (kAnnotationsCacheAlignment - bytes % kAnnotationsCacheAlignment) %
+             kAnnotationsCacheAlignment;
+    ptr_ += std::min<size_t>(bytes, end_ - ptr_);
+    return data;
+  }
+
+  void ReadStrings(ImageIdPairs &image_id_pairs) {
+    uint64_t count = Read<uint64_t>();
+    image_id_pairs.clear();
+    image_id_pairs.reserve(count);
+    for (uint64_t i = 0; i < count; i++) {
+      auto name = ReadArray<char>();
+      image_id_pairs.emplace_back(std::string(name.data(), name.size()), static_cast<int>(i));
+    }
+  }
+
+  void ReadRles(std::vector<RLEMaskPtr> &rles) {
+    uint64_t count = Read<uint64_t>();
+    rles.clear();
+    rles.reserve(count);
+    for (uint64_t i = 0; i < count; i++) {
+      siz h = Read<uint64_t>();
+      siz w = Read<uint64_t>();
+      rles.push_back(std::make_shared<RLEMask>(h, w, ReadArray<uint>()));
+    }
+  }
+
+ private:
+  void Check(size_t bytes) {
+    DALI_ENFORCE(bytes <= static_cast<size_t>(end_ - ptr_),
+                 "The COCO annotations cache is truncated: " + path_);
+  }
+
+  const char *ptr_, *end_;
+  const std::string &path_;
+};
+
 }  // namespace detail
 
+std::string CocoLoader::AnnotationsCachePath(uint64_t &key) const {
+  const auto annotations_file = spec_.GetArgument<string>("annotations_file");
+  struct stat st;
+  DALI_ENFORCE(stat(annotations_file.c_str(), &st) == 0,
+               "Could not open JSON annotations file: \"" + annotations_file + "\"");
+
+  // everything that affects the parsed annotations
+  std::string images;
+  for (auto &image : images_)
+    images += image + '\n';
+  key = HashString(make_string(
+      annotations_file, '\n', st.st_size, '\n', st.st_mtim.tv_sec, '.', st.st_mtim.tv_nsec, '\n',
+      spec_.GetArgument<bool>("ltrb"), spec_.GetArgument<bool>("ratio"),
+      spec_.GetArgument<bool>("skip_empty"), spec_.GetArgument<float>("size_threshold"), '\n',
+      output_polygon_masks_, output_pixelwise_masks_, output_image_ids_, '\n', images));
+
+  auto cache_dir = spec_.GetArgument<string>("annotations_cache_dir");
+  auto sep = annotations_file.find_last_of('/');
+  if (cache_dir.empty())
+    cache_dir = sep == std::string::npos ? "." : annotations_file.substr(0, sep);
+  auto name = sep == std::string::npos ? annotations_file : annotations_file.substr(sep + 1);
+  char key_str[17];
+  snprintf(key_str, sizeof(key_str), "%016llx", static_cast<unsigned long long>(key));  // NOLINT
+  return make_string(cache_dir, "/", name, ".", key_str, ".dali_cache");
+}
+
+void CocoLoader::ViewVectors() {
+  view_.heights = make_cspan(heights_);
+  view_.widths = make_cspan(widths_);
+  view_.offsets = make_cspan(offsets_);
+  view_.labels = make_cspan(labels_);
+  view_.counts = make_cspan(counts_);
+  view_.original_ids = make_cspan(original_ids_);
+  view_.masks_rles_idx = make_cspan(masks_rles_idx_);
+  view_.boxes = make_cspan(boxes_);
+  view_.polygon_data = make_cspan(polygon_data_);
+  view_.vertices_data = make_cspan(vertices_data_);
+  view_.polygon_offset = make_cspan(polygon_offset_);
+  view_.polygon_count = make_cspan(polygon_count_);
+  view_.vertices_offset = make_cspan(vertices_offset_);
+  view_.vertices_count = make_cspan(vertices_count_);
+  view_.mask_offsets = make_cspan(mask_offsets_);
+  view_.mask_counts = make_cspan(mask_counts_);
+}
+
+bool CocoLoader::LoadAnnotationsCache() {
+  if (!spec_.GetArgument<bool>("cache_annotations"))
+    return false;
+  // computed before the parsing, which discards the list of the images
+  cache_path_ = AnnotationsCachePath(cache_key_);
+  // the preprocessed annotations are saved from the parsed vectors
+  if (spec_.GetArgument<bool>("save_preprocessed_annotations"))
+    return false;
+
+  const auto &path = cache_path_;
+  int fd = open(path.c_str(), O_RDONLY);
+  if (fd < 0)
+    return false;
+  struct stat st;
+  if (fstat(fd, &st) != 0 || st.st_size == 0) {
+    close(fd);
+    return false;
+  }
+  size_t size = st.st_size;
+  void *mem = mmap(nullptr, size, PROT_READ, MAP_SHARED, fd, 0);
+  close(fd);
+  if (mem == MAP_FAILED)
+    return false;
+  auto mapping = std::shared_ptr<void>(mem, [size](void *p) { munmap(p, size); });
+
+  try {
+    detail::AnnotationsCacheReader reader(static_cast<const char *>(mem), size, path);
+    if (reader.Read<std::array<char, 8>>() != detail::kAnnotationsCacheMagic ||
+        reader.Read<uint64_t>() != detail::kAnnotationsCacheVersion ||
+        reader.Read<uint64_t>() != cache_key_)
+      return false;
+
+    reader.ReadStrings(image_label_pairs_);
+    view_.heights = reader.ReadArray<int>();
+    view_.widths = reader.ReadArray<int>();
+    view_.offsets = reader.ReadArray<int>();
+    view_.labels = reader.ReadArray<int>();
+    view_.counts = reader.ReadArray<int>();
+    view_.original_ids = reader.ReadArray<int>();
+    view_.masks_rles_idx = reader.ReadArray<int>();
+    view_.boxes = reader.ReadArray<float>();
+    view_.polygon_data = reader.ReadArray<ivec3>();
+    view_.vertices_data = reader.ReadArray<vec2>();
+    view_.polygon_offset = reader.ReadArray<int64_t>();
+    view_.polygon_count = reader.ReadArray<int64_t>();
+    view_.vertices_offset = reader.ReadArray<int64_t>();
+    view_.vertices_count = reader.ReadArray<int64_t>();
+    view_.mask_offsets = reader.ReadArray<int64_t>();
+    view_.mask_counts = reader.ReadArray<int64_t>();
+    reader.ReadRles(masks_rles_);
+  } catch (std::exception &e) {
+    DALI_WARN(make_string("Ignoring the invalid COCO annotations cache ", path, ": ", e.what()));
+    image_label_pairs_.clear();
+    masks_rles_.clear();
+    view_ = {};
+    return false;
+  }
+  cache_mapping_ = std::move(mapping);
+  images_.clear();
+  return true;
+}
+
+void CocoLoader::SaveAnnotationsCache() {
+  if (cache_path_.empty())
+    return;
+  const auto &path = cache_path_;
+  // written to a temporary file first, so that the processes building the cache at the same time
+  // never see a partial one
+  std::string tmp_path = make_string(path, ".tmp", getpid(), "_",
+                                     std::hash<std::thread::id>()(std::this_thread::get_id()));
+  try {
+    detail::AnnotationsCacheWriter writer(tmp_path);
+    writer.Write(detail::kAnnotationsCacheMagic);
+    writer.Write(detail::kAnnotationsCacheVersion);
+    writer.Write(cache_key_);
+    writer.WriteStrings(image_label_pairs_);
+    writer.WriteArray(view_.heights);
+    writer.WriteArray(view_.widths);
+    writer.WriteArray(view_.offsets);
+    writer.WriteArray(view_.labels);
+    writer.WriteArray(view_.counts);
+    writer.WriteArray(view_.original_ids);
+    writer.WriteArray(view_.masks_rles_idx);
+    writer.WriteArray(view_.boxes);
+    writer.WriteArray(view_.polygon_data);
+    writer.WriteArray(view_.vertices_data);
+    writer.WriteArray(view_.polygon_offset);
+    writer.WriteArray(view_.polygon_count);
+    writer.WriteArray(view_.vertices_offset);
+    writer.WriteArray(view_.vertices_count);
+    writer.WriteArray(view_.mask_offsets);
+    writer.WriteArray(view_.mask_counts);
+    writer.WriteRles(masks_rles_);
+    writer.Close();
+    DALI_ENFORCE(std::rename(tmp_path.c_str(), path.c_str()) == 0,
+                 make_string("Failed to rename ", tmp_path, " to ", path));
+  } catch (std::exception &e) {
+    std::remove(tmp_path.c_str());
+    DALI_WARN(make_string("Could not cache the COCO annotations in ", path, ": ", e.what()));
+  }
+}
+
 void CocoLoader::SavePreprocessedAnnotations(const std::string &path,
                                              const ImageIdPairs &image_id_pairs) {
   using detail::SaveToFile;
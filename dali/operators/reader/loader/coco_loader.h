@@ -139,48 +139,55 @@ class DLL_PUBLIC CocoLoader : public FileLabelLoader {
   };
 
   span<const vec<4>> bboxes(int image_idx) const {
-    return {reinterpret_cast<const vec<4>*>(boxes_.data()) + offsets_[image_idx],
-            counts_[image_idx]};
+    return {reinterpret_cast<const vec<4>*>(view_.boxes.data()) + view_.offsets[image_idx],
+            view_.counts[image_idx]};
   }
 
   span<const int> labels(int image_idx) const {
-    return {labels_.data() + offsets_[image_idx], counts_[image_idx]};
+    return {view_.labels.data() + view_.offsets[image_idx], view_.counts[image_idx]};
   }
 
   int image_id(int image_idx) const {
     assert(output_image_ids_);
-    return original_ids_[image_idx];
+    return view_.original_ids[image_idx];
   }
 
   PixelwiseMasksInfo pixelwise_masks_info(int image_idx) const {
     assert(output_pixelwise_masks_);
     return {
-      {heights_[image_idx], widths_[image_idx], 1},
-      {masks_rles_.data() + mask_offsets_[image_idx], mask_counts_[image_idx]},
-      {masks_rles_idx_.data() + mask_offsets_[image_idx], mask_counts_[image_idx]}
+      {view_.heights[image_idx], view_.widths[image_idx], 1},
+      {masks_rles_.data() + view_.mask_offsets[image_idx], view_.mask_counts[image_idx]},
+      {view_.masks_rles_idx.data() + view_.mask_offsets[image_idx], view_.mask_counts[image_idx]}
     };
   }
 
   span<const ivec3> polygons(int image_idx) const {
     assert(output_polygon_masks_ || output_pixelwise_masks_);
-    if (polygon_data_.empty() || polygon_offset_.empty() || polygon_count_.empty())
+    if (view_.polygon_data.empty() || view_.polygon_offset.empty() ||
+        view_.polygon_count.empty())
       return {};
-    return {polygon_data_.data() + polygon_offset_[image_idx], polygon_count_[image_idx]};
+    return {view_.polygon_data.data() + view_.polygon_offset[image_idx],
+            view_.polygon_count[image_idx]};
   }
 
   span<const vec2> vertices(int image_idx) const {
     assert(output_polygon_masks_ || output_pixelwise_masks_);
-    if (vertices_data_.empty() || vertices_offset_.empty() || vertices_count_.empty())
+    if (view_.vertices_data.empty() || view_.vertices_offset.empty() ||
+        view_.vertices_count.empty())
       return {};
-    return {vertices_data_.data() + vertices_offset_[image_idx], vertices_count_[image_idx]};
+    return {view_.vertices_data.data() + view_.vertices_offset[image_idx],
+            view_.vertices_count[image_idx]};
   }
 
  protected:
   void PrepareMetadataImpl() override {
     if (has_preprocessed_annotations_) {
       ParsePreprocessedAnnotations();
-    } else {
+      ViewVectors();
+    } else if (!LoadAnnotationsCache()) {
       ParseJsonAnnotations();
+      ViewVectors();
+      SaveAnnotationsCache();
     }
 
     DALI_ENFORCE(Size() > 0, "No files found.");
@@ -199,6 +206,27 @@ class DLL_PUBLIC CocoLoader : public FileLabelLoader {
 
   void SavePreprocessedAnnotations(const std::string &path, const ImageIdPairs &image_id_pairs);
 
+  /**
+   * @brief Points the views of the annotations at the vectors holding the parsed annotations
+   */
+  void ViewVectors();
+
+  /**
+   * @brief Maps the cache of the parsed annotations, if there is an up-to-date one.
+   *
+   * The cache is identified by the path, size and modification time of the annotations file and
+   * by the options affecting the parsing. It is mapped read-only, so the processes reading the
+   * same dataset share the memory of the annotations.
+   */
+  bool LoadAnnotationsCache();
+
+  /**
+   * @brief Writes the cache of the parsed annotations. Failing to write it is not an error.
+   */
+  void SaveAnnotationsCache();
+
+  std::string AnnotationsCachePath(uint64_t &key) const;
+
  private:
   const OpSpec &spec_;
 
@@ -225,6 +253,20 @@ class DLL_PUBLIC CocoLoader : public FileLabelLoader {
   std::vector<int64_t> mask_offsets_;  // per-sample offsets of masks
   std::vector<int64_t> mask_counts_;   // number of masks per sample
 
+  // The annotations used by the accessors, viewing either the vectors above or
+  // the memory-mapped cache
+  struct {
+    span<const int> heights, widths, offsets, labels, counts, original_ids, masks_rles_idx;
+    span<const float> boxes;
+    span<const ivec3> polygon_data;
+    span<const vec2> vertices_data;
+    span<const int64_t> polygon_offset, polygon_count, vertices_offset, vertices_count;
+    span<const int64_t> mask_offsets, mask_counts;
+  } view_;
+  std::shared_ptr<void> cache_mapping_;
+  std::string cache_path_;
+  uint64_t cache_key_ = 0;
+
   bool output_polygon_masks_ = false;
   bool output_pixelwise_masks_ = false;
   bool output_image_ids_ = false;
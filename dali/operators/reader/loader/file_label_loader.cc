@@ -49,32 +49,33 @@ void FileLabelLoader::ReadSample(ImageLabelWrapper &image_label) {
     return;
   }
 
-  auto current_image = FileStream::Open(filesystem::join_path(file_root_, image_pair.first),
-                                        read_ahead_, !copy_read_data_);
-  Index image_size = current_image->Size();
+  auto image_file = image_pair.first;
+  DeferRead([this, &image_label, image_file, meta]() {
+    auto current_image = FileStream::Open(filesystem::join_path(file_root_, image_file),
+                                          read_ahead_, !copy_read_data_);
+    Index image_size = current_image->Size();
 
-  if (copy_read_data_) {
-    if (image_label.image.shares_data()) {
-      image_label.image.Reset();
+    if (copy_read_data_) {
+      if (image_label.image.shares_data()) {
+        image_label.image.Reset();
+      }
+      image_label.image.Resize({image_size});
+      // copy the image
+      Index ret = current_image->Read(image_label.image.mutable_data<uint8_t>(), image_size);
+      DALI_ENFORCE(ret == image_size, make_string("Failed to read file: ", image_file));
+    } else {
+      auto p = current_image->Get(image_size);
+      DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_file));
+      // Wrap the raw data in the Tensor object.
+      image_label.image.ShareData(p, image_size, {image_size});
+      image_label.image.set_type(TypeInfo::Create<uint8_t>());
     }
-    image_label.image.Resize({image_size});
-    // copy the image
-    Index ret = current_image->Read(image_label.image.mutable_data<uint8_t>(), image_size);
-    DALI_ENFORCE(ret == image_size, make_string("Failed to read file: ", image_pair.first));
-  } else {
-    auto p = current_image->Get(image_size);
-    DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_pair.first));
-    // Wrap the raw data in the Tensor object.
-    image_label.image.ShareData(p, image_size, {image_size});
-    image_label.image.set_type(TypeInfo::Create<uint8_t>());
-  }
 
-  // close the file handle
-  current_image->Close();
+    // close the file handle
+    current_image->Close();
 
-  // copy the label
-  image_label.label = image_pair.second;
-  image_label.image.SetMeta(meta);
+    image_label.image.SetMeta(meta);
+  });
 }
 
 Index FileLabelLoader::SizeImpl() {
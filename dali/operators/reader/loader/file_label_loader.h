@@ -1,4 +1,4 @@
-// Copyright (c) 2017, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -55,6 +55,7 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
       has_labels_arg_ = spec.TryGetRepeatedArgument(labels, "labels");
       has_file_list_arg_ = spec.TryGetArgument(file_list_, "file_list");
       has_file_root_arg_ = spec.TryGetArgument(file_root_, "file_root");
+      spec.TryGetArgument(file_list_cache_dir_, "file_list_cache_dir");
 
       DALI_ENFORCE(has_file_root_arg_ || has_files_arg_ || has_file_list_arg_,
         "``file_root`` argument is required when not using ``files`` or ``file_list``.");
@@ -113,6 +114,10 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
     copy_read_data_ = dont_use_mmap_ || !mmap_reserver_.CanShareMappedData();
   }
 
+  bool CanCheckpoint() const override {
+    return true;
+  }
+
   void PrepareEmpty(ImageLabelWrapper &tensor) override;
   void ReadSample(ImageLabelWrapper &tensor) override;
 
@@ -122,7 +127,8 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
   void PrepareMetadataImpl() override {
     if (image_label_pairs_.empty()) {
       if (!has_file_list_arg_ && !has_files_arg_) {
-        image_label_pairs_ = filesystem::traverse_directories(file_root_);
+        image_label_pairs_ = filesystem::traverse_labeled_directories(file_root_,
+                                                                      file_list_cache_dir_);
       } else if (has_file_list_arg_) {
         // load (path, label) pairs from list
         std::ifstream s(file_list_);
@@ -191,10 +197,28 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
     }
   }
 
+  LoaderPosition GetPosition() const override {
+    return {current_index_, current_epoch_};
+  }
+
+  void SetPosition(const LoaderPosition &position) override {
+    // the order of the files in an epoch depends on all the previous epochs
+    DALI_ENFORCE(position.epoch >= current_epoch_,
+                 "The reader can only move forward through the epochs.");
+    while (current_epoch_ < position.epoch) {
+      current_epoch_++;
+      if (shuffle_after_epoch_) {
+        std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
+        std::shuffle(image_label_pairs_.begin(), image_label_pairs_.end(), g);
+      }
+    }
+    current_index_ = position.index;
+  }
+
   using Loader<CPUBackend, ImageLabelWrapper>::shard_id_;
   using Loader<CPUBackend, ImageLabelWrapper>::num_shards_;
 
-  string file_root_, file_list_;
+  string file_root_, file_list_, file_list_cache_dir_;
   vector<std::pair<string, int>> image_label_pairs_;
 
   bool has_files_arg_     = false;
@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -56,6 +56,7 @@ class FileLoader : public Loader<Backend, Target> {
     has_files_arg_ = spec.TryGetRepeatedArgument(files, "files");
     has_file_list_arg_ = spec.TryGetArgument(file_list_, "file_list");
     has_file_root_arg_ = spec.TryGetArgument(file_root_, "file_root");
+    spec.TryGetArgument(file_list_cache_dir_, "file_list_cache_dir");
 
     DALI_ENFORCE(has_file_root_arg_ || has_files_arg_ || has_file_list_arg_,
                  "``file_root`` argument is required when not using ``files`` or ``file_list``.");
@@ -102,6 +103,10 @@ class FileLoader : public Loader<Backend, Target> {
     copy_read_data_ = dont_use_mmap_ || !mmap_reserver_.CanShareMappedData();
   }
 
+  bool CanCheckpoint() const override {
+    return true;
+  }
+
   void PrepareEmpty(Target &image_file) override {
     PrepareEmptyTensor(image_file.image);
     image_file.filename = "";
@@ -129,34 +134,37 @@ class FileLoader : public Loader<Backend, Target> {
       return;
     }
 
-    auto current_image = InputStream::Open(filesystem::join_path(file_root_, image_file),
-                                           read_ahead_, !copy_read_data_);
-    Index image_size = current_image->Size();
+    DeferRead([this, &imfile, image_file, meta]() {
+      auto current_image = InputStream::Open(filesystem::join_path(file_root_, image_file),
+                                             read_ahead_, !copy_read_data_);
+      Index image_size = current_image->Size();
 
-    if (copy_read_data_) {
-      if (imfile.image.shares_data()) {
-        imfile.image.Reset();
+      if (copy_read_data_) {
+        if (imfile.image.shares_data()) {
+          imfile.image.Reset();
+        }
+        imfile.image.Resize({image_size});
+        // copy the image
+        Index ret = current_image->Read(imfile.image.template mutable_data<uint8_t>(),
+                                        image_size);
+        DALI_ENFORCE(ret == image_size, make_string("Failed to read file: ", image_file));
+      } else {
+        auto p = current_image->Get(image_size);
+        DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_file));
+        // Wrap the raw data in the Tensor object.
+        imfile.image.ShareData(p, image_size, {image_size});
+        imfile.image.set_type(TypeInfo::Create<uint8_t>());
       }
-      imfile.image.Resize({image_size});
-      // copy the image
-      Index ret = current_image->Read(imfile.image.template mutable_data<uint8_t>(), image_size);
-      DALI_ENFORCE(ret == image_size, make_string("Failed to read file: ", image_file));
-    } else {
-      auto p = current_image->Get(image_size);
-      DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_file));
-      // Wrap the raw data in the Tensor object.
-      imfile.image.ShareData(p, image_size, {image_size});
-      imfile.image.set_type(TypeInfo::Create<uint8_t>());
-    }
 
-    // close the file handle
-    current_image->Close();
+      // close the file handle
+      current_image->Close();
 
-    // set metadata
-    imfile.image.SetMeta(meta);
+      // set metadata
+      imfile.image.SetMeta(meta);
 
-    // set string
-    imfile.filename = filesystem::join_path(file_root_, image_file);
+      // set string
+      imfile.filename = filesystem::join_path(file_root_, image_file);
+    });
   }
 
  protected:
@@ -164,10 +172,14 @@ class FileLoader : public Loader<Backend, Target> {
     return static_cast<Index>(images_.size());
   }
 
-  void PrepareMetadataImpl() override {
+  /**
+   * @brief Fills the list of the files from ``file_root``, ``file_list`` or ``files``,
+   *        unless it is already filled
+   */
+  void DiscoverFiles() {
     if (images_.empty()) {
       if (!has_files_arg_ && !has_file_list_arg_) {
-        images_ = filesystem::traverse_directories(file_root_, file_filter_);
+        images_ = filesystem::traverse_directories(file_root_, file_filter_, file_list_cache_dir_);
       } else if (has_file_list_arg_) {
         // load paths from list
         std::ifstream s(file_list_);
@@ -182,6 +194,10 @@ class FileLoader : public Loader<Backend, Target> {
         DALI_ENFORCE(s.eof(), "Wrong format of file_list: " + file_list_);
       }
     }
+  }
+
+  void PrepareMetadataImpl() override {
+    DiscoverFiles();
     DALI_ENFORCE(Size() > 0, "No files found.");
 
     if (shuffle_) {
@@ -208,6 +224,24 @@ class FileLoader : public Loader<Backend, Target> {
     }
   }
 
+  LoaderPosition GetPosition() const override {
+    return {current_index_, current_epoch_};
+  }
+
+  void SetPosition(const LoaderPosition &position) override {
+    // the order of the files in an epoch depends on all the previous epochs
+    DALI_ENFORCE(position.epoch >= current_epoch_,
+                 "The reader can only move forward through the epochs.");
+    while (current_epoch_ < position.epoch) {
+      current_epoch_++;
+      if (shuffle_after_epoch_) {
+        std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
+        std::shuffle(images_.begin(), images_.end(), g);
+      }
+    }
+    current_index_ = position.index;
+  }
+
   using Loader<Backend, Target>::shard_id_;
   using Loader<Backend, Target>::num_shards_;
   using Loader<Backend, Target>::stick_to_shard_;
@@ -218,10 +252,11 @@ class FileLoader : public Loader<Backend, Target> {
   using Loader<Backend, Target>::read_ahead_;
   using Loader<Backend, Target>::MoveToNextShard;
   using Loader<Backend, Target>::ShouldSkipImage;
+  using Loader<Backend, Target>::DeferRead;
   using Loader<Backend, Target>::Size;
   using Loader<Backend, Target>::PrepareEmptyTensor;
 
-  string file_list_, file_root_, file_filter_;
+  string file_list_, file_root_, file_filter_, file_list_cache_dir_;
   vector<std::string> images_;
 
   bool has_files_arg_ = false;
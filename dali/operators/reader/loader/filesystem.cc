@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -14,11 +14,21 @@
 
 #include <dirent.h>
 #include <errno.h>
-#include <glob.h>
+#include <fnmatch.h>
 #include <sys/stat.h>
+#include <unistd.h>
 #include <algorithm>
-#include <string>
+#include <atomic>
+#include <cstdio>
+#include <cstdlib>
 #include <cstring>
+#include <ctime>
+#include <exception>
+#include <fstream>
+#include <functional>
+#include <memory>
+#include <string>
+#include <thread>
 #include <utility>
 #include <vector>
 #include "dali/operators/reader/loader/filesystem.h"
@@ -45,160 +55,265 @@ std::string join_path(const std::string &dir, const std::string &path) {
     return dir + dir_sep + path;
 }
 
+namespace {
 
+constexpr const char *kFileListCacheHeader = "DALI_FILE_LIST 1";
 
-inline void assemble_file_list(std::vector<std::pair<std::string, int>>& file_label_pairs,
-                               const std::string &path, const std::string &curr_entry, int label) {
-  std::string curr_dir_path = path + dir_sep + curr_entry;
-  DIR *dir = opendir(curr_dir_path.c_str());
+using DirHandle = std::unique_ptr<DIR, int (*)(DIR *)>;
 
-  dirent *entry;
+DirHandle open_dir(const std::string &dir_path) {
+  DIR *dir = opendir(dir_path.c_str());
+  DALI_ENFORCE(dir != nullptr, "Directory " + dir_path + " could not be opened.");
+  return {dir, closedir};
+}
 
-  while ((entry = readdir(dir))) {
+bool is_directory(const std::string &dir_path, const dirent *entry) {
 #ifdef _DIRENT_HAVE_D_TYPE
-    /*
-     * we support only regular files and symlinks, if FS returns DT_UNKNOWN
-     * it doesn't mean anything and let us validate filename itself
-     */
-    if (entry->d_type != DT_REG && entry->d_type != DT_LNK &&
-        entry->d_type != DT_UNKNOWN) {
-      continue;
-    }
+  // the type reported by readdir is enough, unless it is a symlink or the FS doesn't report it
+  if (entry->d_type != DT_UNKNOWN && entry->d_type != DT_LNK)
+    return entry->d_type == DT_DIR;
 #endif
-    std::string rel_path = curr_entry + dir_sep + std::string{entry->d_name};
-    if (HasKnownExtension(std::string(entry->d_name))) {
-      file_label_pairs.push_back(std::make_pair(rel_path, label));
-    }
-  }
-  closedir(dir);
+  std::string full_path = join_path(dir_path, entry->d_name);
+  struct stat s;
+  int ret = stat(full_path.c_str(), &s);
+  DALI_ENFORCE(ret == 0,
+      "Could not access " + full_path + " during directory traversal.");
+  return S_ISDIR(s.st_mode);
 }
 
-vector<std::pair<string, int>> traverse_directories(const std::string &file_root) {
-  // open the root
-  DIR *dir = opendir(file_root.c_str());
-
-  DALI_ENFORCE(dir != nullptr,
-      "Directory " + file_root + " could not be opened.");
-
-  struct dirent *entry;
-
-  std::vector<std::pair<std::string, int>> file_label_pairs;
-  std::vector<std::string> entry_name_list;
-
-  while ((entry = readdir(dir))) {
-    struct stat s;
-    std::string entry_name(entry->d_name);
-    std::string full_path = join_path(file_root, entry_name);
-    int ret = stat(full_path.c_str(), &s);
-    DALI_ENFORCE(ret == 0,
-        "Could not access " + full_path + " during directory traversal.");
+vector<string> list_subdirectories(const std::string &file_root) {
+  auto dir = open_dir(file_root);
+  vector<string> subdirs;
+  while (dirent *entry = readdir(dir.get())) {
     if (strcmp(entry->d_name, ".") == 0 || strcmp(entry->d_name, "..") == 0) continue;
-    if (S_ISDIR(s.st_mode)) {
-      entry_name_list.push_back(entry_name);
-    }
+    if (is_directory(file_root, entry))
+      subdirs.emplace_back(entry->d_name);
   }
-  // sort directories to preserve class alphabetic order, as readdir could
-  // return unordered dir list. Otherwise file reader for training and validation
-  // could return directories with the same names in completely different order
-  std::sort(entry_name_list.begin(), entry_name_list.end());
-  for (unsigned dir_count = 0; dir_count < entry_name_list.size(); ++dir_count) {
-    assemble_file_list(file_label_pairs, file_root, entry_name_list[dir_count], dir_count);
+  return subdirs;
+}
+
+struct mtime_t {
+  int64_t sec = -1, nsec = -1;
+
+  bool operator==(const mtime_t &other) const {
+    return sec == other.sec && nsec == other.nsec;
   }
-  // sort file names as well
-  std::sort(file_label_pairs.begin(), file_label_pairs.end());
-  printf("read %lu files from %lu directories\n", file_label_pairs.size(), entry_name_list.size());
+};
 
-  closedir(dir);
+mtime_t get_mtime(const std::string &path) {
+  mtime_t mtime;
+  struct stat s;
+  if (stat(path.c_str(), &s) == 0) {
+    mtime.sec = s.st_mtim.tv_sec;
+    mtime.nsec = s.st_mtim.tv_nsec;
+  }
+  return mtime;
+}
 
-  return file_label_pairs;
+std::string file_list_cache_path(const std::string &file_root, const std::string &kind,
+                                 const std::string &cache_dir) {
+  std::unique_ptr<char, decltype(&free)> real_root(realpath(file_root.c_str(), nullptr), &free);
+  std::string key = (real_root ? std::string(real_root.get()) : file_root) + '\n' + kind;
+  char name[64];
+  snprintf(name, sizeof(name), "file_list_%016llx.txt",
+           static_cast<unsigned long long>(std::hash<std::string>()(key)));  // NOLINT
+  return join_path(cache_dir, name);
 }
 
+/**
+ * @brief Reads the scan stored in the cache, if the cache describes the current state
+ *        of the directories
+ */
+bool load_file_list_cache(const std::string &cache_path, const std::string &file_root,
+                          const std::string &kind, DirectoryScan &scan) {
+  std::ifstream in(cache_path);
+  if (!in.is_open())
+    return false;
 
-inline void assemble_file_list(std::vector<std::string>& file_list,
-                               const std::string &path, const std::string &curr_entry,
-                               const std::string &filter) {
-  std::string curr_dir_path = path + dir_sep + curr_entry;
-  DIR *dir = opendir(curr_dir_path.c_str());
+  std::string header, cached_kind, cached_root;
+  mtime_t root_mtime;
+  size_t num_dirs = 0;
+  std::getline(in, header);
+  std::getline(in, cached_kind);
+  std::getline(in, cached_root);
+  in >> root_mtime.sec >> root_mtime.nsec >> num_dirs;
+  if (!in || header != kFileListCacheHeader || cached_kind != kind || cached_root != file_root ||
+      !(get_mtime(file_root) == root_mtime))
+    return false;
 
-  dirent *entry;
+  std::vector<mtime_t> mtimes(num_dirs);
+  scan.dirs.resize(num_dirs);
+  scan.files.resize(num_dirs);
+  for (size_t d = 0; d < num_dirs && in; d++) {
+    size_t num_files = 0;
+    in >> mtimes[d].sec >> mtimes[d].nsec >> num_files;
+    in.get();  // the space before the name
+    std::getline(in, scan.dirs[d]);
+    scan.files[d].resize(num_files);
+    for (size_t f = 0; f < num_files && in; f++)
+      std::getline(in, scan.files[d][f]);
+  }
+  if (!in)
+    return false;
+
+  std::atomic<bool> valid{true};
+  ParallelFor(num_dirs, [&](size_t d) {
+    if (!(get_mtime(join_path(file_root, scan.dirs[d])) == mtimes[d]))
+      valid = false;
+  });
+  return valid;
+}
 
-  if (filter.empty()) {
-    while ((entry = readdir(dir))) {
-      std::string full_path = curr_dir_path + dir_sep + std::string{entry->d_name};
+/**
+ * @brief Stores the scan in the cache. The cache is written to a temporary file first, so that
+ *        the processes scanning the same directories at the same time never see a partial one.
+ *
+ * Failing to write the cache (e.g. in a read-only location) is not an error.
+ */
+void save_file_list_cache(const std::string &cache_path, const std::string &file_root,
+                          const std::string &kind, mtime_t root_mtime,
+                          const DirectoryScan &scan, const std::vector<mtime_t> &mtimes) {
+  // A directory modified within the resolution of the timestamps could be modified again
+  // without changing its modification time - such a scan is not cached.
+  int64_t racy_sec = static_cast<int64_t>(time(nullptr)) - 1;
+  if (root_mtime.sec >= racy_sec ||
+      std::any_of(mtimes.begin(), mtimes.end(), [&](mtime_t m) { return m.sec >= racy_sec; }))
+    return;
 
+  std::string tmp_path = make_string(cache_path, ".tmp", getpid(), "_",
+                                     std::hash<std::thread::id>()(std::this_thread::get_id()));
+  try {
+    auto has_newline = [](const std::string &name) {
+      return name.find('\n') != std::string::npos;
+    };
+    DALI_ENFORCE(!has_newline(file_root) &&
+                 std::none_of(scan.dirs.begin(), scan.dirs.end(), has_newline) &&
+                 std::none_of(scan.files.begin(), scan.files.end(),
+                              [&](const vector<string> &names) {
+                                return std::any_of(names.begin(), names.end(), has_newline);
+                              }),
+                 "The paths containing new line characters cannot be cached");
+    {
+      std::ofstream out(tmp_path);
+      DALI_ENFORCE(out.is_open(), "Could not open " + tmp_path);
+      out << kFileListCacheHeader << '\n' << kind << '\n' << file_root << '\n'
+          << root_mtime.sec << ' ' << root_mtime.nsec << ' ' << scan.dirs.size() << '\n';
+      for (size_t d = 0; d < scan.dirs.size(); d++) {
+        out << mtimes[d].sec << ' ' << mtimes[d].nsec << ' ' << scan.files[d].size() << ' '
+            << scan.dirs[d] << '\n';
+        for (auto &name : scan.files[d])
+          out << name << '\n';
+      }
+      DALI_ENFORCE(out.good(), "Could not write " + tmp_path);
+    }
+    DALI_ENFORCE(std::rename(tmp_path.c_str(), cache_path.c_str()) == 0,
+                 make_string("Failed to rename ", tmp_path, " to ", cache_path));
+  } catch (std::exception &e) {
+    std::remove(tmp_path.c_str());
+    DALI_WARN(make_string("Could not cache the file list in ", cache_path, ": ", e.what()));
+  }
+}
+
+}  // namespace
+
+vector<string> list_files(const std::string &dir_path,
+                          const std::function<bool(const std::string &name)> &accept) {
+  auto dir = open_dir(dir_path);
+  vector<string> files;
+  while (dirent *entry = readdir(dir.get())) {
 #ifdef _DIRENT_HAVE_D_TYPE
     /*
      * we support only regular files and symlinks, if FS returns DT_UNKNOWN
      * it doesn't mean anything and let us validate filename itself
      */
-      if (entry->d_type != DT_REG && entry->d_type != DT_LNK &&
-         entry->d_type != DT_UNKNOWN) {
-        continue;
-      }
-#endif
-      std::string rel_path = curr_entry + dir_sep + std::string{entry->d_name};
-      if (HasKnownExtension(std::string(entry->d_name))) {
-         file_list.push_back(rel_path);
-      }
-    }
-  } else {
-    // use glob to do the file search
-    glob_t pglob;
-    std::string pattern = curr_dir_path + dir_sep + filter;
-    if (glob(pattern.c_str(), GLOB_TILDE, NULL, &pglob) == 0) {
-      // iterate through the matched files
-      for (unsigned int count = 0; count < pglob.gl_pathc; ++count) {
-        std::string match(pglob.gl_pathv[count]);
-        std::string rel_path = curr_entry + dir_sep + match.substr(match.find_last_of(dir_sep)+1);
-        file_list.push_back(rel_path);
-      }
-      // clean up
-      globfree(&pglob);
+    if (entry->d_type != DT_REG && entry->d_type != DT_LNK &&
+        entry->d_type != DT_UNKNOWN) {
+      continue;
     }
+#endif
+    std::string name(entry->d_name);
+    if (accept(name))
+      files.push_back(std::move(name));
   }
-  closedir(dir);
+  return files;
 }
 
+DirectoryScan scan_directories(
+    const std::string &file_root, bool include_root, const std::string &kind,
+    const std::function<vector<string>(const std::string &dir_path)> &list_dir,
+    const std::string &cache_dir) {
+  DirectoryScan scan;
+  std::string cache_path;
+  if (!cache_dir.empty()) {
+    cache_path = file_list_cache_path(file_root, kind, cache_dir);
+    if (load_file_list_cache(cache_path, file_root, kind, scan))
+      return scan;
+    scan = {};
+  }
+
+  // the modification times are taken before listing, so that the changes made in the meantime
+  // invalidate the cache
+  mtime_t root_mtime = get_mtime(file_root);
+  scan.dirs = list_subdirectories(file_root);
+  if (include_root)
+    scan.dirs.push_back(".");
+  // sort directories to preserve class alphabetic order, as readdir could
+  // return unordered dir list. Otherwise file reader for training and validation
+  // could return directories with the same names in completely different order
+  std::sort(scan.dirs.begin(), scan.dirs.end());
 
-vector<std::string> traverse_directories(const std::string &file_root, const std::string &filter) {
-  // open the root
-  DIR *dir = opendir(file_root.c_str());
+  std::vector<mtime_t> mtimes(scan.dirs.size());
+  scan.files.resize(scan.dirs.size());
+  ParallelFor(scan.dirs.size(), [&](size_t d) {
+    std::string dir_path = join_path(file_root, scan.dirs[d]);
+    mtimes[d] = get_mtime(dir_path);
+    scan.files[d] = list_dir(dir_path);
+  });
 
-  DALI_ENFORCE(dir != nullptr,
-      "Directory " + file_root + " could not be opened.");
+  if (!cache_path.empty())
+    save_file_list_cache(cache_path, file_root, kind, root_mtime, scan, mtimes);
+  return scan;
+}
 
-  struct dirent *entry;
+vector<std::pair<string, int>> traverse_labeled_directories(const std::string &file_root,
+                                                            const std::string &cache_dir) {
+  auto scan = scan_directories(file_root, false, "labeled", [](const std::string &dir_path) {
+    return list_files(dir_path, HasKnownExtension);
+  }, cache_dir);
 
-  std::vector<std::string> file_list;
-  std::vector<std::string> entry_name_list;
-
-  // always append the root current directory
-  entry_name_list.push_back(".");
-
-  // now traverse sub-directories
-  while ((entry = readdir(dir))) {
-    struct stat s;
-    std::string entry_name(entry->d_name);
-    std::string full_path = join_path(file_root, entry_name);
-    int ret = stat(full_path.c_str(), &s);
-    DALI_ENFORCE(ret == 0,
-        "Could not access " + full_path + " during directory traversal.");
-    if (strcmp(entry->d_name, ".") == 0 || strcmp(entry->d_name, "..") == 0) continue;
-    if (S_ISDIR(s.st_mode)) {
-      entry_name_list.push_back(entry_name);
-    }
+  std::vector<std::pair<std::string, int>> file_label_pairs;
+  for (size_t d = 0; d < scan.dirs.size(); d++) {
+    for (auto &name : scan.files[d])
+      file_label_pairs.emplace_back(scan.dirs[d] + dir_sep + name, d);
   }
+  // sort file names as well
+  std::sort(file_label_pairs.begin(), file_label_pairs.end());
+  printf("read %lu files from %lu directories\n", file_label_pairs.size(), scan.dirs.size());
+
+  return file_label_pairs;
+}
+
+vector<std::string> traverse_directories(const std::string &file_root, const std::string &filter,
+                                         const std::string &cache_dir) {
+  // the root current directory is always included
+  auto scan = scan_directories(file_root, true, "filter:" + filter,
+                               [&](const std::string &dir_path) {
+    if (filter.empty())
+      return list_files(dir_path, HasKnownExtension);
+    return list_files(dir_path, [&](const std::string &name) {
+      // same matching as glob: the hidden files are matched only explicitly
+      return fnmatch(filter.c_str(), name.c_str(), FNM_PERIOD) == 0;
+    });
+  }, cache_dir);
 
-  // sort directories
-  std::sort(entry_name_list.begin(), entry_name_list.end());
-  for (unsigned dir_count = 0; dir_count < entry_name_list.size(); ++dir_count) {
-    assemble_file_list(file_list, file_root, entry_name_list[dir_count], filter);
+  std::vector<std::string> file_list;
+  for (size_t d = 0; d < scan.dirs.size(); d++) {
+    for (auto &name : scan.files[d])
+      file_list.push_back(scan.dirs[d] + dir_sep + name);
   }
   // sort file names as well
   std::sort(file_list.begin(), file_list.end());
-  printf("read %lu files from %lu directories\n", file_list.size(), entry_name_list.size());
-
-  closedir(dir);
+  printf("read %lu files from %lu directories\n", file_list.size(), scan.dirs.size());
 
   return file_list;
 }
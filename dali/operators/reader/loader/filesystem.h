@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -15,6 +15,7 @@
 #ifndef DALI_OPERATORS_READER_LOADER_FILESYSTEM_H_
 #define DALI_OPERATORS_READER_LOADER_FILESYSTEM_H_
 
+#include <functional>
 #include <string>
 #include <utility>
 #include <vector>
@@ -23,10 +24,58 @@
 namespace dali {
 namespace filesystem {
 
-DLL_PUBLIC vector<string> traverse_directories(const string &path, const string &filter);
+/**
+ * @brief Lists the files matching `filter` in `path` and in its direct subdirectories.
+ *
+ * The paths are relative to `path`. With an empty `filter`, the files with a known extension
+ * are listed. See `scan_directories` for the meaning of `cache_dir`.
+ */
+DLL_PUBLIC vector<string> traverse_directories(const string &path, const string &filter,
+                                               const string &cache_dir = "");
+
+/**
+ * @brief Lists the files with a known extension in the direct subdirectories of `file_root`,
+ *        labeled with the index of the subdirectory in the sorted list of the subdirectories.
+ *
+ * The paths are relative to `file_root`. See `scan_directories` for the meaning of `cache_dir`.
+ */
+DLL_PUBLIC vector<std::pair<string, int>> traverse_labeled_directories(
+    const string &file_root, const string &cache_dir = "");
 
-// TODO(michalz): Make it a more generic utility; support filters.
-DLL_PUBLIC vector<std::pair<string, int>> traverse_directories(const string &file_root);
+/**
+ * @brief Lists the names of the files accepted by `accept` in `dir_path`.
+ *
+ * Only the regular files and symlinks are listed (if the file system does not report the type
+ * of the entries, only the name is checked).
+ */
+DLL_PUBLIC vector<string> list_files(const string &dir_path,
+                                     const std::function<bool(const string &name)> &accept);
+
+struct DirectoryScan {
+  /// sorted names of the scanned directories, "." stands for the root itself
+  vector<string> dirs;
+  /// names of the files found in each of the directories, in no particular order
+  vector<vector<string>> files;
+};
+
+/**
+ * @brief Lists the files in the direct subdirectories of `file_root` (and in `file_root` itself,
+ *        if `include_root` is set), with `list_dir` called for each of them in parallel.
+ *
+ * If `cache_dir` is not empty, the result is stored there and reused by the subsequent scans of
+ * the same `file_root` with the same `kind`, as long as the modification times of the root and
+ * of all the scanned directories are unchanged (adding, removing or renaming a file changes the
+ * modification time of its directory). The directories modified in the last second before the
+ * scan are not cached, since their further changes might not be visible in the modification
+ * times. `kind` identifies `list_dir`: the scans listing the files differently must use
+ * different kinds.
+ *
+ * Failing to write the cache (e.g. in a read-only location) is not an error.
+ */
+DLL_PUBLIC DirectoryScan scan_directories(
+    const string &file_root, bool include_root, const string &kind,
+    const std::function<vector<string>(const string &dir_path)> &list_dir,
+    const string &cache_dir = "");
 
 /**
  * @brief Prepends dir to a relative path and keeps absolute path unchanged.
@@ -0,0 +1,111 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <fcntl.h>
+#include <stdlib.h>
+#include <sys/stat.h>
+#include <algorithm>
+#include <atomic>
+#include <ctime>
+#include <fstream>
+#include <string>
+#include <utility>
+#include <vector>
+#include "dali/operators/reader/loader/filesystem.h"
+
+namespace dali {
+
+namespace {
+
+std::string TempDirName() {
+  char name[] = "/tmp/dali_filesystem_test_XXXXXX";
+  EXPECT_NE(mkdtemp(name), nullptr);
+  return name;
+}
+
+void CreateFile(const std::string &path) {
+  std::ofstream f(path);
+  f << "x";
+}
+
+// makes the directory old enough for its scan to be cached
+void BackdateDir(const std::string &path, int seconds_ago) {
+  timespec times[2];
+  times[0].tv_sec = times[1].tv_sec = time(nullptr) - seconds_ago;
+  times[0].tv_nsec = times[1].tv_nsec = 0;
+  ASSERT_EQ(utimensat(AT_FDCWD, path.c_str(), times, 0), 0);
+}
+
+}  // namespace
+
+TEST(FilesystemTest, TraverseLabeledDirectories) {
+  std::string root = TempDirName();
+  for (auto dir : {"b", "a"})
+    ASSERT_EQ(mkdir((root + "/" + dir).c_str(), 0755), 0);
+  CreateFile(root + "/a/2.jpg");
+  CreateFile(root + "/a/1.jpg");
+  CreateFile(root + "/a/notes.txt");
+  CreateFile(root + "/b/0.png");
+  CreateFile(root + "/top.jpg");
+
+  std::vector<std::pair<std::string, int>> expected = {{"a/1.jpg", 0}, {"a/2.jpg", 0},
+                                                       {"b/0.png", 1}};
+  EXPECT_EQ(filesystem::traverse_labeled_directories(root), expected);
+
+  std::vector<std::string> expected_filtered = {"./top.jpg", "a/1.jpg", "a/2.jpg"};
+  EXPECT_EQ(filesystem::traverse_directories(root, "*.jpg"), expected_filtered);
+}
+
+TEST(FilesystemTest, FileListCache) {
+  std::string root = TempDirName();
+  std::string cache_dir = TempDirName();
+  for (auto dir : {"a", "b", "c"}) {
+    ASSERT_EQ(mkdir((root + "/" + dir).c_str(), 0755), 0);
+    CreateFile(root + "/" + dir + "/0.jpg");
+    BackdateDir(root + "/" + dir, 100);
+  }
+  BackdateDir(root, 100);
+
+  std::atomic<int> listed{0};
+  auto scan = [&]() {
+    return filesystem::scan_directories(root, false, "test", [&](const std::string &dir_path) {
+      listed++;
+      return filesystem::list_files(dir_path, [](const std::string &) { return true; });
+    }, cache_dir);
+  };
+
+  auto scan1 = scan();
+  EXPECT_EQ(listed, 3);
+  EXPECT_EQ(scan1.dirs, (std::vector<std::string>{"a", "b", "c"}));
+
+  auto scan2 = scan();
+  EXPECT_EQ(listed, 3);  // the cached list is used
+  EXPECT_EQ(scan2.dirs, scan1.dirs);
+  EXPECT_EQ(scan2.files, scan1.files);
+
+  CreateFile(root + "/b/1.jpg");
+  BackdateDir(root + "/b", 50);
+  auto scan3 = scan();
+  EXPECT_EQ(listed, 6);  // the directory has changed - everything is scanned again
+  std::vector<std::string> files_b = scan3.files[1];
+  std::sort(files_b.begin(), files_b.end());
+  EXPECT_EQ(files_b, (std::vector<std::string>{"0.jpg", "1.jpg"}));
+
+  auto scan4 = scan();
+  EXPECT_EQ(listed, 6);
+  EXPECT_EQ(scan4.files, scan3.files);
+}
+
+}  // namespace dali
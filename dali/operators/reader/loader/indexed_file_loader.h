@@ -15,14 +15,18 @@
 #ifndef DALI_OPERATORS_READER_LOADER_INDEXED_FILE_LOADER_H_
 #define DALI_OPERATORS_READER_LOADER_INDEXED_FILE_LOADER_H_
 
+#include <algorithm>
 #include <vector>
 #include <string>
 #include <tuple>
 #include <fstream>
 #include <memory>
+#include <numeric>
+#include <random>
 
 #include "dali/core/common.h"
 #include "dali/operators/reader/loader/loader.h"
+#include "dali/operators/reader/loader/record_index.h"
 #include "dali/util/file.h"
 
 namespace dali {
@@ -33,15 +37,31 @@ class IndexedFileLoader : public Loader<CPUBackend, Tensor<CPUBackend>> {
     : Loader(options),
       uris_(options.GetRepeatedArgument<std::string>("path")),
       index_uris_(options.GetRepeatedArgument<std::string>("index_path")),
-      current_index_(0), current_file_index_(0), current_file_(nullptr) {
+      current_index_(0), current_file_index_(0), current_file_(nullptr),
+      shuffle_after_epoch_(options.GetArgument<bool>("shuffle_after_epoch")),
+      shuffle_block_size_(options.GetArgument<int>("shuffle_block_size")),
+      current_epoch_(0) {
+    DALI_ENFORCE(shuffle_block_size_ >= 0, make_string(
+        "``shuffle_block_size`` must be non-negative, got ", shuffle_block_size_, "."));
+    /*
+     * The permutation of the records is the same in all the shards, so that they read
+     * disjoint parts of it - see FileLabelLoader
+     */
+    DALI_ENFORCE(!(shuffle_after_epoch_  && stick_to_shard_),
+                 "shuffle_after_epoch and stick_to_shard cannot be both true");
+    DALI_ENFORCE(!(shuffle_after_epoch_ && shuffle_),
+                 "shuffle_after_epoch and random_shuffle cannot be both true");
+    if (shuffle_after_epoch_) {
+      stick_to_shard_ = true;
     }
+  }
 
   void ReadSample(Tensor<CPUBackend>& tensor) override {
     MoveToNextShard(current_index_);
 
-    int64 seek_pos, size;
-    size_t file_index;
-    std::tie(seek_pos, size, file_index) = indices_[current_index_];
+    auto entry = indices_[RecordAt(current_index_)];
+    int64 seek_pos = entry.offset, size = entry.size;
+    size_t file_index = entry.file_index;
     ++current_index_;
 
     std::string image_key = uris_[file_index] + " at index " + to_string(seek_pos);
@@ -53,6 +73,7 @@ class IndexedFileLoader : public Loader<CPUBackend, Tensor<CPUBackend>> {
       current_file_->Close();
       current_file_ = FileStream::Open(uris_[file_index], read_ahead_, !copy_read_data_);
       current_file_index_ = file_index;
+      should_seek_ = true;
     }
 
     // if image is cached, skip loading
@@ -100,17 +121,15 @@ class IndexedFileLoader : public Loader<CPUBackend, Tensor<CPUBackend>> {
     }
   }
 
+  bool CanCheckpoint() const override {
+    return true;
+  }
+
   virtual void ReadIndexFile(const std::vector<std::string>& index_uris) {
     DALI_ENFORCE(index_uris.size() == uris_.size(),
         "Number of index files needs to match the number of data files");
     for (size_t i = 0; i < index_uris.size(); ++i) {
-      std::ifstream fin(index_uris[i]);
-      DALI_ENFORCE(fin.good(), "Failed to open file " + index_uris[i]);
-      int64 pos, size;
-      while (fin >> pos >> size) {
-        indices_.push_back(std::make_tuple(pos, size, i));
-      }
-      fin.close();
+      indices_.AddIndexFile(index_uris[i], i);
     }
   }
 
@@ -134,14 +153,21 @@ class IndexedFileLoader : public Loader<CPUBackend, Tensor<CPUBackend>> {
   }
 
   void Reset(bool wrap_to_shard) override {
-    int64 seek_pos, size;
-    size_t file_index;
     if (wrap_to_shard) {
       current_index_ = start_index(shard_id_, num_shards_, Size());
     } else {
       current_index_ = 0;
     }
-    std::tie(seek_pos, size, file_index) = indices_[current_index_];
+
+    current_epoch_++;
+
+    if (shuffle_after_epoch_) {
+      ShuffleRecords(kDaliDataloaderSeed + current_epoch_);
+    }
+
+    auto entry = indices_[RecordAt(current_index_)];
+    int64 seek_pos = entry.offset;
+    size_t file_index = entry.file_index;
     if (file_index != current_file_index_) {
       if (current_file_index_ != static_cast<size_t>(INVALID_INDEX)) {
         current_file_->Close();
@@ -150,18 +176,80 @@ class IndexedFileLoader : public Loader<CPUBackend, Tensor<CPUBackend>> {
       current_file_index_ = file_index;
     }
     current_file_->Seek(seek_pos);
+    should_seek_ = false;
+    next_seek_pos_ = seek_pos;
+  }
+
+  LoaderPosition GetPosition() const override {
+    return {static_cast<Index>(current_index_), current_epoch_};
+  }
+
+  void SetPosition(const LoaderPosition &position) override {
+    DALI_ENFORCE(position.index >= 0 && static_cast<size_t>(position.index) <= indices_.size(),
+                 "Invalid reader state: the position is out of the range of the records.");
+    if (shuffle_after_epoch_ && position.epoch != current_epoch_) {
+      ShuffleRecords(kDaliDataloaderSeed + position.epoch);
+    }
+    current_epoch_ = position.epoch;
+    current_index_ = position.index;
+    // the file is opened and the record is found in ReadSample
+    should_seek_ = true;
+  }
+
+  /**
+   * @brief Index of the record read at the given position of the epoch
+   */
+  size_t RecordAt(size_t position) const {
+    return shuffle_after_epoch_ ? order_[position] : position;
+  }
+
+  /**
+   * @brief Permutes the order in which the records are read.
+   *
+   * With a non-zero ``shuffle_block_size``, the order of the blocks of consecutive records
+   * is permuted and the records are shuffled only within their blocks, so that the reads
+   * stay mostly sequential.
+   */
+  void ShuffleRecords(int64_t seed) {
+    size_t n = indices_.size();
+    order_.resize(n);
+    std::iota(order_.begin(), order_.end(), 0);
+    std::mt19937 g(seed);
+    if (shuffle_block_size_ == 0) {
+      std::shuffle(order_.begin(), order_.end(), g);
+      return;
+    }
+    size_t block_size = shuffle_block_size_;
+    size_t num_blocks = (n + block_size - 1) / block_size;
+    std::vector<size_t> blocks(num_blocks);
+    std::iota(blocks.begin(), blocks.end(), 0);
+    std::shuffle(blocks.begin(), blocks.end(), g);
+    auto out = order_.begin();
+    for (size_t block : blocks) {
+      auto begin = out;
+      size_t start = block * block_size, end = std::min(start + block_size, n);
+      for (size_t i = start; i < end; i++)
+        *out++ = i;
+      std::shuffle(begin, out, g);
+    }
   }
 
   std::vector<std::string> uris_;
   std::vector<std::string> index_uris_;
-  std::vector<std::tuple<int64, int64, size_t>> indices_;
+  RecordIndex indices_;
   size_t current_index_;
   size_t current_file_index_;
   std::unique_ptr<FileStream> current_file_;
   FileStream::MappingReserver mmap_reserver_;
   static constexpr int INVALID_INDEX = -1;
   bool should_seek_ = false;
-  int64 next_seek_pos_;
+  int64 next_seek_pos_ = 0;
+
+  bool shuffle_after_epoch_;
+  int shuffle_block_size_;
+  int current_epoch_;
+  // the order of the records in the current epoch, used with shuffle_after_epoch
+  std::vector<size_t> order_;
 };
 
 }  // namespace dali
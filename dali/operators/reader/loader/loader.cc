@@ -51,6 +51,14 @@ decreases the time of all of the following accesses.)code", false)
 
 This value should be increased when the pipeline is CPU-stage bound, trading memory
 consumption for better interleaving with the Loader thread.)code", 1)
+  .AddOptionalArg("num_io_threads",
+      R"code(Number of threads used to load the samples of a batch concurrently.
+
+The order of the samples does not depend on the number of threads. Increasing this value
+improves the throughput when reading from storage with high latency, for example, network
+file systems. Only the readers that load every sample from a separate file, such as
+:meth:`nvidia.dali.ops.FileReader` and :meth:`nvidia.dali.ops.NumpyReader`, use the
+additional threads.)code", 1)
   .AddOptionalArg("skip_cached_images",
       R"code(If set to True, the loading data will be skipped when the sample is
 in the decoder cache.
@@ -15,11 +15,14 @@
 #ifndef DALI_OPERATORS_READER_LOADER_LOADER_H_
 #define DALI_OPERATORS_READER_LOADER_LOADER_H_
 
+#include <algorithm>
+#include <functional>
 #include <list>
 #include <map>
 #include <memory>
 #include <mutex>
 #include <random>
+#include <sstream>
 #include <string>
 #include <type_traits>
 #include <utility>
@@ -31,7 +34,10 @@
 #include "dali/core/error_handling.h"
 #include "dali/pipeline/operator/op_spec.h"
 #include "dali/pipeline/data/tensor.h"
+#include "dali/pipeline/util/thread_pool.h"
+#include "dali/operators/decoder/cache/host_image_cache.h"
 #include "dali/operators/decoder/cache/image_cache_factory.h"
+#include "dali/operators/reader/loader/loader_state.h"
 
 namespace dali {
 
@@ -132,9 +138,11 @@ class Loader {
       for (int i = 0; i < initial_buffer_fill_; ++i) {
         auto tensor_ptr = LoadTargetUniquePtr(new LoadTarget());
         PrepareEmpty(*tensor_ptr);
+        auto sample_info = NextSampleInfo();
         ReadSample(*tensor_ptr);
         IncreaseReadSampleCounter();
         sample_buffer_.push_back(std::move(tensor_ptr));
+        sample_infos_.push_back(sample_info);
         ++shards_.back().end;
       }
 
@@ -181,6 +189,8 @@ class Loader {
         RecycleTensor(std::move(recycle_ptr));
     });
     std::swap(sample_buffer_[idx], sample_buffer_[shards_.front().start % sample_buffer_.size()]);
+    last_sample_info_ = sample_infos_[idx];
+    std::swap(sample_infos_[idx], sample_infos_[shards_.front().start % sample_infos_.size()]);
     // now grab an empty tensor, fill it and add to filled buffers
     // empty_tensors_ needs to be thread-safe w.r.t. RecycleTensor()
     // being called by multiple consumer threads
@@ -191,9 +201,11 @@ class Loader {
       tensor_ptr = std::move(empty_tensors_.back());
       empty_tensors_.pop_back();
     }
+    auto sample_info = NextSampleInfo();
     ReadSample(*tensor_ptr);
     IncreaseReadSampleCounter();
     std::swap(sample_buffer_[shards_.back().end % sample_buffer_.size()], tensor_ptr);
+    sample_infos_[shards_.back().end % sample_infos_.size()] = sample_info;
     ++shards_.back().end;
     last_sample_ptr_tmp = sample_ptr;
 
@@ -214,6 +226,148 @@ class Loader {
   // reads.
   virtual void ReadSample(LoadTarget& tensor) = 0;
 
+  /**
+   * @brief Makes the loaders that support it defer loading the sample data in ReadSample
+   *        until FinishDeferredReads is called.
+   */
+  void EnableDeferredReads() {
+    defer_reads_ = true;
+  }
+
+  /**
+   * @brief Completes the reads deferred since the last call, concurrently, in the thread pool.
+   *
+   * The samples returned by ReadOne are valid only after the reads are completed.
+   */
+  void FinishDeferredReads(ThreadPool &thread_pool) {
+    if (deferred_reads_.empty())
+      return;
+    auto reads = std::move(deferred_reads_);
+    deferred_reads_.clear();
+    for (auto &read : reads) {
+      thread_pool.AddWork([&read](int) { read(); });
+    }
+    thread_pool.RunAll();
+  }
+
+  /**
+   * @brief Whether the loader can report its position in the dataset and seek to it,
+   *        which is needed to save and restore its state.
+   */
+  virtual bool CanCheckpoint() const {
+    return false;
+  }
+
+  /**
+   * @brief Returns the state of the loader after the last sample returned by ReadOne
+   */
+  LoaderState GetState() {
+    DALI_ENFORCE(CanCheckpoint(), "This reader does not support saving its state.");
+    if (!loading_flag_) {
+      PrepareMetadata();
+    }
+    LoaderState state;
+    state.size = Size();
+    state.shard_id = shard_id_;
+    state.num_shards = num_shards_;
+    state.initial_buffer_fill = initial_buffer_fill_;
+    state.started = initial_buffer_filled_;
+    std::stringstream rng;
+    rng << e_;
+    state.rng = rng.str();
+    state.read_sample_counter = read_sample_counter_;
+    state.returned_sample_counter = returned_sample_counter_;
+    state.virtual_shard_id = virtual_shard_id_;
+    for (auto &shard : shards_)
+      state.shards.push_back({shard.start, shard.end});
+    state.buffer = sample_infos_;
+    state.has_last_sample = last_sample_ptr_tmp != nullptr;
+    state.last_sample = last_sample_info_;
+    state.position = GetPosition();
+    state.read_seq = read_seq_;
+    return state;
+  }
+
+  /**
+   * @brief Restores the state saved with GetState.
+   *
+   * Only the samples that were kept in the shuffling buffer are read again, the loader seeks
+   * directly to the position of the next sample to read. Must be called before ReadOne.
+   */
+  void SetState(const LoaderState &state) {
+    DALI_ENFORCE(CanCheckpoint(), "This reader does not support restoring its state.");
+    if (!loading_flag_) {
+      PrepareMetadata();
+    }
+    DALI_ENFORCE(!initial_buffer_filled_,
+                 "The state of the reader can be restored only before it reads any sample.");
+    DALI_ENFORCE(state.size == Size() && state.shard_id == shard_id_ &&
+                 state.num_shards == num_shards_ &&
+                 state.initial_buffer_fill == initial_buffer_fill_,
+                 make_string("The state was saved by a reader with different parameters or with a "
+                             "different dataset: ", state.size, " samples, shard ",
+                             state.shard_id, " of ", state.num_shards, ", buffer of ",
+                             state.initial_buffer_fill, " samples (the current reader has ",
+                             Size(), " samples, shard ", shard_id_, " of ", num_shards_,
+                             ", buffer of ", initial_buffer_fill_, " samples)."));
+    if (!state.started)
+      return;
+    DALI_ENFORCE(state.buffer.size() == static_cast<size_t>(initial_buffer_fill_),
+                 "Invalid reader state: wrong number of samples in the buffer.");
+
+    std::stringstream rng(state.rng);
+    rng >> e_;
+    read_sample_counter_ = state.read_sample_counter;
+    returned_sample_counter_ = state.returned_sample_counter;
+    virtual_shard_id_ = state.virtual_shard_id;
+    shards_.clear();
+    for (auto &shard : state.shards)
+      shards_.push_back({shard.start, shard.end});
+
+    // Read the buffered samples again, in the order they were originally read, as the loaders
+    // may only be able to move forward through the epochs
+    std::vector<int> order(state.buffer.size());
+    for (size_t i = 0; i < order.size(); i++)
+      order[i] = i;
+    if (state.has_last_sample)
+      order.push_back(-1);
+    auto info = [&](int i) -> const LoaderState::Sample & {
+      return i < 0 ? state.last_sample : state.buffer[i];
+    };
+    std::sort(order.begin(), order.end(), [&](int a, int b) {
+      return info(a).seq < info(b).seq;
+    });
+    sample_buffer_.clear();
+    sample_buffer_.resize(state.buffer.size());
+    for (int i : order) {
+      auto tensor_ptr = LoadTargetUniquePtr(new LoadTarget());
+      PrepareEmpty(*tensor_ptr);
+      SetPosition(info(i).position);
+      ReadSample(*tensor_ptr);
+      if (i >= 0) {
+        sample_buffer_[i] = std::move(tensor_ptr);
+      } else {
+        last_sample_ptr_tmp = LoadTargetSharedPtr(tensor_ptr.release(),
+          [this](LoadTarget* sample) {
+            LoadTargetUniquePtr recycle_ptr(sample);
+            RecycleTensor(std::move(recycle_ptr));
+        });
+      }
+    }
+    sample_infos_ = state.buffer;
+    last_sample_info_ = state.last_sample;
+    SetPosition(state.position);
+    read_seq_ = state.read_seq;
+
+    std::lock_guard<std::mutex> lock(empty_tensors_mutex_);
+    for (int i = 0; i < initial_empty_size_; ++i) {
+      auto tensor_ptr = LoadTargetUniquePtr(new LoadTarget());
+      PrepareEmpty(*tensor_ptr);
+      empty_tensors_.push_back(std::move(tensor_ptr));
+    }
+    initial_buffer_filled_ = true;
+  }
+
   void PrepareMetadata() {
     std::lock_guard<std::mutex> l(prepare_metadata_mutex_);
     if (!loading_flag_) {
@@ -263,6 +417,22 @@ class Loader {
   // Reset reader to the first sample
   virtual void Reset(bool wrap_to_shard) = 0;
 
+  /**
+   * @brief Returns the position of the next sample to read, for the loaders that can checkpoint
+   */
+  virtual LoaderPosition GetPosition() const {
+    DALI_FAIL("This reader does not support saving its state.");
+  }
+
+  /**
+   * @brief Moves to the position returned by GetPosition, for the loaders that can checkpoint
+   *
+   * The loaders may require that the epoch of the position is not earlier than the current one.
+   */
+  virtual void SetPosition(const LoaderPosition &position) {
+    DALI_FAIL("This reader does not support restoring its state.");
+  }
+
   // Check if given reader moved to the next shard
   virtual inline bool IsNextShard(Index current_index) {
      return current_index >= Size() ||
@@ -294,6 +464,29 @@ class Loader {
     }
   }
 
+  LoaderState::Sample NextSampleInfo() {
+    LoaderState::Sample info;
+    if (CanCheckpoint())
+      info.position = GetPosition();
+    info.seq = read_seq_++;
+    return info;
+  }
+
+  /**
+   * @brief Runs `read`, which loads the data of a sample, either immediately or, if the reads are
+   *        deferred, in FinishDeferredReads.
+   *
+   * ReadSample should advance the state of the loader before calling this function and `read`
+   * should only touch the target sample, so the order of the samples does not depend on the order
+   * in which the deferred reads complete.
+   */
+  void DeferRead(std::function<void()> read) {
+    if (defer_reads_)
+      deferred_reads_.push_back(std::move(read));
+    else
+      read();
+  }
+
   bool ShouldSkipImage(const ImageCache::ImageKey& key) {
     if (!skip_cached_images_)
       return false;
@@ -305,8 +498,12 @@ class Loader {
       auto &image_cache_factory = ImageCacheFactory::Instance();
       if (image_cache_factory.IsInitialized(device_id_))
         cache_ = image_cache_factory.Get(device_id_);
+      auto &host_cache_factory = HostImageCacheFactory::Instance();
+      if (host_cache_factory.IsInitialized(device_id_))
+        host_cache_ = host_cache_factory.Get(device_id_);
     });
-    return cache_ && cache_->IsCached(key);
+    return (cache_ && cache_->IsCached(key)) ||
+           (host_cache_ && host_cache_->IsCachedPermanently(key));
   }
 
   std::vector<LoadTargetUniquePtr> sample_buffer_;
@@ -355,6 +552,7 @@ class Loader {
   // Image cache
   std::once_flag fetch_cache_;
   std::shared_ptr<ImageCache> cache_;
+  std::shared_ptr<HostImageCache> host_cache_;
 
   // Counts how many samples the reader have read already from this epoch
   Index read_sample_counter_;
@@ -378,6 +576,16 @@ class Loader {
   };
 
   std::deque<ShardBoundaries> shards_;
+
+  // The positions of the samples in sample_buffer_ and of the last returned sample, see GetState
+  std::vector<LoaderState::Sample> sample_infos_;
+  LoaderState::Sample last_sample_info_;
+  // The number of samples read so far
+  Index read_seq_ = 0;
+
+  // If true, the loaders defer loading the data of the samples until FinishDeferredReads is called
+  bool defer_reads_ = false;
+  std::vector<std::function<void()>> deferred_reads_;
 };
 
 template<typename T, typename... Args>
@@ -0,0 +1,148 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <cstring>
+#include <type_traits>
+#include <utility>
+
+#include "dali/core/error_handling.h"
+#include "dali/operators/reader/loader/loader_state.h"
+
+namespace dali {
+
+namespace {
+
+constexpr char kMagic[8] = {'D', 'A', 'L', 'I', 'L', 'D', 'S', '1'};
+
+class StateWriter {
+ public:
+  template <typename T>
+  void Write(const T &value) {
+    static_assert(std::is_trivially_copyable<T>::value, "Only trivially copyable values");
+    data_.append(reinterpret_cast<const char *>(&value), sizeof(T));
+  }
+
+  void Write(const std::string &str) {
+    Write<uint64_t>(str.size());
+    data_.append(str);
+  }
+
+  template <typename T>
+  void Write(const std::vector<T> &v) {
+    Write<uint64_t>(v.size());
+    data_.append(reinterpret_cast<const char *>(v.data()), v.size() * sizeof(T));
+  }
+
+  std::string &data() {
+    return data_;
+  }
+
+ private:
+  std::string data_;
+};
+
+class StateReader {
+ public:
+  explicit StateReader(const std::string &data) : data_(data) {}
+
+  template <typename T>
+  void Read(T &value) {
+    static_assert(std::is_trivially_copyable<T>::value, "Only trivially copyable values");
+    Consume(&value, sizeof(T));
+  }
+
+  void Read(std::string &str) {
+    uint64_t n = 0;
+    Read(n);
+    DALI_ENFORCE(n <= data_.size() - pos_, "Invalid reader state: the data is truncated.");
+    str.assign(data_, pos_, n);
+    pos_ += n;
+  }
+
+  template <typename T>
+  void Read(std::vector<T> &v) {
+    uint64_t n = 0;
+    Read(n);
+    DALI_ENFORCE(n <= (data_.size() - pos_) / sizeof(T),
+                 "Invalid reader state: the data is truncated.");
+    v.resize(n);
+    Consume(v.data(), n * sizeof(T));
+  }
+
+  bool AtEnd() const {
+    return pos_ == data_.size();
+  }
+
+ private:
+  void Consume(void *dst, size_t n) {
+    DALI_ENFORCE(n <= data_.size() - pos_, "Invalid reader state: the data is truncated.");
+    std::memcpy(dst, data_.data() + pos_, n);
+    pos_ += n;
+  }
+
+  const std::string &data_;
+  size_t pos_ = 0;
+};
+
+}  // namespace
+
+std::string LoaderState::Serialize() const {
+  StateWriter w;
+  w.data().append(kMagic, sizeof(kMagic));
+  w.Write(size);
+  w.Write(shard_id);
+  w.Write(num_shards);
+  w.Write(initial_buffer_fill);
+  w.Write(started);
+  w.Write(rng);
+  w.Write(read_sample_counter);
+  w.Write(returned_sample_counter);
+  w.Write(virtual_shard_id);
+  w.Write(shards);
+  w.Write(buffer);
+  w.Write(has_last_sample);
+  w.Write(last_sample);
+  w.Write(position);
+  w.Write(read_seq);
+  return std::move(w.data());
+}
+
+LoaderState LoaderState::Deserialize(const std::string &data) {
+  DALI_ENFORCE(data.size() >= sizeof(kMagic) &&
+               std::memcmp(data.data(), kMagic, sizeof(kMagic)) == 0,
+               "Invalid reader state: the data was not produced by a DALI reader.");
+  StateReader r(data);
+  char magic[sizeof(kMagic)];
+  r.Read(magic);
+  LoaderState state;
+  r.Read(state.size);
+  r.Read(state.shard_id);
+  r.Read(state.num_shards);
+  r.Read(state.initial_buffer_fill);
+  r.Read(state.started);
+  r.Read(state.rng);
+  r.Read(state.read_sample_counter);
+  r.Read(state.returned_sample_counter);
+  r.Read(state.virtual_shard_id);
+  r.Read(state.shards);
+  r.Read(state.buffer);
+  r.Read(state.has_last_sample);
+  r.Read(state.last_sample);
+  r.Read(state.position);
+  r.Read(state.read_seq);
+  DALI_ENFORCE(r.AtEnd(), "Invalid reader state: unexpected data at the end.");
+  return state;
+}
+
+}  // namespace dali
@@ -0,0 +1,78 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_READER_LOADER_LOADER_STATE_H_
+#define DALI_OPERATORS_READER_LOADER_LOADER_STATE_H_
+
+#include <string>
+#include <vector>
+#include "dali/core/api_helper.h"
+#include "dali/core/common.h"
+
+namespace dali {
+
+/**
+ * @brief Position of a loader in the dataset, as reported by the loaders that support
+ *        saving their state
+ */
+struct LoaderPosition {
+  Index index = 0;    // the loader-specific index of the next sample to read
+  int64_t epoch = 0;  // the loader-specific epoch number, which determines the order of samples
+};
+
+/**
+ * @brief The state of a Loader, sufficient to continue reading from the same sample
+ *        without reading the samples that precede it.
+ *
+ * The samples kept in the shuffling buffer are stored as the positions the loader was at
+ * before reading them, so they can be read again when the state is restored.
+ */
+struct DLL_PUBLIC LoaderState {
+  struct Sample {
+    LoaderPosition position;  // the position of the loader before reading the sample
+    Index seq = 0;            // the number of samples read before this one
+  };
+
+  struct Shard {
+    Index start = 0;
+    Index end = 0;
+  };
+
+  // properties of the loader, which must match when the state is restored
+  Index size = 0;
+  int shard_id = 0;
+  int num_shards = 0;
+  int initial_buffer_fill = 0;
+
+  // false if the loader has not read any sample yet
+  bool started = false;
+  std::string rng;
+  Index read_sample_counter = 0;
+  Index returned_sample_counter = 0;
+  int virtual_shard_id = 0;
+  std::vector<Shard> shards;
+  std::vector<Sample> buffer;
+  bool has_last_sample = false;
+  Sample last_sample;
+  LoaderPosition position;
+  Index read_seq = 0;
+
+  DLL_PUBLIC std::string Serialize() const;
+
+  DLL_PUBLIC static LoaderState Deserialize(const std::string &data);
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_READER_LOADER_LOADER_STATE_H_
@@ -1,4 +1,4 @@
-// Copyright (c) 2017, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -13,7 +13,12 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <stdlib.h>
+#include <unistd.h>
+#include <fstream>
 #include <memory>
+#include <string>
+#include <vector>
 
 #include "dali/core/common.h"
 #include "dali/pipeline/data/backend.h"
@@ -21,6 +26,7 @@
 #include "dali/test/dali_test.h"
 
 #include "dali/operators/reader/loader/loader.h"
+#include "dali/operators/reader/loader/loader_state.h"
 #include "dali/operators/reader/loader/file_label_loader.h"
 #include "dali/operators/reader/loader/recordio_loader.h"
 #include "dali/operators/reader/loader/indexed_file_loader.h"
@@ -99,6 +105,61 @@ TYPED_TEST(DataLoadStoreTest, RecordIOLoaderMmmap) {
   }
 }
 
+TYPED_TEST(DataLoadStoreTest, RecordIOLoaderBinaryIndexMultipleFiles) {
+  // the records of the data files, the offsets in the index refer to the concatenated files
+  std::vector<std::vector<std::string>> records = {{"abcd", "efghij"}, {"klmnop", "qrs"}};
+  std::vector<std::string> path;
+  std::vector<int64> offsets, sizes;
+  int64 global_offset = 0;
+  for (auto &file_records : records) {
+    char name[] = "/tmp/dali_recordio_XXXXXX";
+    int fd = mkstemp(name);
+    ASSERT_GE(fd, 0);
+    close(fd);
+    std::ofstream f(name, std::ios::binary);
+    for (auto &record : file_records) {
+      f << record;
+      offsets.push_back(global_offset);
+      sizes.push_back(record.size());
+      global_offset += record.size();
+    }
+    path.push_back(name);
+  }
+  char index_name[] = "/tmp/dali_recordio_idx_XXXXXX";
+  int fd = mkstemp(index_name);
+  ASSERT_GE(fd, 0);
+  close(fd);
+  RecordIndex::WriteBinaryIndexFile(index_name, offsets, sizes);
+  std::vector<std::string> index_path = {index_name};
+
+  for (bool dont_use_mmap : {true, false}) {
+    shared_ptr<dali::RecordIOLoader> reader(
+        new RecordIOLoader(
+            OpSpec("MXNetReader")
+            .AddArg("path", path)
+            .AddArg("index_path", index_path)
+            .AddArg("max_batch_size", 32)
+            .AddArg("device_id", 0)
+            .AddArg("dont_use_mmap", dont_use_mmap)));
+
+    reader->PrepareMetadata();
+    ASSERT_EQ(reader->Size(), static_cast<Index>(offsets.size()));
+    for (size_t file = 0; file < records.size(); file++) {
+      for (auto &record : records[file]) {
+        auto sample = reader->ReadOne(false);
+        auto *sample_data = sample->template data<uint8_t>();
+        std::string data(reinterpret_cast<const char *>(sample_data), sample->size());
+        EXPECT_EQ(data, record);
+        EXPECT_EQ(sample->GetSourceInfo().substr(0, path[file].size()), path[file]);
+      }
+    }
+  }
+
+  for (auto &p : path)
+    unlink(p.c_str());
+  unlink(index_name);
+}
+
 TYPED_TEST(DataLoadStoreTest, TFRecordLoaderMmmap) {
   for (bool dont_use_mmap : {true, false}) {
     std::vector<std::string> path = {testing::dali_extra_path() + "/db/tfrecord/train"};
@@ -153,6 +214,31 @@ TYPED_TEST(DataLoadStoreTest, LoaderTest) {
   }
 }
 
+TYPED_TEST(DataLoadStoreTest, FileLabelLoaderState) {
+  auto spec = OpSpec("FileReader")
+              .AddArg("file_root", loader_test_image_folder)
+              .AddArg("max_batch_size", 4)
+              .AddArg("device_id", 0)
+              .AddArg("random_shuffle", true)
+              .AddArg("initial_fill", 8);
+  shared_ptr<dali::FileLabelLoader> reader(new FileLabelLoader(spec));
+  shared_ptr<dali::FileLabelLoader> restored(new FileLabelLoader(spec));
+  reader->PrepareMetadata();
+
+  for (int i = 0; i < 13; ++i) {
+    auto sample = reader->ReadOne(i % 4 == 0);
+  }
+  auto state = LoaderState::Deserialize(reader->GetState().Serialize());
+  restored->SetState(state);
+
+  for (int i = 13; i < 100; ++i) {
+    auto expected = reader->ReadOne(i % 4 == 0);
+    auto sample = restored->ReadOne(i % 4 == 0);
+    EXPECT_EQ(sample->image.GetSourceInfo(), expected->image.GetSourceInfo());
+    EXPECT_EQ(sample->label, expected->label);
+  }
+}
+
 TYPED_TEST(DataLoadStoreTest, LoaderTestFail) {
   shared_ptr<dali::FileLabelLoader> reader(
       new FileLabelLoader(OpSpec("FileReader")
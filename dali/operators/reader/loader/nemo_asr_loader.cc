@@ -12,8 +12,11 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <algorithm>
 #include <string>
 #include <numeric>
+#include <utility>
+#include <vector>
 #include "dali/core/common.h"
 #include "dali/core/error_handling.h"
 #include "dali/operators/decoder/audio/generic_decoder.h"
@@ -68,6 +71,54 @@ void ParseManifest(std::vector<NemoAsrEntry> &entries, std::istream& manifest_fi
   }
 }
 
+std::vector<size_t> BucketByDuration(const std::vector<NemoAsrEntry> &entries, int batch_size,
+                                     int num_shards, std::mt19937 &rng) {
+  size_t size = entries.size();
+  std::vector<size_t> sorted(size);
+  std::iota(sorted.begin(), sorted.end(), 0);
+  std::stable_sort(sorted.begin(), sorted.end(), [&](size_t a, size_t b) {
+    return entries[a].duration < entries[b].duration;
+  });
+
+  size_t num_batches = size / batch_size;
+  std::vector<size_t> batch_order(num_batches);
+  std::iota(batch_order.begin(), batch_order.end(), 0);
+  std::shuffle(batch_order.begin(), batch_order.end(), rng);
+
+  // full batches for each shard
+  std::vector<size_t> order(size);
+  std::vector<size_t> shard_filled(num_shards);
+  std::vector<bool> batch_used(num_batches, false);
+  size_t next_batch = 0;
+  for (int shard = 0; shard < num_shards; shard++) {
+    size_t begin = start_index(shard, num_shards, size);
+    size_t end = start_index(shard + 1, num_shards, size);
+    size_t &filled = shard_filled[shard];
+    for (size_t n = (end - begin) / batch_size; n > 0; n--) {
+      size_t batch = batch_order[next_batch++];
+      batch_used[batch] = true;
+      for (int i = 0; i < batch_size; i++)
+        order[begin + filled++] = sorted[batch * batch_size + i];
+    }
+  }
+
+  // the remaining entries, still sorted by duration, complete the shards
+  std::vector<size_t> leftover;
+  for (size_t i = 0; i < size; i++) {
+    if (i / batch_size >= num_batches || !batch_used[i / batch_size])
+      leftover.push_back(sorted[i]);
+  }
+  size_t next_leftover = 0;
+  for (int shard = 0; shard < num_shards; shard++) {
+    size_t begin = start_index(shard, num_shards, size);
+    size_t end = start_index(shard + 1, num_shards, size);
+    for (size_t i = begin + shard_filled[shard]; i < end; i++)
+      order[i] = leftover[next_leftover++];
+  }
+  assert(next_leftover == leftover.size());
+  return order;
+}
+
 }  // namespace detail
 
 void NemoAsrLoader::PrepareMetadataImpl() {
@@ -97,11 +148,16 @@ void NemoAsrLoader::Reset(bool wrap_to_shard) {
   if (shuffle_after_epoch_) {
     std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
     std::shuffle(shuffled_indices_.begin(), shuffled_indices_.end(), g);
+  } else if (bucket_by_duration_) {
+    // seeded the same way on every shard, so that the shards read disjoint sets of samples
+    std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
+    shuffled_indices_ = detail::BucketByDuration(entries_, batch_size_, num_shards_, g);
   }
 }
 
 void NemoAsrLoader::PrepareEmpty(AsrSample &sample) {
   sample = {};
+  sample.decoded_audio_.set_pinned(false);
 }
 
 template <typename OutputType>
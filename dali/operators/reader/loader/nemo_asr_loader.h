@@ -19,6 +19,7 @@
 #include <future>
 #include <istream>
 #include <memory>
+#include <random>
 #include <string>
 #include <utility>
 #include <vector>
@@ -64,6 +65,17 @@ class AsrSample {
     decode_f_(audio, tid);
   }
 
+  /**
+   * @brief The buffer the audio is decoded to, when the sample is prefetched
+   */
+  Tensor<CPUBackend> &decoded_audio() {
+    return decoded_audio_;
+  }
+
+  const Tensor<CPUBackend> &decoded_audio() const {
+    return decoded_audio_;
+  }
+
   friend class NemoAsrLoader;
 
   AsrSample() = default;
@@ -81,6 +93,7 @@ class AsrSample {
   std::string audio_filepath_;  // for tensor metadata purposes
   TensorShape<> shape_;
 
+  Tensor<CPUBackend> decoded_audio_;
   std::function<void(Tensor<CPUBackend>&, int)> decode_f_;
   std::unique_ptr<AudioDecoderBase> decoder_;
 };
@@ -91,6 +104,18 @@ DLL_PUBLIC void ParseManifest(std::vector<NemoAsrEntry> &entries, std::istream &
                               double min_duration = kDefaultDuration,
                               double max_duration = kDefaultDuration);
 
+/**
+ * @brief Returns the order in which the entries are read, so that each batch consists of
+ *        entries of similar duration.
+ *
+ * The entries, sorted by duration, are split into batches, which are assigned to the shards in
+ * a random order. The entries that don't form a full batch of a shard are gathered in the last
+ * batch of the shard.
+ */
+DLL_PUBLIC std::vector<size_t> BucketByDuration(const std::vector<NemoAsrEntry> &entries,
+                                                int batch_size, int num_shards,
+                                                std::mt19937 &rng);
+
 }  // namespace detail
 
 class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
@@ -105,6 +130,8 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
         dtype_(spec.GetArgument<DALIDataType>("dtype")),
         min_duration_(spec.GetArgument<float>("min_duration")),
         max_duration_(spec.GetArgument<float>("max_duration")),
+        bucket_by_duration_(spec.GetArgument<bool>("bucket_by_duration")),
+        batch_size_(spec.GetArgument<int>("max_batch_size")),
         num_threads_(std::max(1, spec.GetArgument<int>("num_threads"))),
         decode_scratch_(num_threads_),
         resample_scratch_(num_threads_) {
@@ -120,9 +147,16 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
     if (shuffle_after_epoch_ && shuffle_)
       DALI_FAIL("`shuffle_after_epoch` and `random_shuffle` can't be provided together");
     /*
-     * Imply `stick_to_shard` from  `shuffle_after_epoch`
+     * Bucketing decides the order of the samples on its own, shuffling them would mix
+     * the samples of different durations again
+     */
+    if (bucket_by_duration_ && (shuffle_ || shuffle_after_epoch_))
+      DALI_FAIL("`bucket_by_duration` can't be provided together with `random_shuffle` or "
+                "`shuffle_after_epoch`");
+    /*
+     * Imply `stick_to_shard` from  `shuffle_after_epoch` and `bucket_by_duration`
      */
-    if (shuffle_after_epoch_)
+    if (shuffle_after_epoch_ || bucket_by_duration_)
       stick_to_shard_ = true;
 
     double q = quality_;
@@ -164,6 +198,8 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
   DALIDataType dtype_;
   double min_duration_;
   double max_duration_;
+  bool bucket_by_duration_;
+  int batch_size_;
   int num_threads_;
   kernels::signal::resampling::Resampler resampler_;
   std::vector<std::vector<float>> decode_scratch_;
@@ -13,7 +13,9 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <algorithm>
 #include <cstdio>
+#include <random>
 #include <utility>
 #include <sstream>
 #include <string>
@@ -76,6 +78,43 @@ TEST(NemoAsrLoaderTest, ParseManifest) {
   EXPECT_EQ("path/to/audio1.wav", entries[0].audio_filepath);
 }
 
+TEST(NemoAsrLoaderTest, BucketByDuration) {
+  const int size = 103, batch_size = 8, num_shards = 3;
+  std::vector<NemoAsrEntry> entries(size);
+  std::mt19937 rng(123);
+  std::uniform_real_distribution<double> dist(0.5, 20.0);
+  for (auto &entry : entries)
+    entry.duration = dist(rng);
+
+  auto order = detail::BucketByDuration(entries, batch_size, num_shards, rng);
+  ASSERT_EQ(size, order.size());
+  auto sorted_order = order;
+  std::sort(sorted_order.begin(), sorted_order.end());
+  for (int i = 0; i < size; i++)
+    ASSERT_EQ(i, sorted_order[i]);
+
+  std::vector<double> durations;
+  for (auto &entry : entries)
+    durations.push_back(entry.duration);
+  std::sort(durations.begin(), durations.end());
+
+  // every full batch of a shard consists of consecutive entries in the order of duration
+  for (int shard = 0; shard < num_shards; shard++) {
+    int begin = start_index(shard, num_shards, size);
+    int end = start_index(shard + 1, num_shards, size);
+    for (int b = begin; b + batch_size <= end; b += batch_size) {
+      double lo = entries[order[b]].duration, hi = lo;
+      for (int i = b; i < b + batch_size; i++) {
+        lo = std::min(lo, entries[order[i]].duration);
+        hi = std::max(hi, entries[order[i]].duration);
+      }
+      auto first = std::lower_bound(durations.begin(), durations.end(), lo);
+      auto last = std::lower_bound(durations.begin(), durations.end(), hi);
+      EXPECT_EQ(batch_size - 1, last - first);
+    }
+  }
+}
+
 TEST(NemoAsrLoaderTest, ParseNonAsciiTransript) {
   using TestData = std::pair<std::string, std::vector<uint8_t>>;
 
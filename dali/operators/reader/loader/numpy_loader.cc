@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -14,8 +14,17 @@
 
 #include <dirent.h>
 #include <errno.h>
+#include <fcntl.h>
+#include <strings.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#include <array>
+#include <cstdio>
 #include <cstdlib>
+#include <cstring>
 #include <memory>
+#include <numeric>
+#include <thread>
 
 #include "dali/core/common.h"
 #include "dali/operators/reader/loader/numpy_loader.h"
@@ -159,7 +168,9 @@ void ParseHeaderMetadata(NumpyParseTarget& target, const std::string &header) {
   }
 }
 
-void ParseHeader(FileStream *file, NumpyParseTarget& target) {
+void ParseHeader(FileStream *file, NumpyParseTarget& target, int64_t offset) {
+  if (offset != 0)
+    file->Seek(offset);
   // check if the file is actually a numpy file
   std::vector<uint8_t> token(11);
   int64_t nread = file->Read(token.data(), 10);
@@ -178,7 +189,7 @@ void ParseHeader(FileStream *file, NumpyParseTarget& target) {
                "Error extracting header length.");
 
   // read header: the offset is a magic number
-  int64 offset = 6 + 1 + 1 + 2;
+  offset += 6 + 1 + 1 + 2;
   // the header_len can be 4GiB according to the NPYv2 file format
   // specification: https://numpy.org/neps/nep-0001-npy-format.html
   // while this allocation could be sizable, it is performed on the host.
@@ -193,10 +204,418 @@ void ParseHeader(FileStream *file, NumpyParseTarget& target) {
   file->Seek(offset);  // prepare file for later reads
 
   ParseHeaderMetadata(target, header);
+  target.data_offset = offset;
+}
+
+namespace {
+
+constexpr uint32_t kZipLocalHeaderSignature = 0x04034b50;
+constexpr uint32_t kZipCentralHeaderSignature = 0x02014b50;
+constexpr uint32_t kZipEndSignature = 0x06054b50;
+constexpr uint32_t kZip64EndSignature = 0x06064b50;
+constexpr uint32_t kZip64LocatorSignature = 0x07064b50;
+constexpr int64_t kZipLocalHeaderSize = 30;
+constexpr int64_t kZipCentralHeaderSize = 46;
+constexpr int64_t kZipEndSize = 22;
+constexpr int64_t kZip64EndSize = 56;
+constexpr int64_t kZip64LocatorSize = 20;
+
+// the zip archives are little endian, as are the supported platforms
+template <typename T>
+T ReadLE(const uint8_t *ptr) {
+  T value;
+  memcpy(&value, ptr, sizeof(T));
+  return value;
+}
+
+void ReadAt(FileStream *file, int64_t offset, uint8_t *buffer, int64_t size, const char *what) {
+  file->Seek(offset);
+  DALI_ENFORCE(static_cast<int64_t>(file->Read(buffer, size)) == size,
+               make_string("Failed to read the ", what, " of the .npz archive."));
+}
+
+bool IsNpzFile(const std::string &path) {
+  return path.size() > 4 && strcasecmp(path.c_str() + path.size() - 4, ".npz") == 0;
+}
+
+/**
+ * @brief The offset of the local header of the entry of the central directory at `entry`,
+ *        which might be stored in the ZIP64 extended information field
+ */
+int64_t LocalHeaderOffset(const uint8_t *entry, const uint8_t *extra, int64_t extra_len) {
+  uint64_t offset = ReadLE<uint32_t>(entry + 42);
+  if (offset != 0xFFFFFFFFu)
+    return offset;
+  for (int64_t pos = 0; pos + 4 <= extra_len; ) {
+    uint16_t id = ReadLE<uint16_t>(extra + pos);
+    uint16_t size = ReadLE<uint16_t>(extra + pos + 2);
+    if (id == 0x0001) {
+      // the 64-bit values are present only for the saturated 32-bit fields, in this order:
+      // uncompressed size, compressed size, local header offset
+      int64_t field = 0;
+      if (ReadLE<uint32_t>(entry + 24) == 0xFFFFFFFFu)
+        field += 8;
+      if (ReadLE<uint32_t>(entry + 20) == 0xFFFFFFFFu)
+        field += 8;
+      DALI_ENFORCE(field + 8 <= size && pos + 4 + size <= extra_len,
+                   "Invalid ZIP64 extended information in the .npz archive.");
+      return ReadLE<uint64_t>(extra + pos + 4 + field);
+    }
+    pos += 4 + size;
+  }
+  DALI_FAIL("Missing ZIP64 extended information in the .npz archive.");
+}
+
+}  // namespace
+
+std::vector<std::pair<std::string, int64_t>> ListNpzMembers(FileStream *file) {
+  int64_t file_size = file->Size();
+  // the end of central directory record can be followed by a comment of up to 64 KiB
+  int64_t tail_size = std::min<int64_t>(file_size, kZipEndSize + 0xFFFF);
+  DALI_ENFORCE(tail_size >= kZipEndSize, "The .npz archive is too short.");
+  std::vector<uint8_t> tail(tail_size);
+  ReadAt(file, file_size - tail_size, tail.data(), tail_size, "end of central directory");
+  int64_t end = tail_size - kZipEndSize;
+  while (end >= 0 && ReadLE<uint32_t>(&tail[end]) != kZipEndSignature)
+    end--;
+  DALI_ENFORCE(end >= 0, "Not a valid .npz (zip) archive.");
+
+  uint64_t num_entries = ReadLE<uint16_t>(&tail[end + 10]);
+  uint64_t dir_size = ReadLE<uint32_t>(&tail[end + 12]);
+  uint64_t dir_offset = ReadLE<uint32_t>(&tail[end + 16]);
+  if (num_entries == 0xFFFF || dir_size == 0xFFFFFFFFu || dir_offset == 0xFFFFFFFFu) {
+    // ZIP64 - the actual values are in the ZIP64 end of central directory record
+    DALI_ENFORCE(end >= kZip64LocatorSize &&
+                 ReadLE<uint32_t>(&tail[end - kZip64LocatorSize]) == kZip64LocatorSignature,
+                 "Invalid ZIP64 end of central directory in the .npz archive.");
+    uint8_t end64[kZip64EndSize];
+    ReadAt(file, ReadLE<uint64_t>(&tail[end - kZip64LocatorSize + 8]), end64, kZip64EndSize,
+           "ZIP64 end of central directory");
+    DALI_ENFORCE(ReadLE<uint32_t>(end64) == kZip64EndSignature,
+                 "Invalid ZIP64 end of central directory in the .npz archive.");
+    num_entries = ReadLE<uint64_t>(end64 + 32);
+    dir_size = ReadLE<uint64_t>(end64 + 40);
+    dir_offset = ReadLE<uint64_t>(end64 + 48);
+  }
+  DALI_ENFORCE(dir_offset <= static_cast<uint64_t>(file_size) &&
+               dir_size <= file_size - dir_offset,
+               "Invalid central directory in the .npz archive.");
+
+  std::vector<uint8_t> dir(dir_size);
+  ReadAt(file, dir_offset, dir.data(), dir_size, "central directory");
+  std::vector<std::pair<std::string, int64_t>> members;
+  int64_t pos = 0;
+  for (uint64_t i = 0; i < num_entries; i++) {
+    DALI_ENFORCE(pos + kZipCentralHeaderSize <= static_cast<int64_t>(dir_size) &&
+                 ReadLE<uint32_t>(&dir[pos]) == kZipCentralHeaderSignature,
+                 "Invalid central directory in the .npz archive.");
+    const uint8_t *entry = &dir[pos];
+    uint16_t method = ReadLE<uint16_t>(entry + 10);
+    int64_t name_len = ReadLE<uint16_t>(entry + 28);
+    int64_t extra_len = ReadLE<uint16_t>(entry + 30);
+    int64_t comment_len = ReadLE<uint16_t>(entry + 32);
+    int64_t entry_size = kZipCentralHeaderSize + name_len + extra_len + comment_len;
+    DALI_ENFORCE(pos + entry_size <= static_cast<int64_t>(dir_size),
+                 "Invalid central directory in the .npz archive.");
+    std::string name(reinterpret_cast<const char *>(entry + kZipCentralHeaderSize), name_len);
+    int64_t local_offset = LocalHeaderOffset(entry, entry + kZipCentralHeaderSize + name_len,
+                                             extra_len);
+    pos += entry_size;
+    if (name.empty() || name.back() == '/')  // a directory
+      continue;
+
+    DALI_ENFORCE(method == 0, make_string("The array \"", name, "\" is compressed. Only the "
+                 "uncompressed .npz archives (written with ``numpy.savez``) are supported."));
+    uint8_t local[kZipLocalHeaderSize];
+    ReadAt(file, local_offset, local, kZipLocalHeaderSize, "local file header");
+    DALI_ENFORCE(ReadLE<uint32_t>(local) == kZipLocalHeaderSignature,
+                 "Invalid local file header in the .npz archive.");
+    // the local header can have a different extra field than the central directory entry
+    int64_t data_offset = local_offset + kZipLocalHeaderSize + ReadLE<uint16_t>(local + 26) +
+                          ReadLE<uint16_t>(local + 28);
+
+    // the arrays are identified by the keys, as in numpy.load
+    if (name.size() > 4 && name.compare(name.size() - 4, 4, ".npy") == 0)
+      name.resize(name.size() - 4);
+    members.emplace_back(std::move(name), data_offset);
+  }
+  return members;
+}
+
+std::string NumpySampleFile(const std::string &sample) {
+  auto pos = sample.find(".npz/");
+  return pos == std::string::npos ? sample : sample.substr(0, pos + 4);
+}
+
+constexpr std::array<char, 8> kNumpyHeaderIndexMagic = {{'D', 'A', 'L', 'I', 'N', 'P', 'Y', 'I'}};
+constexpr uint64_t kNumpyHeaderIndexVersion = 1;
+
+struct NumpyHeaderIndexHeader {
+  std::array<char, 8> magic;
+  uint64_t version;
+  uint64_t key;
+  uint64_t num_entries;
+  uint64_t num_shape_values;
+  uint64_t names_size;
+};
+
+/**
+ * @brief The header of one array, as stored in the index.
+ *
+ * The index consists of NumpyHeaderIndexHeader, the entries (in the order of the files),
+ * the indices of the entries sorted by name, the shapes and the names. All the parts are
+ * 8-byte aligned, so that they can be used directly from the mapped memory.
+ */
+struct NumpyHeaderIndexEntry {
+  uint64_t name_offset;
+  uint64_t shape_offset;
+  int64_t data_offset;
+  int64_t file_size;
+  uint32_t name_length;
+  int32_t type;
+  uint32_t ndim;
+  uint32_t fortran_order;
+};
+
+static_assert(sizeof(NumpyHeaderIndexHeader) % 8 == 0 && sizeof(NumpyHeaderIndexEntry) % 8 == 0,
+              "The parts of the header index must be 8-byte aligned");
+
+void NumpyHeaderCache::PrepareFiles(const string &file_root, vector<string> &files,
+                                    const string &index_dir) {
+  std::string index_path;
+  uint64_t key = 0;
+  if (!index_dir.empty()) {
+    std::unique_ptr<char, decltype(&free)> real_root(realpath(file_root.c_str(), nullptr), &free);
+    key = HashString(real_root ? std::string(real_root.get()) : file_root);
+    for (auto &file : files)
+      key = HashString("\n", HashString(file, key));
+    char key_str[17];
+    snprintf(key_str, sizeof(key_str), "%016llx", static_cast<unsigned long long>(key));  // NOLINT
+    index_path = filesystem::join_path(index_dir, make_string("numpy_headers.", key_str,
+                                                              ".dali_idx"));
+    if (LoadIndex(index_path, key, files))
+      return;
+  }
+
+  // the archives are always listed; the headers of the other files are parsed upfront
+  // only to build the index
+  bool build_index = !index_path.empty();
+  std::vector<size_t> to_parse;
+  for (size_t i = 0; i < files.size(); i++) {
+    if (build_index || IsNpzFile(files[i]))
+      to_parse.push_back(i);
+  }
+  if (to_parse.empty())
+    return;
+
+  std::vector<std::vector<std::pair<std::string, NumpyParseTarget>>> parsed(to_parse.size());
+  ParallelFor(to_parse.size(), [&](size_t j) {
+    const auto &file_name = files[to_parse[j]];
+    auto file = FileStream::Open(file_root + "/" + file_name, false, false);
+    int64_t file_size = file->Size();
+    if (IsNpzFile(file_name)) {
+      for (auto &member : ListNpzMembers(file.get())) {
+        NumpyParseTarget target;
+        ParseHeader(file.get(), target, member.second);
+        target.file_size = file_size;
+        parsed[j].emplace_back(file_name + "/" + member.first, std::move(target));
+      }
+    } else {
+      NumpyParseTarget target;
+      ParseHeader(file.get(), target);
+      target.file_size = file_size;
+      parsed[j].emplace_back(file_name, std::move(target));
+    }
+    file->Close();
+  });
+
+  vector<string> expanded;
+  vector<NumpyParseTarget> targets;  // of all the files, when building the index
+  for (size_t i = 0, j = 0; i < files.size(); i++) {
+    if (j < to_parse.size() && to_parse[j] == i) {
+      for (auto &entry : parsed[j]) {
+        expanded.push_back(entry.first);
+        if (build_index)
+          targets.push_back(entry.second);
+      }
+      j++;
+    } else {
+      expanded.push_back(std::move(files[i]));
+    }
+  }
+  files = std::move(expanded);
+
+  if (build_index) {
+    SaveIndex(index_path, key, files, targets);
+    if (LoadIndex(index_path, key, files))
+      return;
+  }
+  // the headers of the archived arrays are needed to read them - keep them in the memory
+  std::unique_lock<std::mutex> cache_lock(cache_mutex_);
+  for (auto &entries : parsed) {
+    for (auto &entry : entries)
+      header_cache_[entry.first] = std::move(entry.second);
+  }
+  has_stored_headers_ = true;
+}
+
+bool NumpyHeaderCache::LoadIndex(const string &path, uint64_t key, vector<string> &files) {
+  int fd = open(path.c_str(), O_RDONLY);
+  if (fd < 0)
+    return false;
+  struct stat st;
+  if (fstat(fd, &st) != 0 || st.st_size < static_cast<off_t>(sizeof(NumpyHeaderIndexHeader))) {
+    close(fd);
+    return false;
+  }
+  size_t size = st.st_size;
+  void *mem = mmap(nullptr, size, PROT_READ, MAP_SHARED, fd, 0);
+  close(fd);
+  if (mem == MAP_FAILED)
+    return false;
+  auto mapping = std::shared_ptr<void>(mem, [size](void *p) { munmap(p, size); });
+
+  const char *data = static_cast<const char *>(mem);
+  NumpyHeaderIndexHeader header;
+  memcpy(&header, data, sizeof(header));
+  if (header.magic != kNumpyHeaderIndexMagic || header.version != kNumpyHeaderIndexVersion ||
+      header.key != key)
+    return false;
+
+  vector<string> index_files;
+  try {
+    size_t n = header.num_entries;
+    size_t entries_offset = sizeof(header);
+    DALI_ENFORCE(n <= (size - entries_offset) / (sizeof(NumpyHeaderIndexEntry) + sizeof(uint64_t)),
+                 "Too many entries.");
+    size_t order_offset = entries_offset + n * sizeof(NumpyHeaderIndexEntry);
+    size_t shapes_offset = order_offset + n * sizeof(uint64_t);
+    DALI_ENFORCE(header.num_shape_values <= (size - shapes_offset) / sizeof(int64_t),
+                 "Too many shape values.");
+    size_t names_offset = shapes_offset + header.num_shape_values * sizeof(int64_t);
+    DALI_ENFORCE(header.names_size <= size - names_offset, "Truncated names.");
+
+    auto *entries = reinterpret_cast<const NumpyHeaderIndexEntry *>(data + entries_offset);
+    auto *order = reinterpret_cast<const uint64_t *>(data + order_offset);
+    const char *names = data + names_offset;
+    index_files.resize(n);
+    for (size_t i = 0; i < n; i++) {
+      const auto &e = entries[i];
+      DALI_ENFORCE(e.name_offset <= header.names_size &&
+                   e.name_length <= header.names_size - e.name_offset &&
+                   e.shape_offset <= header.num_shape_values &&
+                   e.ndim <= header.num_shape_values - e.shape_offset && order[i] < n,
+                   make_string("Invalid entry ", i, "."));
+      index_files[i].assign(names + e.name_offset, e.name_length);
+    }
+    index_entries_ = entries;
+    index_order_ = order;
+    index_shapes_ = reinterpret_cast<const int64_t *>(data + shapes_offset);
+    index_names_ = names;
+    index_size_ = n;
+  } catch (std::exception &e) {
+    DALI_WARN(make_string("Ignoring the invalid numpy header index ", path, ": ", e.what()));
+    return false;
+  }
+  index_mapping_ = std::move(mapping);
+  files = std::move(index_files);
+  return true;
+}
+
+void NumpyHeaderCache::SaveIndex(const string &path, uint64_t key, const vector<string> &files,
+                                 const vector<NumpyParseTarget> &targets) {
+  size_t n = files.size();
+  std::vector<NumpyHeaderIndexEntry> entries(n);
+  std::vector<int64_t> shapes;
+  std::string names;
+  for (size_t i = 0; i < n; i++) {
+    const auto &target = targets[i];
+    auto &e = entries[i];
+    e.name_offset = names.size();
+    e.shape_offset = shapes.size();
+    e.data_offset = target.data_offset;
+    e.file_size = target.file_size;
+    e.name_length = files[i].size();
+    e.type = target.type_info.id();
+    e.ndim = target.shape.size();
+    e.fortran_order = target.fortran_order;
+    names += files[i];
+    shapes.insert(shapes.end(), target.shape.begin(), target.shape.end());
+  }
+  std::vector<uint64_t> order(n);
+  std::iota(order.begin(), order.end(), 0);
+  std::sort(order.begin(), order.end(), [&](uint64_t a, uint64_t b) {
+    return files[a] < files[b];
+  });
+  NumpyHeaderIndexHeader header = {kNumpyHeaderIndexMagic, kNumpyHeaderIndexVersion, key, n,
+                                   shapes.size(), names.size()};
+
+  // written to a temporary file first, so that the processes building the index at the same
+  // time never see a partial one
+  std::string tmp_path = make_string(path, ".tmp", getpid(), "_",
+                                     std::hash<std::thread::id>()(std::this_thread::get_id()));
+  try {
+    {
+      std::ofstream out(tmp_path, std::ios_base::binary | std::ios_base::out);
+      DALI_ENFORCE(out.is_open(), "Could not open the file for writing: " + tmp_path);
+      out.write(reinterpret_cast<const char *>(&header), sizeof(header));
+      out.write(reinterpret_cast<const char *>(entries.data()),
+                n * sizeof(NumpyHeaderIndexEntry));
+      out.write(reinterpret_cast<const char *>(order.data()), n * sizeof(uint64_t));
+      out.write(reinterpret_cast<const char *>(shapes.data()), shapes.size() * sizeof(int64_t));
+      out.write(names.data(), names.size());
+      DALI_ENFORCE(out.good(), "Could not write " + tmp_path);
+    }
+    DALI_ENFORCE(std::rename(tmp_path.c_str(), path.c_str()) == 0,
+                 make_string("Failed to rename ", tmp_path, " to ", path));
+  } catch (std::exception &e) {
+    std::remove(tmp_path.c_str());
+    DALI_WARN(make_string("Could not store the numpy header index in ", path, ": ", e.what()));
+  }
+}
+
+bool NumpyHeaderCache::FindInIndex(const string &file_name, NumpyParseTarget &target) const {
+  if (index_size_ == 0)
+    return false;
+  auto compare = [this](uint64_t idx, const string &name) {
+    const auto &e = index_entries_[idx];
+    return name.compare(0, string::npos, index_names_ + e.name_offset, e.name_length);
+  };
+  auto it = std::lower_bound(index_order_, index_order_ + index_size_, file_name,
+                             [&](uint64_t idx, const string &name) {
+                               return compare(idx, name) > 0;
+                             });
+  if (it == index_order_ + index_size_ || compare(*it, file_name) != 0)
+    return false;
+  const auto &e = index_entries_[*it];
+  target.shape.assign(index_shapes_ + e.shape_offset, index_shapes_ + e.shape_offset + e.ndim);
+  target.type_info = TypeTable::GetTypeInfo(static_cast<DALIDataType>(e.type));
+  target.fortran_order = e.fortran_order;
+  target.data_offset = e.data_offset;
+  target.file_size = e.file_size;
+  return true;
+}
+
+void NumpyHeaderCache::ReadHeader(FileStream *file, const string &sample,
+                                  NumpyParseTarget &target) {
+  // the stored header is valid as long as the size of the file is unchanged
+  if (GetFromCache(sample, target) &&
+      (target.file_size < 0 || target.file_size == static_cast<int64_t>(file->Size()))) {
+    file->Seek(target.data_offset);
+    return;
+  }
+  DALI_ENFORCE(NumpySampleFile(sample).size() == sample.size(),
+               make_string("The archive containing \"", sample, "\" has changed after it was "
+                           "listed."));
+  ParseHeader(file, target);
+  UpdateCache(sample, target);
 }
 
 bool NumpyHeaderCache::GetFromCache(const string &file_name, NumpyParseTarget &target) {
-  if (!cache_headers_) {
+  if (FindInIndex(file_name, target)) {
+    return true;
+  }
+  if (!cache_headers_ && !has_stored_headers_) {
     return false;
   }
   std::unique_lock<std::mutex> cache_lock(cache_mutex_);
@@ -240,49 +659,45 @@ void NumpyLoader::ReadSample(ImageFileWrapper& imfile) {
     return;
   }
 
-  auto current_image = FileStream::Open(file_root_ + "/" + image_file, read_ahead_,
-                                        !copy_read_data_);
+  DeferRead([this, &imfile, image_file, meta]() {
+    auto current_image = FileStream::Open(file_root_ + "/" + detail::NumpySampleFile(image_file),
+                                          read_ahead_, !copy_read_data_);
 
-  // read the header
-  NumpyParseTarget target;
-  auto ret = header_cache_.GetFromCache(image_file, target);
-  if (ret) {
-    current_image->Seek(target.data_offset);
-  } else {
-    detail::ParseHeader(current_image.get(), target);
-    header_cache_.UpdateCache(image_file, target);
-  }
+    // read the header
+    NumpyParseTarget target;
+    header_cache_.ReadHeader(current_image.get(), image_file, target);
 
-  Index image_bytes = target.nbytes();
+    Index image_bytes = target.nbytes();
 
-  if (copy_read_data_) {
-    if (imfile.image.shares_data()) {
-      imfile.image.Reset();
+    if (copy_read_data_) {
+      if (imfile.image.shares_data()) {
+        imfile.image.Reset();
+      }
+      imfile.image.Resize(target.shape, target.type_info);
+      // copy the image
+      Index ret = current_image->Read(static_cast<uint8_t*>(imfile.image.raw_mutable_data()),
+                                      image_bytes);
+      DALI_ENFORCE(ret == image_bytes, make_string("Failed to read file: ", image_file));
+    } else {
+      auto p = current_image->Get(image_bytes);
+      DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_file));
+      // Wrap the raw data in the Tensor object.
+      imfile.image.ShareData(p, image_bytes, {image_bytes});
+      imfile.image.Resize(target.shape, target.type_info);
     }
-    imfile.image.Resize(target.shape, target.type_info);
-    // copy the image
-    Index ret = current_image->Read(static_cast<uint8_t*>(imfile.image.raw_mutable_data()),
-                                    image_bytes);
-    DALI_ENFORCE(ret == image_bytes, make_string("Failed to read file: ", image_file));
-  } else {
-    auto p = current_image->Get(image_bytes);
-    DALI_ENFORCE(p != nullptr, make_string("Failed to read file: ", image_file));
-    // Wrap the raw data in the Tensor object.
-    imfile.image.ShareData(p, image_bytes, {image_bytes});
-    imfile.image.Resize(target.shape, target.type_info);
-  }
 
-  // close the file handle
-  current_image->Close();
+    // close the file handle
+    current_image->Close();
 
-  // set metadata
-  imfile.image.SetMeta(meta);
+    // set metadata
+    imfile.image.SetMeta(meta);
 
-  // set file path
-  imfile.filename = file_root_ + "/" + image_file;
+    // set file path
+    imfile.filename = file_root_ + "/" + image_file;
 
-  // set meta
-  imfile.meta = (target.fortran_order ? "transpose:true" : "transpose:false");
+    // set meta
+    imfile.meta = (target.fortran_order ? "transpose:true" : "transpose:false");
+  });
 }
 
 }  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -44,6 +44,8 @@ class NumpyParseTarget{
   TypeInfo type_info;
   bool fortran_order;
   int64_t data_offset;
+  /// size of the file containing the array, if known - used to validate the stored headers
+  int64_t file_size = -1;
 
   size_t size() const {
     return volume(shape);
@@ -59,19 +61,67 @@ namespace detail {
 DLL_PUBLIC void ParseHeaderMetadata(NumpyParseTarget& target, const std::string &header);
 
 // parser function, only for internal use
-void ParseHeader(FileStream *file, NumpyParseTarget& target);
+// `offset` is the position of the array in the file (non-zero for the arrays in .npz archives)
+void ParseHeader(FileStream *file, NumpyParseTarget& target, int64_t offset = 0);
+
+/**
+ * @brief Lists the arrays stored in a .npz archive, as (key, offset of the array in the archive)
+ *
+ * Only the uncompressed archives, as written by ``numpy.savez``, are supported.
+ */
+DLL_PUBLIC std::vector<std::pair<std::string, int64_t>> ListNpzMembers(FileStream *file);
+
+/**
+ * @brief The path of the file containing the sample.
+ *
+ * The arrays stored in .npz archives are named ``<archive>.npz/<key>``.
+ */
+DLL_PUBLIC std::string NumpySampleFile(const std::string &sample);
+
+struct NumpyHeaderIndexEntry;
 
 class NumpyHeaderCache {
  public:
   explicit NumpyHeaderCache(bool cache_headers) : cache_headers_(cache_headers) {}
+
+  /**
+   * @brief Replaces the .npz archives in `files` with the arrays they contain.
+   *
+   * If `index_dir` is not empty, the headers of all the files are parsed in parallel and stored
+   * in an index in that directory, which is mapped to the memory and reused by the subsequent
+   * runs with the same `file_root` and `files`.
+   */
+  void PrepareFiles(const string &file_root, vector<string> &files, const string &index_dir);
+
+  /**
+   * @brief Reads the header of the sample (or takes it from the cache) and moves `file`
+   *        to the beginning of the data
+   */
+  void ReadHeader(FileStream *file, const string &sample, NumpyParseTarget &target);
+
   bool GetFromCache(const string &file_name, NumpyParseTarget &target);
   void UpdateCache(const string &file_name, const NumpyParseTarget &value);
 
  private:
+  bool LoadIndex(const string &path, uint64_t key, vector<string> &files);
+  void SaveIndex(const string &path, uint64_t key, const vector<string> &files,
+                 const vector<NumpyParseTarget> &targets);
+  bool FindInIndex(const string &file_name, NumpyParseTarget &target) const;
+
   // helper for header caching
   std::mutex cache_mutex_;
   bool cache_headers_;
+  // also holds the headers of the arrays in the .npz archives, regardless of `cache_headers_`
   std::map<string, NumpyParseTarget> header_cache_;
+  bool has_stored_headers_ = false;
+
+  // the persisted header index, mapped to the memory
+  std::shared_ptr<void> index_mapping_;
+  const NumpyHeaderIndexEntry *index_entries_ = nullptr;
+  const uint64_t *index_order_ = nullptr;  // entries sorted by name
+  const int64_t *index_shapes_ = nullptr;
+  const char *index_names_ = nullptr;
+  size_t index_size_ = 0;
 };
 
 }  // namespace detail
@@ -82,12 +132,23 @@ class NumpyLoader : public FileLoader<> {
     const OpSpec& spec,
     bool shuffle_after_epoch = false)
     : FileLoader(spec, shuffle_after_epoch),
-    header_cache_(spec.GetArgument<bool>("cache_header_information")) {}
+    header_cache_(spec.GetArgument<bool>("cache_header_information")),
+    header_index_dir_(spec.GetArgument<string>("header_index_dir")) {}
 
   // we want to make it possible to override this function as well
   void ReadSample(ImageFileWrapper& tensor) override;
+
+ protected:
+  void PrepareMetadataImpl() override {
+    DiscoverFiles();
+    header_cache_.PrepareFiles(file_root_, images_, header_index_dir_);
+    DALI_ENFORCE(Size() > 0, "No files found.");
+    FileLoader::PrepareMetadataImpl();
+  }
+
  private:
   detail::NumpyHeaderCache header_cache_;
+  string header_index_dir_;
 };
 
 }  // namespace dali
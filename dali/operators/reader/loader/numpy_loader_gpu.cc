@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -88,17 +88,12 @@ void NumpyLoaderGPU::ReadSample(ImageFileWrapperGPU& imfile) {
 
   imfile.read_meta_f = [this, image_file, &imfile] () {
     // open file
-    imfile.file_stream = CUFileStream::Open(file_root_ + "/" + image_file, read_ahead_, false);
+    imfile.file_stream = CUFileStream::Open(file_root_ + "/" + detail::NumpySampleFile(image_file),
+                                            read_ahead_, false);
 
     // read the header
     NumpyParseTarget target;
-    auto ret = header_cache_.GetFromCache(image_file, target);
-    if (ret) {
-      imfile.file_stream->Seek(target.data_offset);
-    } else {
-      detail::ParseHeader(imfile.file_stream.get(), target);
-      header_cache_.UpdateCache(image_file, target);
-    }
+    header_cache_.ReadHeader(imfile.file_stream.get(), image_file, target);
 
     imfile.type_info = target.type_info;
     imfile.shape = target.shape;
@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -46,7 +46,8 @@ class NumpyLoaderGPU : public CUFileLoader {
     bool shuffle_after_epoch = false) :
       CUFileLoader(spec, images, shuffle_after_epoch),
       register_buffers_(spec.GetArgument<bool>("register_buffers")),
-      header_cache_(spec.GetArgument<bool>("cache_header_information")) {}
+      header_cache_(spec.GetArgument<bool>("cache_header_information")),
+      header_index_dir_(spec.GetArgument<string>("header_index_dir")) {}
 
   ~NumpyLoaderGPU() override {
     // set device
@@ -63,6 +64,13 @@ class NumpyLoaderGPU : public CUFileLoader {
   void ReadSample(ImageFileWrapperGPU& tensor) override;
 
  protected:
+  void PrepareMetadataImpl() override {
+    DiscoverFiles();
+    header_cache_.PrepareFiles(file_root_, images_, header_index_dir_);
+    DALI_ENFORCE(Size() > 0, "No files found.");
+    CUFileLoader::PrepareMetadataImpl();
+  }
+
   // register input tensor
   void RegisterBuffer(void *buffer, size_t total_size);
 
@@ -78,6 +86,7 @@ class NumpyLoaderGPU : public CUFileLoader {
   std::map<uint8_t*, size_t> reg_buff_;
 
   detail::NumpyHeaderCache header_cache_;
+  string header_index_dir_;
 };
 
 }  // namespace dali
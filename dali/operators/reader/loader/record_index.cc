@@ -0,0 +1,182 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <cerrno>
+#include <cstring>
+#include <fstream>
+#include <utility>
+
+#include "dali/core/error_handling.h"
+#include "dali/core/format.h"
+#include "dali/operators/reader/loader/record_index.h"
+
+namespace dali {
+
+namespace {
+
+struct ParsedEntries {
+  std::vector<int64> offsets, sizes;
+};
+
+}  // namespace
+
+bool RecordIndex::IsBinaryIndexFile(const std::string &path) {
+  std::ifstream fin(path, std::ios::binary);
+  char magic[sizeof(record_index::kMagic)];
+  if (!fin.read(magic, sizeof(magic)))
+    return false;
+  return std::memcmp(magic, record_index::kMagic, sizeof(magic)) == 0;
+}
+
+void RecordIndex::AddIndexFile(const std::string &path, size_t file_index) {
+  if (IsBinaryIndexFile(path))
+    MapBinaryIndexFile(path, file_index);
+  else
+    ParseTextIndexFile(path, file_index);
+}
+
+void RecordIndex::AddEntries(std::vector<int64> offsets, std::vector<int64> sizes,
+                             size_t file_index) {
+  DALI_ENFORCE(offsets.size() == sizes.size(), "The number of offsets and sizes must match");
+  auto parsed = std::make_shared<ParsedEntries>();
+  parsed->offsets = std::move(offsets);
+  parsed->sizes = std::move(sizes);
+  Segment seg;
+  seg.count = parsed->offsets.size();
+  seg.offsets = parsed->offsets.data();
+  seg.sizes = parsed->sizes.data();
+  seg.file_index = file_index;
+  seg.storage = std::move(parsed);
+  AddSegment(std::move(seg));
+}
+
+void RecordIndex::AddSegment(Segment seg) {
+  if (seg.count == 0)
+    return;
+  seg.start = size_;
+  size_ += seg.count;
+  segments_.push_back(std::move(seg));
+}
+
+void RecordIndex::ParseTextIndexFile(const std::string &path, size_t file_index) {
+  std::ifstream fin(path);
+  DALI_ENFORCE(fin.good(), "Failed to open file " + path);
+  std::vector<int64> offsets, sizes;
+  int64 pos, size;
+  while (fin >> pos >> size) {
+    offsets.push_back(pos);
+    sizes.push_back(size);
+  }
+  AddEntries(std::move(offsets), std::move(sizes), file_index);
+}
+
+void RecordIndex::MapBinaryIndexFile(const std::string &path, size_t file_index) {
+  int fd = open(path.c_str(), O_RDONLY);
+  DALI_ENFORCE(fd >= 0, make_string("Failed to open file ", path, ": ", std::strerror(errno)));
+  struct stat st;
+  if (fstat(fd, &st) != 0) {
+    close(fd);
+    DALI_FAIL(make_string("Failed to read the size of ", path, ": ", std::strerror(errno)));
+  }
+  size_t length = st.st_size;
+  void *mem = length > 0 ? mmap(nullptr, length, PROT_READ, MAP_SHARED, fd, 0) : MAP_FAILED;
+  close(fd);
+  DALI_ENFORCE(mem != MAP_FAILED, make_string("Failed to map the index file ", path));
+  std::shared_ptr<const void> mapping(mem, [length](const void *p) {
+    munmap(const_cast<void *>(p), length);
+  });
+
+  DALI_ENFORCE(length >= sizeof(record_index::Header),
+               make_string("Invalid binary index file ", path, ": the file is truncated."));
+  auto *header = static_cast<const record_index::Header *>(mem);
+  DALI_ENFORCE(header->version == record_index::kVersion,
+               make_string("Unsupported version of the binary index file ", path, ": ",
+                           header->version));
+  size_t n = header->num_records;
+  bool has_file_ids = header->flags & record_index::kHasFileIds;
+  size_t expected = sizeof(record_index::Header) + n * 2 * sizeof(int64) +
+                    (has_file_ids ? n * sizeof(uint32_t) : 0);
+  DALI_ENFORCE(length >= expected,
+               make_string("Invalid binary index file ", path, ": expected ", expected,
+                           " bytes, got ", length, "."));
+
+  const char *columns = static_cast<const char *>(mem) + sizeof(record_index::Header);
+  Segment seg;
+  seg.count = n;
+  seg.offsets = reinterpret_cast<const int64 *>(columns);
+  seg.sizes = seg.offsets + n;
+  seg.file_ids = has_file_ids ? reinterpret_cast<const uint32_t *>(seg.sizes + n) : nullptr;
+  seg.file_index = file_index;
+  seg.storage = std::move(mapping);
+  AddSegment(std::move(seg));
+}
+
+void RecordIndex::ScanTFRecordFile(const std::string &path, std::vector<int64> &offsets,
+                                   std::vector<int64> &sizes) {
+  // A TFRecord is: uint64 length, uint32 crc of the length, data, uint32 crc of the data
+  constexpr int64 kRecordOverhead = sizeof(uint64_t) + 2 * sizeof(uint32_t);
+  int fd = open(path.c_str(), O_RDONLY);
+  DALI_ENFORCE(fd >= 0, make_string("Failed to open file ", path, ": ", std::strerror(errno)));
+  std::unique_ptr<int, void(*)(int *)> fd_guard(&fd, [](int *fd) { close(*fd); });
+  struct stat st;
+  DALI_ENFORCE(fstat(fd, &st) == 0,
+               make_string("Failed to read the size of ", path, ": ", std::strerror(errno)));
+  // only the headers of the records are read - don't let the read-ahead fetch the data
+  posix_fadvise(fd, 0, 0, POSIX_FADV_RANDOM);
+
+  int64 file_size = st.st_size;
+  offsets.clear();
+  sizes.clear();
+  int64 pos = 0;
+  while (pos < file_size) {
+    uint64_t length = 0;
+    DALI_ENFORCE(file_size - pos >= kRecordOverhead &&
+                 pread(fd, &length, sizeof(length), pos) == sizeof(length),
+                 make_string("Not a valid TFRecord file: ", path));
+    DALI_ENFORCE(length <= static_cast<uint64_t>(file_size - pos - kRecordOverhead),
+                 make_string("Not a valid TFRecord file: ", path, ". The record at offset ",
+                             pos, " exceeds the end of the file."));
+    int64 size = length + kRecordOverhead;
+    offsets.push_back(pos);
+    sizes.push_back(size);
+    pos += size;
+  }
+}
+
+void RecordIndex::WriteBinaryIndexFile(const std::string &path, const std::vector<int64> &offsets,
+                                       const std::vector<int64> &sizes,
+                                       const std::vector<uint32_t> &file_ids) {
+  DALI_ENFORCE(offsets.size() == sizes.size() && (file_ids.empty() ||
+               file_ids.size() == offsets.size()),
+               "The number of offsets, sizes and file ids must match");
+  record_index::Header header;
+  std::memcpy(header.magic, record_index::kMagic, sizeof(header.magic));
+  header.version = record_index::kVersion;
+  header.flags = file_ids.empty() ? 0 : record_index::kHasFileIds;
+  header.num_records = offsets.size();
+
+  std::ofstream fout(path, std::ios::binary | std::ios::trunc);
+  DALI_ENFORCE(fout.good(), "Failed to open file " + path);
+  fout.write(reinterpret_cast<const char *>(&header), sizeof(header));
+  fout.write(reinterpret_cast<const char *>(offsets.data()), offsets.size() * sizeof(int64));
+  fout.write(reinterpret_cast<const char *>(sizes.data()), sizes.size() * sizeof(int64));
+  fout.write(reinterpret_cast<const char *>(file_ids.data()), file_ids.size() * sizeof(uint32_t));
+  DALI_ENFORCE(fout.good(), "Failed to write the index file " + path);
+}
+
+}  // namespace dali
@@ -0,0 +1,158 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_READER_LOADER_RECORD_INDEX_H_
+#define DALI_OPERATORS_READER_LOADER_RECORD_INDEX_H_
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "dali/core/common.h"
+
+namespace dali {
+
+/**
+ * @brief Layout of the binary index files.
+ *
+ * All the values are little-endian:
+ *
+ *   char[8]  magic       - "DALIIDX1"
+ *   uint32   version     - 1
+ *   uint32   flags       - bit 0: the file id column is present
+ *   uint64   num_records
+ *   int64    offsets[num_records]
+ *   int64    sizes[num_records]
+ *   uint32   file_ids[num_records]  (optional)
+ *
+ * The columns are placed directly after the header and are aligned to 8 bytes, so the loader can
+ * use them in place, in a read-only memory mapping shared by all the processes reading the index.
+ */
+namespace record_index {
+
+constexpr char kMagic[8] = {'D', 'A', 'L', 'I', 'I', 'D', 'X', '1'};
+constexpr uint32_t kVersion = 1;
+constexpr uint32_t kHasFileIds = 1;
+
+struct Header {
+  char magic[8];
+  uint32_t version;
+  uint32_t flags;
+  uint64_t num_records;
+};
+
+static_assert(sizeof(Header) == 24, "Unexpected size of the binary index header");
+
+}  // namespace record_index
+
+/**
+ * @brief Index of records stored in a set of data files: the offset, the size
+ *        and the index of the data file of every record.
+ *
+ * The index consists of segments - typically one per index file. The segments are either
+ * memory-mapped binary index files, used in place, or entries parsed from text index files.
+ */
+class DLL_PUBLIC RecordIndex {
+ public:
+  struct Entry {
+    int64 offset;
+    int64 size;
+    size_t file_index;
+  };
+
+  size_t size() const {
+    return size_;
+  }
+
+  bool empty() const {
+    return size_ == 0;
+  }
+
+  Entry operator[](size_t idx) const {
+    const Segment &seg = FindSegment(idx);
+    size_t i = idx - seg.start;
+    return {seg.offsets[i], seg.sizes[i], seg.file_ids ? seg.file_ids[i] : seg.file_index};
+  }
+
+  /**
+   * @brief Adds the entries of the index file `path` describing the records of the data file
+   *        `file_index`. The binary index files are memory-mapped, the text ones are parsed.
+   *
+   * The text index files consist of "<offset> <size>" lines.
+   * If the binary index contains the file id column, `file_index` is ignored.
+   */
+  void AddIndexFile(const std::string &path, size_t file_index);
+
+  /**
+   * @brief Adds a segment of records placed in the data file `file_index`.
+   */
+  void AddEntries(std::vector<int64> offsets, std::vector<int64> sizes, size_t file_index);
+
+  /**
+   * @brief Checks if `path` is a binary index file.
+   */
+  static bool IsBinaryIndexFile(const std::string &path);
+
+  /**
+   * @brief Finds the offsets and the sizes of the records in the TFRecord file `path`.
+   *
+   * Only the length fields of the records are read, so the data is not brought into memory.
+   */
+  static void ScanTFRecordFile(const std::string &path, std::vector<int64> &offsets,
+                               std::vector<int64> &sizes);
+
+  /**
+   * @brief Writes a binary index file. `file_ids` may be empty.
+   */
+  static void WriteBinaryIndexFile(const std::string &path, const std::vector<int64> &offsets,
+                                   const std::vector<int64> &sizes,
+                                   const std::vector<uint32_t> &file_ids = {});
+
+ private:
+  struct Segment {
+    size_t start = 0;
+    size_t count = 0;
+    const int64 *offsets = nullptr;
+    const int64 *sizes = nullptr;
+    const uint32_t *file_ids = nullptr;
+    size_t file_index = 0;
+    // keeps the mapping or the parsed data alive
+    std::shared_ptr<const void> storage;
+  };
+
+  const Segment &FindSegment(size_t idx) const {
+    // the number of segments is small (one per index file) - binary search is cheap
+    size_t lo = 0, hi = segments_.size();
+    while (hi - lo > 1) {
+      size_t mid = (lo + hi) / 2;
+      if (segments_[mid].start <= idx)
+        lo = mid;
+      else
+        hi = mid;
+    }
+    return segments_[lo];
+  }
+
+  void AddSegment(Segment seg);
+  void MapBinaryIndexFile(const std::string &path, size_t file_index);
+  void ParseTextIndexFile(const std::string &path, size_t file_index);
+
+  std::vector<Segment> segments_;
+  size_t size_ = 0;
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_READER_LOADER_RECORD_INDEX_H_
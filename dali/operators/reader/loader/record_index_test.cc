@@ -0,0 +1,128 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <stdlib.h>
+#include <unistd.h>
+#include <fstream>
+#include <string>
+#include <vector>
+#include "dali/operators/reader/loader/record_index.h"
+
+namespace dali {
+
+namespace {
+
+std::string TempFileName() {
+  char name[] = "/tmp/dali_record_index_XXXXXX";
+  int fd = mkstemp(name);
+  EXPECT_GE(fd, 0);
+  close(fd);
+  return name;
+}
+
+}  // namespace
+
+TEST(RecordIndexTest, TextAndBinaryMatch) {
+  std::vector<int64> offsets = {0, 120, 4242, 100000};
+  std::vector<int64> sizes = {120, 4122, 95758, 17};
+
+  auto text_path = TempFileName();
+  {
+    std::ofstream f(text_path);
+    for (size_t i = 0; i < offsets.size(); i++)
+      f << offsets[i] << " " << sizes[i] << "\n";
+  }
+  auto binary_path = TempFileName();
+  RecordIndex::WriteBinaryIndexFile(binary_path, offsets, sizes);
+
+  EXPECT_FALSE(RecordIndex::IsBinaryIndexFile(text_path));
+  EXPECT_TRUE(RecordIndex::IsBinaryIndexFile(binary_path));
+
+  RecordIndex index;
+  index.AddIndexFile(text_path, 0);
+  index.AddIndexFile(binary_path, 1);
+  ASSERT_EQ(index.size(), 2 * offsets.size());
+  for (size_t i = 0; i < index.size(); i++) {
+    auto e = index[i];
+    EXPECT_EQ(e.offset, offsets[i % offsets.size()]);
+    EXPECT_EQ(e.size, sizes[i % offsets.size()]);
+    EXPECT_EQ(e.file_index, i / offsets.size());
+  }
+
+  unlink(text_path.c_str());
+  unlink(binary_path.c_str());
+}
+
+TEST(RecordIndexTest, FileIds) {
+  std::vector<int64> offsets = {0, 10, 0, 5, 0};
+  std::vector<int64> sizes = {10, 20, 5, 30, 7};
+  std::vector<uint32_t> file_ids = {0, 0, 1, 1, 3};
+
+  auto path = TempFileName();
+  RecordIndex::WriteBinaryIndexFile(path, offsets, sizes, file_ids);
+
+  RecordIndex index;
+  index.AddEntries({}, {}, 7);
+  index.AddIndexFile(path, 0);
+  ASSERT_EQ(index.size(), offsets.size());
+  for (size_t i = 0; i < index.size(); i++) {
+    auto e = index[i];
+    EXPECT_EQ(e.offset, offsets[i]);
+    EXPECT_EQ(e.size, sizes[i]);
+    EXPECT_EQ(e.file_index, file_ids[i]);
+  }
+
+  unlink(path.c_str());
+}
+
+TEST(RecordIndexTest, TruncatedBinaryIndex) {
+  auto path = TempFileName();
+  RecordIndex::WriteBinaryIndexFile(path, {0, 1, 2}, {1, 1, 1});
+  ASSERT_EQ(truncate(path.c_str(), 30), 0);
+  RecordIndex index;
+  EXPECT_THROW(index.AddIndexFile(path, 0), std::runtime_error);
+  unlink(path.c_str());
+}
+
+TEST(RecordIndexTest, ScanTFRecordFile) {
+  std::vector<int64> data_sizes = {0, 17, 3, 1000};
+  std::vector<int64> expected_offsets, expected_sizes;
+  auto path = TempFileName();
+  {
+    std::ofstream f(path, std::ios::binary);
+    int64 pos = 0;
+    for (int64 data_size : data_sizes) {
+      uint64_t length = data_size;
+      uint32_t crc = 0;
+      f.write(reinterpret_cast<const char *>(&length), sizeof(length));
+      f.write(reinterpret_cast<const char *>(&crc), sizeof(crc));
+      f << std::string(data_size, 'x');
+      f.write(reinterpret_cast<const char *>(&crc), sizeof(crc));
+      expected_offsets.push_back(pos);
+      expected_sizes.push_back(data_size + 16);
+      pos += data_size + 16;
+    }
+  }
+  std::vector<int64> offsets, sizes;
+  RecordIndex::ScanTFRecordFile(path, offsets, sizes);
+  EXPECT_EQ(offsets, expected_offsets);
+  EXPECT_EQ(sizes, expected_sizes);
+
+  ASSERT_EQ(truncate(path.c_str(), expected_offsets.back() + 10), 0);
+  EXPECT_THROW(RecordIndex::ScanTFRecordFile(path, offsets, sizes), std::runtime_error);
+  unlink(path.c_str());
+}
+
+}  // namespace dali
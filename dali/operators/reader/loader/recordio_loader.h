@@ -18,6 +18,7 @@
 #include <algorithm>
 #include <memory>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "dali/operators/reader/loader/indexed_file_loader.h"
@@ -44,11 +45,15 @@ class RecordIOLoader : public IndexedFileLoader {
     DALI_ENFORCE(index_uris.size() == 1,
         "RecordIOReader supports only a single index file");
     const std::string& path = index_uris[0];
+    if (RecordIndex::IsBinaryIndexFile(path)) {
+      ReadBinaryIndexFile(path, file_offsets);
+      return;
+    }
     std::ifstream index_file(path);
     DALI_ENFORCE(index_file.good(),
         "Could not open RecordIO index file. Provided path: \"" + path + "\"");
     std::vector<size_t> temp;
-    size_t index, offset, prev_offset = -1;
+    size_t index, offset;
     while (index_file >> index >> offset) {
       temp.push_back(offset);
     }
@@ -57,24 +62,13 @@ class RecordIOLoader : public IndexedFileLoader {
                   path, "\""));
 
     std::sort(temp.begin(), temp.end());
-    size_t file_offset_index = 0;
+    std::vector<std::pair<size_t, int64>> records;
+    records.reserve(temp.size());
     for (size_t i = 0; i < temp.size() - 1; ++i) {
-      if (temp[i] >= file_offsets[file_offset_index + 1]) {
-        ++file_offset_index;
-      }
-      int64 size = temp[i + 1] - temp[i];
-      // skip 0 sized images
-      if (size) {
-        indices_.push_back(std::make_tuple(temp[i] - file_offsets[file_offset_index],
-                                          size, file_offset_index));
-      }
-    }
-    int64 size = file_offsets.back() - temp.back();
-    // skip 0 sized images
-    if (size) {
-      indices_.push_back(std::make_tuple(temp.back() - file_offsets[file_offset_index],
-                                        size, file_offset_index));
+      records.emplace_back(temp[i], temp[i + 1] - temp[i]);
     }
+    records.emplace_back(temp.back(), file_offsets.back() - temp.back());
+    AddGlobalRecords(records, file_offsets);
     index_file.close();
   }
 
@@ -82,12 +76,20 @@ class RecordIOLoader : public IndexedFileLoader {
     // if we moved to next shard wrap up
     MoveToNextShard(current_index_);
 
-    int64 seek_pos, size;
-    size_t file_index;
-    std::tie(seek_pos, size, file_index) = indices_[current_index_];
+    auto entry = indices_[RecordAt(current_index_)];
+    int64 seek_pos = entry.offset, size = entry.size;
+    size_t file_index = entry.file_index;
 
     ++current_index_;
 
+    // with shuffle_after_epoch the records are not read in the order of the files
+    if (file_index != current_file_index_) {
+      current_file_->Close();
+      current_file_ = FileStream::Open(uris_[file_index], read_ahead_, !copy_read_data_);
+      current_file_index_ = file_index;
+      should_seek_ = true;
+    }
+
     std::string image_key = uris_[file_index] + " at index " + to_string(seek_pos);
     DALIMeta meta;
     meta.SetSourceInfo(image_key);
@@ -153,7 +155,63 @@ class RecordIOLoader : public IndexedFileLoader {
   }
 
  private:
-  bool should_seek_ = false;
+  /**
+   * @brief Reads a binary index file.
+   *
+   * If the index holds the file id column, or there's just one data file, it's used directly.
+   * Otherwise, as with the text index, the offsets refer to the data files concatenated
+   * in the order of `path` and are split here into the per-file offsets.
+   */
+  void ReadBinaryIndexFile(const std::string& path, const std::vector<size_t>& file_offsets) {
+    RecordIndex index;
+    index.AddIndexFile(path, 0);
+    DALI_ENFORCE(!index.empty(),
+      make_string("RecordIO index file doesn't contain any indices. Provided path: \"",
+                  path, "\""));
+    bool has_file_ids = false;
+    for (size_t i = 0; i < index.size() && !has_file_ids && uris_.size() > 1; ++i)
+      has_file_ids = index[i].file_index != 0;
+    if (uris_.size() == 1 || has_file_ids) {
+      indices_ = std::move(index);
+      return;
+    }
+    std::vector<std::pair<size_t, int64>> records;
+    records.reserve(index.size());
+    for (size_t i = 0; i < index.size(); ++i) {
+      auto entry = index[i];
+      records.emplace_back(entry.offset, entry.size);
+    }
+    std::sort(records.begin(), records.end());
+    AddGlobalRecords(records, file_offsets);
+  }
+
+  /**
+   * @brief Splits the records, given by their offsets in the concatenated data files,
+   *        between the data files. `records` must be sorted by the offset.
+   */
+  void AddGlobalRecords(const std::vector<std::pair<size_t, int64>>& records,
+                        const std::vector<size_t>& file_offsets) {
+    size_t file_offset_index = 0;
+    std::vector<int64> offsets, sizes;
+    for (auto& record : records) {
+      size_t offset = record.first;
+      int64 size = record.second;
+      DALI_ENFORCE(offset < file_offsets.back(), make_string("RecordIO index offset ", offset,
+          " exceeds the total size of the data files (", file_offsets.back(), " bytes)"));
+      while (offset >= file_offsets[file_offset_index + 1]) {
+        indices_.AddEntries(std::move(offsets), std::move(sizes), file_offset_index);
+        offsets.clear();
+        sizes.clear();
+        ++file_offset_index;
+      }
+      // skip 0 sized images
+      if (size) {
+        offsets.push_back(offset - file_offsets[file_offset_index]);
+        sizes.push_back(size);
+      }
+    }
+    indices_.AddEntries(std::move(offsets), std::move(sizes), file_offset_index);
+  }
 };
 
 }  // namespace dali
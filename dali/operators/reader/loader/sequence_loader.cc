@@ -1,4 +1,4 @@
-// Copyright (c) 2018-2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2018-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -12,10 +12,10 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
-#include <glob.h>
 #include <algorithm>
 #include <map>
 #include "dali/image/image.h"
+#include "dali/operators/reader/loader/filesystem.h"
 #include "dali/operators/reader/loader/sequence_loader.h"
 #include "dali/operators/reader/loader/utils.h"
 
@@ -33,21 +33,22 @@ std::string parent_dir(const std::string &path) {
 
 namespace filesystem {
 
-std::vector<Stream> GatherExtractedStreams(const string &file_root) {
-  glob_t glob_buff;
-  std::string glob_pattern = file_root + "/*/*";
-  const int glob_flags = 0;
-  int glob_ret = glob(glob_pattern.c_str(), glob_flags, nullptr, &glob_buff);
-  DALI_ENFORCE(glob_ret == 0,
-               "Glob for pattern: \"" + glob_pattern + "\" failed. Verify the file_root argument");
+std::vector<Stream> GatherExtractedStreams(const string &file_root, const string &cache_dir) {
+  auto scan = scan_directories(file_root, false, "sequence", [](const std::string &dir_path) {
+    return list_files(dir_path, [](const std::string &name) {
+      return name[0] != '.' && HasExtension(name, kKnownImageExtensions);
+    });
+  }, cache_dir);
   std::vector<std::string> files;
-  for (size_t i = 0; i < glob_buff.gl_pathc; i++) {
-    std::string file = glob_buff.gl_pathv[i];
-    if (HasExtension(file, kKnownImageExtensions)) {
-      files.push_back(std::move(file));
-    }
+  for (size_t d = 0; d < scan.dirs.size(); d++) {
+    if (scan.dirs[d][0] == '.')  // hidden directories are not streams
+      continue;
+    for (auto &name : scan.files[d])
+      files.push_back(file_root + "/" + scan.dirs[d] + "/" + name);
   }
-  globfree(&glob_buff);
+  DALI_ENFORCE(!files.empty(),
+               "No frames found in the subdirectories of \"" + file_root +
+               "\". Verify the file_root argument");
   std::sort(files.begin(), files.end());
   std::map<std::string, size_t> streamName_bucket_map;
   std::vector<Stream> streams;
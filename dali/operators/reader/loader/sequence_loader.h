@@ -1,4 +1,4 @@
-// Copyright (c) 2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2018-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -55,10 +55,14 @@ using Stream = std::pair<std::string, std::vector<std::string>>;
  *     > 00006.png
  *     ....
  *
+ * The streams are scanned in parallel. See `scan_directories` for the meaning of `cache_dir`.
+ *
  * @param file_root
+ * @param cache_dir
  * @return std::vector<Stream> GatherExtractedStreams
  */
-std::vector<Stream> DLL_PUBLIC GatherExtractedStreams(const string &file_root);
+std::vector<Stream> DLL_PUBLIC GatherExtractedStreams(const string &file_root,
+                                                      const string &cache_dir = "");
 
 }  // namespace filesystem
 
@@ -88,6 +92,7 @@ class SequenceLoader : public Loader<CPUBackend, TensorSequence> {
   explicit SequenceLoader(const OpSpec &spec)
       : Loader(spec),
         file_root_(spec.GetArgument<string>("file_root")),
+        file_list_cache_dir_(spec.GetArgument<string>("file_list_cache_dir")),
         sequence_length_(spec.GetArgument<int32_t>("sequence_length")),
         step_(spec.GetArgument<int32_t>("step")),
         stride_(spec.GetArgument<int32_t>("stride")),
@@ -102,7 +107,7 @@ class SequenceLoader : public Loader<CPUBackend, TensorSequence> {
   Index SizeImpl() override;
 
   void PrepareMetadataImpl() override {
-    streams_ = filesystem::GatherExtractedStreams(file_root_);
+    streams_ = filesystem::GatherExtractedStreams(file_root_, file_list_cache_dir_);
     sequences_ = detail::GenerateSequences(streams_, sequence_length_, step_, stride_);
     total_size_ = sequences_.size();
     DALI_ENFORCE(sequence_length_ > 0, "Sequence length must be positive");
@@ -135,6 +140,7 @@ class SequenceLoader : public Loader<CPUBackend, TensorSequence> {
   // will be a video file
 
   string file_root_;
+  string file_list_cache_dir_;
   int32_t sequence_length_;
   int32_t step_;
   int32_t stride_;
@@ -0,0 +1,140 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_READER_LOADER_TFRECORD_LOADER_H_
+#define DALI_OPERATORS_READER_LOADER_TFRECORD_LOADER_H_
+
+#include <sys/stat.h>
+#include <unistd.h>
+#include <algorithm>
+#include <atomic>
+#include <cstdio>
+#include <exception>
+#include <functional>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+#include "dali/core/common.h"
+#include "dali/core/error_handling.h"
+#include "dali/operators/reader/loader/indexed_file_loader.h"
+
+namespace dali {
+
+/**
+ * @brief Loader of TFRecord files.
+ *
+ * If no index files are provided, the index is built on the first use by scanning the data
+ * files, in parallel. With ``cache_index``, the index of every data file is stored next to it
+ * in a binary index file (see `kIndexCacheSuffix`) and reused as long as it is not older than
+ * the data file.
+ */
+class TFRecordLoader : public IndexedFileLoader {
+ public:
+  static constexpr const char *kIndexCacheSuffix = ".dali.idx";
+
+  explicit TFRecordLoader(const OpSpec& options)
+    : IndexedFileLoader(options),
+      cache_index_(options.GetArgument<bool>("cache_index")) {
+  }
+  ~TFRecordLoader() override {}
+
+  void ReadIndexFile(const std::vector<std::string>& index_uris) override {
+    if (!index_uris.empty()) {
+      IndexedFileLoader::ReadIndexFile(index_uris);
+      return;
+    }
+    BuildIndex();
+  }
+
+ private:
+  void BuildIndex() {
+    size_t num_files = uris_.size();
+    std::vector<std::string> cached_index(num_files);
+    std::vector<std::vector<int64>> offsets(num_files), sizes(num_files);
+    std::vector<std::exception_ptr> errors(num_files);
+
+    std::atomic<size_t> next_file{0};
+    auto worker = [&]() {
+      for (size_t i; (i = next_file++) < num_files; ) {
+        try {
+          std::string cache_path = uris_[i] + kIndexCacheSuffix;
+          if (cache_index_ && IsIndexCacheValid(uris_[i], cache_path)) {
+            cached_index[i] = cache_path;
+            continue;
+          }
+          RecordIndex::ScanTFRecordFile(uris_[i], offsets[i], sizes[i]);
+          if (cache_index_)
+            WriteIndexCache(cache_path, offsets[i], sizes[i]);
+        } catch (...) {
+          errors[i] = std::current_exception();
+        }
+      }
+    };
+
+    size_t num_threads = std::min<size_t>(num_files,
+                                          std::max(1u, std::thread::hardware_concurrency()));
+    std::vector<std::thread> threads;
+    for (size_t t = 1; t < num_threads; t++)
+      threads.emplace_back(worker);
+    worker();
+    for (auto &thread : threads)
+      thread.join();
+
+    for (auto &error : errors) {
+      if (error)
+        std::rethrow_exception(error);
+    }
+    for (size_t i = 0; i < num_files; i++) {
+      if (!cached_index[i].empty())
+        indices_.AddIndexFile(cached_index[i], i);
+      else
+        indices_.AddEntries(std::move(offsets[i]), std::move(sizes[i]), i);
+    }
+  }
+
+  static bool IsIndexCacheValid(const std::string &data_path, const std::string &cache_path) {
+    struct stat data_st, cache_st;
+    if (stat(data_path.c_str(), &data_st) != 0 || stat(cache_path.c_str(), &cache_st) != 0)
+      return false;
+    return cache_st.st_mtime >= data_st.st_mtime && RecordIndex::IsBinaryIndexFile(cache_path);
+  }
+
+  /**
+   * @brief Stores the index next to the data file. The index is written to a temporary file
+   *        first, so that the processes building it at the same time never see a partial one.
+   *
+   * Failing to write the cache (e.g. in a read-only location) is not an error.
+   */
+  static void WriteIndexCache(const std::string &cache_path, const std::vector<int64> &offsets,
+                              const std::vector<int64> &sizes) {
+    std::string tmp_path = make_string(cache_path, ".tmp", getpid(), "_",
+                                       std::hash<std::thread::id>()(std::this_thread::get_id()));
+    try {
+      RecordIndex::WriteBinaryIndexFile(tmp_path, offsets, sizes);
+      DALI_ENFORCE(std::rename(tmp_path.c_str(), cache_path.c_str()) == 0,
+                   make_string("Failed to rename ", tmp_path, " to ", cache_path));
+    } catch (std::exception &e) {
+      std::remove(tmp_path.c_str());
+      DALI_WARN(make_string("Could not cache the index in ", cache_path, ": ", e.what()));
+    }
+  }
+
+  bool cache_index_;
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_READER_LOADER_TFRECORD_LOADER_H_
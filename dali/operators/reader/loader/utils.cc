@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -59,12 +59,23 @@ bool HasExtension(std::string filepath, const std::vector<std::string> &extensio
 
 
 bool HasKnownExtension(const std::string &filepath) {
-  std::vector<std::string> extensions;
-
-  extensions.insert(extensions.end(), kKnownAudioExtensions.begin(), kKnownAudioExtensions.end());
-  extensions.insert(extensions.end(), kKnownImageExtensions.begin(), kKnownImageExtensions.end());
+  // called for every file found in the traversed directories - build the list only once
+  static const std::vector<std::string> extensions = []() {
+    std::vector<std::string> exts;
+    exts.insert(exts.end(), kKnownAudioExtensions.begin(), kKnownAudioExtensions.end());
+    exts.insert(exts.end(), kKnownImageExtensions.begin(), kKnownImageExtensions.end());
+    return exts;
+  }();
 
   return HasExtension(filepath, extensions);
 }
 
+uint64_t HashString(const std::string &str, uint64_t hash) {
+  for (unsigned char c : str) {
+    hash ^= c;
+    hash *= 1099511628211ull;
+  }
+  return hash;
+}
+
 }  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -15,8 +15,13 @@
 #ifndef DALI_OPERATORS_READER_LOADER_UTILS_H_
 #define DALI_OPERATORS_READER_LOADER_UTILS_H_
 
-#include <vector>
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <exception>
 #include <string>
+#include <thread>
+#include <vector>
 #include "dali/core/api_helper.h"
 
 namespace dali {
@@ -41,6 +46,44 @@ DLL_PUBLIC bool HasExtension(std::string filepath, const std::vector<std::string
  */
 DLL_PUBLIC bool HasKnownExtension(const std::string &filepath);
 
+/**
+ * @brief 64-bit FNV-1a hash, stable between the runs and the processes
+ */
+DLL_PUBLIC uint64_t HashString(const std::string &str,
+                               uint64_t hash = 14695981039346656037ull);
+
+/**
+ * @brief Calls func(i) for i in [0, n) on up to hardware_concurrency threads (including
+ *        the calling one) and rethrows the first error, if any
+ */
+template <typename Func>
+void ParallelFor(size_t n, const Func &func) {
+  std::vector<std::exception_ptr> errors(n);
+  std::atomic<size_t> next{0};
+  auto worker = [&]() {
+    for (size_t i; (i = next++) < n; ) {
+      try {
+        func(i);
+      } catch (...) {
+        errors[i] = std::current_exception();
+      }
+    }
+  };
+
+  size_t num_threads = std::min<size_t>(n, std::max(1u, std::thread::hardware_concurrency()));
+  std::vector<std::thread> threads;
+  for (size_t t = 1; t < num_threads; t++)
+    threads.emplace_back(worker);
+  worker();
+  for (auto &thread : threads)
+    thread.join();
+
+  for (auto &error : errors) {
+    if (error)
+      std::rethrow_exception(error);
+  }
+}
+
 }  // namespace dali
 
 #endif  // DALI_OPERATORS_READER_LOADER_UTILS_H_
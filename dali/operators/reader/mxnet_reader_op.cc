@@ -30,8 +30,29 @@ DALI_SCHEMA(MXNetReader)
       R"code(List (of length 1) that contains a path to the index (.idx) file.
 
 The file is generated by the MXNet's ``im2rec.py`` script with the RecordIO file. The list can
-also be generated by using the ``rec2idx`` script that is distributed with DALI.)code",
+also be generated by using the ``rec2idx`` script that is distributed with DALI.
+
+Both the text index files and the binary ones, generated by ``rec2idx --binary``, are supported.
+The binary index files are memory-mapped and shared between the processes that read them.)code",
       DALI_STRING_VEC)
+  .AddOptionalArg("shuffle_after_epoch",
+      R"code(If set to True, the reader shuffles the order of the records after each epoch,
+using the index to read them in the shuffled order.
+
+Unlike ``random_shuffle``, this gives a permutation of the whole dataset in every epoch
+without keeping a large buffer of samples in memory. The permutation is the same for all
+the shards, so the shards still read disjoint parts of the dataset.
+
+``stick_to_shard`` and ``random_shuffle`` cannot be used when this argument is set to True.)code",
+      false)
+  .AddOptionalArg("shuffle_block_size",
+      R"code(The number of consecutive records shuffled together when
+``shuffle_after_epoch`` is set.
+
+If set to a non-zero value, the order of the blocks of that many consecutive records is permuted
+and the records are shuffled only within their blocks, so that the reads stay mostly sequential.
+If 0, the whole dataset is permuted.)code",
+      0)
   .AddParent("LoaderBase");
 
 }  // namespace dali
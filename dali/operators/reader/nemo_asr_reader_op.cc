@@ -85,6 +85,17 @@ in seconds, of the audio samples.
 
 Samples with a duration longer than this value will be ignored.)code",
     0.0f)
+  .AddOptionalArg("bucket_by_duration",
+    R"code(If set to True, the samples of similar duration are grouped in the same batches,
+which reduces the padding needed to process the batches of audio.
+
+The samples are sorted by the ``duration`` from the manifest and split into batches,
+which are read in a random order, different in every epoch. The samples without a ``duration``
+are treated as the shortest ones.
+
+Can't be used together with ``random_shuffle`` or ``shuffle_after_epoch``.
+Implies ``stick_to_shard``.)code",
+    false)
   .AddOptionalArg<bool>("normalize_text", "Normalize text.", nullptr)
   .DeprecateArg("normalize_text")  // deprecated since 0.28dev
   .AdditionalOutputsFn([](const OpSpec& spec) {
@@ -101,12 +112,6 @@ NemoAsrReader::NemoAsrReader(const OpSpec& spec)
       num_threads_(std::max(1, spec.GetArgument<int>("num_threads"))),
       thread_pool_(num_threads_, spec.GetArgument<int>("device_id"), false) {
   loader_ = InitLoader<NemoAsrLoader>(spec);
-
-  prefetched_decoded_audio_.resize(prefetch_queue_depth_);
-  for (auto& batch : prefetched_decoded_audio_) {
-    batch = std::make_unique<TensorVector<CPUBackend>>();
-    batch->set_pinned(false);
-  }
 }
 
 NemoAsrReader::~NemoAsrReader() {
@@ -119,21 +124,22 @@ void NemoAsrReader::Prefetch() {
                       DomainTimeRange::kRed);
   DataReader<CPUBackend, AsrSample>::Prefetch();
   auto &curr_batch = prefetched_batch_queue_[curr_batch_producer_];
-  auto &audio_batch = *prefetched_decoded_audio_[curr_batch_producer_];
   int nsamples = static_cast<int>(curr_batch.size());
-
   assert(nsamples > 0);
-  auto ndim = curr_batch[0]->shape().sample_dim();
-  TensorListShape<> shape(nsamples, ndim);
+
+  // The audio is decoded into the samples themselves, as the batches consumed by the operator
+  // don't have to match the prefetched ones
   for (int i = 0; i < nsamples; i++) {
-    shape.set_tensor_shape(i, curr_batch[i]->shape());
+    auto &sample = *curr_batch[i];
+    auto &audio = sample.decoded_audio();
+    audio.set_type(TypeTable::GetTypeInfo(dtype_));
+    audio.Resize(sample.shape());
   }
-  audio_batch.Resize(shape, TypeTable::GetTypeInfo(dtype_));
 
   // Waiting until all the audio samples are ready to be consumed
   for (int i = 0; i < nsamples; i++) {
     auto &sample = *curr_batch[i];
-    auto &audio = audio_batch[i];
+    auto &audio = sample.decoded_audio();
     const auto &audio_meta = sample.audio_meta();
     int64_t priority = audio_meta.length * audio_meta.channels;
     thread_pool_.AddWork(
@@ -146,7 +152,7 @@ void NemoAsrReader::Prefetch() {
 
 void NemoAsrReader::RunImpl(SampleWorkspace &ws) {
   const auto &sample = GetSample(ws.data_idx());
-  const auto &sample_audio = GetDecodedAudioSample(ws.data_idx());
+  const auto &sample_audio = sample.decoded_audio();
 
   auto &audio = ws.Output<CPUBackend>(0);
   audio.Copy(sample_audio, 0);
@@ -176,9 +182,4 @@ void NemoAsrReader::RunImpl(SampleWorkspace &ws) {
   }
 }
 
-Tensor<CPUBackend>& NemoAsrReader::GetDecodedAudioSample(int sample_idx) {
-  auto &curr_batch = *prefetched_decoded_audio_[curr_batch_consumer_];
-  return curr_batch[sample_idx];
-}
-
 }  // namespace dali
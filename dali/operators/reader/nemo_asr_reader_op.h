@@ -38,18 +38,12 @@ class NemoAsrReader : public DataReader<CPUBackend, AsrSample> {
   void RunImpl(SampleWorkspace &ws) override;
 
  private:
-  Tensor<CPUBackend>& GetDecodedAudioSample(int sample_idx);
-
   bool read_sr_;
   bool read_text_;
   DALIDataType dtype_;
 
   int num_threads_;
   ThreadPool thread_pool_;
-
-  // prefetch_depth * batch_size set of buffers that we reuse to decode audio
-  using TensorVectorPtr = std::unique_ptr<TensorVector<CPUBackend>>;
-  std::vector<TensorVectorPtr> prefetched_decoded_audio_;
 };
 
 }  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -57,6 +57,9 @@ This operator can be used in the following modes:
 2. Read file names from a text file indicated in ``file_list`` argument.
 3. Read files listed in ``files`` argument.
 
+Every array stored in an uncompressed ``.npz`` archive (written with ``numpy.savez``) is read as
+a separate sample, named ``<archive>.npz/<key>``.
+
 .. note::
   The ``gpu`` backend requires cuFile/GDS support (418.x driver family or newer). Please check
   the relevant GDS package for more details.
@@ -98,6 +101,20 @@ sizes vary a lot.)code", true)
       R"code(If set to True, the header information for each file is cached, improving access
 speed.)code",
       false)
+  .AddOptionalArg("header_index_dir",
+      R"code(Path to a directory in which an index of the headers of all the files is stored.
+
+If specified, the headers are parsed in parallel when the reader is built and the index is
+reused by the subsequent runs with the same list of files, so that the files are not parsed
+again. The index entry of a file is used as long as the size of the file does not change.)code",
+      std::string())
+  .AddOptionalArg("file_list_cache_dir",
+      R"(Path to a directory in which the list of the files found in ``file_root`` is cached.
+
+If specified, the list is reused by the subsequent runs (e.g. by the other ranks of a distributed
+job) as long as the modification times of ``file_root`` and of its subdirectories do not change,
+which happens when files are added, removed or renamed. This argument is ignored when file
+paths are taken from ``file_list`` or ``files``.)", std::string())
 
   .AddParent("LoaderBase");
 
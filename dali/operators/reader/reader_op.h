@@ -17,6 +17,7 @@
 
 #include <atomic>
 #include <condition_variable>
+#include <deque>
 #include <memory>
 #include <string>
 #include <thread>
@@ -28,6 +29,8 @@
 #include "dali/operators/reader/loader/loader.h"
 #include "dali/operators/reader/parser/parser.h"
 #include "dali/pipeline/operator/operator.h"
+#include "dali/pipeline/util/thread_pool.h"
+#include "dali/pipeline/util/profiler.h"
 
 namespace dali {
 
@@ -67,6 +70,12 @@ class DataReader : public Operator<Backend> {
           if (std::is_same<Backend, GPUBackend>::value) {
             device_id_ = spec.GetArgument<int>("device_id");
           }
+          int num_io_threads = spec.GetArgument<int>("num_io_threads");
+          DALI_ENFORCE(num_io_threads > 0, "``num_io_threads`` needs to be greater than 0");
+          if (num_io_threads > 1) {
+            io_thread_pool_ = std::make_unique<ThreadPool>(
+                num_io_threads, spec.GetArgument<int>("device_id"), false);
+          }
         }
 
   ~DataReader() noexcept override {
@@ -76,6 +85,8 @@ class DataReader : public Operator<Backend> {
       // and RecycleTensor could be safely executed
       batch.clear();
     }
+    curr_samples_.clear();
+    leftover_samples_.clear();
   }
 
   // perform the prefetching operation
@@ -86,9 +97,16 @@ class DataReader : public Operator<Backend> {
     auto &curr_batch = prefetched_batch_queue_[curr_batch_producer_];
     curr_batch.reserve(max_batch_size_);
     curr_batch.clear();
+    if (io_thread_pool_) {
+      // The samples are chosen in order, but the data is loaded concurrently afterwards
+      loader_->EnableDeferredReads();
+    }
     for (int i = 0; i < max_batch_size_; ++i) {
       curr_batch.push_back(loader_->ReadOne(i == 0));
     }
+    if (io_thread_pool_) {
+      loader_->FinishDeferredReads(*io_thread_pool_);
+    }
   }
 
   // Main prefetch work loop
@@ -97,6 +115,7 @@ class DataReader : public Operator<Backend> {
     ProducerWait();
     while (!finished_) {
       try {
+        SaveLoaderState();
         Prefetch();
       } catch (const std::exception& e) {
         ProducerStop(std::current_exception());
@@ -134,7 +153,7 @@ class DataReader : public Operator<Backend> {
   void Run(HostWorkspace &ws) override {
     // If necessary start prefetching thread and wait for a consumable batch
     StartPrefetchThread();
-    ConsumerWait();
+    GatherSamples(ws.GetRequestedBatchSize(0));
 
     // consume batch
     DomainTimeRange tr("[DALI][DataReader] Run #" + to_string(curr_batch_consumer_),
@@ -145,8 +164,36 @@ class DataReader : public Operator<Backend> {
 
     EnforceUniformOutput(ws);
 
-    // Notify that we have consumed whole batch
-    ConsumerAdvanceQueue();
+    curr_samples_.clear();
+  }
+
+  /**
+   * @brief Collects the samples of the current iteration in `curr_samples_`.
+   *
+   * The batch size of an iteration can be smaller than the size of the prefetched batches.
+   * The samples of a prefetched batch that are not consumed in the iteration are carried over
+   * to the next ones, so that no sample is lost and the order of the samples is preserved.
+   */
+  void GatherSamples(int batch_size) {
+    DALI_ENFORCE(batch_size <= max_batch_size_, make_string("The requested batch size ",
+                 batch_size, " exceeds the maximum batch size ", max_batch_size_, "."));
+    if (batch_size != max_batch_size_ || !leftover_samples_.empty())
+      partial_batches_ = true;
+    curr_samples_.clear();
+    curr_samples_.reserve(batch_size);
+    while (static_cast<int>(curr_samples_.size()) < batch_size) {
+      if (leftover_samples_.empty()) {
+        ConsumerWait();
+        auto &batch = prefetched_batch_queue_[curr_batch_consumer_];
+        for (auto &sample : batch)
+          leftover_samples_.push_back(std::move(sample));
+        batch.clear();
+        // the samples are moved out, so the slot can be refilled right away
+        ConsumerAdvanceQueue();
+      }
+      curr_samples_.push_back(std::move(leftover_samples_.front()));
+      leftover_samples_.pop_front();
+    }
   }
 
   void EnforceUniformOutput(const HostWorkspace &ws) const {
@@ -179,6 +226,10 @@ class DataReader : public Operator<Backend> {
     StartPrefetchThread();
     ConsumerWait();
 
+    DALI_ENFORCE(ws.GetRequestedBatchSize(0) == max_batch_size_, make_string(
+                 "The GPU reader ", this->name(), " does not support batches smaller than the "
+                 "maximum batch size."));
+
     // Consume batch
     Operator<Backend>::Run(ws);
     CUDA_CALL(cudaStreamSynchronize(ws.stream()));
@@ -201,7 +252,56 @@ class DataReader : public Operator<Backend> {
     return ret;
   }
 
+  bool HasReaderState() const override {
+    return loader_->CanCheckpoint();
+  }
+
+  void EnableReaderState(bool enable) override {
+    save_states_ = enable;
+  }
+
+  std::string GetReaderState(int64_t iteration) override {
+    DALI_ENFORCE(save_states_, make_string("Saving the state of the reader ", this->name(),
+                 " is not enabled."));
+    DALI_ENFORCE(!partial_batches_, make_string("The state of the reader ", this->name(),
+                 " is not available after consuming batches smaller than the prefetched ones."));
+    {
+      std::lock_guard<std::mutex> lock(prefetch_access_mutex_);
+      if (!prefetch_thread_.joinable()) {
+        if (iteration == batches_prefetched_)
+          return loader_->GetState().Serialize();
+        DALI_FAIL(make_string("The state of the reader ", this->name(), " for iteration ",
+                              iteration, " is not available."));
+      }
+      // the batch of the iteration can't be prefetched before the preceding ones are consumed
+      DALI_ENFORCE(iteration < batches_consumed_ + prefetch_queue_depth_, make_string(
+                   "The state of the reader ", this->name(), " for iteration ", iteration,
+                   " is not available before the iteration ",
+                   iteration - prefetch_queue_depth_, " is run."));
+    }
+    std::unique_lock<std::mutex> lock(states_mutex_);
+    // The prefetch thread saves the state before it starts reading the batch of the iteration,
+    // which might not have happened yet
+    state_saved_.wait(lock, [&]() { return finished_ || batches_prefetched_ > iteration; });
+    for (auto &state : saved_states_) {
+      if (state.first == iteration)
+        return state.second.Serialize();
+    }
+    DALI_FAIL(make_string("The state of the reader ", this->name(), " for iteration ", iteration,
+                          " is not available. Only the states of the iterations that are "
+                          "currently being prefetched can be obtained."));
+  }
+
+  void SetReaderState(const std::string &state) override {
+    std::lock_guard<std::mutex> lock(prefetch_access_mutex_);
+    DALI_ENFORCE(!prefetch_thread_.joinable() && batches_prefetched_ == 0,
+                 "The state of the reader can be restored only before the first iteration.");
+    loader_->SetState(LoaderState::Deserialize(state));
+  }
+
   LoadTarget& GetSample(int sample_idx) {
+    if (std::is_same<Backend, CPUBackend>::value)
+      return *curr_samples_[sample_idx];
     return *prefetched_batch_queue_[curr_batch_consumer_][sample_idx];
   }
 
@@ -271,6 +371,11 @@ class DataReader : public Operator<Backend> {
         prefetch_error_ = error;
     }
     consumer_.notify_all();
+    {
+      // wake up the threads waiting for the states that won't be saved anymore
+      std::lock_guard<std::mutex> lock(states_mutex_);
+    }
+    state_saved_.notify_all();
   }
 
   void ProducerAdvanceQueue() {
@@ -289,6 +394,7 @@ class DataReader : public Operator<Backend> {
   void ConsumerWait() {
     DomainTimeRange tr("[DALI][DataReader] ConsumerWait #" + to_string(curr_batch_consumer_),
                  DomainTimeRange::kMagenta);
+    ProfilerRange stall(ProfilerEventType::kReaderStall);
     std::unique_lock<std::mutex> prefetch_lock(prefetch_access_mutex_);
     consumer_.wait(prefetch_lock, [this]() { return finished_ || !IsPrefetchQueueEmpty(); });
     if (prefetch_error_) std::rethrow_exception(prefetch_error_);
@@ -298,6 +404,7 @@ class DataReader : public Operator<Backend> {
     {
       std::lock_guard<std::mutex> lock(prefetch_access_mutex_);
       AdvanceIndex(curr_batch_consumer_, consumer_cycle_);
+      batches_consumed_++;
     }
     producer_.notify_one();
   }
@@ -315,6 +422,28 @@ class DataReader : public Operator<Backend> {
     return curr_batch_producer_ == curr_batch_consumer_ && consumer_cycle_ != producer_cycle_;
   }
 
+  /**
+   * @brief Remembers the state of the loader before it reads the next batch, so that it can be
+   *        returned for the iteration that consumes this batch
+   */
+  void SaveLoaderState() {
+    // getting the state of the loader is not free, so it's done only if it was requested
+    bool can_checkpoint = save_states_ && loader_->CanCheckpoint();
+    LoaderState state;
+    if (can_checkpoint)
+      state = loader_->GetState();
+    {
+      std::lock_guard<std::mutex> lock(states_mutex_);
+      if (can_checkpoint) {
+        saved_states_.emplace_back(batches_prefetched_, std::move(state));
+        if (saved_states_.size() > kMaxSavedStates)
+          saved_states_.pop_front();
+      }
+      batches_prefetched_++;
+    }
+    state_saved_.notify_all();
+  }
+
   USE_OPERATOR_MEMBERS();
 
   std::thread prefetch_thread_;
@@ -339,12 +468,31 @@ class DataReader : public Operator<Backend> {
   bool producer_cycle_;
   int device_id_;
 
+  // The samples consumed in the current iteration and the ones carried over to the next
+  // iterations (CPU only)
+  std::vector<LoadTargetPtr> curr_samples_;
+  std::deque<LoadTargetPtr> leftover_samples_;
+  // whether any iteration did not consume exactly one prefetched batch
+  std::atomic<bool> partial_batches_{false};
+
   // keep track of how many samples have been processed over all threads.
   std::atomic<int> samples_processed_;
 
   // stores any catched exceptions in the prefetch worker
   std::exception_ptr prefetch_error_;
 
+  // Threads loading the samples of a batch concurrently, if the loader supports it
+  std::unique_ptr<ThreadPool> io_thread_pool_;
+
+  // The states of the loader before reading the most recent batches, keyed by the batch number
+  static constexpr size_t kMaxSavedStates = 64;
+  std::mutex states_mutex_;
+  std::condition_variable state_saved_;
+  std::deque<std::pair<int64_t, LoaderState>> saved_states_;
+  std::atomic<int64_t> batches_prefetched_{0};
+  std::atomic<bool> save_states_{false};
+  int64_t batches_consumed_ = 0;
+
   // Loader
   std::unique_ptr<Loader<Backend, LoadTarget>> loader_;
 
@@ -1,4 +1,4 @@
-// Copyright (c) 2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2018-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -72,6 +72,13 @@ represent streams.)code",
                     R"code(Distance between consecutive frames in a sequence.)code", 1, false)
     .AddOptionalArg("image_type",
                     R"code(The color space of input and output image.)code", DALI_RGB, false)
+    .AddOptionalArg("file_list_cache_dir",
+                    R"code(Path to a directory in which the list of the frames found in
+``file_root`` is cached.
+
+If specified, the list is reused by the subsequent runs (e.g. by the other ranks of a distributed
+job) as long as the modification times of ``file_root`` and of the stream directories do not
+change, which happens when files are added, removed or renamed.)code", std::string())
     .AddParent("LoaderBase")
     .AllowSequences();
 
@@ -29,12 +29,42 @@ DALI_SCHEMA(_TFRecordReaderBase)
   .AddArg("path",
       R"code(List of paths to TFRecord files.)code",
       DALI_STRING_VEC)
-  .AddArg("index_path",
+  .AddOptionalArg("index_path",
       R"code(List of paths to index files. There should be one index file for every TFRecord file.
 
 The index files can be obtained from TFRecord files by using the ``tfrecord2idx`` script
-that is distributed with DALI.)code",
-      DALI_STRING_VEC);
+that is distributed with DALI. Both the text index files and the binary ones, generated by
+``tfrecord2idx``, are supported. The binary index files are memory-mapped and shared between
+the processes that read them.
+
+If not provided, the index is built when the reader is first used, by scanning the TFRecord
+files in parallel. See ``cache_index``.)code",
+      std::vector<std::string>{})
+  .AddOptionalArg("cache_index",
+      R"code(If set to True and ``index_path`` is not provided, the index built for every
+TFRecord file is stored next to it, in a binary index file with the ``.dali.idx`` suffix.
+
+The stored index is used instead of scanning the file again, unless the TFRecord file is newer.
+If the index cannot be stored (e.g. the location is read-only), a warning is issued.)code",
+      true)
+  .AddOptionalArg("shuffle_after_epoch",
+      R"code(If set to True, the reader shuffles the order of the records after each epoch,
+using the index to read them in the shuffled order.
+
+Unlike ``random_shuffle``, this gives a permutation of the whole dataset in every epoch
+without keeping a large buffer of samples in memory. The permutation is the same for all
+the shards, so the shards still read disjoint parts of the dataset.
+
+``stick_to_shard`` and ``random_shuffle`` cannot be used when this argument is set to True.)code",
+      false)
+  .AddOptionalArg("shuffle_block_size",
+      R"code(The number of consecutive records shuffled together when
+``shuffle_after_epoch`` is set.
+
+If set to a non-zero value, the order of the blocks of that many consecutive records is permuted
+and the records are shuffled only within their blocks, so that the reads stay mostly sequential.
+If 0, the whole dataset is permuted.)code",
+      0);
 
 DALI_SCHEMA(_TFRecordReader)
   .DocStr(R"code(Reads samples from a TensorFlow TFRecord file.)code")
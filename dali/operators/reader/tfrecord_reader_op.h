@@ -18,7 +18,7 @@
 #ifdef DALI_BUILD_PROTO3
 
 #include "dali/operators/reader/reader_op.h"
-#include "dali/operators/reader/loader/indexed_file_loader.h"
+#include "dali/operators/reader/loader/tfrecord_loader.h"
 #include "dali/operators/reader/parser/tfrecord_parser.h"
 
 namespace dali {
@@ -27,7 +27,7 @@ class TFRecordReader : public DataReader<CPUBackend, Tensor<CPUBackend>> {
  public:
   explicit TFRecordReader(const OpSpec& spec)
   : DataReader<CPUBackend, Tensor<CPUBackend>>(spec) {
-    loader_ = InitLoader<IndexedFileLoader>(spec);
+    loader_ = InitLoader<TFRecordLoader>(spec);
     parser_.reset(new TFRecordParser(spec));
     DALI_ENFORCE(!skip_cached_images_,
       "TFRecordReader doesn't support `skip_cached_images` option");
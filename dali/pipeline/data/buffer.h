@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -27,6 +27,7 @@
 #include "dali/core/device_guard.h"
 #include "dali/core/error_handling.h"
 #include "dali/core/util.h"
+#include "dali/pipeline/data/host_memory_pool.h"
 #include "dali/pipeline/data/types.h"
 
 namespace dali {
@@ -254,8 +255,11 @@ class DLL_PUBLIC Buffer {
                  "Cannot reallocate Buffer if it is sharing data. "
                  "Clear the status by `Reset()` first.");
     data_.reset();
-    data_.reset(Backend::New(new_num_bytes, pinned_),
-                std::bind(FreeMemory, std::placeholders::_1, new_num_bytes, device_, pinned_));
+    if (std::is_same<Backend, CPUBackend>::value && !pinned_)
+      data_ = AllocateFromHostMemoryPool(new_num_bytes);  // empty if the pool is disabled
+    if (!data_)
+      data_.reset(Backend::New(new_num_bytes, pinned_),
+                  std::bind(FreeMemory, std::placeholders::_1, new_num_bytes, device_, pinned_));
 
     num_bytes_ = new_num_bytes;
   }
@@ -0,0 +1,99 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <memory>
+#include <mutex>
+
+#include "dali/core/mm/malloc_resource.h"
+#include "dali/pipeline/data/host_memory_pool.h"
+
+namespace dali {
+
+namespace {
+
+constexpr size_t kHostPoolAlignment = 64;
+
+class HostMemoryPool {
+ public:
+  explicit HostMemoryPool(bool use_hugepages)
+  : upstream_(use_hugepages), pool_(&upstream_, PoolOptions(use_hugepages)) {}
+
+  bool UsesHugepages() const {
+    return upstream_.uses_hugepages();
+  }
+
+  void *Allocate(size_t bytes) {
+    return pool_.allocate(bytes, kHostPoolAlignment);
+  }
+
+  void Deallocate(void *ptr, size_t bytes) {
+    pool_.deallocate(ptr, bytes, kHostPoolAlignment);
+  }
+
+  mm::pool_stats Stats() {
+    return pool_.get_stats();
+  }
+
+ private:
+  static mm::pool_options PoolOptions(bool use_hugepages) {
+    auto opt = mm::default_host_pool_opts();
+    opt.upstream_alignment = kHostPoolAlignment;
+    if (use_hugepages)
+      opt.min_block_size = mm::mmap_memory_resource::kHugePageSize;
+    return opt;
+  }
+
+  mm::mmap_memory_resource upstream_;
+  mm::size_class_pool_resource<mm::memory_kind::host, mm::allocation_order::host> pool_;
+};
+
+std::mutex host_pool_mutex;
+// Accessed with atomic_load/atomic_store, so that the allocations don't need the mutex.
+// Each allocation keeps its pool alive, so the pool can be replaced at any time.
+std::shared_ptr<HostMemoryPool> host_pool;
+
+}  // namespace
+
+void SetHostMemoryPool(bool enable, bool use_hugepages) {
+  std::lock_guard<std::mutex> guard(host_pool_mutex);
+  auto current = std::atomic_load(&host_pool);
+  if (!enable) {
+    std::atomic_store(&host_pool, std::shared_ptr<HostMemoryPool>());
+    return;
+  }
+  if (current && current->UsesHugepages() == use_hugepages)
+    return;
+  std::atomic_store(&host_pool, std::make_shared<HostMemoryPool>(use_hugepages));
+}
+
+bool IsHostMemoryPoolEnabled() {
+  return std::atomic_load(&host_pool) != nullptr;
+}
+
+std::shared_ptr<void> AllocateFromHostMemoryPool(size_t bytes) {
+  auto pool = std::atomic_load(&host_pool);
+  if (!pool)
+    return {};
+  void *ptr = pool->Allocate(bytes);
+  return std::shared_ptr<void>(ptr, [pool, bytes](void *p) {
+    pool->Deallocate(p, bytes);
+  });
+}
+
+mm::pool_stats GetHostMemoryPoolStats() {
+  auto pool = std::atomic_load(&host_pool);
+  return pool ? pool->Stats() : mm::pool_stats();
+}
+
+}  // namespace dali
@@ -0,0 +1,56 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_PIPELINE_DATA_HOST_MEMORY_POOL_H_
+#define DALI_PIPELINE_DATA_HOST_MEMORY_POOL_H_
+
+#include <cstddef>
+#include <memory>
+#include "dali/core/api_helper.h"
+#include "dali/core/mm/size_class_pool_resource.h"
+
+namespace dali {
+
+/**
+ * @brief Enables or disables the process-wide pool for the non-pinned host buffers
+ *
+ * When enabled, the CPU buffers (and thus the CPU TensorLists and TensorVectors) take their
+ * non-pinned memory from a pool with size classes, instead of the CPU allocator.
+ * The pool is backed by memory mapped directly from the OS, optionally with transparent
+ * huge pages.
+ *
+ * Changing the settings starts a new pool. The memory of the previous one is returned to the OS
+ * when all the buffers allocated from it are freed. Calling it with the current settings is
+ * a no-op.
+ */
+DLL_PUBLIC void SetHostMemoryPool(bool enable, bool use_hugepages = false);
+
+DLL_PUBLIC bool IsHostMemoryPoolEnabled();
+
+/**
+ * @brief Allocates host memory from the pool
+ *
+ * @return The allocation, which returns the memory to the pool it was taken from when released,
+ *         or an empty pointer if the pool is disabled.
+ */
+DLL_PUBLIC std::shared_ptr<void> AllocateFromHostMemoryPool(size_t bytes);
+
+/**
+ * @brief Returns the statistics of the current pool; all zeros if the pool is disabled.
+ */
+DLL_PUBLIC mm::pool_stats GetHostMemoryPoolStats();
+
+}  // namespace dali
+
+#endif  // DALI_PIPELINE_DATA_HOST_MEMORY_POOL_H_
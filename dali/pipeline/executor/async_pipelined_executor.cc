@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -37,6 +37,10 @@ void AsyncPipelinedExecutor::RunCPU() {
         lock.unlock();
 
         PipelinedExecutor::RunCPU();
+        // With the overlapped iterations, the mixed stage is signaled once
+        // the iteration is finished
+        if (cpu_iteration_overlap_)
+          return;
 
         // Mark that there is now mixed work to do
         // and signal to any threads that are waiting
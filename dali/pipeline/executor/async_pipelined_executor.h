@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -58,6 +58,8 @@ class DLL_PUBLIC AsyncPipelinedExecutor : public PipelinedExecutor {
      */
     mixed_work_cv_.notify_all();
     gpu_work_cv_.notify_all();
+    // The operators of the overlapped CPU iterations signal the mixed stage when finished
+    WaitForCPUIterations();
     /*
      * We need to call shutdown here and not rely on cpu_thread_ destructor
      * as when WorkerThread destructor is called conditional variables and mutexes
@@ -79,6 +81,12 @@ class DLL_PUBLIC AsyncPipelinedExecutor : public PipelinedExecutor {
     }
   }
 
+  DLL_PUBLIC void EnableCPUIterationOverlap(bool enable_overlap = false) override {
+    DALI_ENFORCE(graph_ == nullptr,
+                 "The CPU iteration overlap must be set before the executor is built.");
+    cpu_iteration_overlap_ = enable_overlap;
+  }
+
   DLL_PUBLIC void RunCPU() override;
 
   DLL_PUBLIC void RunMixed() override;
@@ -105,6 +113,14 @@ class DLL_PUBLIC AsyncPipelinedExecutor : public PipelinedExecutor {
   }
 
  protected:
+  void CPUIterationFinished() override {
+    // Mark that there is now mixed work to do
+    // and signal to any threads that are waiting
+    std::unique_lock<std::mutex> mixed_lock(GetReadyMutex());
+    ++mixed_work_counter_;
+    mixed_work_cv_.notify_one();
+  }
+
   void CheckForErrors() {
     cpu_thread_.CheckForErrors();
     mixed_thread_.CheckForErrors();
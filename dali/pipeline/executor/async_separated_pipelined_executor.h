@@ -1,4 +1,4 @@
-// Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -51,6 +51,8 @@ class DLL_PUBLIC AsyncSeparatedPipelinedExecutor : public SeparatedPipelinedExec
     mixed_thread_.ForceStop();
     gpu_thread_.ForceStop();
 
+    WaitForCPUIterations();
+
     /*
      * We need to call shutdown here and not rely on cpu_thread_ destructor
      * as when WorkerThread destructor is called conditional variables and mutexes
@@ -72,6 +74,12 @@ class DLL_PUBLIC AsyncSeparatedPipelinedExecutor : public SeparatedPipelinedExec
     }
   }
 
+  DLL_PUBLIC void EnableCPUIterationOverlap(bool enable_overlap = false) override {
+    DALI_ENFORCE(graph_ == nullptr,
+                 "The CPU iteration overlap must be set before the executor is built.");
+    cpu_iteration_overlap_ = enable_overlap;
+  }
+
   DLL_PUBLIC void RunCPU() override;
 
   DLL_PUBLIC void RunMixed() override;
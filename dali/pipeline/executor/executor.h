@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -15,10 +15,16 @@
 #ifndef DALI_PIPELINE_EXECUTOR_EXECUTOR_H_
 #define DALI_PIPELINE_EXECUTOR_EXECUTOR_H_
 
+#include <algorithm>
+#include <array>
 #include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <functional>
 #include <map>
 #include <memory>
 #include <queue>
+#include <set>
 #include <string>
 #include <utility>
 #include <vector>
@@ -34,8 +40,10 @@
 #include "dali/pipeline/graph/op_graph.h"
 #include "dali/pipeline/graph/op_graph_storage.h"
 #include "dali/pipeline/graph/op_graph_verifier.h"
+#include "dali/pipeline/operator/batch_size_provider.h"
 #include "dali/pipeline/operator/common.h"
 #include "dali/pipeline/util/event_pool.h"
+#include "dali/pipeline/util/profiler.h"
 #include "dali/pipeline/util/stream_pool.h"
 #include "dali/pipeline/util/thread_pool.h"
 #include "dali/pipeline/workspace/device_workspace.h"
@@ -79,6 +87,10 @@ class DLL_PUBLIC ExecutorBase {
   DLL_PUBLIC virtual void SetCompletionCallback(ExecutorCallback cb) = 0;
   DLL_PUBLIC virtual void EnableMemoryStats(bool enable_memory_stats = false) = 0;
   DLL_PUBLIC virtual ExecutorMetaMap GetExecutorMeta() = 0;
+  DLL_PUBLIC virtual void EnableProfiling(bool enable_profiling = false) = 0;
+  DLL_PUBLIC virtual Profiler &GetProfiler() = 0;
+  DLL_PUBLIC virtual void SetCPUOpConcurrency(int concurrency) = 0;
+  DLL_PUBLIC virtual void EnableCPUIterationOverlap(bool enable_overlap = false) = 0;
 
  protected:
   // virtual to allow the TestPruneWholeGraph test in gcc
@@ -121,6 +133,34 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   DLL_PUBLIC void EnableMemoryStats(bool enable_memory_stats = false) override {
     enable_memory_stats_ = enable_memory_stats;
   }
+  DLL_PUBLIC void EnableProfiling(bool enable_profiling = false) override {
+    profiler_.Enable(enable_profiling);
+  }
+  DLL_PUBLIC Profiler &GetProfiler() override {
+    return profiler_;
+  }
+  /**
+   * @brief Sets the maximum number of CPU operators run at the same time.
+   *
+   * The operators that do not depend on each other run concurrently, as soon as their inputs
+   * are ready. An operator runs on the main thread pool, if it is free, or on an additional
+   * pool of `num_thread / concurrency` threads. Must be called before `Build`.
+   */
+  DLL_PUBLIC void SetCPUOpConcurrency(int concurrency) override {
+    DALI_ENFORCE(concurrency > 0, make_string(
+        "The number of concurrently run CPU operators must be positive, got: ", concurrency));
+    DALI_ENFORCE(graph_ == nullptr,
+                 "The CPU operator concurrency must be set before the executor is built.");
+    cpu_op_concurrency_ = concurrency;
+  }
+  /**
+   * @brief Sets if the CPU stage can start the next iterations before the previous ones are
+   *        finished. Only supported by the asynchronous pipelined executors.
+   */
+  DLL_PUBLIC void EnableCPUIterationOverlap(bool enable_overlap = false) override {
+    DALI_ENFORCE(!enable_overlap, "Overlapping the iterations of the CPU stage requires "
+                 "the asynchronous pipelined execution.");
+  }
   DLL_PUBLIC void Build(OpGraph *graph, vector<string> output_names) override;
   DLL_PUBLIC void Init() override {}
   DLL_PUBLIC void RunCPU() override;
@@ -338,7 +378,146 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   std::mutex mixed_memory_stats_mutex_;
   std::mutex gpu_memory_stats_mutex_;
 
+  // Timings of the operators and of the waits for the queues. The iterations
+  // are counted separately by each stage, as the stages may run concurrently.
+  Profiler profiler_;
+  std::array<int64_t, static_cast<int>(OpType::COUNT)> stage_iterations_ = {};
+
+  // The operators deciding the batch size of the iterations, and the batch sizes
+  // of the iterations passed from the CPU stage to the following stages
+  std::vector<BatchSizeProvider *> batch_size_providers_;
+  std::mutex batch_sizes_mutex_;
+  std::queue<int> mixed_batch_sizes_, gpu_batch_sizes_;
+
+  // Scheduling of the CPU operators run concurrently (see SetCPUOpConcurrency), indexed by
+  // the CPU partition ids: the number of CPU parents, the CPU children and the operators
+  // that cannot run at the same time
+  int cpu_op_concurrency_ = 1;
+  std::vector<int> cpu_op_num_parents_;
+  std::vector<std::vector<OpPartitionId>> cpu_op_children_, cpu_op_conflicts_;
+
+  // If set, RunCPU returns as soon as the iteration is started and the operators of the next
+  // iterations can run before the previous iteration is finished
+  bool cpu_iteration_overlap_ = false;
+
+  struct CPUIteration {
+    QueueIdxs idxs;
+    int batch_size;
+    int64_t iteration;
+    std::vector<int> num_pending_parents, num_running_conflicts;
+    int num_unfinished_ops;
+  };
+  // The state of the scheduler: the iterations started, oldest first, the next iteration
+  // of each operator (every operator runs the iterations in order, one at a time)
+  // and the free thread pools
+  std::mutex cpu_sched_mutex_;
+  std::condition_variable cpu_sched_cv_;
+  std::deque<CPUIteration> cpu_iterations_;
+  std::vector<int64_t> cpu_op_next_iteration_;
+  std::vector<bool> cpu_op_running_;
+  std::set<int> cpu_free_pools_;
+  int cpu_num_running_ops_ = 0;
+
+  // The threads running the operators and the thread pools used by them; the first one
+  // is the main thread pool. Declared after the state of the scheduler, so that they are
+  // stopped before it is destroyed.
+  std::vector<std::unique_ptr<ThreadPool>> cpu_op_extra_pools_;
+  std::vector<ThreadPool *> cpu_op_pools_;
+  std::unique_ptr<ThreadPool> cpu_op_runners_;
+
+  /**
+   * @brief Called when an iteration of the CPU stage is finished and its queue indices are
+   *        released, if the iterations are overlapped
+   */
+  virtual void CPUIterationFinished() {}
+
+  /**
+   * @brief Waits until all the started iterations of the CPU stage are finished or, after
+   *        an error or a stop, until no operator is running
+   */
+  void WaitForCPUIterations() {
+    std::unique_lock<std::mutex> lock(cpu_sched_mutex_);
+    FinishCPUIterations();
+    cpu_sched_cv_.wait(lock, [&]() { return cpu_iterations_.empty(); });
+  }
+
  private:
+  /**
+   * @brief Finds the batch size of the next iteration. All the batch size providers must agree
+   *        on it. If there are none, the maximum batch size is used.
+   */
+  int InferBatchSize() {
+    if (batch_size_providers_.empty())
+      return max_batch_size_;
+    int batch_size = batch_size_providers_[0]->NextBatchSize();
+    for (size_t i = 1; i < batch_size_providers_.size(); i++) {
+      int other = batch_size_providers_[i]->NextBatchSize();
+      DALI_ENFORCE(other == batch_size, make_string(
+          "All the external sources of the pipeline must provide batches of the same size "
+          "in a given iteration. Got batches of ", batch_size, " and ", other, " samples."));
+    }
+    for (auto *provider : batch_size_providers_)
+      provider->Advance();
+    return batch_size;
+  }
+
+  /**
+   * @brief Passes the batch size of the iteration to the given stage queue
+   */
+  void PushBatchSize(std::queue<int> &queue, int batch_size) {
+    std::lock_guard<std::mutex> lock(batch_sizes_mutex_);
+    queue.push(batch_size);
+  }
+
+  int PopBatchSize(std::queue<int> &queue) {
+    std::lock_guard<std::mutex> lock(batch_sizes_mutex_);
+    // the queue is empty only if the previous stage was interrupted by an error
+    if (queue.empty())
+      return max_batch_size_;
+    int batch_size = queue.front();
+    queue.pop();
+    return batch_size;
+  }
+
+  /**
+   * @brief Acquires the queue indices for the stage, recording the time spent waiting for them
+   */
+  QueueIdxs AcquireStageIdxs(OpType stage) {
+    if (!profiler_.IsEnabled())
+      return QueuePolicy::AcquireIdxs(stage);
+    int64_t start = Profiler::Now();
+    auto idxs = QueuePolicy::AcquireIdxs(stage);
+    profiler_.Record(to_string(stage), ProfilerEventType::kQueueWait, stage,
+                     stage_iterations_[static_cast<int>(stage)], start, Profiler::Now());
+    return idxs;
+  }
+
+  /**
+   * @brief Finds the dependencies between the CPU operators and creates the thread pools
+   *        needed to run them concurrently
+   */
+  void SetupCPUOpScheduling();
+
+  /**
+   * @brief Runs a single CPU operator, optionally using the given thread pool
+   */
+  void RunCPUOp(OpPartitionId cpu_op_id, QueueIdxs cpu_idxs, int batch_size, int64_t iteration,
+                ThreadPool *thread_pool = nullptr);
+
+  /**
+   * @brief Starts the operators that are ready to run: their CPU parents and their previous
+   *        iteration are finished and a thread pool is free. Must be called with
+   *        `cpu_sched_mutex_` held.
+   */
+  void ScheduleCPUOps();
+
+  /**
+   * @brief Releases the queue indices of the finished iterations, in order. After an error
+   *        or a stop, when no operator is running, all the started iterations are released.
+   *        Must be called with `cpu_sched_mutex_` held.
+   */
+  void FinishCPUIterations();
+
   template <typename InputRef>
   static bool SetDefaultLayoutIfNeeded(InputRef &in, const OpSchema &schema, int in_idx) {
     if (!in.GetLayout().empty())
@@ -351,7 +530,7 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   }
 
   template <typename Workspace>
-  void RunHelper(OpNode &op_node, Workspace &ws) {
+  void RunHelper(OpNode &op_node, Workspace &ws, int batch_size) {
     auto &output_desc = op_node.output_desc;
     auto &op = *op_node.op;
     output_desc.clear();
@@ -368,8 +547,7 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
       if (had_empty_layout) empty_layout_in_idxs.push_back(i);
     }
 
-    ws.set_batch_size(
-        max_batch_size_);  // TODO(mszolucha) change, when BS in inferred from the pipeline
+    ws.set_batch_size(batch_size);
 
     if (op.Setup(output_desc, ws)) {
       DALI_ENFORCE(
@@ -447,6 +625,14 @@ void Executor<WorkspacePolicy, QueuePolicy>::Build(OpGraph *graph, vector<string
 
   // Check if graph is ok for execution
   CheckGraphConstraints(*graph_);
+
+  batch_size_providers_.clear();
+  for (int op_id = 0; op_id < graph_->NumOp(); op_id++) {
+    if (auto *provider = dynamic_cast<BatchSizeProvider *>(graph_->Node(op_id).op.get()))
+      batch_size_providers_.push_back(provider);
+  }
+  mixed_batch_sizes_ = {};
+  gpu_batch_sizes_ = {};
   // Clear the old data
   tensor_to_store_queue_.clear();
 
@@ -488,6 +674,75 @@ void Executor<WorkspacePolicy, QueuePolicy>::Build(OpGraph *graph, vector<string
 
   // Producer-consumer queues info
   SetupOutputQueuesForGraph();
+
+  SetupCPUOpScheduling();
+}
+
+template <typename WorkspacePolicy, typename QueuePolicy>
+void Executor<WorkspacePolicy, QueuePolicy>::SetupCPUOpScheduling() {
+  cpu_op_runners_.reset();
+  cpu_op_extra_pools_.clear();
+  cpu_op_pools_.clear();
+  int num_ops = graph_->NumOp(OpType::CPU);
+  int concurrency = std::min(cpu_op_concurrency_, num_ops);
+  // overlapping the iterations makes sense only if the operators can run concurrently
+  if (cpu_iteration_overlap_)
+    concurrency = std::max(concurrency, 2);
+  if (concurrency < 2)
+    return;
+
+  cpu_op_num_parents_.assign(num_ops, 0);
+  cpu_op_children_.assign(num_ops, {});
+  cpu_op_conflicts_.assign(num_ops, {});
+  // RunHelper sets the default layouts of the inputs for the time the operator runs, so
+  // other consumers of such an input cannot run at the same time
+  std::vector<std::set<TensorNodeId>> inputs(num_ops), layout_inputs(num_ops);
+  for (int op_id = 0; op_id < num_ops; op_id++) {
+    const OpNode &node = graph_->Node(OpType::CPU, op_id);
+    for (OpNodeId parent : node.parents) {
+      if (graph_->NodeType(parent) != OpType::CPU)
+        continue;
+      cpu_op_num_parents_[op_id]++;
+      cpu_op_children_[graph_->NodeIdx(parent)].push_back(op_id);
+    }
+    const auto &schema = node.spec.GetSchema();
+    for (int i = 0; i < static_cast<int>(node.parent_tensors.size()); i++) {
+      inputs[op_id].insert(node.parent_tensors[i]);
+      if (i < node.spec.NumRegularInput() && schema.HasInputLayouts(i))
+        layout_inputs[op_id].insert(node.parent_tensors[i]);
+    }
+  }
+  auto sets_layout_of_input = [&](int op_id, int other_id) {
+    for (TensorNodeId tensor : layout_inputs[op_id]) {
+      if (inputs[other_id].count(tensor))
+        return true;
+    }
+    return false;
+  };
+  for (int a = 0; a < num_ops; a++) {
+    for (int b = a + 1; b < num_ops; b++) {
+      if (sets_layout_of_input(a, b) || sets_layout_of_input(b, a)) {
+        cpu_op_conflicts_[a].push_back(b);
+        cpu_op_conflicts_[b].push_back(a);
+      }
+    }
+  }
+
+  int extra_pool_size = std::max(1, thread_pool_.size() / concurrency);
+  cpu_op_pools_.push_back(&thread_pool_);
+  for (int i = 1; i < concurrency; i++) {
+    cpu_op_extra_pools_.emplace_back(new ThreadPool(extra_pool_size, device_id_, false));
+    cpu_op_pools_.push_back(cpu_op_extra_pools_.back().get());
+  }
+  cpu_op_runners_.reset(new ThreadPool(concurrency, device_id_, false));
+
+  cpu_iterations_.clear();
+  cpu_op_next_iteration_.assign(num_ops, stage_iterations_[static_cast<int>(OpType::CPU)]);
+  cpu_op_running_.assign(num_ops, false);
+  cpu_free_pools_.clear();
+  for (int i = 0; i < concurrency; i++)
+    cpu_free_pools_.insert(i);
+  cpu_num_running_ops_ = 0;
 }
 
 template <typename WorkspacePolicy, typename QueuePolicy>
@@ -504,44 +759,139 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunCPU() {
 
   DeviceGuard g(device_id_);
 
-  auto cpu_idxs = QueuePolicy::AcquireIdxs(OpType::CPU);
+  auto cpu_idxs = AcquireStageIdxs(OpType::CPU);
   if (exec_error_ || QueuePolicy::IsStopSignaled() || !QueuePolicy::AreValid(cpu_idxs)) {
     QueuePolicy::ReleaseIdxs(OpType::CPU, cpu_idxs);
+    if (cpu_iteration_overlap_)
+      CPUIterationFinished();
     return;
   }
-
-  // Run the cpu-ops in the thread
-  // Process each CPU Op in batch
-  for (int cpu_op_id = 0; cpu_op_id < graph_->NumOp(OpType::CPU) && !exec_error_; ++cpu_op_id) {
-    OpNode &op_node = graph_->Node(OpType::CPU, cpu_op_id);
-    typename WorkspacePolicy::template ws_t<OpType::CPU> ws =
-        WorkspacePolicy::template GetWorkspace<OpType::CPU>(cpu_idxs, *graph_, cpu_op_id);
-    DomainTimeRange tr("[DALI][CPU op] " + op_node.instance_name, DomainTimeRange::kBlue1);
-
-    try {
-      RunHelper(op_node, ws);
-      FillStats(cpu_memory_stats_, ws, "CPU_" + op_node.instance_name, cpu_memory_stats_mutex_);
-    } catch (std::exception &e) {
-      HandleError("CPU", op_node, e.what());
-    } catch (...) {
-      HandleError();
-    }
+  int64_t iteration = stage_iterations_[static_cast<int>(OpType::CPU)]++;
+
+  int batch_size = max_batch_size_;
+  try {
+    batch_size = InferBatchSize();
+  } catch (std::exception &e) {
+    HandleError(make_string("Error when inferring the batch size of the iteration:\n",
+                            e.what()));
   }
+  PushBatchSize(mixed_batch_sizes_, batch_size);
+
+  if (cpu_op_runners_) {
+    std::unique_lock<std::mutex> lock(cpu_sched_mutex_);
+    int num_ops = graph_->NumOp(OpType::CPU);
+    cpu_iterations_.push_back({cpu_idxs, batch_size, iteration, cpu_op_num_parents_,
+                               std::vector<int>(num_ops, 0), num_ops});
+    ScheduleCPUOps();
+    FinishCPUIterations();
+    // The queue indices are released by the scheduler
+    if (!cpu_iteration_overlap_)
+      cpu_sched_cv_.wait(lock, [&]() { return cpu_iterations_.empty(); });
+    return;
+  }
+
+  for (int cpu_op_id = 0; cpu_op_id < graph_->NumOp(OpType::CPU) && !exec_error_; ++cpu_op_id)
+    RunCPUOp(cpu_op_id, cpu_idxs, batch_size, iteration);
 
   // Pass the work to the mixed stage
   QueuePolicy::ReleaseIdxs(OpType::CPU, cpu_idxs);
 }
 
+template <typename WorkspacePolicy, typename QueuePolicy>
+void Executor<WorkspacePolicy, QueuePolicy>::RunCPUOp(OpPartitionId cpu_op_id, QueueIdxs cpu_idxs,
+                                                      int batch_size, int64_t iteration,
+                                                      ThreadPool *thread_pool) {
+  OpNode &op_node = graph_->Node(OpType::CPU, cpu_op_id);
+  typename WorkspacePolicy::template ws_t<OpType::CPU> ws =
+      WorkspacePolicy::template GetWorkspace<OpType::CPU>(cpu_idxs, *graph_, cpu_op_id);
+  if (thread_pool)
+    ws.SetThreadPool(thread_pool);
+  DomainTimeRange tr("[DALI][CPU op] " + op_node.instance_name, DomainTimeRange::kBlue1);
+  ProfilerScope profile(&profiler_, op_node.instance_name, OpType::CPU, iteration);
+
+  try {
+    RunHelper(op_node, ws, batch_size);
+    FillStats(cpu_memory_stats_, ws, "CPU_" + op_node.instance_name, cpu_memory_stats_mutex_);
+  } catch (std::exception &e) {
+    HandleError("CPU", op_node, e.what());
+  } catch (...) {
+    HandleError();
+  }
+}
+
+template <typename WorkspacePolicy, typename QueuePolicy>
+void Executor<WorkspacePolicy, QueuePolicy>::ScheduleCPUOps() {
+  if (exec_error_ || QueuePolicy::IsStopSignaled())
+    return;
+  int num_ops = graph_->NumOp(OpType::CPU);
+  // The older iterations go first, then the operators in the order of the graph
+  for (auto &it : cpu_iterations_) {
+    for (OpPartitionId op_id = 0; op_id < num_ops && !cpu_free_pools_.empty(); op_id++) {
+      if (cpu_op_running_[op_id] || cpu_op_next_iteration_[op_id] != it.iteration ||
+          it.num_pending_parents[op_id] > 0 || it.num_running_conflicts[op_id] > 0)
+        continue;
+      int pool = *cpu_free_pools_.begin();
+      cpu_free_pools_.erase(cpu_free_pools_.begin());
+      cpu_op_running_[op_id] = true;
+      for (OpPartitionId other : cpu_op_conflicts_[op_id])
+        it.num_running_conflicts[other]++;
+      cpu_num_running_ops_++;
+      QueueIdxs idxs = it.idxs;
+      int batch_size = it.batch_size;
+      int64_t iteration = it.iteration;
+      cpu_op_runners_->DoWorkWithID([this, op_id, pool, idxs, batch_size, iteration](int) {
+        RunCPUOp(op_id, idxs, batch_size, iteration, cpu_op_pools_[pool]);
+        std::lock_guard<std::mutex> lock(cpu_sched_mutex_);
+        // the iteration cannot be released while its operators are running
+        auto &it = cpu_iterations_[iteration - cpu_iterations_.front().iteration];
+        for (OpPartitionId other : cpu_op_conflicts_[op_id])
+          it.num_running_conflicts[other]--;
+        for (OpPartitionId child : cpu_op_children_[op_id])
+          it.num_pending_parents[child]--;
+        it.num_unfinished_ops--;
+        cpu_op_running_[op_id] = false;
+        cpu_op_next_iteration_[op_id] = iteration + 1;
+        cpu_free_pools_.insert(pool);
+        cpu_num_running_ops_--;
+        ScheduleCPUOps();
+        FinishCPUIterations();
+      });
+    }
+  }
+}
+
+template <typename WorkspacePolicy, typename QueuePolicy>
+void Executor<WorkspacePolicy, QueuePolicy>::FinishCPUIterations() {
+  bool stopped = exec_error_ || QueuePolicy::IsStopSignaled();
+  bool any_finished = false;
+  while (!cpu_iterations_.empty() && (cpu_iterations_.front().num_unfinished_ops == 0 ||
+                                      (stopped && cpu_num_running_ops_ == 0))) {
+    auto &it = cpu_iterations_.front();
+    QueuePolicy::ReleaseIdxs(OpType::CPU, it.idxs);
+    for (auto &next_iteration : cpu_op_next_iteration_)
+      next_iteration = std::max(next_iteration, it.iteration + 1);
+    cpu_iterations_.pop_front();
+    any_finished = true;
+    if (cpu_iteration_overlap_)
+      CPUIterationFinished();
+  }
+  if (any_finished)
+    cpu_sched_cv_.notify_all();
+}
+
 template <typename WorkspacePolicy, typename QueuePolicy>
 void Executor<WorkspacePolicy, QueuePolicy>::RunMixed() {
   DomainTimeRange tr("[DALI][Executor] RunMixed");
   DeviceGuard g(device_id_);
 
-  auto mixed_idxs = QueuePolicy::AcquireIdxs(OpType::MIXED);
+  auto mixed_idxs = AcquireStageIdxs(OpType::MIXED);
   if (exec_error_ || QueuePolicy::IsStopSignaled() || !QueuePolicy::AreValid(mixed_idxs)) {
     QueuePolicy::ReleaseIdxs(OpType::MIXED, mixed_idxs);
     return;
   }
+  int64_t iteration = stage_iterations_[static_cast<int>(OpType::MIXED)]++;
+  int batch_size = PopBatchSize(mixed_batch_sizes_);
+  PushBatchSize(gpu_batch_sizes_, batch_size);
 
   // short path for pure CPU pipeline
   if (device_id_ == CPU_ONLY_DEVICE_ID) {
@@ -565,7 +915,8 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunMixed() {
             WorkspacePolicy::template GetWorkspace<OpType::MIXED>(mixed_idxs, *graph_, i);
         DomainTimeRange tr("[DALI][Mixed op] " + op_node.instance_name,
             DomainTimeRange::kOrange);
-        RunHelper(op_node, ws);
+        ProfilerScope profile(&profiler_, op_node.instance_name, OpType::MIXED, iteration);
+        RunHelper(op_node, ws, batch_size);
         FillStats(mixed_memory_stats_, ws,  "MIXED_" + op_node.instance_name,
                   mixed_memory_stats_mutex_);
         if (ws.has_stream() && ws.has_event()) {
@@ -601,11 +952,13 @@ template <typename WorkspacePolicy, typename QueuePolicy>
 void Executor<WorkspacePolicy, QueuePolicy>::RunGPU() {
   DomainTimeRange tr("[DALI][Executor] RunGPU");
 
-  auto gpu_idxs = QueuePolicy::AcquireIdxs(OpType::GPU);
+  auto gpu_idxs = AcquireStageIdxs(OpType::GPU);
   if (exec_error_ || QueuePolicy::IsStopSignaled() || !QueuePolicy::AreValid(gpu_idxs)) {
     QueuePolicy::ReleaseIdxs(OpType::GPU, gpu_idxs);
     return;
   }
+  int64_t iteration = stage_iterations_[static_cast<int>(OpType::GPU)]++;
+  int batch_size = PopBatchSize(gpu_batch_sizes_);
 
   // short path for pure CPU pipeline
   if (device_id_ == CPU_ONLY_DEVICE_ID) {
@@ -632,7 +985,8 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunGPU() {
 
         DomainTimeRange tr("[DALI][GPU op] " + op_node.instance_name,
             DomainTimeRange::knvGreen);
-        RunHelper(op_node, ws);
+        ProfilerScope profile(&profiler_, op_node.instance_name, OpType::GPU, iteration);
+        RunHelper(op_node, ws, batch_size);
         FillStats(gpu_memory_stats_, ws, "GPU_" + op_node.instance_name, gpu_memory_stats_mutex_);
         if (ws.has_event()) {
           CUDA_CALL(cudaEventRecord(ws.event(), ws.stream()));
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -75,6 +75,7 @@ class DLL_PUBLIC PipelinedExecutorImpl : public Executor<WorkspacePolicy, QueueP
 
   using Executor<WorkspacePolicy, QueuePolicy>::device_id_;
   using Executor<WorkspacePolicy, QueuePolicy>::stage_queue_depths_;
+  using Executor<WorkspacePolicy, QueuePolicy>::cpu_iteration_overlap_;
 };
 
 template <typename WorkspacePolicy, typename QueuePolicy>
@@ -104,6 +105,13 @@ std::vector<int> PipelinedExecutorImpl<WorkspacePolicy, QueuePolicy>::GetTensorQ
       result[id] = stage_queue_depths_[static_cast<OpType>(stage)];
     }
   }
+  // The overlapping iterations of the CPU stage need separate buffers for all its tensors
+  if (cpu_iteration_overlap_) {
+    for (int id = 0; id < graph.NumTensor(); id++) {
+      if (graph.NodeType(graph.Tensor(id).producer.node) == OpType::CPU)
+        result[id] = stage_queue_depths_[OpType::CPU];
+    }
+  }
   return result;
 }
 
@@ -0,0 +1,47 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_PIPELINE_OPERATOR_BATCH_SIZE_PROVIDER_H_
+#define DALI_PIPELINE_OPERATOR_BATCH_SIZE_PROVIDER_H_
+
+#include "dali/core/api_helper.h"
+
+namespace dali {
+
+/**
+ * @brief Implemented by the operators that decide the batch size of the iterations,
+ *        e.g. by the ExternalSource, which produces the batches fed by the user.
+ *
+ * The executor queries the providers when it starts the CPU stage of an iteration, which can be
+ * ahead of the iteration run by the stage of the provider itself. Therefore the providers keep
+ * track of the batches they have already reported.
+ */
+class DLL_PUBLIC BatchSizeProvider {
+ public:
+  /**
+   * @brief The batch size of the first iteration that has not been reported yet
+   */
+  virtual int NextBatchSize() = 0;
+
+  /**
+   * @brief Marks the batch size returned by NextBatchSize as reported
+   */
+  virtual void Advance() = 0;
+
+  virtual ~BatchSizeProvider() = default;
+};
+
+}  // namespace dali
+
+#endif  // DALI_PIPELINE_OPERATOR_BATCH_SIZE_PROVIDER_H_
@@ -24,6 +24,7 @@ void ExternalSource<CPUBackend>::RunImpl(HostWorkspace &ws) {
     std::unique_lock<std::mutex> busy_lock(busy_m_);
     tensor_vector_elm = tv_data_.PopFront();
     state_.pop_front();
+    PopBatchSize();
   }
   auto &output = ws.template OutputRef<CPUBackend>(0);
   // if the output is pinned and input not it needs to be copied
@@ -30,6 +30,7 @@ void ExternalSource<GPUBackend>::RunImpl(DeviceWorkspace &ws) {
     tensor_list_elm = tl_data_.PopFront();
     state_info = state_.front();
     state_.pop_front();
+    PopBatchSize();
     // even with no_copy we may have copied from TensorVector to TensorList and we
     // need to sync with that
     if (!no_copy_ || state_info.copied_shared_data) {
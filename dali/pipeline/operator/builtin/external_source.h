@@ -19,6 +19,7 @@
 #include <string>
 #include <vector>
 #include <memory>
+#include <iterator>
 #include <list>
 #include <mutex>
 #include <condition_variable>
@@ -26,6 +27,7 @@
 
 #include "dali/core/nvtx.h"
 #include "dali/core/cuda_event.h"
+#include "dali/pipeline/operator/batch_size_provider.h"
 #include "dali/pipeline/operator/operator.h"
 #include "dali/pipeline/util/worker_thread.h"
 
@@ -101,7 +103,7 @@ class CachingList {
  * may mix the order of inputted data.
  */
 template <typename Backend>
-class ExternalSource : public Operator<Backend> {
+class ExternalSource : public Operator<Backend>, public BatchSizeProvider {
   using uptr_tl_type = std::unique_ptr<TensorList<Backend>>;
   using uptr_tv_type = std::unique_ptr<TensorVector<Backend>>;
   using uptr_cuda_event_type = std::unique_ptr<detail::CudaEventWrapper>;
@@ -164,9 +166,37 @@ class ExternalSource : public Operator<Backend> {
     SetDataSourceHelper(tv, stream, sync, use_copy_kernel);
   }
 
+  int NextBatchSize() override {
+    std::unique_lock<std::mutex> busy_lock(busy_m_);
+    if (blocking_) {
+      cv_.wait(busy_lock, [&]() { return batch_sizes_.size() > reported_batches_; });
+    } else {
+      DALI_ENFORCE(batch_sizes_.size() > reported_batches_,
+                   "No data was provided to the ExternalSource. Make sure to feed it properly.");
+    }
+    return *std::next(batch_sizes_.begin(), reported_batches_);
+  }
+
+  void Advance() override {
+    std::lock_guard<std::mutex> busy_lock(busy_m_);
+    reported_batches_++;
+  }
+
   DISABLE_COPY_MOVE_ASSIGN(ExternalSource);
 
  protected:
+  /**
+   * @brief Removes the batch size of the batch consumed by the current iteration.
+   *        Must be called with `busy_m_` locked.
+   */
+  void PopBatchSize() {
+    if (batch_sizes_.empty())
+      return;
+    batch_sizes_.pop_front();
+    if (reported_batches_ > 0)
+      reported_batches_--;
+  }
+
   bool SetupImpl(std::vector<OutputDesc> &output_desc, const workspace_t<Backend> &ws) override {
     std::unique_lock<std::mutex> busy_lock(busy_m_);
     if (blocking_) {
@@ -395,7 +425,12 @@ class ExternalSource : public Operator<Backend> {
     } else {
       CopyUserData(batch, stream, sync, use_copy_kernel);
     }
-    cv_.notify_one();
+    {
+      std::lock_guard<std::mutex> busy_lock(busy_m_);
+      batch_sizes_.push_back(batch.ntensor());
+    }
+    // both the Setup of this operator and the executor inferring the batch size may be waiting
+    cv_.notify_all();
   }
 
   string output_name_;
@@ -419,6 +454,13 @@ class ExternalSource : public Operator<Backend> {
 
   std::list<ExternalSourceState > state_;
 
+  /*
+   * the batch sizes of the fed batches, the first `reported_batches_` of them were already
+   * reported to the executor through the BatchSizeProvider interface
+   */
+  std::list<int> batch_sizes_;
+  size_t reported_batches_ = 0;
+
   /*
    * indicates that user provide noncontiguous GPU input with zero copy option so DALI needs
    * to create an internal copy, it is used to raise a warning when the user mixes contiguous and
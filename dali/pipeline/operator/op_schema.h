@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -401,6 +401,14 @@ graph even if its outputs are not used.)code", false);
     return *this;
   }
 
+  /**
+   * @brief Returns true if the allowed layouts of the given input are specified
+   */
+  DLL_PUBLIC inline bool HasInputLayouts(int index) const {
+    CheckInputIndex(index);
+    return !input_layouts_[index].empty();
+  }
+
   /**
    * @brief Verifies that the layout is valid for given input index and number of dimensions
    *        or returns a default layout if the layout parameter is empty.
@@ -441,14 +441,15 @@ class DLL_PUBLIC OpSpec {
                      "\" is not uniform. To access non-uniform argument inputs use "
                      "ArgumentWorkspace::ArgumentInput method directly.");
 
+    // the batch of the current iteration can be smaller than the maximum batch size
     bool valid_shape =
-        shape.num_elements() == batch_size &&
-        (shape.num_samples() == batch_size || shape.num_samples() == 1);
+        (shape.num_samples() <= batch_size && shape.num_elements() == shape.num_samples()) ||
+        (shape.num_samples() == 1 && shape.num_elements() == batch_size);
     if (should_throw) {
       DALI_ENFORCE(valid_shape, make_string(
-                   "Unexpected shape of argument \"", name, "\". Expected batch of ", batch_size,
-                   " scalars or a batch of tensors containing one element per sample or a single "
-                   "tensor with ", batch_size, " elements. Got:\n", shape));
+                   "Unexpected shape of argument \"", name, "\". Expected batch of up to ",
+                   batch_size, " scalars or a batch of tensors containing one element per sample "
+                   "or a single tensor with ", batch_size, " elements. Got:\n", shape));
     }
     return valid_shape;
   }
@@ -17,16 +17,22 @@
 namespace dali {
 
 template <typename Backend>
-void OperatorBase::EnforceConstantBatchSize(const workspace_t<Backend> &ws) const {
+void OperatorBase::EnforceUniformInputBatchSize(const workspace_t<Backend> &ws) const {
+  // the batch size of the iteration, inferred by the executor
+  int batch_size = ws.NumOutput() > 0 ? ws.GetRequestedBatchSize(0) : -1;
   for (int i = 0; i < ws.NumInput(); i++) {
-    DALI_ENFORCE(ws.GetInputBatchSize(i) == max_batch_size_,
-                 "Batch size has to be constant throughout the processing");
+    int input_batch_size = ws.GetInputBatchSize(i);
+    if (batch_size < 0)
+      batch_size = input_batch_size;
+    DALI_ENFORCE(input_batch_size == batch_size, make_string(
+        "All the inputs of the operator must have the batch size of the current iteration, ",
+        batch_size, ". Got ", input_batch_size, " samples in the input ", i, "."));
   }
 }
 
-template void OperatorBase::EnforceConstantBatchSize<CPUBackend>(const workspace_t<CPUBackend>&w) const;  // NOLINT
-template void OperatorBase::EnforceConstantBatchSize<GPUBackend>(const workspace_t<GPUBackend>&w) const;  // NOLINT
-template void OperatorBase::EnforceConstantBatchSize<MixedBackend>(const workspace_t<MixedBackend>&w) const;  // NOLINT
+template void OperatorBase::EnforceUniformInputBatchSize<CPUBackend>(const workspace_t<CPUBackend>&w) const;  // NOLINT
+template void OperatorBase::EnforceUniformInputBatchSize<GPUBackend>(const workspace_t<GPUBackend>&w) const;  // NOLINT
+template void OperatorBase::EnforceUniformInputBatchSize<MixedBackend>(const workspace_t<MixedBackend>&w) const;  // NOLINT
 
 DALI_DEFINE_OPTYPE_REGISTRY(CPUOperator, OperatorBase);
 DALI_DEFINE_OPTYPE_REGISTRY(GPUOperator, OperatorBase);
@@ -159,6 +159,35 @@ class DLL_PUBLIC OperatorBase {
     return {};
   }
 
+  /**
+   * @brief For reader Ops, returns whether the reader can save and restore its state
+   */
+  DLL_PUBLIC virtual bool HasReaderState() const {
+    return false;
+  }
+
+  /**
+   * @brief For reader Ops, sets whether the reader saves its states as it prefetches
+   *        the batches, so that they can be obtained with GetReaderState
+   */
+  DLL_PUBLIC virtual void EnableReaderState(bool enable) {}
+
+  /**
+   * @brief For reader Ops, returns the serialized state of the reader from before
+   *        it produced the batch for the given iteration
+   */
+  DLL_PUBLIC virtual std::string GetReaderState(int64_t iteration) {
+    DALI_FAIL("Operator " + name() + " does not support saving the reader state.");
+  }
+
+  /**
+   * @brief For reader Ops, restores the state returned by GetReaderState.
+   *        Must be called before the first iteration.
+   */
+  DLL_PUBLIC virtual void SetReaderState(const std::string &state) {
+    DALI_FAIL("Operator " + name() + " does not support restoring the reader state.");
+  }
+
   DLL_PUBLIC const OpSpec& GetSpec() const {
     return spec_;
   }
@@ -220,7 +249,7 @@ class DLL_PUBLIC OperatorBase {
 
   // TODO(mszolucha): remove to allow i2i variable batch size, when all ops are ready
   template <typename Backend>
-  DLL_PUBLIC void EnforceConstantBatchSize(const workspace_t<Backend> &ws) const;
+  DLL_PUBLIC void EnforceUniformInputBatchSize(const workspace_t<Backend> &ws) const;
 
   const OpSpec spec_;
   int num_threads_;
@@ -284,7 +313,7 @@ class Operator<CPUBackend> : public OperatorBase {
   using OperatorBase::Run;
 
   bool Setup(std::vector<OutputDesc> &output_desc, const HostWorkspace &ws) override {
-    EnforceConstantBatchSize<CPUBackend>(ws);
+    EnforceUniformInputBatchSize<CPUBackend>(ws);
     return SetupImpl(output_desc, ws);
   }
 
@@ -319,7 +348,8 @@ class Operator<CPUBackend> : public OperatorBase {
     // This is implemented, as a default, using the RunImpl that accepts SampleWorkspace,
     // allowing for fallback to old per-sample implementations.
 
-    auto curr_batch_size = ws.NumInput() > 0 ? ws.GetInputBatchSize(0) : max_batch_size_;
+    auto curr_batch_size = ws.NumInput() > 0 ? ws.GetInputBatchSize(0)
+                                              : ws.GetRequestedBatchSize(0);
     for (int i = 0; i < ws.NumOutput(); i++) {
       auto &output = ws.OutputRef<CPUBackend>(i);
       output.SetSize(curr_batch_size);
@@ -364,7 +394,7 @@ class Operator<GPUBackend> : public OperatorBase {
   using OperatorBase::Run;
 
   bool Setup(std::vector<OutputDesc> &output_desc, const DeviceWorkspace &ws) override {
-    EnforceConstantBatchSize<GPUBackend>(ws);
+    EnforceUniformInputBatchSize<GPUBackend>(ws);
     return SetupImpl(output_desc, ws);
   }
 
@@ -406,7 +436,7 @@ class Operator<MixedBackend> : public OperatorBase {
   using OperatorBase::Run;
 
   bool Setup(std::vector<OutputDesc> &output_desc, const MixedWorkspace &ws) override {
-    EnforceConstantBatchSize<MixedBackend>(ws);
+    EnforceUniformInputBatchSize<MixedBackend>(ws);
     return SetupImpl(output_desc, ws);
   }
 
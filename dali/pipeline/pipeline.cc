@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -443,6 +443,9 @@ void Pipeline::Build(vector<std::pair<string, string>> output_names) {
                   num_threads_, device_id_, bytes_per_sample_hint_, set_affinity_, max_num_stream_,
                   default_cuda_stream_priority_, prefetch_queue_depth_);
   executor_->EnableMemoryStats(enable_memory_stats_);
+  executor_->EnableProfiling(enable_profiling_);
+  executor_->SetCPUOpConcurrency(cpu_op_concurrency_);
+  executor_->EnableCPUIterationOverlap(cpu_iteration_overlap_);
   executor_->Init();
 
   // Creating the graph
@@ -535,6 +538,18 @@ void Pipeline::Build(vector<std::pair<string, string>> output_names) {
   // Load the final graph into the executor
   executor_->Build(&graph_, outputs);
   built_ = true;
+  EnableCheckpointing(enable_checkpointing_);
+}
+
+void Pipeline::EnableCheckpointing(bool enable_checkpointing) {
+  enable_checkpointing_ = enable_checkpointing;
+  if (!built_)
+    return;
+  for (Index i = 0; i < graph_.NumOp(); ++i) {
+    OpNode &node = graph_.Node(i);
+    if (node.op->HasReaderState())
+      node.op->EnableReaderState(enable_checkpointing_);
+  }
 }
 
 void Pipeline::SetOutputNames(const vector<std::pair<string, string>> &output_names) {
@@ -765,6 +780,36 @@ ReaderMeta Pipeline::GetReaderMeta(std::string name) {
   return meta;
 }
 
+std::map<std::string, std::string> Pipeline::GetReaderState(int64_t iteration) {
+  DALI_ENFORCE(built_, "\"Build()\" must be called before getting the reader state.");
+  DALI_ENFORCE(enable_checkpointing_, "Checkpointing is not enabled for the pipeline.");
+  std::map<std::string, std::string> ret;
+  for (Index i = 0; i < graph_.NumOp(); ++i) {
+    const OpNode &current = graph_.Node(i);
+    if (current.op->HasReaderState()) {
+      ret.insert(make_pair(current.instance_name, current.op->GetReaderState(iteration)));
+    }
+  }
+  return ret;
+}
+
+std::string Pipeline::GetReaderState(const std::string &name, int64_t iteration) {
+  DALI_ENFORCE(built_, "\"Build()\" must be called before getting the reader state.");
+  DALI_ENFORCE(enable_checkpointing_, "Checkpointing is not enabled for the pipeline.");
+  OpNode *node = GetOperatorNode(name);
+  DALI_ENFORCE(node->op->HasReaderState(),
+               "Operator " + name + " does not support saving the reader state.");
+  return node->op->GetReaderState(iteration);
+}
+
+void Pipeline::SetReaderState(const std::string &name, const std::string &state) {
+  DALI_ENFORCE(built_, "\"Build()\" must be called before restoring the reader state.");
+  OpNode *node = GetOperatorNode(name);
+  DALI_ENFORCE(node->op->HasReaderState(),
+               "Operator " + name + " does not support restoring the reader state.");
+  node->op->SetReaderState(state);
+}
+
 const std::string &Pipeline::output_device(int id) const {
   DALI_ENFORCE(built_,
       "\"Build()\" must be called prior to calling \"output_device()\".");
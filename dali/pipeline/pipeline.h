@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -315,6 +315,33 @@ class DLL_PUBLIC Pipeline {
     }
   }
 
+  /**
+   * @brief Set if the DALI pipeline should record the timings of the operators and of the waits
+   *        for the executor queues, readers and Python callbacks
+   *
+   * @param enable_profiling If the timings should be recorded
+   */
+  DLL_PUBLIC void EnableProfiling(bool enable_profiling = true) {
+    enable_profiling_ = enable_profiling;
+    if (executor_) {
+      executor_->EnableProfiling(enable_profiling_);
+    }
+  }
+
+  /**
+   * @brief Set if the readers of the pipeline should save their states, which can be then
+   *        obtained with GetReaderState. Saving the states adds some work to every
+   *        prefetched batch.
+   */
+  DLL_PUBLIC void EnableCheckpointing(bool enable_checkpointing = true);
+
+  /**
+   * @brief Obtains the profiler of the executor, or nullptr if the pipeline is not built
+   */
+  DLL_PUBLIC Profiler *GetProfiler() {
+    return executor_ ? &executor_->GetProfiler() : nullptr;
+  }
+
   /**
    * @brief Set queue sizes for Pipeline using Separated Queues
    *
@@ -333,6 +360,43 @@ class DLL_PUBLIC Pipeline {
     prefetch_queue_depth_ = QueueSizes(cpu_size, gpu_size);
   }
 
+  /**
+   * @brief Set the maximum number of CPU operators that are run at the same time
+   *
+   * The CPU operators that do not depend on each other are run concurrently. An operator
+   * uses the main thread pool of the pipeline, if it is free, or an additional thread pool
+   * of `num_threads / cpu_op_concurrency` threads.
+   *
+   * @param cpu_op_concurrency Maximum number of concurrently run CPU operators; 1 runs
+   *                           the operators one by one
+   */
+  DLL_PUBLIC void SetCPUOpConcurrency(int cpu_op_concurrency) {
+    DALI_ENFORCE(!built_,
+                 "Alterations to the pipeline after "
+                 "\"Build()\" has been called are not allowed - cannot set CPU op concurrency.");
+    DALI_ENFORCE(cpu_op_concurrency > 0, "Only positive CPU op concurrency allowed");
+    cpu_op_concurrency_ = cpu_op_concurrency;
+  }
+
+  /**
+   * @brief Set if the CPU stage can start the next iterations before the previous ones
+   *        are finished
+   *
+   * Each operator still processes the iterations in order, but e.g. the readers and decoders
+   * can work on the next iteration while the last operators finish the current one. The number
+   * of iterations in progress is limited by the CPU prefetch queue depth.
+   * Requires the asynchronous pipelined execution.
+   *
+   * @param cpu_iteration_overlap If the iterations can overlap
+   */
+  DLL_PUBLIC void SetCPUIterationOverlap(bool cpu_iteration_overlap) {
+    DALI_ENFORCE(!built_,
+                 "Alterations to the pipeline after "
+                 "\"Build()\" has been called are not allowed - cannot set CPU iteration "
+                 "overlap.");
+    cpu_iteration_overlap_ = cpu_iteration_overlap;
+  }
+
   /*
    * @brief Set name output_names of the pipeline. Used to update the graph without
    * running the executor.
@@ -412,6 +476,25 @@ class DLL_PUBLIC Pipeline {
    */
   DLL_PUBLIC ReaderMeta GetReaderMeta(std::string name);
 
+  /**
+   * @brief Returns the map of (node name, serialized reader state) for all readers that can
+   *        save their state, taken from before they produced the batch of the given iteration.
+   *        Requires EnableCheckpointing.
+   */
+  DLL_PUBLIC std::map<std::string, std::string> GetReaderState(int64_t iteration);
+
+  /**
+   * @brief Returns the serialized state of the reader with given name, taken from before
+   *        it produced the batch of the given iteration
+   */
+  DLL_PUBLIC std::string GetReaderState(const std::string &name, int64_t iteration);
+
+  /**
+   * @brief Restores the state of the reader with given name. Must be called after Build
+   *        and before the first iteration.
+   */
+  DLL_PUBLIC void SetReaderState(const std::string &name, const std::string &state);
+
   /**
    * @brief Returns the number of threads used by the pipeline.
    */
@@ -510,6 +593,10 @@ class DLL_PUBLIC Pipeline {
   int next_internal_logical_id_ = -1;
   QueueSizes prefetch_queue_depth_;
   bool enable_memory_stats_ = false;
+  bool enable_profiling_ = false;
+  bool enable_checkpointing_ = false;
+  int cpu_op_concurrency_ = 1;
+  bool cpu_iteration_overlap_ = false;
 
   std::vector<int64_t> seed_;
   int original_seed_;
@@ -0,0 +1,84 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <chrono>
+#include <functional>
+#include <thread>
+#include <utility>
+
+#include "dali/pipeline/util/profiler.h"
+
+namespace dali {
+
+const char *to_string(ProfilerEventType type) {
+  switch (type) {
+    case ProfilerEventType::kOperator:
+      return "operator";
+    case ProfilerEventType::kQueueWait:
+      return "queue_wait";
+    case ProfilerEventType::kReaderStall:
+      return "reader_stall";
+    case ProfilerEventType::kCallback:
+      return "python_callback";
+    default:
+      return "<invalid>";
+  }
+}
+
+void Profiler::Record(ProfilerEvent event) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  stats_[StatsKey(event.type, event.stage, event.name)].Add(event.end_ns - event.start_ns);
+  if (max_events_ == 0)
+    return;
+  if (events_.size() == max_events_)
+    events_.pop_front();
+  events_.push_back(std::move(event));
+}
+
+void Profiler::Record(std::string name, ProfilerEventType type, OpType stage,
+                      int64_t iteration, int64_t start_ns, int64_t end_ns) {
+  Record({std::move(name), type, stage, iteration, start_ns, end_ns, ThreadId()});
+}
+
+std::vector<ProfilerEvent> Profiler::Events() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return {events_.begin(), events_.end()};
+}
+
+Profiler::StatsMap Profiler::Stats() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return stats_;
+}
+
+void Profiler::Reset() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  events_.clear();
+  stats_.clear();
+}
+
+int64_t Profiler::Now() {
+  return std::chrono::duration_cast<std::chrono::nanoseconds>(
+      std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+uint64_t Profiler::ThreadId() {
+  return std::hash<std::thread::id>()(std::this_thread::get_id());
+}
+
+Profiler::Context &Profiler::CurrentContext() {
+  static thread_local Context context;
+  return context;
+}
+
+}  // namespace dali
@@ -0,0 +1,207 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_PIPELINE_UTIL_PROFILER_H_
+#define DALI_PIPELINE_UTIL_PROFILER_H_
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <deque>
+#include <limits>
+#include <map>
+#include <mutex>
+#include <string>
+#include <tuple>
+#include <vector>
+#include "dali/core/api_helper.h"
+#include "dali/core/common.h"
+
+namespace dali {
+
+enum class ProfilerEventType : uint8_t {
+  kOperator = 0,     // wall time of the Setup and Run of an operator
+  kQueueWait = 1,    // time a stage of the executor waited for its input or output buffers
+  kReaderStall = 2,  // time a reader waited for the prefetching thread to provide a batch
+  kCallback = 3,     // time spent in Python callbacks
+  COUNT = 4
+};
+
+DLL_PUBLIC const char *to_string(ProfilerEventType type);
+
+struct ProfilerEvent {
+  std::string name;
+  ProfilerEventType type;
+  OpType stage;
+  int64_t iteration;
+  int64_t start_ns;
+  int64_t end_ns;
+  uint64_t thread_id;
+};
+
+struct ProfilerStats {
+  int64_t count = 0;
+  int64_t total_ns = 0;
+  int64_t min_ns = std::numeric_limits<int64_t>::max();
+  int64_t max_ns = 0;
+
+  void Add(int64_t duration_ns) {
+    count++;
+    total_ns += duration_ns;
+    min_ns = std::min(min_ns, duration_ns);
+    max_ns = std::max(max_ns, duration_ns);
+  }
+};
+
+/**
+ * @brief Collects the timings of the operators and of the waits in the pipeline.
+ *
+ * The statistics are accumulated over the whole lifetime of the profiler (or since the last
+ * `Reset`), while only the most recent `max_events` events are kept for the per-iteration
+ * breakdown and for the trace export.
+ *
+ * The code running on behalf of an operator (e.g. a reader waiting for its prefetching thread)
+ * reports its timings through `ProfilerRange`, which uses the operator context set up by the
+ * executor for the current thread with `ProfilerScope`.
+ */
+class DLL_PUBLIC Profiler {
+ public:
+  using StatsKey = std::tuple<ProfilerEventType, OpType, std::string>;
+  using StatsMap = std::map<StatsKey, ProfilerStats>;
+
+  static constexpr size_t kDefaultMaxEvents = 1 << 16;
+
+  DLL_PUBLIC explicit Profiler(size_t max_events = kDefaultMaxEvents)
+      : max_events_(max_events) {}
+
+  DLL_PUBLIC void Enable(bool enable = true) {
+    enabled_ = enable;
+  }
+
+  DLL_PUBLIC bool IsEnabled() const {
+    return enabled_;
+  }
+
+  DLL_PUBLIC void Record(ProfilerEvent event);
+
+  DLL_PUBLIC void Record(std::string name, ProfilerEventType type, OpType stage,
+                         int64_t iteration, int64_t start_ns, int64_t end_ns);
+
+  /**
+   * @brief Returns the most recent events, ordered by the time of recording
+   */
+  DLL_PUBLIC std::vector<ProfilerEvent> Events() const;
+
+  /**
+   * @brief Returns the statistics accumulated for each (type, stage, name) triple
+   */
+  DLL_PUBLIC StatsMap Stats() const;
+
+  DLL_PUBLIC void Reset();
+
+  /**
+   * @brief Monotonic time in nanoseconds, as used for the recorded events
+   */
+  DLL_PUBLIC static int64_t Now();
+
+  DLL_PUBLIC static uint64_t ThreadId();
+
+  struct Context {
+    Profiler *profiler = nullptr;
+    const std::string *op_name = nullptr;
+    OpType stage = OpType::COUNT;
+    int64_t iteration = -1;
+  };
+
+  /**
+   * @brief The operator context of the calling thread
+   */
+  DLL_PUBLIC static Context &CurrentContext();
+
+ private:
+  std::atomic<bool> enabled_{false};
+  size_t max_events_;
+  mutable std::mutex mutex_;
+  std::deque<ProfilerEvent> events_;
+  StatsMap stats_;
+};
+
+/**
+ * @brief Sets the operator context of the calling thread and records the wall time
+ *        of the operator on destruction
+ *
+ * Does nothing if the profiler is null or disabled.
+ */
+class DLL_PUBLIC ProfilerScope {
+ public:
+  ProfilerScope(Profiler *profiler, const std::string &op_name, OpType stage, int64_t iteration)
+      : active_(profiler && profiler->IsEnabled()) {
+    if (!active_)
+      return;
+    auto &ctx = Profiler::CurrentContext();
+    prev_ = ctx;
+    ctx.profiler = profiler;
+    ctx.op_name = &op_name;
+    ctx.stage = stage;
+    ctx.iteration = iteration;
+    start_ = Profiler::Now();
+  }
+
+  ~ProfilerScope() {
+    if (!active_)
+      return;
+    auto &ctx = Profiler::CurrentContext();
+    ctx.profiler->Record(*ctx.op_name, ProfilerEventType::kOperator, ctx.stage, ctx.iteration,
+                         start_, Profiler::Now());
+    ctx = prev_;
+  }
+
+  DISABLE_COPY_MOVE_ASSIGN(ProfilerScope);
+
+ private:
+  bool active_;
+  Profiler::Context prev_;
+  int64_t start_ = 0;
+};
+
+/**
+ * @brief Records the time spent in a scope, attributed to the operator run by the calling thread
+ *
+ * Does nothing if there is no operator context for the calling thread.
+ */
+class DLL_PUBLIC ProfilerRange {
+ public:
+  explicit ProfilerRange(ProfilerEventType type)
+      : type_(type), ctx_(Profiler::CurrentContext()) {
+    if (ctx_.profiler)
+      start_ = Profiler::Now();
+  }
+
+  ~ProfilerRange() {
+    if (ctx_.profiler)
+      ctx_.profiler->Record(*ctx_.op_name, type_, ctx_.stage, ctx_.iteration,
+                            start_, Profiler::Now());
+  }
+
+  DISABLE_COPY_MOVE_ASSIGN(ProfilerRange);
+
+ private:
+  ProfilerEventType type_;
+  Profiler::Context ctx_;
+  int64_t start_ = 0;
+};
+
+}  // namespace dali
+
+#endif  // DALI_PIPELINE_UTIL_PROFILER_H_
@@ -0,0 +1,85 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <string>
+#include "dali/pipeline/util/profiler.h"
+
+namespace dali {
+
+TEST(ProfilerTest, ScopeAndRange) {
+  Profiler profiler;
+  std::string op_name = "reader";
+  {
+    ProfilerScope scope(&profiler, op_name, OpType::CPU, 0);
+    ProfilerRange range(ProfilerEventType::kReaderStall);
+  }
+  // not enabled - nothing recorded
+  EXPECT_TRUE(profiler.Events().empty());
+  EXPECT_TRUE(profiler.Stats().empty());
+
+  profiler.Enable();
+  for (int iter = 0; iter < 3; iter++) {
+    ProfilerScope scope(&profiler, op_name, OpType::CPU, iter);
+    ProfilerRange range(ProfilerEventType::kReaderStall);
+  }
+  // no operator context outside of the scope
+  { ProfilerRange range(ProfilerEventType::kCallback); }
+
+  auto events = profiler.Events();
+  ASSERT_EQ(events.size(), 6u);
+  for (int i = 0; i < 3; i++) {
+    // the range ends before the scope
+    EXPECT_EQ(events[2 * i].type, ProfilerEventType::kReaderStall);
+    EXPECT_EQ(events[2 * i + 1].type, ProfilerEventType::kOperator);
+    for (auto &e : {events[2 * i], events[2 * i + 1]}) {
+      EXPECT_EQ(e.name, op_name);
+      EXPECT_EQ(e.stage, OpType::CPU);
+      EXPECT_EQ(e.iteration, i);
+      EXPECT_LE(e.start_ns, e.end_ns);
+    }
+    EXPECT_LE(events[2 * i + 1].start_ns, events[2 * i].start_ns);
+  }
+
+  auto stats = profiler.Stats();
+  ASSERT_EQ(stats.size(), 2u);
+  auto &op_stats = stats[Profiler::StatsKey(ProfilerEventType::kOperator, OpType::CPU, op_name)];
+  EXPECT_EQ(op_stats.count, 3);
+  EXPECT_LE(op_stats.min_ns, op_stats.max_ns);
+  EXPECT_LE(op_stats.max_ns, op_stats.total_ns);
+}
+
+TEST(ProfilerTest, MaxEvents) {
+  Profiler profiler(4);
+  profiler.Enable();
+  for (int i = 0; i < 10; i++)
+    profiler.Record("op", ProfilerEventType::kOperator, OpType::GPU, i, 10 * i, 10 * i + i);
+  auto events = profiler.Events();
+  ASSERT_EQ(events.size(), 4u);
+  EXPECT_EQ(events.front().iteration, 6);
+  EXPECT_EQ(events.back().iteration, 9);
+
+  auto stats = profiler.Stats();
+  auto &op_stats = stats[Profiler::StatsKey(ProfilerEventType::kOperator, OpType::GPU, "op")];
+  EXPECT_EQ(op_stats.count, 10);
+  EXPECT_EQ(op_stats.total_ns, 45);
+  EXPECT_EQ(op_stats.min_ns, 0);
+  EXPECT_EQ(op_stats.max_ns, 9);
+
+  profiler.Reset();
+  EXPECT_TRUE(profiler.Events().empty());
+  EXPECT_TRUE(profiler.Stats().empty());
+}
+
+}  // namespace dali
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -30,6 +30,7 @@
 #include "dali/operators.h"
 #include "dali/pipeline/data/dltensor.h"
 #include "dali/pipeline/data/copy_to_external.h"
+#include "dali/pipeline/data/host_memory_pool.h"
 
 namespace dali {
 namespace python {
@@ -388,7 +389,9 @@ void ExposeTensor(py::module &m) {
     })
     .def("copy_to_external",
         [](Tensor<CPUBackend> &t, py::object p) {
-          CopyToExternal(ctypes_void_ptr(p), kernels::AllocType::Host, t, 0, false);
+          void *ptr = ctypes_void_ptr(p);
+          py::gil_scoped_release interpreter_unlock{};
+          CopyToExternal(ptr, kernels::AllocType::Host, t, 0, false);
         },
       "ptr"_a,
       R"code(
@@ -410,6 +413,11 @@ void ExposeTensor(py::module &m) {
       R"code(
       Returns the address of the first element of tensor.
       )code")
+    .def("_expose_dlpack_capsule", &TensorToDLPackView<CPUBackend>,
+      R"code(
+      Returns a DLPack capsule viewing the data of the tensor, without copying it.
+      The capsule does not own the data, which is valid only as long as the tensor is.
+      )code")
     .def_property("__array_interface__", &ArrayInterfaceRepr<CPUBackend>, nullptr,
       R"code(
       Returns array interface representation of TensorCPU.
@@ -493,6 +501,7 @@ void ExposeTensor(py::module &m) {
           cudaStream_t stream = cuda_stream.is_none()
                 ? UserStream::Get()->GetStream(t)
                 : static_cast<cudaStream_t>(ctypes_void_ptr(cuda_stream));
+          py::gil_scoped_release interpreter_unlock{};
           CopyToExternal(ptr, kernels::AllocType::GPU, t, stream, use_copy_kernel);
           if (!non_blocking) {
             CUDA_CALL(cudaStreamSynchronize(stream));
@@ -526,6 +535,11 @@ void ExposeTensor(py::module &m) {
       R"code(
       Returns the address of the first element of tensor.
       )code")
+    .def("_expose_dlpack_capsule", &TensorToDLPackView<GPUBackend>,
+      R"code(
+      Returns a DLPack capsule viewing the data of the tensor, without copying it.
+      The capsule does not own the data, which is valid only as long as the tensor is.
+      )code")
     .def_property("__cuda_array_interface__",  &ArrayInterfaceRepr<GPUBackend>, nullptr,
       R"code(
       Returns cuda array interface representation of TensorGPU.
@@ -747,7 +761,9 @@ void ExposeTensorList(py::module &m) {
       )code")
     .def("copy_to_external",
         [](TensorList<CPUBackend> &tl, py::object p) {
-          CopyToExternal(ctypes_void_ptr(p), kernels::AllocType::Host, tl, 0, false);
+          void *ptr = ctypes_void_ptr(p);
+          py::gil_scoped_release interpreter_unlock{};
+          CopyToExternal(ptr, kernels::AllocType::Host, tl, 0, false);
         },
       R"code(
       Copy the contents of this `TensorList` to an external pointer
@@ -872,6 +888,7 @@ void ExposeTensorList(py::module &m) {
           cudaStream_t stream = cuda_stream.is_none()
                 ? UserStream::Get()->GetStream(t)
                 : static_cast<cudaStream_t>(ctypes_void_ptr(cuda_stream));
+          py::gil_scoped_release interpreter_unlock{};
           CopyToExternal(ptr, AllocType::GPU, t, stream, use_copy_kernel);
           if (!non_blocking) {
             CUDA_CALL(cudaStreamSynchronize(stream));
@@ -1052,6 +1069,36 @@ void ExposeBufferPolicyFunctions(py::module &m) {
   m.def("GetHostBufferShrinkThreshold", Buffer<CPUBackend>::GetShrinkThreshold);
   m.def("GetHostBufferGrowthFactor", Buffer<CPUBackend>::GetGrowthFactor);
   m.def("GetDeviceBufferGrowthFactor", Buffer<GPUBackend>::GetGrowthFactor);
+
+  m.def("SetHostMemoryPool", &SetHostMemoryPool, "enable"_a, "use_hugepages"_a = false,
+      R"code(
+      Enables or disables the pool for the non-pinned host memory of the CPU operators' outputs.
+
+      The pool uses size classes, which avoids returning the memory to the OS and faulting it
+      in again when the sizes of the samples vary between the iterations.
+      The setting is process-wide - it affects all the pipelines and takes effect for
+      the allocations made after the call. The pool is disabled by default.
+      The statistics of the pool can be obtained with ``GetHostMemoryPoolStats()``.
+
+      enable : bool
+          If True, the memory is taken from the pool, otherwise it's allocated with
+          the default CPU allocator.
+      use_hugepages : bool
+          If True, the memory of the pool is advised to be backed with transparent huge pages,
+          reducing the number of page faults and TLB misses.
+      )code");
+  m.def("IsHostMemoryPoolEnabled", &IsHostMemoryPoolEnabled);
+  m.def("GetHostMemoryPoolStats", []() {
+    auto stats = GetHostMemoryPoolStats();
+    py::dict d;
+    d["allocations"] = stats.allocations;
+    d["deallocations"] = stats.deallocations;
+    d["bytes_in_use"] = stats.bytes_in_use;
+    d["peak_bytes_in_use"] = stats.peak_bytes_in_use;
+    d["upstream_blocks"] = stats.upstream_blocks;
+    d["upstream_bytes"] = stats.upstream_bytes;
+    return d;
+  });
 }
 
 py::dict DeprecatedArgMetaToDict(const DeprecatedArgDef & meta) {
@@ -1096,6 +1143,34 @@ py::dict ExecutorMetaToDict(const ExecutorMetaMap &meta) {
   return d;
 }
 
+py::list ProfilerStatsToList(const Profiler::StatsMap &stats) {
+  py::list l;
+  for (const auto &stat : stats) {
+    ProfilerEventType type;
+    OpType stage;
+    std::string name;
+    std::tie(type, stage, name) = stat.first;
+    l.append(py::make_tuple(to_string(type), to_string(stage), name, stat.second.count,
+                            stat.second.total_ns, stat.second.min_ns, stat.second.max_ns));
+  }
+  return l;
+}
+
+py::list ProfilerEventsToList(const std::vector<ProfilerEvent> &events) {
+  py::list l;
+  for (const auto &e : events) {
+    l.append(py::make_tuple(to_string(e.type), to_string(e.stage), e.name, e.iteration,
+                            e.start_ns, e.end_ns, e.thread_id));
+  }
+  return l;
+}
+
+Profiler &GetBuiltPipelineProfiler(Pipeline *p) {
+  auto *profiler = p->GetProfiler();
+  DALI_ENFORCE(profiler != nullptr, "The pipeline must be built to access its profiling data.");
+  return *profiler;
+}
+
 template <typename Backend>
 void FeedPipeline(Pipeline *p, const string &name, py::list list, cudaStream_t stream,
                   bool sync = false, bool use_copy_kernel = false) {
@@ -1104,9 +1179,29 @@ void FeedPipeline(Pipeline *p, const string &name, py::list list, cudaStream_t s
     auto &t = list[i].cast<Tensor<Backend>&>();
     tv[i] = std::move(t);
   }
+  py::gil_scoped_release interpreter_unlock{};
   p->SetExternalInput(name, tv, stream, sync, use_copy_kernel);
 }
 
+/**
+ * @brief Deleter of the pipelines owned by Python objects
+ *
+ * Destroying the pipeline joins the executor threads, which may be waiting for the GIL
+ * (e.g. when running PythonFunction), so the GIL is released for the time of the destruction.
+ */
+struct PyPipelineDeleter {
+  void operator()(Pipeline *pipeline) const {
+    if (PyGILState_Check()) {
+      py::gil_scoped_release interpreter_unlock{};
+      delete pipeline;
+    } else {
+      delete pipeline;
+    }
+  }
+};
+
+using PyPipelinePtr = std::unique_ptr<Pipeline, PyPipelineDeleter>;
+
 PYBIND11_MODULE(backend_impl, m) {
   dali::InitOperatorsLib();
   m.doc() = "Python bindings for the C++ portions of DALI";
@@ -1189,17 +1284,17 @@ PYBIND11_MODULE(backend_impl, m) {
         });
 
   // Pipeline class
-  py::class_<Pipeline>(m, "Pipeline")
+  py::class_<Pipeline, PyPipelinePtr>(m, "Pipeline")
     .def(py::init(
             [](int batch_size, int num_threads, int device_id, int64_t seed = -1,
                 bool pipelined_execution = true, int prefetch_queue_depth = 2,
                 bool async_execution = true, size_t bytes_per_sample_hint = 0,
                 bool set_affinity = false, int max_num_stream = -1,
                 int default_cuda_stream_priority = 0) {
-              return std::make_unique<Pipeline>(
+              return PyPipelinePtr(new Pipeline(
                       batch_size, num_threads, device_id, seed, pipelined_execution,
                       prefetch_queue_depth, async_execution, bytes_per_sample_hint, set_affinity,
-                      max_num_stream, default_cuda_stream_priority);
+                      max_num_stream, default_cuda_stream_priority));
             }),
         "batch_size"_a,
         "num_threads"_a,
@@ -1221,11 +1316,11 @@ PYBIND11_MODULE(backend_impl, m) {
              bool async_execution = true, size_t bytes_per_sample_hint = 0,
              bool set_affinity = false, int max_num_stream = -1,
              int default_cuda_stream_priority = 0) {
-              return std::make_unique<Pipeline>(
+              return PyPipelinePtr(new Pipeline(
                                serialized_pipe,
                                batch_size, num_threads, device_id, pipelined_execution,
                                prefetch_queue_depth, async_execution, bytes_per_sample_hint,
-                               set_affinity, max_num_stream, default_cuda_stream_priority);
+                               set_affinity, max_num_stream, default_cuda_stream_priority));
             }),
         "serialized_pipe"_a,
         "batch_size"_a = -1,
@@ -1271,20 +1366,63 @@ PYBIND11_MODULE(backend_impl, m) {
           auto ret = p->GetExecutorMeta();
           return ExecutorMetaToDict(ret);
         })
+    .def("EnableProfiling",
+        [](Pipeline *p, bool enable_profiling) {
+          p->EnableProfiling(enable_profiling);
+        },
+        "enable_profiling"_a = true)
+    .def("EnableCheckpointing",
+        [](Pipeline *p, bool enable_checkpointing) {
+          p->EnableCheckpointing(enable_checkpointing);
+        },
+        "enable_checkpointing"_a = true)
+    .def("profiler_stats",
+        [](Pipeline *p) {
+          return ProfilerStatsToList(GetBuiltPipelineProfiler(p).Stats());
+        })
+    .def("profiler_events",
+        [](Pipeline *p) {
+          return ProfilerEventsToList(GetBuiltPipelineProfiler(p).Events());
+        })
+    .def("ResetProfiler",
+        [](Pipeline *p) {
+          GetBuiltPipelineProfiler(p).Reset();
+        })
+    .def("RecordCallbackTime",
+        [](Pipeline *p, const std::string &name, int64_t iteration,
+           int64_t start_ns, int64_t end_ns) {
+          auto &profiler = GetBuiltPipelineProfiler(p);
+          if (profiler.IsEnabled())
+            profiler.Record(name, ProfilerEventType::kCallback, OpType::CPU, iteration,
+                            start_ns, end_ns);
+        },
+        "name"_a, "iteration"_a, "start_ns"_a, "end_ns"_a)
     .def("SetQueueSizes",
         [](Pipeline *p, int cpu_size, int gpu_size) {
           p->SetQueueSizes(cpu_size, gpu_size);
         })
+    .def("SetCPUOpConcurrency",
+        [](Pipeline *p, int cpu_op_concurrency) {
+          p->SetCPUOpConcurrency(cpu_op_concurrency);
+        })
+    .def("SetCPUIterationOverlap",
+        [](Pipeline *p, bool cpu_iteration_overlap) {
+          p->SetCPUIterationOverlap(cpu_iteration_overlap);
+        })
     .def("SetOutputNames",
         [](Pipeline *p, const std::vector<std::pair<string, string>>& outputs) {
           p->SetOutputNames(outputs);
           })
     .def("RunCPU", &Pipeline::RunCPU, py::call_guard<py::gil_scoped_release>())
-    .def("RunGPU", &Pipeline::RunGPU)
+    .def("RunGPU", &Pipeline::RunGPU, py::call_guard<py::gil_scoped_release>())
     .def("Outputs",
         [](Pipeline *p) {
           DeviceWorkspace ws;
-          p->Outputs(&ws);
+          {
+            // the executor may need the GIL to finish the iteration we wait for
+            py::gil_scoped_release interpreter_unlock{};
+            p->Outputs(&ws);
+          }
 
           py::tuple outs(ws.NumOutput());
           for (int i = 0; i < ws.NumOutput(); ++i) {
@@ -1299,7 +1437,10 @@ PYBIND11_MODULE(backend_impl, m) {
     .def("ShareOutputs",
         [](Pipeline *p) {
           DeviceWorkspace ws;
-          p->ShareOutputs(&ws);
+          {
+            py::gil_scoped_release interpreter_unlock{};
+            p->ShareOutputs(&ws);
+          }
 
           py::tuple outs(ws.NumOutput());
           for (int i = 0; i < ws.NumOutput(); ++i) {
@@ -1314,13 +1455,14 @@ PYBIND11_MODULE(backend_impl, m) {
     .def("ReleaseOutputs",
         [](Pipeline *p) {
           p->ReleaseOutputs();
-        })
+        }, py::call_guard<py::gil_scoped_release>())
     .def("batch_size", &Pipeline::batch_size)
     .def("num_threads", &Pipeline::num_threads)
     .def("device_id", &Pipeline::device_id)
     .def("SetExternalTLInput",
         [](Pipeline *p, const string &name, const TensorList<CPUBackend> &tl,
            py::object /*cuda_stream*/, bool /*use_copy_kernel*/) {
+          py::gil_scoped_release interpreter_unlock{};
           p->SetExternalInput(name, tl, 0, true);
         },
         "name"_a,
@@ -1333,6 +1475,7 @@ PYBIND11_MODULE(backend_impl, m) {
            cudaStream_t stream = cuda_stream.is_none()
                                  ? UserStream::Get()->GetStream(tl)
                                  : static_cast<cudaStream_t>(ctypes_void_ptr(cuda_stream));
+          py::gil_scoped_release interpreter_unlock{};
           p->SetExternalInput(name, tl, stream, cuda_stream.is_none(), use_copy_kernel);
         },
         "name"_a,
@@ -1393,7 +1536,23 @@ PYBIND11_MODULE(backend_impl, m) {
           DALI_ENFORCE(meta,
               "Operator " + op_name + "  not found or does not expose valid metadata.");
           return ReaderMetaToDict(meta);
-        });
+        })
+    .def("reader_state",
+        [](Pipeline* p, int64_t iteration) {
+          py::dict d;
+          for (auto &state : p->GetReaderState(iteration)) {
+            d[state.first.c_str()] = py::bytes(state.second);
+          }
+          return d;
+        }, "iteration"_a)
+    .def("reader_state",
+        [](Pipeline* p, const std::string& op_name, int64_t iteration) -> py::bytes {
+          return p->GetReaderState(op_name, iteration);
+        }, "op_name"_a, "iteration"_a)
+    .def("set_reader_state",
+        [](Pipeline* p, const std::string& op_name, py::bytes state) {
+          p->SetReaderState(op_name, state);
+        }, "op_name"_a, "state"_a);
 
 #define DALI_OPSPEC_ADDARG(T) \
     .def("AddArg", \
@@ -1418,6 +1577,11 @@ PYBIND11_MODULE(backend_impl, m) {
         py::return_value_policy::reference_internal)
     .def("AddOutput", &OpSpec::AddOutput,
         py::return_value_policy::reference_internal)
+    .def("RenameInput",
+        [](OpSpec *spec, int idx, const std::string &name) -> OpSpec& {
+          spec->MutableInput(idx).name = name;
+          return *spec;
+        }, "idx"_a, "name"_a, py::return_value_policy::reference_internal)
     DALI_OPSPEC_ADDARG(std::string)
     DALI_OPSPEC_ADDARG(bool)
     DALI_OPSPEC_ADDARG(int64)
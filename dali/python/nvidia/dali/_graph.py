@@ -0,0 +1,289 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+
+
+def input_edges(op):
+    """Iterates over the input DataNodes of the operator instance `op`, flattening
+    the inputs passed as lists."""
+    for edge in op.inputs:
+        if isinstance(edge, list):
+            for e in edge:
+                yield e
+        else:
+            yield edge
+
+
+def _source_of(edge):
+    source_op = edge.source
+    if source_op is None:
+        raise RuntimeError(
+            "Pipeline encountered "
+            "Edge with no source op.")
+    return source_op
+
+
+def topological_sort(edges):
+    """Returns the operator instances needed to compute `edges` in topological order -
+    every operator is preceded by the producers of all its inputs.
+
+    Each operator and each edge are visited a constant number of times, so the cost is linear
+    in the size of the graph. The operators are ordered so that the ones closest to the outputs
+    come last - it is the order in which the previous, quadratic, implementation added them
+    to the backend.
+    """
+    # Discover the graph and count the consumers of each operator
+    ops = {}
+    num_consumers = {}
+    roots = []
+    for edge in edges:
+        source_op = _source_of(edge)
+        if source_op.id not in ops:
+            ops[source_op.id] = source_op
+            num_consumers[source_op.id] = 0
+            roots.append(source_op)
+    to_visit = list(roots)
+    while to_visit:
+        op = to_visit.pop()
+        op.check_args()
+        for edge in input_edges(op):
+            source_op = _source_of(edge)
+            if source_op.id not in ops:
+                ops[source_op.id] = source_op
+                num_consumers[source_op.id] = 0
+                to_visit.append(source_op)
+            num_consumers[source_op.id] += 1
+
+    # Kahn's algorithm on the reversed graph - an operator is placed once all of its
+    # consumers have been placed
+    order = []
+    ready = deque(op for op in roots if num_consumers[op.id] == 0)
+    while ready:
+        op = ready.popleft()
+        order.append(op)
+        for edge in input_edges(op):
+            source_id = edge.source.id
+            num_consumers[source_id] -= 1
+            if num_consumers[source_id] == 0:
+                ready.append(ops[source_id])
+
+    if len(order) != len(ops):
+        raise RuntimeError("The pipeline graph contains a cycle.")
+    order.reverse()
+    return order
+
+
+# Operators that are deterministic and have no state or side-effects - two instances with the same
+# arguments and inputs always produce the same outputs.
+_mergeable_schemas = {
+    "ArithmeticGenericOp",
+    "Cast",
+    "Cat",
+    "Constant",
+    "CropMirrorNormalize",
+    "ElementExtract",
+    "Flip",
+    "LookupTable",
+    "Normalize",
+    "OneHot",
+    "Pad",
+    "Reinterpret",
+    "Reshape",
+    "Shapes",
+    "Slice",
+    "Stack",
+    "Transpose",
+}
+
+
+def _hashable(value):
+    """Converts an argument value to a hashable object that identifies it exactly.
+    Returns None if the value is of an unexpected type."""
+    if isinstance(value, (list, tuple)):
+        items = tuple(_hashable(x) for x in value)
+        if any(x is None for x in items):
+            return None
+        return items
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        # the type is a part of the key - 1, 1.0 and True are different arguments
+        return (type(value).__name__, value)
+    if hasattr(value, "dtype") and hasattr(value, "tobytes"):
+        return (str(value.dtype), tuple(value.shape), value.tobytes())
+    if hasattr(type(value), "__members__"):
+        # enumerations exported from the backend, e.g. DALIDataType
+        return (type(value).__name__, int(value))
+    return None
+
+
+def _merge_key(op):
+    from nvidia.dali.ops import _schema_name
+    schema_name = _schema_name(type(op.op))
+    if schema_name not in _mergeable_schemas or op.op.preserve:
+        return None
+    spec_args = op.spec_args
+    if spec_args is None:
+        return None
+    args = []
+    for name in sorted(spec_args.keys()):
+        value = _hashable(spec_args[name])
+        if value is None:
+            return None
+        args.append((name, value))
+    inputs = tuple((edge.name, edge.device) for edge in input_edges(op))
+    return (schema_name, op.op.device, tuple(args), inputs, tuple(op.argument_input_names))
+
+
+def _replacement(replaced_by):
+    """Returns a function mapping an edge produced by an instance that is a key in `replaced_by`
+    to the corresponding output of the instance that replaces it."""
+    def replacement(edge):
+        rep = replaced_by.get(edge.source.id)
+        if rep is None:
+            return edge
+        idx = [out.name for out in edge.source.outputs].index(edge.name)
+        rep_edge = rep.outputs[idx]
+        if rep_edge.device != edge.device:
+            rep_edge = rep_edge.gpu()
+        return rep_edge
+    return replacement
+
+
+def merge_duplicate_ops(ops, output_edges):
+    """Eliminates common subexpressions from the graph.
+
+    `ops` are the operator instances in topological order. Instances of deterministic operators
+    that have the same arguments and inputs as an instance seen earlier are removed and their
+    consumers are rewired to the outputs of the earlier instance. Instances producing
+    `output_edges` are always kept.
+
+    Returns the list of remaining operators, still in topological order.
+    """
+    protected = set(edge.source.id for edge in output_edges)
+    replaced_by = {}   # id of a removed instance -> instance producing the same outputs
+    representatives = {}
+    replacement = _replacement(replaced_by)
+
+    result = []
+    for op in ops:
+        if replaced_by:
+            op.replace_inputs(replacement)
+        key = _merge_key(op)
+        if key is not None:
+            rep = representatives.get(key)
+            if rep is None:
+                representatives[key] = op
+            elif op.id not in protected:
+                replaced_by[op.id] = rep
+                continue
+        result.append(op)
+    return result
+
+
+# The maximum number of inputs of ArithmeticGenericOp
+_max_arithm_inputs = 64
+
+
+def _arithm_expression(op):
+    """Returns the expression computed by a CPU ArithmeticGenericOp instance, with the inputs
+    referred to by their DataNodes, or None if the instance cannot be fused."""
+    expression = getattr(op.op, "_expression", None)
+    if expression is None or op.op.device != "cpu" or op.op.preserve:
+        return None
+    inputs = list(input_edges(op))
+
+    def resolve(expression):
+        name, args = expression
+        resolved = []
+        for category, value in args:
+            if category == "call":
+                value = resolve(value)
+            elif category == "edge":
+                value = inputs[value]
+            resolved.append((category, value))
+        return (name, resolved)
+
+    return resolve(expression)
+
+
+def _count_edges(expression):
+    names = set()
+    def visit(expression):
+        for category, value in expression[1]:
+            if category == "call":
+                visit(value)
+            elif category == "edge":
+                names.add((value.name, value.device))
+    visit(expression)
+    return len(names)
+
+
+def fuse_arithmetic_ops(ops, output_edges):
+    """Collapses chains of arithmetic operators running on the CPU into single operators.
+
+    `ops` are the operator instances in topological order. When an arithmetic operator consumes
+    the result of another arithmetic operator, which has no other consumers and does not produce
+    any of `output_edges`, the producer's expression is inlined in the consumer's expression
+    and the producer is removed. The consumer is replaced by a new instance with the same
+    output name that evaluates the nested expression, without materializing the intermediate
+    results.
+
+    Returns the list of remaining operators, still in topological order.
+    """
+    from nvidia.dali.ops import _fused_arithm_op
+    protected = set(edge.source.id for edge in output_edges)
+    num_uses = {}
+    for op in ops:
+        for edge in input_edges(op):
+            num_uses[edge.source.id] = num_uses.get(edge.source.id, 0) + 1
+    replaced_by = {}   # id of a fused consumer -> instance evaluating the nested expression
+    replacement = _replacement(replaced_by)
+    absorbed = set()
+
+    def inline(expression, inlined):
+        name, args = expression
+        new_args = []
+        for category, value in args:
+            if category == "call":
+                value = inline(value, inlined)
+            elif category == "edge" and value.device == "cpu":
+                producer = value.source
+                if num_uses.get(producer.id) == 1 and producer.id not in protected:
+                    producer_expression = _arithm_expression(producer)
+                    if producer_expression is not None:
+                        inlined.append(producer.id)
+                        category, value = "call", producer_expression
+            new_args.append((category, value))
+        return (name, new_args)
+
+    result = []
+    for op in ops:
+        if replaced_by:
+            op.replace_inputs(replacement)
+        expression = _arithm_expression(op)
+        if expression is not None:
+            inlined = []
+            expression = inline(expression, inlined)
+            if inlined and _count_edges(expression) <= _max_arithm_inputs:
+                absorbed.update(inlined)
+                fused_op = _fused_arithm_op(expression, op.name).source
+                fused_op.check_args()
+                fused_op.relation_id = op.relation_id
+                num_uses[fused_op.id] = num_uses.get(op.id, 0)
+                if op.id in protected:
+                    protected.add(fused_op.id)
+                replaced_by[op.id] = fused_op
+                op = fused_op
+        result.append(op)
+    return [op for op in result if op.id not in absorbed]
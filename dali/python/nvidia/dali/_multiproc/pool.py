@@ -0,0 +1,192 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import queue
+from collections import deque
+from nvidia.dali._multiproc.worker import worker, ScheduledTask
+from nvidia.dali._multiproc.shared_mem import SharedMem, read_samples
+
+
+class _CallbackContext(object):
+    """Bookkeeping of the batches requested from a single parallel callback.
+
+    The batches are identified by consecutive ``batch_id`` numbers. Each batch is split into
+    contiguous ranges of samples - one per worker - and it is complete when all the workers
+    have replied.
+    """
+    def __init__(self, group, prefetch_queue_depth):
+        self.group = group
+        self.prefetch_queue_depth = prefetch_queue_depth
+        self.next_batch_id = 0
+        self.scheduled = deque()     # ids of the batches scheduled and not yet received
+        self.partial = {}            # batch_id -> {worker_id: CompletedTask}
+        self.num_parts = {}          # batch_id -> number of workers the batch was split among
+        self.discard_below = 0       # replies for older batches are ignored
+
+
+class WorkerPool(object):
+    """Pool of worker processes running per-sample callbacks of parallel external sources.
+
+    The workers write the samples to shared memory chunks, so only the descriptions of the
+    samples are passed through the pipes. Each callback keeps up to its ``prefetch_queue_depth``
+    batches scheduled, so the workers can compute the data for the following iterations while
+    the pipeline consumes the current one.
+    """
+    def __init__(self, groups, num_workers, start_method = "fork"):
+        if num_workers < 1:
+            raise ValueError("The number of Python workers must be positive, got {}."
+                             .format(num_workers))
+        mp = multiprocessing.get_context(start_method)
+        self._contexts = [_CallbackContext(group, group.prefetch_queue_depth) for group in groups]
+        callbacks = [group.callback for group in groups]
+        multioutput = [group.is_multioutput for group in groups]
+        self._result_queue = mp.Queue()
+        self._task_pipes = []
+        self._processes = []
+        # mapped chunks: (worker_id, context_idx, slot) -> SharedMem
+        self._chunks = {}
+        self._closed = False
+        for worker_id in range(num_workers):
+            task_r, task_w = mp.Pipe(duplex=False)
+            process = mp.Process(target=worker,
+                                 args=(worker_id, callbacks, multioutput, task_r,
+                                       self._result_queue),
+                                 daemon=True)
+            process.start()
+            task_r.close()
+            self._task_pipes.append(task_w)
+            self._processes.append(process)
+
+    @property
+    def num_workers(self):
+        return len(self._processes)
+
+    def _schedule_batch(self, context_idx, batch_size):
+        ctx = self._contexts[context_idx]
+        batch_id = ctx.next_batch_id
+        ctx.next_batch_id += 1
+        iter_offset = len(ctx.scheduled)
+        args = [ctx.group.callback_args(i, iter_offset, batch_size) for i in range(batch_size)]
+        slot = batch_id % ctx.prefetch_queue_depth
+        chunk_size = (batch_size + self.num_workers - 1) // self.num_workers
+        num_parts = 0
+        for worker_id, start in enumerate(range(0, batch_size, chunk_size)):
+            task = ScheduledTask(context_idx, batch_id, slot, args[start:start + chunk_size])
+            self._task_pipes[worker_id].send(task)
+            num_parts += 1
+        ctx.scheduled.append(batch_id)
+        ctx.num_parts[batch_id] = num_parts
+        ctx.partial[batch_id] = {}
+
+    def _check_workers(self):
+        for worker_id, process in enumerate(self._processes):
+            if not process.is_alive():
+                raise RuntimeError("Python worker {} exited unexpectedly with code {}."
+                                   .format(worker_id, process.exitcode))
+
+    def _receive_reply(self):
+        while True:
+            try:
+                return self._result_queue.get(timeout=1)
+            except queue.Empty:
+                self._check_workers()
+
+    def _get_chunk(self, reply):
+        key = (reply.worker_id, reply.context_idx, reply.slot)
+        shm = self._chunks.get(key)
+        if shm is None or shm.name != reply.shm_name:
+            if shm is not None:
+                shm.close()
+            shm = SharedMem.open(reply.shm_name, reply.capacity)
+            self._chunks[key] = shm
+        return shm
+
+    def receive_batch(self, context_idx, batch_size):
+        """Returns the next batch of the callback ``context_idx`` as a list of samples.
+
+        Each sample is a list of NumPy arrays (one per output of the callback) that view
+        the shared memory - the data must be consumed (copied) before the next call.
+        Raises StopIteration if the callback signalled the end of data.
+        """
+        if self._closed:
+            raise RuntimeError("The Python worker pool is closed.")
+        ctx = self._contexts[context_idx]
+        while len(ctx.scheduled) < ctx.prefetch_queue_depth:
+            self._schedule_batch(context_idx, batch_size)
+        batch_id = ctx.scheduled[0]
+        while len(ctx.partial[batch_id]) < ctx.num_parts[batch_id]:
+            reply = self._receive_reply()
+            reply_ctx = self._contexts[reply.context_idx]
+            if reply.batch_id < reply_ctx.discard_below:
+                continue
+            reply_ctx.partial[reply.batch_id][reply.worker_id] = reply
+        ctx.scheduled.popleft()
+        del ctx.num_parts[batch_id]
+        parts = ctx.partial.pop(batch_id)
+        samples = []
+        for worker_id in sorted(parts.keys()):
+            reply = parts[worker_id]
+            if reply.error is not None:
+                self.reset_context(context_idx)
+                raise RuntimeError("Exception in the Python worker {} while running the external "
+                                   "source callback:\n{}".format(worker_id, reply.error))
+            if reply.stop_iteration:
+                self.reset_context(context_idx)
+                raise StopIteration
+            samples += read_samples(self._get_chunk(reply), reply.metas)
+        return samples
+
+    def schedule_next(self, context_idx, batch_size):
+        """Tops up the queue of batches scheduled for the callback ``context_idx``.
+        Should be called once the last received batch has been consumed."""
+        ctx = self._contexts[context_idx]
+        while len(ctx.scheduled) < ctx.prefetch_queue_depth:
+            self._schedule_batch(context_idx, batch_size)
+
+    def reset_context(self, context_idx):
+        """Discards the batches scheduled for the callback ``context_idx``.
+        Used when the epoch ends and the callback is restarted from the first sample."""
+        ctx = self._contexts[context_idx]
+        ctx.discard_below = ctx.next_batch_id
+        ctx.scheduled.clear()
+        ctx.partial.clear()
+        ctx.num_parts.clear()
+
+    def reset(self):
+        for context_idx in range(len(self._contexts)):
+            self.reset_context(context_idx)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for pipe in self._task_pipes:
+            try:
+                pipe.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self._task_pipes:
+            pipe.close()
+        for shm in self._chunks.values():
+            shm.close()
+        self._chunks.clear()
+        self._result_queue.close()
+
+    def __del__(self):
+        self.close()
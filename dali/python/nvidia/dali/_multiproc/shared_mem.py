@@ -0,0 +1,137 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+import tempfile
+import numpy as np
+
+_shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Alignment of the arrays placed in a shared memory chunk
+_alignment = 64
+
+
+def _align_up(x, alignment = _alignment):
+    return (x + alignment - 1) // alignment * alignment
+
+
+class SharedMem(object):
+    """Chunk of memory that can be mapped in the address space of many processes.
+
+    The chunk is backed by a file placed in ``/dev/shm`` (or in the default temporary directory,
+    if ``/dev/shm`` is not available). The path of the file is used as the name of the chunk
+    and is what is exchanged between the processes.
+    """
+    def __init__(self, name, capacity, mem, owner):
+        self.name = name
+        self.capacity = capacity
+        self._mem = mem
+        self._owner = owner
+
+    @classmethod
+    def allocate(cls, capacity):
+        """Creates a new chunk of at least `capacity` bytes. The calling process owns the chunk
+        and removes the backing file when the chunk is closed."""
+        capacity = max(_align_up(capacity), _alignment)
+        fd, name = tempfile.mkstemp(prefix="nvidia_dali_", dir=_shm_dir)
+        try:
+            os.ftruncate(fd, capacity)
+            mem = mmap.mmap(fd, capacity)
+        except Exception:
+            os.close(fd)
+            os.unlink(name)
+            raise
+        os.close(fd)
+        return cls(name, capacity, mem, True)
+
+    @classmethod
+    def open(cls, name, capacity):
+        """Maps a chunk created (and owned) by another process."""
+        fd = os.open(name, os.O_RDWR)
+        try:
+            mem = mmap.mmap(fd, capacity)
+        finally:
+            os.close(fd)
+        return cls(name, capacity, mem, False)
+
+    @property
+    def buf(self):
+        return self._mem
+
+    def close(self):
+        if self._mem is None:
+            return
+        try:
+            self._mem.close()
+        except BufferError:
+            # There are still arrays referencing the memory - the mapping is released
+            # when the last of them is garbage collected.
+            pass
+        self._mem = None
+        if self._owner:
+            try:
+                os.unlink(self.name)
+            except FileNotFoundError:
+                pass
+
+
+class SampleMeta(object):
+    """Describes where the arrays of a single sample are placed within a shared memory chunk."""
+    def __init__(self, arrays):
+        # list of (offset, shape, dtype string) tuples - one per output of the callback
+        self.arrays = arrays
+
+
+def _to_array(data):
+    if hasattr(data, "asnumpy"):
+        data = data.asnumpy()
+    elif hasattr(data, "numpy") and not isinstance(data, np.ndarray):
+        data = data.numpy()
+    return np.ascontiguousarray(data)
+
+
+def serialized_size(samples):
+    """Returns the arrays of the ``samples`` and the number of bytes needed to store them."""
+    size = 0
+    sample_arrays = []
+    for sample in samples:
+        arrays = [_to_array(x) for x in sample]
+        for arr in arrays:
+            size = _align_up(size) + arr.nbytes
+        sample_arrays.append(arrays)
+    return sample_arrays, size
+
+
+def write_samples(shm, sample_arrays):
+    """Copies the arrays to the shared memory chunk and returns a list of `SampleMeta`."""
+    metas = []
+    offset = 0
+    for arrays in sample_arrays:
+        descs = []
+        for arr in arrays:
+            offset = _align_up(offset)
+            dst = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, offset=offset)
+            dst[...] = arr
+            del dst
+            descs.append((offset, arr.shape, arr.dtype.str))
+            offset += arr.nbytes
+        metas.append(SampleMeta(descs))
+    return metas
+
+
+def read_samples(shm, metas):
+    """Creates NumPy arrays viewing the samples described by ``metas``."""
+    return [[np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+             for offset, shape, dtype in meta.arrays] for meta in metas]
@@ -0,0 +1,98 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import traceback
+from nvidia.dali._multiproc.shared_mem import SharedMem, serialized_size, write_samples
+
+
+class ScheduledTask(object):
+    """Part of a batch that a single worker is asked to produce.
+
+    `context_idx`: index of the parallel callback in the pool
+    `batch_id`:    consecutive number of the batch requested from that callback
+    `slot`:        index of the shared memory chunk that the worker should write the samples to
+    `args`:        list of argument tuples - the callback is invoked once for each of them
+    """
+    def __init__(self, context_idx, batch_id, slot, args):
+        self.context_idx = context_idx
+        self.batch_id = batch_id
+        self.slot = slot
+        self.args = args
+
+
+class CompletedTask(object):
+    """Reply sent by a worker when it processed a `ScheduledTask`.
+
+    If the callback succeeded, ``shm_name`` and ``capacity`` identify the shared memory chunk
+    holding the samples described by ``metas``. If the callback signalled the end of data,
+    ``stop_iteration`` is set. Otherwise, ``error`` contains the formatted traceback.
+    """
+    def __init__(self, worker_id, context_idx, batch_id, slot, shm_name = None, capacity = 0,
+                 metas = None, stop_iteration = False, error = None):
+        self.worker_id = worker_id
+        self.context_idx = context_idx
+        self.batch_id = batch_id
+        self.slot = slot
+        self.shm_name = shm_name
+        self.capacity = capacity
+        self.metas = metas
+        self.stop_iteration = stop_iteration
+        self.error = error
+
+
+def _as_tuple(sample, is_multioutput):
+    if is_multioutput:
+        return tuple(sample)
+    return (sample,)
+
+
+def worker(worker_id, callbacks, multioutput, task_pipe, result_queue):
+    """Main loop of a worker process.
+
+    Receives `ScheduledTask` objects through ``task_pipe``, runs the requested callback for every
+    sample of the task, places the results in a shared memory chunk and replies with
+    a `CompletedTask`. The loop ends when ``None`` is received instead of a task.
+    """
+    chunks = {}
+    try:
+        while True:
+            task = task_pipe.recv()
+            if task is None:
+                break
+            callback = callbacks[task.context_idx]
+            try:
+                samples = [_as_tuple(callback(*args), multioutput[task.context_idx])
+                           for args in task.args]
+                sample_arrays, size = serialized_size(samples)
+                key = (task.context_idx, task.slot)
+                shm = chunks.get(key)
+                if shm is None or shm.capacity < size:
+                    if shm is not None:
+                        shm.close()
+                    # leave some headroom to avoid reallocation on every slightly larger batch
+                    shm = SharedMem.allocate(int(size * 1.1))
+                    chunks[key] = shm
+                metas = write_samples(shm, sample_arrays)
+                reply = CompletedTask(worker_id, task.context_idx, task.batch_id, task.slot,
+                                      shm_name=shm.name, capacity=shm.capacity, metas=metas)
+            except StopIteration:
+                reply = CompletedTask(worker_id, task.context_idx, task.batch_id, task.slot,
+                                      stop_iteration=True)
+            except Exception:
+                reply = CompletedTask(worker_id, task.context_idx, task.batch_id, task.slot,
+                                      error=traceback.format_exc())
+            result_queue.put(reply)
+    finally:
+        for shm in chunks.values():
+            shm.close()
@@ -1,8 +1,32 @@
 # custom wrappers around ops
 from nvidia.dali import backend as _b
+import asyncio
 import inspect
+import queue
+import threading
+import time
 import nvidia.dali.types
 
+_loop_tls = threading.local()
+
+def _run_coroutine(awaitable):
+    """Runs the awaitable to completion in an event loop private to the calling thread."""
+    loop = getattr(_loop_tls, "event_loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _loop_tls.event_loop = loop
+    try:
+        return loop.run_until_complete(awaitable)
+    except StopAsyncIteration:
+        raise StopIteration
+
+async def _gather(awaitables):
+    return await asyncio.gather(*awaitables)
+
+def _monotonic_ns():
+    # time.monotonic uses the same clock as the backend (time.monotonic_ns needs Python 3.7)
+    return int(time.monotonic() * 1e9)
+
 def _get_batch_shape(data):
     if isinstance(data, (list, tuple, _b.TensorListCPU, _b.TensorListGPU)):
         if len(data) == 0:
@@ -17,12 +41,18 @@ def _get_batch_shape(data):
             shape = data.shape()
         return [shape[1:]] * shape[0], True
 
+def _get_batch_size(data, default):
+    try:
+        return len(_get_batch_shape(data)[0])
+    except Exception:
+        return default
+
 def _check_data_batch(data, batch_size, layout):
     shape, uniform = _get_batch_shape(data)
-    if len(shape) != batch_size:
+    if not 0 < len(shape) <= batch_size:
         raise RuntimeError("The external source callback returned an unexpected batch "
-                           "size. Expected batch_size == {}, actual: {}".format(batch_size,
-                                                                                len(shape)))
+                           "size. Expected 0 < batch_size <= {}, actual: {}".format(batch_size,
+                                                                                   len(shape)))
 
     if len(shape) > 0:
         dim = len(shape[0])
@@ -63,14 +93,47 @@ class _CycleGenFunc():
             self.it = iter(self.source())
             return next(self.it)
 
+class _CycleAsyncIter():
+    def __init__(self, iterable):
+        self.source = iterable
+
+    def __aiter__(self):
+        self.it = self.source.__aiter__()
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.it.__anext__()
+        except StopAsyncIteration:
+            self.it = self.source.__aiter__()
+            return await self.it.__anext__()
+
+class _CycleAsyncGenFunc():
+    def __init__(self, gen_func):
+        self.source = gen_func
+
+    def __aiter__(self):
+        self.it = self.source()
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.it.__anext__()
+        except StopAsyncIteration:
+            self.it = self.source()
+            return await self.it.__anext__()
+
 class _ExternalSourceGroup(object):
-    def __init__(self, callback, is_multioutput, instances = [], cuda_stream = None, use_copy_kernel = None, batch = True):
+    def __init__(self, callback, is_multioutput, instances = [], cuda_stream = None, use_copy_kernel = None, batch = True,
+                 parallel = False, prefetch_queue_depth = None):
         self.instances = list(instances)  # we need a copy!
         self.is_multioutput = is_multioutput
         self.callback = callback
         self._cuda_stream = cuda_stream
         self.use_copy_kernel = use_copy_kernel
         self.batch = batch
+        self.parallel = parallel
+        self.prefetch_queue_depth = prefetch_queue_depth
         self.current_iter = 0
         self.current_sample = 0
         if callback is not None:
@@ -81,31 +144,52 @@ class _ExternalSourceGroup(object):
     def append(self, instance):
         self.instances.append(instance)
 
-    def callback_args(self, idx_in_batch):
+    def callback_args(self, idx_in_batch, iter_offset = 0, batch_size = 0):
+        """Arguments of the callback call. The ``iter_offset`` and ``batch_size`` are used
+        when the arguments are computed ahead of time for the following iterations."""
         if not self.accepts_arg:
             return ()
+        iteration = self.current_iter + iter_offset
         if idx_in_batch is not None:
-            arg = nvidia.dali.types.SampleInfo(self.current_sample + idx_in_batch, idx_in_batch, self.current_iter)
+            idx_in_epoch = self.current_sample + iter_offset * batch_size + idx_in_batch
+            arg = nvidia.dali.types.SampleInfo(idx_in_epoch, idx_in_batch, iteration)
         else:
-            arg = self.current_iter
+            arg = iteration
         return (arg,)
 
     def reset_indices(self):
         self.current_iter = 0
         self.current_sample = 0
 
-    def call_and_feed(self, pipeline, batch_size):
+    def call(self, pipeline, batch_size):
+        """Runs the callback for the next iteration and returns its output.
+        Coroutines returned by ``async def`` callbacks are awaited - for per-sample callbacks,
+        the coroutines of the whole batch are awaited concurrently."""
         try:
-            if self.batch:
+            if self.parallel:
+                callback_out = pipeline._py_pool.receive_batch(self.pool_context_idx, batch_size)
+            elif self.batch:
                 callback_out = self.callback(*self.callback_args(None))
+                if inspect.isawaitable(callback_out):
+                    callback_out = _run_coroutine(callback_out)
+                # the batch callbacks can return batches smaller than the maximum batch size
+                if not self.is_multioutput:
+                    batch_size = _get_batch_size(callback_out, batch_size)
             else:
                 callback_out = [self.callback(*self.callback_args(i)) for i in range(batch_size)]
+                if any(inspect.isawaitable(sample) for sample in callback_out):
+                    callback_out = _run_coroutine(_gather(callback_out))
             self.current_sample += batch_size
             self.current_iter += 1
         except StopIteration:
             self.reset_indices()
             raise
+        return callback_out
+
+    def call_and_feed(self, pipeline, batch_size):
+        self.feed(pipeline, self.call(pipeline, batch_size), batch_size)
 
+    def feed(self, pipeline, callback_out, batch_size):
         if self.is_multioutput:
             for op in self.instances:
                 if self.batch:
@@ -115,10 +199,98 @@ class _ExternalSourceGroup(object):
                     data = [callback_out[i][op._output_index] for i in range(batch_size)]
                 pipeline.feed_input(op._name, data, op._layout, self._cuda_stream, self.use_copy_kernel)
         else:
-            data = callback_out
+            if self.parallel:
+                data = [sample[0] for sample in callback_out]
+            else:
+                data = callback_out
             op = self.instances[0]
             pipeline.feed_input(op._name, data, op._layout, self._cuda_stream, self.use_copy_kernel)
 
+        if self.parallel:
+            # the data was copied by feed_input, so the workers can reuse the memory
+            pipeline._py_pool.schedule_next(self.pool_context_idx, batch_size)
+
+class _CallbackPrefetcher(object):
+    """Runs the callbacks of the external sources in a background thread.
+
+    The outputs of the callbacks are computed up to ``depth`` iterations ahead and stored in
+    a bounded queue, from which they are taken (and fed to the pipeline) by the thread that runs
+    the pipeline. When the callbacks signal the end of data or raise an error, the background
+    thread exits; :meth:`reset` starts it again from the first iteration.
+    """
+    def __init__(self, groups, batch_size, depth):
+        self._groups = groups
+        self._batch_size = batch_size
+        self._depth = depth
+        self._thread = None
+        self._error = None
+        self._start()
+
+    @property
+    def groups(self):
+        return self._groups
+
+    def _start(self):
+        self._stopped = False
+        self._error = None
+        self._queue = queue.Queue(maxsize=self._depth)
+        self._thread = threading.Thread(target=self._loop, daemon=True,
+                                        name="DALI external source prefetcher")
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stopped:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _loop(self):
+        while not self._stopped:
+            outputs = []
+            times = []
+            try:
+                for group in self._groups:
+                    start = _monotonic_ns()
+                    outputs.append(group.call(None, self._batch_size))
+                    times.append((start, _monotonic_ns()))
+            except Exception as err:  # StopIteration included
+                self._put((None, err))
+                return
+            if not self._put(((outputs, times), None)):
+                return
+
+    def next_outputs(self):
+        """Returns the list of outputs of the callbacks for the next iteration and the list
+        of the (start, end) times of the callbacks, in nanoseconds."""
+        while True:
+            try:
+                outputs, err = self._queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if not self._thread.is_alive() and self._queue.empty():
+                    if self._error is not None:
+                        raise self._error
+                    raise RuntimeError("The external source prefetching thread is not running.")
+        if err is not None:
+            self._error = err
+            raise err
+        return outputs
+
+    def stop(self):
+        self._stopped = True
+        if self._thread is not None:
+            self._thread.join()
+
+    def reset(self):
+        """Discards the prefetched data and restarts the callbacks from the first iteration."""
+        self.stop()
+        for group in self._groups:
+            group.reset_indices()
+        self._start()
+
 def _is_generator_function(x):
     """Checks whether x is a generator function or a callable object
     where __call__ is a generator function"""
@@ -129,8 +301,34 @@ def _is_generator_function(x):
     call = getattr(x, "__call__", None)
     return _is_generator_function(call)
 
+def _check_parallel_source(source):
+    if source is None:
+        return
+    if inspect.isgenerator(source) or _is_generator_function(source) or \
+            hasattr(source, "__iter__") or not callable(source):
+        raise TypeError("Parallel external source requires ``source`` to be a callable - "
+                        "iterables and generators cannot be split among the worker processes.")
+
+def _is_async_iterable(x):
+    return x is not None and (inspect.isasyncgen(x) or hasattr(x, "__aiter__"))
+
 def _get_callback_from_source(source, cycle):
     iterable = False
+    if inspect.isasyncgenfunction(source) or _is_async_iterable(source):
+        if cycle:
+            if inspect.isasyncgen(source):
+                raise TypeError("Cannot cycle through an asynchronous generator - if the generator "
+                    "is a result of calling an asynchronous generator function, pass that function "
+                    "instead as `source`.")
+            if inspect.isasyncgenfunction(source):
+                iterator = _CycleAsyncGenFunc(source).__aiter__()
+            else:
+                iterator = _CycleAsyncIter(source).__aiter__()
+        else:
+            if inspect.isasyncgenfunction(source):
+                source = source()
+            iterator = source.__aiter__()
+        return lambda: _run_coroutine(iterator.__anext__())
     if source is not None:
         try:
             if cycle:
@@ -215,6 +413,11 @@ Args
     However, unlike a generator, the function can be used with ``cycle``. In this case, the function
     will be called again when the generator reaches the end of iteration.
 
+    The source can also be a coroutine function (``async def``), an asynchronous generator
+    function or an asynchronous iterable. Coroutines returned by a per-sample source are awaited
+    concurrently for all samples in the batch. See the ``py_callback_thread`` argument of
+    :class:`Pipeline` for running the sources in a background thread.
+
     For GPU inputs, it is a user's responsibility to modify the provided GPU memory content
     only in the provided stream. DALI schedules a copy on this stream, and all work is properly
     queued. If no stream is provided, DALI will use a default, with a best-effort approach at
@@ -299,10 +502,30 @@ Keyword Args
 `batch` : bool, optional
     If set to ``True`` or ``None``, the ``source`` is expected to produce an entire batch at once.
     If set to ``False``, the ``source`` is called per-sample.
+
+`parallel` : bool, optional, default = False
+    If set to ``True``, the ``source`` is run in a pool of Python worker processes started
+    by the pipeline. The number of workers and the way they are started is controlled with
+    the ``py_num_workers`` and ``py_start_method`` arguments of the :class:`Pipeline`.
+
+    The samples of each batch are split among the workers and the workers place the results
+    in shared memory, from which they are fed to the pipeline.
+
+    The parallel mode requires that ``batch`` is set to ``False`` and that the ``source`` is
+    a callable (not an iterable nor a generator), which is either stateless or depends only on
+    the :class:`nvidia.dali.types.SampleInfo` argument - each worker runs its own copy of
+    the ``source``. The samples must be NumPy arrays or objects convertible to them.
+
+    The end of data is signalled by raising StopIteration from the ``source``.
+
+`prefetch_queue_depth` : int, optional, default = 1
+    Applicable only when ``parallel`` is set to ``True``. The number of batches that
+    the workers compute ahead of the current iteration.
 """
 
     def __init__(self, source = None, num_outputs = None, *, cycle = None, layout = None, name = None, device = "cpu",
-                 cuda_stream = None, use_copy_kernel = None, batch = None, **kwargs):
+                 cuda_stream = None, use_copy_kernel = None, batch = None, parallel = None,
+                 prefetch_queue_depth = None, **kwargs):
         self._schema = _b.GetSchema("_ExternalSource")
         self._spec = _b.OpSpec("_ExternalSource")
         self._device = device
@@ -322,6 +545,10 @@ Keyword Args
         self._num_outputs = num_outputs
         self._batch = batch
         self._callback = callback
+        self._parallel = parallel
+        self._prefetch_queue_depth = prefetch_queue_depth
+        if parallel:
+            _check_parallel_source(source)
 
         self._spec.AddArg("device", device)
         for key, value in kwargs.items():
@@ -344,7 +571,8 @@ Keyword Args
         return False
 
     def __call__(self, *, source = None, cycle = None, name = None, layout = None, cuda_stream = None,
-                 use_copy_kernel = None, batch = None, **kwargs):
+                 use_copy_kernel = None, batch = None, parallel = None, prefetch_queue_depth = None,
+                 **kwargs):
         ""
         from nvidia.dali.ops import _OperatorInstance
 
@@ -372,6 +600,33 @@ Keyword Args
         if batch is None:
             batch = True
 
+        if parallel is None:
+            parallel = self._parallel or False
+        elif self._parallel is not None:
+            raise ValueError("The argument ``parallel`` already specified in constructor.")
+
+        if prefetch_queue_depth is None:
+            prefetch_queue_depth = self._prefetch_queue_depth
+        elif self._prefetch_queue_depth is not None:
+            raise ValueError("The argument ``prefetch_queue_depth`` already specified in constructor.")
+
+        if parallel:
+            if source is not None:
+                _check_parallel_source(source)
+            if callback is None:
+                raise ValueError("The argument ``parallel`` can only be used together with ``source``.")
+            if batch:
+                raise ValueError("Parallel external source requires ``batch`` set to False - "
+                                 "the ``source`` is called per-sample in the worker processes.")
+            if prefetch_queue_depth is None:
+                prefetch_queue_depth = 1
+            if prefetch_queue_depth < 1:
+                raise ValueError("``prefetch_queue_depth`` must be a positive integer, got {}."
+                                 .format(prefetch_queue_depth))
+        elif prefetch_queue_depth is not None:
+            raise ValueError("The argument ``prefetch_queue_depth`` is only valid for parallel "
+                             "external source.")
+
         if self._layout is not None:
             if layout is not None:
                 raise RuntimeError("``layout`` already specified in constructor.")
@@ -399,7 +654,8 @@ Keyword Args
         if self._num_outputs is not None:
             outputs = []
             kwargs = {}
-            group = _ExternalSourceGroup(callback, True, cuda_stream=cuda_stream, use_copy_kernel=use_copy_kernel, batch=batch)
+            group = _ExternalSourceGroup(callback, True, cuda_stream=cuda_stream, use_copy_kernel=use_copy_kernel, batch=batch,
+                                         parallel=parallel, prefetch_queue_depth=prefetch_queue_depth)
             for i in range(self._num_outputs):
                 op_instance = _OperatorInstance([], self, **kwargs)
                 op_instance._callback = callback
@@ -425,7 +681,9 @@ Keyword Args
             op_instance._callback = callback
             op_instance._output_index = None
             op_instance._group = _ExternalSourceGroup(callback, False, [op_instance], cuda_stream=cuda_stream,
-                                                      use_copy_kernel=use_copy_kernel, batch=batch)
+                                                      use_copy_kernel=use_copy_kernel, batch=batch,
+                                                      parallel=parallel,
+                                                      prefetch_queue_depth=prefetch_queue_depth)
             op_instance._layout = layout
             op_instance.generate_outputs()
 
@@ -438,8 +696,12 @@ Keyword Args
 def _is_external_source_with_callback(op_instance):
     return isinstance(op_instance._op, ExternalSource) and op_instance._callback is not None
 
+def _is_parallel_external_source(op_instance):
+    return _is_external_source_with_callback(op_instance) and op_instance._group.parallel
+
 def external_source(source = None, num_outputs = None, *, cycle = None, name = None, device = "cpu", layout = None,
-                    cuda_stream = None, use_copy_kernel = None, batch = True, **kwargs):
+                    cuda_stream = None, use_copy_kernel = None, batch = True, parallel = False,
+                    prefetch_queue_depth = None, **kwargs):
     """Creates a data node which is populated with data from a Python source.
 The data can be provided by the ``source`` function or iterable, or it can be provided by
 ``pipeline.feed_input(name, data, layout, cuda_stream)`` inside ``pipeline.iter_setup``.
@@ -468,7 +730,8 @@ provided memory is copied to the internal buffer.
 
     op = ExternalSource(device = device, num_outputs = num_outputs, source = source,
                         cycle = cycle, layout = layout, cuda_stream = cuda_stream,
-                        use_copy_kernel = use_copy_kernel, batch = batch, **kwargs)
+                        use_copy_kernel = use_copy_kernel, batch = batch, parallel = parallel,
+                        prefetch_queue_depth = prefetch_queue_depth, **kwargs)
     return op(name = name)
 
 external_source.__doc__ += ExternalSource._args_doc
@@ -304,6 +304,8 @@ class _OperatorInstance(object):
 
         spec_args, kwargs = _separate_kwargs(kwargs)
         _add_spec_args(op._schema, self._spec, spec_args)
+        self._spec_args = spec_args
+        self._argument_input_names = []
 
         call_args = {**self._default_call_args}
         for k, v in kwargs.items():
@@ -345,6 +347,7 @@ class _OperatorInstance(object):
                                 .format(k, type(arg_inp).__name__)) from e
                 self._spec.AddArgumentInput(k, arg_inp.name)
                 self._inputs = list(self._inputs) + [arg_inp]
+                self._argument_input_names.append(k)
 
         if self._op.schema.IsDeprecated():
             use_instead = self._op.schema.DeprecatedInFavorOf()
@@ -358,6 +361,31 @@ class _OperatorInstance(object):
     def check_args(self):
         self._op.schema.CheckArgs(self._spec)
 
+    def replace_inputs(self, replacement):
+        """Replaces the inputs of the instance with the DataNodes returned by ``replacement``.
+
+        ``replacement`` is called for every input DataNode and returns the node that should be
+        used instead (or the same node). The names of the inputs in the spec are updated.
+        """
+        if not self._inputs:
+            return
+        idx = 0
+        def replace(inp):
+            nonlocal idx
+            new_inp = replacement(inp)
+            if new_inp is not inp:
+                self._spec.RenameInput(idx, new_inp.name)
+            idx += 1
+            return new_inp
+
+        inputs = []
+        for inp in self._inputs:
+            if isinstance(inp, list):
+                inputs.append([replace(x) for x in inp])
+            else:
+                inputs.append(replace(inp))
+        self._inputs = type(self._inputs)(inputs)
+
     def generate_outputs(self):
         pipeline = _Pipeline.current()
         if pipeline is None and self._op.preserve:
@@ -408,6 +436,23 @@ class _OperatorInstance(object):
     def spec(self):
         return self._spec
 
+    @property
+    def op(self):
+        return self._op
+
+    @property
+    def spec_args(self):
+        """Arguments of the instance (including the ones passed to the operator's constructor)
+        stored in the spec. Returns None if they are not known."""
+        init_args = getattr(self._op, "_init_args", None)
+        if init_args is None:
+            return None
+        return {**init_args, **self._spec_args}
+
+    @property
+    def argument_input_names(self):
+        return self._argument_input_names
+
     @property
     def name(self):
         return self._name
@@ -477,6 +522,7 @@ def python_op_factory(name, schema_name = None, op_device = "cpu"):
 
             # Store the specified arguments
             _add_spec_args(self._schema, self._spec, kwargs)
+            self._init_args = kwargs
 
         @property
         def spec(self):
@@ -650,12 +696,17 @@ class TFRecordReader(metaclass=_DaliOperatorMeta):
     global _cpu_ops
     _cpu_ops = _cpu_ops.union({'TFRecordReader'})
 
-    def __init__(self, path, index_path, features, **kwargs):
+    def __init__(self, path, index_path=None, features=None, **kwargs):
+        if features is None:
+            raise TypeError("TFRecordReader requires the `features` argument")
         if isinstance(path, list):
             self._path = path
         else:
             self._path = [path]
-        if isinstance(index_path, list):
+        if index_path is None:
+            # the index is built by the reader
+            self._index_path = []
+        elif isinstance(index_path, list):
             self._index_path = index_path
         else:
             self._index_path = [index_path]
@@ -664,7 +715,8 @@ class TFRecordReader(metaclass=_DaliOperatorMeta):
         self._device = "cpu"
 
         self._spec.AddArg("path", self._path)
-        self._spec.AddArg("index_path", self._index_path)
+        if self._index_path:
+            self._spec.AddArg("index_path", self._index_path)
 
         kwargs, self._call_args = _separate_kwargs(kwargs)
 
@@ -756,9 +808,6 @@ class PythonFunctionBase(metaclass=_DaliOperatorMeta):
         pipeline = _Pipeline.current()
         if pipeline is None:
             _Pipeline._raise_pipeline_required("PythonFunction operator")
-        if pipeline.exec_async or pipeline.exec_pipelined:
-            raise RuntimeError("PythonFunction can be used only in pipelines with `exec_async` and "
-                               "`exec_pipelined` set to False.")
         if (len(inputs) > self._schema.MaxNumInput() or
                 len(inputs) < self._schema.MinNumInput()):
             raise ValueError(
@@ -838,6 +887,18 @@ class PythonFunction(PythonFunctionBase):
         else:
             return [to_dlpack(out) for out in arr_outs]
 
+    @staticmethod
+    def _function_wrapper_pool(pool, function, *dlpack_inputs):
+        # Per-sample function run concurrently for all the samples in the batch
+        arrays = [[_dlpack_to_array(dlpack) for dlpack in dl_input] for dl_input in dlpack_inputs]
+        arr_outs = list(pool.map(function, *arrays))
+        if len(arr_outs) == 0 or arr_outs[0] is None:
+            return
+        if isinstance(arr_outs[0], tuple) or isinstance(arr_outs[0], list):
+            return tuple([_dlpack_from_array(out) for out in outs] for outs in zip(*arr_outs))
+        else:
+            return [_dlpack_from_array(out) for out in arr_outs]
+
     @staticmethod
     def _function_wrapper_cpu(batch_processing, function, *dlpack_inputs):
         if batch_processing:
@@ -869,18 +930,33 @@ class PythonFunction(PythonFunctionBase):
                                                               lambda t: t.toDlpack(),
                                                               *dlpack_inputs)
 
-    def __init__(self, function, num_outputs=1, device='cpu', batch_processing=False, **kwargs):
+    def __init__(self, function, num_outputs=1, device='cpu', batch_processing=False, pool=None,
+                 **kwargs):
         if device == 'gpu':
             _setup_cupy()
-        func = (lambda *ts: PythonFunction._function_wrapper_cpu(batch_processing, function, *ts))\
-               if device == 'cpu' else \
-               (lambda *ts: PythonFunction._function_wrapper_gpu(batch_processing, function, *ts))
+        if pool is not None:
+            if device != 'cpu' or batch_processing:
+                raise ValueError("The argument `pool` can be used only with the per-sample "
+                                 "(`batch_processing=False`) CPU PythonFunction.")
+            func = lambda *ts: PythonFunction._function_wrapper_pool(pool, function, *ts)
+            # the batch is passed to the wrapper at once and split among the pool's workers
+            batch_processing = True
+        elif device == 'cpu':
+            func = lambda *ts: PythonFunction._function_wrapper_cpu(batch_processing, function, *ts)
+        else:
+            func = lambda *ts: PythonFunction._function_wrapper_gpu(batch_processing, function, *ts)
+        self._pool = pool
         super(PythonFunction, self).__init__(impl_name="DLTensorPythonFunctionImpl",
                                              function=func,
                                              num_outputs=num_outputs, device=device,
                                              synchronize_stream=False,
                                              batch_processing=batch_processing, **kwargs)
 
+    def __call__(self, *inputs, **kwargs):
+        if self._pool is not None and len(inputs) == 0:
+            raise ValueError("PythonFunction with a `pool` requires at least one input.")
+        return super(PythonFunction, self).__call__(*inputs, **kwargs)
+
 
 class DLTensorPythonFunction(PythonFunctionBase):
     global _cpu_ops
@@ -1051,6 +1127,10 @@ def _arithm_op(name, *inputs):
     # Create "instance" of operator
     op = ArithmeticGenericOp(device = dev, expression_desc = expression_desc,
                              integer_constants = integers, real_constants = reals)
+    # Keep the structure of the expression, so it can be fused with the neighbouring ones
+    constants = {"integer": integers, "real": reals}
+    op._expression = (name, [(category, idx if category == "edge" else constants[category][idx])
+                             for category, idx in categories_idxs])
     # If we are on gpu, we must mark all inputs as gpu
     if dev == "gpu":
         dev_inputs = list(edge.gpu() for edge in edges)
@@ -1059,6 +1139,48 @@ def _arithm_op(name, *inputs):
     # Call it immediately
     return op(*dev_inputs)
 
+# Generate the description of a nested expression. The `expression` is a tuple of the function
+# name and a list of its arguments - (category, value) pairs, where the category is one of
+# "edge" (the value is a _DataNode), "integer", "real" or "call" (the value is a subexpression).
+# The inputs and constants are appended to `edges`, `integers` and `reals`.
+# Returns the description and the expression with the _DataNodes replaced by their indices.
+def _generate_expression_desc(expression, edges, edge_idxs, integers, reals):
+    name, args = expression
+    descs = []
+    indexed_args = []
+    for category, value in args:
+        if category == "call":
+            desc, value = _generate_expression_desc(value, edges, edge_idxs, integers, reals)
+        elif category == "edge":
+            key = (value.name, value.device)
+            if key not in edge_idxs:
+                edge_idxs[key] = len(edges)
+                edges.append(value)
+            value = edge_idxs[key]
+            desc = "&{}".format(value)
+        elif category == "integer":
+            desc = "${}:{}".format(len(integers), _to_type_desc(value))
+            integers.append(value)
+        elif category == "real":
+            desc = "${}:{}".format(len(reals), _to_type_desc(value))
+            reals.append(value)
+        descs.append(desc)
+        indexed_args.append((category, value))
+    return "{}({})".format(name, " ".join(descs)), (name, indexed_args)
+
+# Create a CPU ArithmeticGenericOp computing the nested `expression` (see _generate_expression_desc)
+# and call it. Used to fuse the chains of arithmetic operators.
+def _fused_arithm_op(expression, name):
+    edges = []
+    integers = []
+    reals = []
+    expression_desc, indexed_expression = _generate_expression_desc(expression, edges, {},
+                                                                     integers, reals)
+    op = ArithmeticGenericOp(device = "cpu", expression_desc = expression_desc,
+                             integer_constants = integers or None, real_constants = reals or None)
+    op._expression = indexed_expression
+    return op(*edges, name = name)
+
 
 def cpu_ops():
     return _cpu_ops
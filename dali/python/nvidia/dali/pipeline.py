@@ -1,4 +1,4 @@
-# Copyright (c) 2017-2020, NVIDIA CORPORATION. All rights reserved.
+# Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -13,14 +13,15 @@
 # limitations under the License.
 
 #pylint: disable=no-member
-from collections import deque
 from nvidia.dali import backend as b
 from nvidia.dali import tensors as Tensors
 from nvidia.dali import types
 from nvidia.dali.backend import CheckDLPackCapsule
 from threading import local as tls
 from . import data_node as _data_node
+from . import _graph
 import warnings
+import weakref
 import ctypes
 pipeline_tls = tls()
 
@@ -105,13 +106,73 @@ Parameters
 `enable_memory_stats`: bool, optional, default = False
     If DALI should print operator output buffer statistics.
     Usefull for `bytes_per_sample_hint` operator parameter.
+`py_num_workers`: int, optional, default = 1
+    The number of Python worker processes started to run the ``source`` callbacks of
+    the external sources created with ``parallel=True``. The workers are started when
+    the pipeline is built.
+`py_start_method`: str, default = "fork"
+    The way the Python workers are started - one of the start methods supported by
+    Python's ``multiprocessing`` module: ``"fork"``, ``"spawn"`` or ``"forkserver"``.
+    With ``"spawn"`` and ``"forkserver"`` the callbacks must be picklable.
+    ``"fork"`` should not be used once CUDA has been initialized in the process.
+`py_callback_thread`: bool, optional, default = False
+    If set to True, the ``source`` callbacks of the external sources are run in a background
+    thread, up to ``prefetch_queue_depth`` (or ``cpu_size``) iterations ahead of the iteration
+    being scheduled, so that producing the input data overlaps with the execution of the pipeline
+    instead of stalling :meth:`run` or :meth:`schedule_run`. Coroutine functions (``async def``)
+    and asynchronous generators used as a ``source`` are run in an event loop owned by
+    that thread.
+
+    The callbacks of the parallel external sources are not affected - they already run
+    in the worker processes.
+`merge_duplicate_ops`: bool, optional, default = False
+    If set to True, the graph is optimized before it is passed to the backend: the instances
+    of deterministic, side-effect free operators (constants, arithmetic expressions, casts,
+    reshapes, etc.) that have the same arguments and the same inputs are merged into one,
+    so that, for example, the same constant or expression used in many branches of the graph
+    is computed only once per iteration. Operators with ``preserve=True`` and operators that
+    use random number generators are never merged.
+`fuse_arithmetic_ops`: bool, optional, default = False
+    If set to True, chains of arithmetic operations on CPU DataNodes (e.g. ``(x - m) * s``
+    or ``math.clamp(x * s, 0, 1)``) are collapsed into single operators evaluating the whole
+    expression, so the intermediate results are not stored in full. An operation is fused with
+    the one producing its input only if that result is not used anywhere else in the graph
+    and it is not an output of the pipeline.
+`enable_profiling`: bool, optional, default = False
+    If set to True, the pipeline records the wall time of each operator, the time each stage
+    of the executor waits for its buffers, the time the readers wait for their prefetching threads
+    and the time spent in the Python callbacks (``python_function`` and the ``source``
+    of the external sources). The results can be obtained with :meth:`profile` or saved with
+    :meth:`export_chrome_trace`.
+`enable_checkpointing`: bool, optional, default = False
+    If set to True, the readers save their states as they prefetch the batches, so that
+    the state matching the last returned batch can be obtained with :meth:`reader_state`.
+    Saving the states adds some work to every batch read, so it is disabled by default.
+`cpu_op_concurrency`: int, optional, default = 1
+    Maximum number of CPU operators run at the same time. The operators that do not depend
+    on each other (e.g. the processing of the images and of the bounding boxes, or the random
+    number generators) are started as soon as their inputs are ready. An operator uses the
+    main thread pool of the pipeline if it is free, or an additional pool of
+    ``num_threads // cpu_op_concurrency`` threads (at least one) otherwise.
+    By default, the CPU operators are run one by one.
+`cpu_iteration_overlap`: bool, optional, default = False
+    If set to True, the CPU operators of the next iterations can start before the current
+    iteration is finished, e.g. the reader and the decoder can process the next batch while
+    the last operators still work on the current one, so that a few slow samples do not stall
+    the following batches. Each operator processes the iterations in order and the number of
+    iterations in progress is limited by the (CPU) ``prefetch_queue_depth``.
+    Requires ``exec_async=True`` and ``exec_pipelined=True``. Unless ``cpu_op_concurrency``
+    is greater, two CPU operators are run at the same time.
 """
     def __init__(self, batch_size = -1, num_threads = -1, device_id = -1, seed = -1,
                  exec_pipelined=True, prefetch_queue_depth=2,
                  exec_async=True, bytes_per_sample=0,
                  set_affinity=False, max_streams=-1, default_cuda_stream_priority = 0,
                  *,
-                 enable_memory_stats=False):
+                 enable_memory_stats=False, py_num_workers=1, py_start_method="fork",
+                 py_callback_thread=False, merge_duplicate_ops=False,
+                 fuse_arithmetic_ops=False, enable_profiling=False, enable_checkpointing=False,
+                 cpu_op_concurrency=1, cpu_iteration_overlap=False):
         self._sinks = []
         self._max_batch_size = batch_size
         self._num_threads = num_threads
@@ -139,6 +200,20 @@ Parameters
         self._graph_out = None
         self._input_callbacks = None
         self._enable_memory_stats = enable_memory_stats
+        self._py_num_workers = py_num_workers
+        self._py_start_method = py_start_method
+        self._py_pool = None
+        self._parallel_input_callbacks = []
+        self._py_callback_thread = py_callback_thread
+        self._callback_prefetcher = None
+        self._merge_duplicate_ops = merge_duplicate_ops
+        self._fuse_arithmetic_ops = fuse_arithmetic_ops
+        self._enable_profiling = enable_profiling
+        self._enable_checkpointing = enable_checkpointing
+        self._cpu_op_concurrency = cpu_op_concurrency
+        self._cpu_iteration_overlap = cpu_iteration_overlap
+        self._callbacks_iter = 0
+        self._returned_batches = 0
         if type(prefetch_queue_depth) is dict:
             self._exec_separated = True
             self._cpu_queue_size = prefetch_queue_depth["cpu_size"]
@@ -218,6 +293,103 @@ Parameters
             raise RuntimeError("Pipeline must be built first.")
         return self._pipe.executor_statistics()
 
+    def profile(self, reset = False):
+        """Returns the timings recorded by the pipeline as a dictionary.
+        To enable the profiling, pass ``enable_profiling=True`` to the pipeline constructor.
+        All the times are given in seconds.
+
+        Available keys:
+
+        ``operators``:       dictionary of ``{operator name : stats}`` with the wall time of each
+                             operator; for the mixed and gpu operators, this is the time
+                             of scheduling the work, not of its execution on the GPU
+
+        ``queue_wait``:      dictionary of ``{stage : stats}`` with the time each stage
+                             (``"cpu"``, ``"mixed"`` and ``"gpu"``) of the executor waited
+                             for free buffers or for the results of the previous stage
+
+        ``reader_stall``:    dictionary of ``{reader name : stats}`` with the time the readers
+                             waited for their prefetching threads to provide a batch
+
+        ``python_callback``: dictionary of ``{operator name : stats}`` with the time spent
+                             in the Python callbacks
+
+        ``iterations``:      list of the most recent iterations, ordered by the iteration number,
+                             each being a dictionary with ``iteration`` (the number of the
+                             iteration) and the total time of each of the above categories
+                             in that iteration, e.g.
+                             ``{"iteration": 3, "operators": {"decoder": 0.02}, ...}``
+
+        The stats are dictionaries with ``stage``, ``count``, ``total``, ``mean``, ``min``
+        and ``max`` keys, accumulated since the pipeline was built or the profile was reset.
+
+        Parameters
+        ----------
+        reset : bool, optional, default = False
+            If set to True, the recorded timings are cleared after they are returned.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        stats = self._pipe.profiler_stats()
+        events = self._pipe.profiler_events()
+        if reset:
+            self._pipe.ResetProfiler()
+
+        categories = ("operators", "queue_wait", "reader_stall", "python_callback")
+        category_of = {"operator": "operators", "queue_wait": "queue_wait",
+                       "reader_stall": "reader_stall", "python_callback": "python_callback"}
+        ns = 1e-9
+        result = {category: {} for category in categories}
+        for event_type, stage, name, count, total, min_time, max_time in stats:
+            result[category_of[event_type]][name] = {
+                "stage": stage,
+                "count": count,
+                "total": total * ns,
+                "mean": total * ns / count,
+                "min": min_time * ns,
+                "max": max_time * ns}
+
+        iterations = {}
+        for event_type, stage, name, iteration, start, end, _ in events:
+            if iteration not in iterations:
+                iterations[iteration] = {category: {} for category in categories}
+            times = iterations[iteration][category_of[event_type]]
+            times[name] = times.get(name, 0.) + (end - start) * ns
+        result["iterations"] = [dict(iteration=i, **iterations[i]) for i in sorted(iterations)]
+        return result
+
+    def export_chrome_trace(self, filename):
+        """Saves the most recent events recorded by the pipeline as a trace in the Chrome Trace
+        Event format, which can be opened with ``chrome://tracing`` or Perfetto.
+        To enable the profiling, pass ``enable_profiling=True`` to the pipeline constructor.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the file to which the trace is written.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        import json
+        import os
+        events = self._pipe.profiler_events()
+        start = min((event[4] for event in events), default=0)
+        thread_ids = {}
+        trace = []
+        for event_type, stage, name, iteration, begin, end, thread in events:
+            tid = thread_ids.setdefault(thread, len(thread_ids))
+            trace.append({
+                "name": name,
+                "cat": event_type,
+                "ph": "X",
+                "ts": (begin - start) / 1000.,
+                "dur": (end - begin) / 1000.,
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"stage": stage, "iteration": iteration}})
+        with open(filename, "w") as trace_file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, trace_file)
+
     def reader_meta(self, name = None):
         """Returns provided reader metadata as a dictionary. If no name is provided if provides
         a dictionary with data for all readers as {reader_name : meta}
@@ -247,6 +419,59 @@ Parameters
             return self._pipe.reader_meta(name)
         return self._pipe.reader_meta()
 
+    def reader_state(self, name = None):
+        """Returns the state of the readers, which allows a new pipeline to continue reading
+        from the sample following the last batch returned by this pipeline, without reading
+        the preceding samples. If no name is provided, returns a dictionary with the states
+        of all the readers that support it, as {reader_name : state}.
+
+        The state is an opaque ``bytes`` object, which can be passed to
+        :meth:`restore_reader_state` of a pipeline with the same definition and arguments.
+        The samples that are prefetched, but not returned yet, are read again
+        by the restored pipeline.
+
+        The file, COCO, numpy, TFRecord and MXNet readers support
+        saving their state. Requires ``enable_checkpointing=True`` in the pipeline constructor.
+
+        Parameters
+        ----------
+        name : str, optional, default = None
+            The reader which state should be returned.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        if not self._enable_checkpointing:
+            raise RuntimeError("Saving the reader state requires the pipeline to be created "
+                               "with `enable_checkpointing=True`.")
+        if name is not None:
+            return self._pipe.reader_state(name, self._returned_batches)
+        return self._pipe.reader_state(self._returned_batches)
+
+    def restore_reader_state(self, state, name = None):
+        """Restores the state of the readers obtained with :meth:`reader_state`.
+
+        Must be called after :meth:`build` and before the pipeline is run for the first time.
+
+        Parameters
+        ----------
+        state : bytes or dict
+            The state of the reader `name`, or a dictionary {reader_name : state},
+            as returned by :meth:`reader_state`.
+        name : str, optional, default = None
+            The reader which state should be restored. Must be provided if `state`
+            is not a dictionary.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        if not self._first_iter:
+            raise RuntimeError("The reader state can be restored only before the first run.")
+        if name is not None:
+            state = {name: state}
+        elif not isinstance(state, dict):
+            raise ValueError("The name of the reader must be provided for a single state.")
+        for reader_name, reader_state in state.items():
+            self._pipe.set_reader_state(reader_name, reader_state)
+
     @staticmethod
     def current():
         return getattr(pipeline_tls, 'current_pipeline', None)
@@ -371,6 +596,10 @@ Parameters
         self._pipe.SetExecutionTypes(self._exec_pipelined, self._exec_separated, self._exec_async)
         self._pipe.SetQueueSizes(self._cpu_queue_size, self._gpu_queue_size)
         self._pipe.EnableExecutorMemoryStats(self._enable_memory_stats)
+        self._pipe.EnableProfiling(self._enable_profiling)
+        self._pipe.EnableCheckpointing(self._enable_checkpointing)
+        self._pipe.SetCPUOpConcurrency(self._cpu_op_concurrency)
+        self._pipe.SetCPUIterationOverlap(self._cpu_iteration_overlap)
 
         if define_graph is not None:
             if self._graph_out is not None:
@@ -397,46 +626,17 @@ Parameters
                 outputs[i] = types.Constant(outputs[i], device="cpu")
             _data_node._check(outputs[i])
 
-        # Backtrack to construct the graph
-        op_ids = set()
-        edges = deque(list(outputs) + self._sinks)
-        ops = []
-        while edges:
-            current_edge = edges.popleft()
-            source_op = current_edge.source
-            if source_op is None:
-                raise RuntimeError(
-                    "Pipeline encountered "
-                    "Edge with no source op.")
-
-            # To make sure we don't double count ops in
-            # the case that they produce more than one
-            # output, we keep track of the unique op ids
-            # for each op we encounter and only add the
-            # op if we have not already
-            if source_op.id not in op_ids:
-                op_ids.add(source_op.id)
-                source_op.check_args()
-                ops.append(source_op)
-            else:
-                # If the op was already added, we need to
-                # change its position to the top of the list.
-                # This ensures topological ordering of ops
-                # when adding to the backend pipeline
-                ops.remove(source_op)
-                ops.append(source_op)
-            for edge in source_op.inputs:
-                if isinstance(edge, list):
-                    for e in edge:
-                        edges.append(e)
-                else:
-                    edges.append(edge)
+        # Collect the operators in topological order
+        ops = _graph.topological_sort(list(outputs) + self._sinks)
+        if self._merge_duplicate_ops:
+            ops = _graph.merge_duplicate_ops(ops, outputs)
+        if self._fuse_arithmetic_ops:
+            ops = _graph.fuse_arithmetic_ops(ops, outputs)
 
         # Add the ops to the graph and build the backend
         related_logical_id = {}
         self._ops = []
-        while ops:
-            op = ops.pop()
+        for op in ops:
             self._ops.append(op)
             if op.relation_id not in related_logical_id:
                 related_logical_id[op.relation_id] = self._pipe.AddOperator(op.spec, op.name)
@@ -454,6 +654,30 @@ Parameters
                 group = op._group
                 groups.add(group)
         self._input_callbacks = list(groups)
+        self._parallel_input_callbacks = [group for group in self._input_callbacks if group.parallel]
+        for context_idx, group in enumerate(self._parallel_input_callbacks):
+            group.pool_context_idx = context_idx
+
+    def _start_py_workers(self):
+        if not self._parallel_input_callbacks or self._py_pool is not None:
+            return
+        from nvidia.dali._multiproc.pool import WorkerPool
+        self._py_pool = WorkerPool(self._parallel_input_callbacks, self._py_num_workers,
+                                   self._py_start_method)
+        # stops the workers and removes the shared memory chunks when the pipeline is destroyed
+        # or at the interpreter exit, whichever comes first
+        weakref.finalize(self, self._py_pool.close)
+
+    def _start_callback_prefetcher(self):
+        if not self._py_callback_thread or self._callback_prefetcher is not None:
+            return
+        groups = [group for group in self._input_callbacks if not group.parallel]
+        if not groups:
+            return
+        from nvidia.dali.external_source import _CallbackPrefetcher
+        self._callback_prefetcher = _CallbackPrefetcher(groups, self._max_batch_size,
+                                                        self._cpu_queue_size)
+        weakref.finalize(self, self._callback_prefetcher.stop)
 
     def build(self, define_graph = None):
         """Build the pipeline.
@@ -478,8 +702,10 @@ Parameters
         if not self._prepared:
             self._prepare_graph(define_graph)
 
+        self._start_py_workers()
         self._pipe.Build(self._names_and_devices)
         self._built = True
+        self._start_callback_prefetcher()
 
     def feed_input(self, data_node, data, layout = None, cuda_stream = None, use_copy_kernel = False):
         """Pass a mutlidimensional array or DLPack (or a list thereof) to an output of ExternalSource.
@@ -502,6 +728,9 @@ Parameters
               * DALI `TensorList` or list of DALI `Tensor` objects
 
             The data to be used as the output of the ExternalSource referred to by `data_node`.
+            The batch can contain up to ``batch_size`` samples. The iterations of the pipeline
+            follow the batch sizes of the data fed to its external sources, which must be
+            the same for all of them in a given iteration.
 
         layout : str or None
             The description of the data layout (or empty string, if not specified).
@@ -632,6 +861,7 @@ Parameters
                 raise StopIteration
             self._batches_to_consume -= 1
             self._gpu_batches_to_consume -= 1
+            self._returned_batches += 1
             return self._outputs()
 
     def schedule_run(self):
@@ -679,6 +909,7 @@ Parameters
                 raise StopIteration
             self._batches_to_consume -= 1
             self._gpu_batches_to_consume -= 1
+            self._returned_batches += 1
             return self._pipe.ShareOutputs()
 
     # for the backward compatibility
@@ -804,9 +1035,18 @@ Parameters
             self._first_iter = True
             self._last_iter = False
             self._iter = 0
+            if self._callback_prefetcher is not None:
+                # resets the indices of the prefetched callbacks and restarts them
+                self._callback_prefetcher.reset()
+                prefetched = self._callback_prefetcher.groups
+            else:
+                prefetched = []
             if self._input_callbacks:
                 for group in self._input_callbacks:
-                    group.reset_indices()
+                    if group not in prefetched:
+                        group.reset_indices()
+            if self._py_pool is not None:
+                self._py_pool.reset()
 
     def empty(self):
         """If there is any work scheduled in the pipeline but not yet consumed
@@ -892,6 +1132,10 @@ Parameters
                                          pipeline._exec_async)
         pipeline._pipe.SetQueueSizes(pipeline._cpu_queue_size, pipeline._gpu_queue_size)
         pipeline._pipe.EnableExecutorMemoryStats(pipeline._enable_memory_stats)
+        pipeline._pipe.EnableProfiling(pipeline._enable_profiling)
+        pipeline._pipe.EnableCheckpointing(pipeline._enable_checkpointing)
+        pipeline._pipe.SetCPUOpConcurrency(pipeline._cpu_op_concurrency)
+        pipeline._pipe.SetCPUIterationOverlap(pipeline._cpu_iteration_overlap)
         pipeline._prepared = True
         pipeline._pipe.Build()
         pipeline._built = True
@@ -919,6 +1163,10 @@ Parameters
         self._pipe.SetExecutionTypes(self._exec_pipelined, self._exec_separated, self._exec_async)
         self._pipe.SetQueueSizes(self._cpu_queue_size, self._gpu_queue_size)
         self._pipe.EnableExecutorMemoryStats(self._enable_memory_stats)
+        self._pipe.EnableProfiling(self._enable_profiling)
+        self._pipe.EnableCheckpointing(self._enable_checkpointing)
+        self._pipe.SetCPUOpConcurrency(self._cpu_op_concurrency)
+        self._pipe.SetCPUIterationOverlap(self._cpu_iteration_overlap)
         self._prepared = True
         self._pipe.Build()
         self._built = True
@@ -965,8 +1213,33 @@ Parameters
         if self._input_callbacks is None:
             return
 
-        for group in self._input_callbacks:
+        iteration = self._callbacks_iter
+        self._callbacks_iter += 1
+        if self._callback_prefetcher is None:
+            for group in self._input_callbacks:
+                self._call_and_feed(group, iteration)
+            return
+
+        outputs, times = self._callback_prefetcher.next_outputs()
+        for group, callback_out, (start, end) in zip(self._callback_prefetcher.groups, outputs,
+                                                     times):
+            if self._enable_profiling:
+                # the callback ran earlier, in the prefetching thread, but for this iteration
+                self._pipe.RecordCallbackTime(group.instances[0].name, iteration, start, end)
+            group.feed(self, callback_out, self._max_batch_size)
+        for group in self._parallel_input_callbacks:
+            self._call_and_feed(group, iteration)
+
+    def _call_and_feed(self, group, iteration):
+        if not self._enable_profiling:
             group.call_and_feed(self, self._max_batch_size)
+            return
+        from nvidia.dali.external_source import _monotonic_ns
+        # only the callback is timed - copying its output to the pipeline is not a part of it
+        start = _monotonic_ns()
+        callback_out = group.call(self, self._max_batch_size)
+        self._pipe.RecordCallbackTime(group.instances[0].name, iteration, start, _monotonic_ns())
+        group.feed(self, callback_out, self._max_batch_size)
 
     def _iter_setup(self):
         self._run_input_callbacks()
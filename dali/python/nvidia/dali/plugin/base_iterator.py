@@ -17,6 +17,8 @@ import math
 import logging
 import numpy as np
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, unique
 
 def _iterator_deprecation_warning():
@@ -95,6 +97,20 @@ class _DaliBaseIterator(object):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    zero_copy : bool, optional, default = False
+                Whether the iterator returns the framework's tensors viewing the output
+                buffers of DALI (through DLPack) instead of copying the outputs.
+                The returned data is valid until ``num_outstanding_batches`` more batches
+                are requested or the iterator is reset.
+    num_outstanding_batches : int, optional, default = 1
+                The number of the most recent batches kept valid in the ``zero_copy`` mode.
+                It cannot be greater than the prefetch queue depth of the pipelines, and
+                each outstanding batch reduces the number of batches DALI can prefetch.
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -119,7 +135,10 @@ class _DaliBaseIterator(object):
                  auto_reset=False,
                  fill_last_batch=None,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
 
         assert pipelines is not None, "Number of provided pipelines has to be at least 1"
         if not isinstance(pipelines, list):
@@ -156,6 +175,24 @@ class _DaliBaseIterator(object):
             _iterator_deprecation_warning()
         self._pipes = pipelines
         self._counter = 0
+        # the number of samples in the most recent batch of each pipeline, which can be smaller
+        # than the batch size when the pipelines are fed with smaller batches
+        self._current_batch_size = self.batch_size
+        self._gather_pool = None
+        if parallel_gather and len(pipelines) > 1:
+            self._gather_pool = ThreadPoolExecutor(max_workers=len(pipelines))
+
+        self._zero_copy = zero_copy
+        self._num_outstanding_batches = num_outstanding_batches
+        # (DALI outputs, framework's tensors) of the batches returned without copying,
+        # which buffers cannot be released yet
+        self._outstanding = deque()
+        if zero_copy:
+            assert num_outstanding_batches >= 1, "At least one outstanding batch is needed"
+            for p in self._pipes:
+                queue_depth = p._gpu_queue_size if p._exec_separated else p._prefetch_queue_depth
+                assert num_outstanding_batches <= queue_depth, \
+                    "`num_outstanding_batches` cannot be greater than the prefetch queue depth"
 
         # Build all pipelines
         for p in self._pipes:
@@ -231,8 +268,8 @@ class _DaliBaseIterator(object):
         if self._last_batch_policy == LastBatchPolicy.PARTIAL:
             # calculate each shard size for each id, and check how many samples are left by substracting
             # from iterator counter the shard size, then go though all GPUs and check how much data needs to be dropped
-            left = self.batch_size - (self._counter - self._shard_sizes_per_gpu_initial[self._shards_id])
-            if_drop = np.less(left, self.batch_size)
+            left = self._current_batch_size - (self._counter - self._shard_sizes_per_gpu_initial[self._shards_id])
+            if_drop = np.less(left, self._current_batch_size)
         return if_drop, left
 
     def _get_outputs(self):
@@ -242,32 +279,81 @@ class _DaliBaseIterator(object):
         if self._size > 0 and self._counter >= self._size:
             self._end_iteration()
 
-        outputs = []
+        if self._zero_copy:
+            # make room for the batch that is about to be returned
+            self._release_outstanding(self._num_outstanding_batches - 1)
+
+        def share_outputs(i):
+            p = self._pipes[i]
+            with p._check_api_type_scope(types.PipelineAPIType.ITERATOR):
+                return p.share_outputs()
+
         try:
-            for p in self._pipes:
-                with p._check_api_type_scope(types.PipelineAPIType.ITERATOR):
-                    outputs.append(p.share_outputs())
+            outputs = self._map_pipes(share_outputs)
         except StopIteration as e:
             # in case ExternalSource returns StopIteration
             if self._size < 0 and self._auto_reset:
                 self.reset()
             raise e
+        self._current_batch_size = max((len(pipe_outputs[0]) for pipe_outputs in outputs
+                                        if len(pipe_outputs) > 0), default=self.batch_size)
         return outputs
 
+    def _hold_outputs(self, outputs, tensors):
+        """
+        Keeps the outputs returned without copying until they can be released
+        """
+        self._outstanding.append((outputs, tensors))
+
+    def _release_outstanding(self, keep):
+        """
+        Releases the oldest batches returned without copying, leaving `keep` most recent ones,
+        and schedules the runs that replace them
+        """
+        while len(self._outstanding) > keep:
+            _, tensors = self._outstanding.popleft()
+            self._wait_for_consumers(tensors)
+            self._schedule_runs()
+
+    def _wait_for_consumers(self, tensors):
+        """
+        Waits until the framework no longer uses the tensors that view DALI outputs,
+        to be overridden by the frameworks which execute asynchronously
+        """
+        pass
+
     def _end_iteration(self):
         if self._auto_reset:
             self.reset()
         raise StopIteration
 
+    def _map_pipes(self, func):
+        """
+        Calls `func` with the index of each pipeline, concurrently if `parallel_gather` is used,
+        and returns the results in the order of the pipelines
+        """
+        if self._gather_pool is None:
+            return [func(i) for i in range(len(self._pipes))]
+        futures = [self._gather_pool.submit(func, i) for i in range(len(self._pipes))]
+        # wait for all the calls, so that none of them is still running when an error is raised
+        errors = [f.exception() for f in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [f.result() for f in futures]
+
     def _schedule_runs(self, release_outputs=True):
         """
         Schedule DALI runs
         """
-        for p in self._pipes:
+        def schedule_run(i):
+            p = self._pipes[i]
             with p._check_api_type_scope(types.PipelineAPIType.ITERATOR):
                 p.release_outputs()
                 p.schedule_run()
 
+        self._map_pipes(schedule_run)
+
     def _advance_and_check_drop_last(self):
         """
         Checks whether the current batch is not fully filled and whether it should be dropped.
@@ -275,12 +361,12 @@ class _DaliBaseIterator(object):
         # check if for given initial count in any GPU with the current value of the samples read
         # if we read one more batch would we overflow
         if self._reader_name:
-            self._counter += self.batch_size
+            self._counter += self._current_batch_size
             if self._last_batch_policy == LastBatchPolicy.DROP:
                 if np.any(self._counter_per_gpu + self._counter > self._shard_sizes_per_gpu):
                     self._end_iteration()
         else:
-            self._counter += self._num_gpus * self.batch_size
+            self._counter += self._num_gpus * self._current_batch_size
             if self._last_batch_policy == LastBatchPolicy.DROP:
                 if self._counter > self._size:
                     self._end_iteration()
@@ -338,6 +424,7 @@ class _DaliBaseIterator(object):
                         # read_in_next_epoch = self._shard_sizes_per_gpu
                         self._size = math.ceil(max(self._shard_sizes_per_gpu) / self.batch_size) * self.batch_size
 
+            self._release_outstanding(0)
             for p in self._pipes:
                 p.reset()
                 if p.empty():
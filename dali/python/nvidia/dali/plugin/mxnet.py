@@ -80,9 +80,13 @@ class _DALIMXNetIteratorBase(mx.io.DataIter, _DaliBaseIterator):
                  fill_last_batch=None,
                  last_batch_padded=False,
                  auto_reset=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
         _DaliBaseIterator.__init__(self, pipelines, size, reader_name, auto_reset,
-                                   fill_last_batch, last_batch_padded, last_batch_policy)
+                                   fill_last_batch, last_batch_padded, last_batch_policy,
+                                   zero_copy, num_outstanding_batches, parallel_gather)
 
     def next(self):
         """
@@ -189,6 +193,20 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    zero_copy : bool, optional, default = False
+                Whether to return MXNet's NDArrays viewing the output buffers of DALI
+                (through DLPack), instead of copying the outputs to NDArrays owned by
+                the iterator. The returned NDArrays are valid until ``num_outstanding_batches``
+                more batches are requested or the iterator is reset. Before the buffers are
+                returned to DALI, the iterator waits for the pending operations using them.
+    num_outstanding_batches : int, optional, default = 1
+                The number of the most recent batches kept valid in the ``zero_copy`` mode.
+                It cannot be greater than the prefetch queue depth of the pipelines.
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -217,7 +235,10 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
                  squeeze_labels=True,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
 
         # check the assert first as _DaliBaseIterator would run the prefetch
         self._output_names_map = [x[0] for x in output_map]
@@ -236,7 +257,10 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
             fill_last_batch,
             last_batch_padded,
             auto_reset,
-            last_batch_policy)
+            last_batch_policy,
+            zero_copy,
+            num_outstanding_batches,
+            parallel_gather)
         self._squeeze_labels = squeeze_labels
         self._dynamic_shape = dynamic_shape
         # Use double-buffering of data batches
@@ -272,68 +296,13 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
 
         # Gather outputs
         outputs = self._get_outputs()
+        dali_tensors = self._map_pipes(lambda i: self._convert_outputs(i, outputs[i]))
 
-        for i in range(self._num_gpus):
-            # MXNet wants batches with clear distinction between
-            # data and label entries, so segregate outputs into
-            # 2 categories
-            category_outputs = {key : [] for key in self._output_categories}
-            for j, out in enumerate(outputs[i]):
-                category_outputs[self._output_categories_map[j]].append(out)
-            # Change DALI TensorLists into Tensors
-            category_tensors = dict()
-            category_info = dict()
-            # For data proceed normally
-            category_tensors[DALIGenericIterator.DATA_TAG] = \
-                [x.as_tensor() for x in category_outputs[DALIGenericIterator.DATA_TAG]]
-            category_info[DALIGenericIterator.DATA_TAG] = \
-                [(x.shape(), np.dtype(x.dtype())) for x in category_tensors[DALIGenericIterator.DATA_TAG]]
-            # For labels we squeeze the tensors
-            category_tensors[DALIGenericIterator.LABEL_TAG] = \
-                [x.as_tensor() for x in category_outputs[DALIGenericIterator.LABEL_TAG]]
-            if self._squeeze_labels:
-                for label in category_tensors[DALIGenericIterator.LABEL_TAG]:
-                    label.squeeze(-1)  # Squeeze last dimension if necessary
-            category_info[DALIGenericIterator.LABEL_TAG] = \
-                [(x.shape(), np.dtype(x.dtype())) for x in category_tensors[DALIGenericIterator.LABEL_TAG]]
-
-            # If we did not yet allocate memory for that batch, do it now
-            if self._data_batches[i][self._current_data_batch] is None:
-                mx_gpu_device = mx.gpu(self._pipes[i].device_id)
-                mx_cpu_device = mx.cpu(0)
-                category_device = {key : [] for key in self._output_categories}
-                for category in self._output_categories:
-                    for t in category_tensors[category]:
-                        if type(t) is TensorGPU:
-                            category_device[category].append(mx_gpu_device)
-                        else:
-                            category_device[category].append(mx_cpu_device)
-                d = []
-                l = []
-                for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.DATA_TAG]):
-                    d.append(get_mx_array(shape, category_device[DALIGenericIterator.DATA_TAG][j], dtype = dtype))
-                for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.LABEL_TAG]):
-                    l.append(get_mx_array(shape, category_device[DALIGenericIterator.LABEL_TAG][j], dtype = dtype))
-
-                self._data_batches[i][self._current_data_batch] = mx.io.DataBatch(data=d, label=l)
-
-            d = self._data_batches[i][self._current_data_batch].data
-            l = self._data_batches[i][self._current_data_batch].label
-            # Copy data from DALI Tensors to MXNet NDArrays
-            if self._dynamic_shape:
-                for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.DATA_TAG]):
-                    if list(d[j].shape) != shape:
-                        d[j] = get_mx_array(shape, d[j].context, dtype = dtype)
-                for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.LABEL_TAG]):
-                    if list(l[j].shape) != shape:
-                        l[j] = get_mx_array(shape, l[j].context, dtype = dtype)
-
-            for j, d_arr in enumerate(d):
-                feed_ndarray(category_tensors[DALIGenericIterator.DATA_TAG][j], d_arr)
-            for j, l_arr in enumerate(l):
-                feed_ndarray(category_tensors[DALIGenericIterator.LABEL_TAG][j], l_arr)
-
-        self._schedule_runs()
+        if self._zero_copy:
+            self._hold_outputs((outputs, dali_tensors),
+                               [db[self._current_data_batch] for db in self._data_batches])
+        else:
+            self._schedule_runs()
 
         self._advance_and_check_drop_last()
 
@@ -341,7 +310,7 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
         if self._reader_name:
             if_drop, left = self._remove_padded()
             if np.any(if_drop):
-                left = [self.batch_size - l for l in left]
+                left = [self._current_batch_size - l for l in left]
                 for i, to_pad in zip(range(self._num_gpus), left):
                     self._data_batches[i][copy_db_index].pad = to_pad
             else:
@@ -366,6 +335,86 @@ class DALIGenericIterator(_DALIMXNetIteratorBase):
 
         return [db[copy_db_index] for db in self._data_batches]
 
+    def _convert_outputs(self, i, pipe_outputs):
+        """
+        Converts the outputs of the i-th pipeline to MXNet's DataBatch in ``self._data_batches[i]``
+        and returns the DALI Tensors they were converted from
+        """
+        # MXNet wants batches with clear distinction between
+        # data and label entries, so segregate outputs into
+        # 2 categories
+        category_outputs = {key : [] for key in self._output_categories}
+        for j, out in enumerate(pipe_outputs):
+            category_outputs[self._output_categories_map[j]].append(out)
+        # Change DALI TensorLists into Tensors
+        category_tensors = dict()
+        category_info = dict()
+        # For data proceed normally
+        category_tensors[DALIGenericIterator.DATA_TAG] = \
+            [x.as_tensor() for x in category_outputs[DALIGenericIterator.DATA_TAG]]
+        category_info[DALIGenericIterator.DATA_TAG] = \
+            [(x.shape(), np.dtype(x.dtype())) for x in category_tensors[DALIGenericIterator.DATA_TAG]]
+        # For labels we squeeze the tensors
+        category_tensors[DALIGenericIterator.LABEL_TAG] = \
+            [x.as_tensor() for x in category_outputs[DALIGenericIterator.LABEL_TAG]]
+        if self._squeeze_labels:
+            for label in category_tensors[DALIGenericIterator.LABEL_TAG]:
+                label.squeeze(-1)  # Squeeze last dimension if necessary
+        category_info[DALIGenericIterator.LABEL_TAG] = \
+            [(x.shape(), np.dtype(x.dtype())) for x in category_tensors[DALIGenericIterator.LABEL_TAG]]
+
+        if self._zero_copy:
+            # View the DALI buffers, which are kept until the NDArrays are no longer valid
+            d = [mx.nd.from_dlpack(x._expose_dlpack_capsule())
+                 for x in category_tensors[DALIGenericIterator.DATA_TAG]]
+            l = [mx.nd.from_dlpack(x._expose_dlpack_capsule())
+                 for x in category_tensors[DALIGenericIterator.LABEL_TAG]]
+            self._data_batches[i][self._current_data_batch] = mx.io.DataBatch(data=d, label=l)
+            return category_tensors
+
+        # If we did not yet allocate memory for that batch, do it now
+        if self._data_batches[i][self._current_data_batch] is None:
+            mx_gpu_device = mx.gpu(self._pipes[i].device_id)
+            mx_cpu_device = mx.cpu(0)
+            category_device = {key : [] for key in self._output_categories}
+            for category in self._output_categories:
+                for t in category_tensors[category]:
+                    if type(t) is TensorGPU:
+                        category_device[category].append(mx_gpu_device)
+                    else:
+                        category_device[category].append(mx_cpu_device)
+            d = []
+            l = []
+            for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.DATA_TAG]):
+                d.append(get_mx_array(shape, category_device[DALIGenericIterator.DATA_TAG][j], dtype = dtype))
+            for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.LABEL_TAG]):
+                l.append(get_mx_array(shape, category_device[DALIGenericIterator.LABEL_TAG][j], dtype = dtype))
+
+            self._data_batches[i][self._current_data_batch] = mx.io.DataBatch(data=d, label=l)
+
+        d = self._data_batches[i][self._current_data_batch].data
+        l = self._data_batches[i][self._current_data_batch].label
+        # Copy data from DALI Tensors to MXNet NDArrays
+        if self._dynamic_shape:
+            for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.DATA_TAG]):
+                if list(d[j].shape) != shape:
+                    d[j] = get_mx_array(shape, d[j].context, dtype = dtype)
+            for j, (shape, dtype) in enumerate(category_info[DALIGenericIterator.LABEL_TAG]):
+                if list(l[j].shape) != shape:
+                    l[j] = get_mx_array(shape, l[j].context, dtype = dtype)
+
+        for j, d_arr in enumerate(d):
+            feed_ndarray(category_tensors[DALIGenericIterator.DATA_TAG][j], d_arr)
+        for j, l_arr in enumerate(l):
+            feed_ndarray(category_tensors[DALIGenericIterator.LABEL_TAG][j], l_arr)
+        return category_tensors
+
+    def _wait_for_consumers(self, tensors):
+        # MXNet engine may still execute the operations reading the NDArrays
+        for batch in tensors:
+            for arr in batch.data + batch.label:
+                _wait_to_write(arr)
+
     DATA_TAG = "data"
     LABEL_TAG = "label"
 
@@ -451,6 +500,20 @@ class DALIClassificationIterator(DALIGenericIterator):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    zero_copy : bool, optional, default = False
+                Whether to return MXNet's NDArrays viewing the output buffers of DALI
+                (through DLPack), instead of copying the outputs to NDArrays owned by
+                the iterator. The returned NDArrays are valid until ``num_outstanding_batches``
+                more batches are requested or the iterator is reset. Before the buffers are
+                returned to DALI, the iterator waits for the pending operations using them.
+    num_outstanding_batches : int, optional, default = 1
+                The number of the most recent batches kept valid in the ``zero_copy`` mode.
+                It cannot be greater than the prefetch queue depth of the pipelines.
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -480,7 +543,10 @@ class DALIClassificationIterator(DALIGenericIterator):
                  squeeze_labels=True,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
         super(DALIClassificationIterator, self).__init__(pipelines,
                                                          [(data_name, DALIClassificationIterator.DATA_TAG),
                                                           (label_name, DALIClassificationIterator.LABEL_TAG)],
@@ -492,7 +558,10 @@ class DALIClassificationIterator(DALIGenericIterator):
                                                          squeeze_labels=squeeze_labels,
                                                          dynamic_shape=dynamic_shape,
                                                          last_batch_padded = last_batch_padded,
-                                                         last_batch_policy = last_batch_policy)
+                                                         last_batch_policy = last_batch_policy,
+                                                         zero_copy = zero_copy,
+                                                         num_outstanding_batches = num_outstanding_batches,
+                                                         parallel_gather = parallel_gather)
 
 ###############################################
 ###############################################
@@ -586,6 +655,11 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -611,7 +685,8 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
                  auto_reset=False,
                  fill_last_batch=None,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 parallel_gather=False):
 
         # check the assert first as _DaliBaseIterator would run the prefetch
         self._output_tags = {DALIGluonIterator.DENSE_TAG, DALIGluonIterator.SPARSE_TAG}
@@ -627,7 +702,8 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
             fill_last_batch,
             last_batch_padded,
             auto_reset,
-            last_batch_policy)
+            last_batch_policy,
+            parallel_gather=parallel_gather)
 
         self._data_batches = [None for i in range(self._num_gpus)]
 
@@ -645,32 +721,7 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
 
         # Gather outputs
         dali_outputs = self._get_outputs()
-
-        for i in range(self._num_gpus):
-            output_elements = []
-            shapes = []
-            for j, out in enumerate(dali_outputs[i]):
-                if self._outputs_types is None or self._outputs_types[j] == DALIGluonIterator.DENSE_TAG:
-                    output_elements.append(out.as_tensor())
-                    shapes.append(output_elements[-1].shape())
-                else:
-                    output_elements.append([out[sample_idx] for sample_idx in range(self.batch_size)])
-                    s = [t.shape() for t in output_elements[-1]]
-                    shapes.append(s)
-
-            if self._data_batches[i] is None:
-                self._data_batches[i] = self._create_data_batch(output_elements, shapes, self._pipes[i].device_id)
-
-            batch = self._data_batches[i]
-            # Copy data from DALI Tensors to MXNet NDArrays
-            for j, output_el in enumerate(output_elements):
-                if self._outputs_types is None or self._outputs_types[j] == DALIGluonIterator.DENSE_TAG:
-                    ndarray = batch[j].resize(shapes[j])
-                    feed_ndarray(output_el, ndarray)
-                else:
-                    for sample_idx in range(self.batch_size):
-                        ndarray = batch[j][sample_idx].resize(shapes[j][sample_idx])
-                        feed_ndarray(output_el[sample_idx], ndarray)
+        self._map_pipes(lambda i: self._convert_outputs(i, dali_outputs[i]))
 
         batches = [[([sample.view for sample in output_el] if isinstance(output_el,list) else output_el.view)
                     for output_el in batch]
@@ -694,13 +745,13 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
         else:
             if self._last_batch_policy == LastBatchPolicy.PARTIAL and (self._counter > self._size) and self._size > 0:
                 # First calculate how much data is required to return exactly self._size entries.
-                diff = self._num_gpus * self.batch_size - (self._counter - self._size)
+                diff = self._num_gpus * self._current_batch_size - (self._counter - self._size)
                 # Figure out how many GPUs to grab from.
-                numGPUs_tograb = int(np.ceil(diff/self.batch_size))
+                numGPUs_tograb = int(np.ceil(diff/self._current_batch_size))
                 # Figure out how many results to grab from the last GPU (as a fractional GPU batch may be required to
                 # bring us right up to self._size).
-                mod_diff = diff % self.batch_size
-                data_fromlastGPU = mod_diff if mod_diff else self.batch_size
+                mod_diff = diff % self._current_batch_size
+                data_fromlastGPU = mod_diff if mod_diff else self._current_batch_size
 
                 # Grab the relevant data.
                 # 1) Grab everything from the relevant GPUs.
@@ -714,6 +765,35 @@ class DALIGluonIterator(_DALIMXNetIteratorBase):
 
         return batches
 
+    def _convert_outputs(self, i, pipe_outputs):
+        """
+        Converts the outputs of the i-th pipeline to MXNet's NDArrays in ``self._data_batches[i]``
+        """
+        output_elements = []
+        shapes = []
+        for j, out in enumerate(pipe_outputs):
+            if self._outputs_types is None or self._outputs_types[j] == DALIGluonIterator.DENSE_TAG:
+                output_elements.append(out.as_tensor())
+                shapes.append(output_elements[-1].shape())
+            else:
+                output_elements.append([out[sample_idx] for sample_idx in range(self.batch_size)])
+                s = [t.shape() for t in output_elements[-1]]
+                shapes.append(s)
+
+        if self._data_batches[i] is None:
+            self._data_batches[i] = self._create_data_batch(output_elements, shapes, self._pipes[i].device_id)
+
+        batch = self._data_batches[i]
+        # Copy data from DALI Tensors to MXNet NDArrays
+        for j, output_el in enumerate(output_elements):
+            if self._outputs_types is None or self._outputs_types[j] == DALIGluonIterator.DENSE_TAG:
+                ndarray = batch[j].resize(shapes[j])
+                feed_ndarray(output_el, ndarray)
+            else:
+                for sample_idx in range(self.batch_size):
+                    ndarray = batch[j][sample_idx].resize(shapes[j][sample_idx])
+                    feed_ndarray(output_el[sample_idx], ndarray)
+
     def _create_data_batch(self, output_elements, shapes, device_id):
         mx_gpu_device = mx.gpu(device_id)
         mx_cpu_device = mx.cpu(0)
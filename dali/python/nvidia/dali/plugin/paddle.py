@@ -187,6 +187,11 @@ class DALIGenericIterator(_DaliBaseIterator):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -213,7 +218,8 @@ class DALIGenericIterator(_DaliBaseIterator):
                  fill_last_batch=None,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 parallel_gather=False):
 
         normalized_map = {}
         for v in output_map:
@@ -229,7 +235,8 @@ class DALIGenericIterator(_DaliBaseIterator):
             "output_map names should be distinct"
         self.output_map = output_map
 
-        _DaliBaseIterator.__init__(self, pipelines, size, reader_name, auto_reset, fill_last_batch, last_batch_padded, last_batch_policy)
+        _DaliBaseIterator.__init__(self, pipelines, size, reader_name, auto_reset, fill_last_batch, last_batch_padded, last_batch_policy,
+                                   parallel_gather=parallel_gather)
         self._dynamic_shape = dynamic_shape
 
         # Use double-buffering of data batches
@@ -250,75 +257,7 @@ class DALIGenericIterator(_DaliBaseIterator):
 
         # Gather outputs
         outputs = self._get_outputs()
-
-        for i in range(self._num_gpus):
-            dev_id = self._pipes[i].device_id
-            # Initialize dict for all output categories
-            category_outputs = dict()
-            # Segregate outputs into categories
-            for j, out in enumerate(outputs[i]):
-                category_outputs[self.output_map[j]] = out
-
-            pd_gpu_place = fluid.CUDAPlace(dev_id)
-            pd_cpu_place = fluid.CPUPlace()
-
-            category_pd_type = dict()
-            category_place = dict()
-            category_tensors = dict()
-            category_shapes = dict()
-            category_lengths = dict()
-            for cat, out in category_outputs.items():
-                lod = self.normalized_map[cat]
-                assert out.is_dense_tensor() or lod > 0, \
-                    "non-dense tensor lists must have LoD > 0"
-
-                if lod > 0:
-                    # +1 for batch dim
-                    seq_len = recursive_length(out, lod + 1)[1:]
-                    shape = out.at(0).shape
-                    if callable(shape):
-                        shape = shape()
-                    shape = [sum(seq_len[-1])] + list(shape[lod:])
-                    category_shapes[cat] = shape
-                    category_lengths[cat] = seq_len
-                else:
-                    out = out.as_tensor()
-                    category_shapes[cat] = out.shape()
-                    category_lengths[cat] = []
-
-                category_tensors[cat] = out
-                category_pd_type[cat] = to_paddle_type(out)
-                if isinstance(out, (TensorGPU, TensorListGPU)):
-                    category_place[cat] = pd_gpu_place
-                else:
-                    category_place[cat] = pd_cpu_place
-
-            if self._data_batches[i] is None:
-                pd_tensors = {}
-                for cat, lod in self.normalized_map.items():
-                    lod_tensor = fluid.core.LoDTensor()
-                    lod_tensor._set_dims(category_shapes[cat])
-                    pd_tensors[cat] = lod_tensor
-                self._data_batches[i] = pd_tensors
-            else:
-                pd_tensors = self._data_batches[i]
-
-            # Copy data from DALI Tensors to LoDTensors
-            for cat, tensor in category_tensors.items():
-                if hasattr(tensor, 'shape'):  # could be tensor list
-                    assert self._dynamic_shape or \
-                        tensor.shape() == pd_tensors[cat].shape(), \
-                        ("Shapes do not match: DALI tensor has size {0}, "
-                         "but LoDTensor has size {1}".format(
-                             tensor.shape(), pd_tensors[cat].shape()))
-
-                lod_tensor = pd_tensors[cat]
-                lod_tensor._set_dims(category_shapes[cat])
-                seq_len = category_lengths[cat]
-                lod_tensor.set_recursive_sequence_lengths(seq_len)
-                ptr = lod_tensor._mutable_data(category_place[cat],
-                                               category_pd_type[cat])
-                feed_ndarray(tensor, ptr)
+        self._map_pipes(lambda i: self._convert_outputs(i, outputs[i]))
 
         self._schedule_runs()
 
@@ -339,15 +278,15 @@ class DALIGenericIterator(_DaliBaseIterator):
             if self._last_batch_policy == LastBatchPolicy.PARTIAL and (self._counter > self._size) and self._size > 0:
                 # First calculate how much data is required to
                 # return exactly self._size entries.
-                diff = self._num_gpus * self.batch_size - (self._counter
-                                                        - self._size)
+                diff = self._num_gpus * self._current_batch_size - (self._counter
+                                                                  - self._size)
                 # Figure out how many GPUs to grab from.
-                num_gpus_to_grab = int(math.ceil(diff / self.batch_size))
+                num_gpus_to_grab = int(math.ceil(diff / self._current_batch_size))
                 # Figure out how many results to grab from the last GPU
                 # (as a fractional GPU batch may be required to bring us
                 # right up to self._size).
-                mod_diff = diff % self.batch_size
-                data_from_last_gpu = mod_diff if mod_diff else self.batch_size
+                mod_diff = diff % self._current_batch_size
+                data_from_last_gpu = mod_diff if mod_diff else self._current_batch_size
 
                 # Grab the relevant data.
                 # 1) Grab everything from the relevant GPUs.
@@ -362,6 +301,78 @@ class DALIGenericIterator(_DaliBaseIterator):
 
         return self._data_batches
 
+    def _convert_outputs(self, i, pipe_outputs):
+        """
+        Copies the outputs of the i-th pipeline to the LoDTensors in ``self._data_batches[i]``
+        """
+        dev_id = self._pipes[i].device_id
+        # Initialize dict for all output categories
+        category_outputs = dict()
+        # Segregate outputs into categories
+        for j, out in enumerate(pipe_outputs):
+            category_outputs[self.output_map[j]] = out
+
+        pd_gpu_place = fluid.CUDAPlace(dev_id)
+        pd_cpu_place = fluid.CPUPlace()
+
+        category_pd_type = dict()
+        category_place = dict()
+        category_tensors = dict()
+        category_shapes = dict()
+        category_lengths = dict()
+        for cat, out in category_outputs.items():
+            lod = self.normalized_map[cat]
+            assert out.is_dense_tensor() or lod > 0, \
+                "non-dense tensor lists must have LoD > 0"
+
+            if lod > 0:
+                # +1 for batch dim
+                seq_len = recursive_length(out, lod + 1)[1:]
+                shape = out.at(0).shape
+                if callable(shape):
+                    shape = shape()
+                shape = [sum(seq_len[-1])] + list(shape[lod:])
+                category_shapes[cat] = shape
+                category_lengths[cat] = seq_len
+            else:
+                out = out.as_tensor()
+                category_shapes[cat] = out.shape()
+                category_lengths[cat] = []
+
+            category_tensors[cat] = out
+            category_pd_type[cat] = to_paddle_type(out)
+            if isinstance(out, (TensorGPU, TensorListGPU)):
+                category_place[cat] = pd_gpu_place
+            else:
+                category_place[cat] = pd_cpu_place
+
+        if self._data_batches[i] is None:
+            pd_tensors = {}
+            for cat, lod in self.normalized_map.items():
+                lod_tensor = fluid.core.LoDTensor()
+                lod_tensor._set_dims(category_shapes[cat])
+                pd_tensors[cat] = lod_tensor
+            self._data_batches[i] = pd_tensors
+        else:
+            pd_tensors = self._data_batches[i]
+
+        # Copy data from DALI Tensors to LoDTensors
+        for cat, tensor in category_tensors.items():
+            if hasattr(tensor, 'shape'):  # could be tensor list
+                assert self._dynamic_shape or \
+                    tensor.shape() == pd_tensors[cat].shape(), \
+                    ("Shapes do not match: DALI tensor has size {0}, "
+                     "but LoDTensor has size {1}".format(
+                         tensor.shape(), pd_tensors[cat].shape()))
+
+            lod_tensor = pd_tensors[cat]
+            lod_tensor._set_dims(category_shapes[cat])
+            seq_len = category_lengths[cat]
+            lod_tensor.set_recursive_sequence_lengths(seq_len)
+            ptr = lod_tensor._mutable_data(category_place[cat],
+                                           category_pd_type[cat])
+            feed_ndarray(tensor, ptr)
+
 class DALIClassificationIterator(DALIGenericIterator):
     """
     DALI iterator for classification tasks for Paddle. It returns 2 outputs
@@ -430,6 +441,11 @@ class DALIClassificationIterator(DALIGenericIterator):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -455,11 +471,13 @@ class DALIClassificationIterator(DALIGenericIterator):
                  fill_last_batch=None,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 parallel_gather=False):
         super(DALIClassificationIterator, self).__init__(
             pipelines, ["data", "label"], size, reader_name=reader_name,
             auto_reset=auto_reset,
             fill_last_batch=fill_last_batch,
             dynamic_shape=dynamic_shape,
             last_batch_padded=last_batch_padded,
-            last_batch_policy=last_batch_policy)
+            last_batch_policy=last_batch_policy,
+            parallel_gather=parallel_gather)
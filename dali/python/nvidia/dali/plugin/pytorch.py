@@ -126,6 +126,20 @@ class DALIGenericIterator(_DaliBaseIterator):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    zero_copy : bool, optional, default = False
+                Whether to return PyTorch's Tensors viewing the output buffers of DALI
+                (through DLPack), instead of copying the outputs to Tensors owned by
+                the iterator. The returned Tensors are valid until ``num_outstanding_batches``
+                more batches are requested or the iterator is reset. Before the buffers are
+                returned to DALI, the current CUDA stream of the device is synchronized.
+    num_outstanding_batches : int, optional, default = 1
+                The number of the most recent batches kept valid in the ``zero_copy`` mode.
+                It cannot be greater than the prefetch queue depth of the pipelines.
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -152,14 +166,19 @@ class DALIGenericIterator(_DaliBaseIterator):
                  fill_last_batch=None,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
 
         # check the assert first as _DaliBaseIterator would run the prefetch
         assert len(set(output_map)) == len(output_map), "output_map names should be distinct"
         self._output_categories = set(output_map)
         self.output_map = output_map
 
-        _DaliBaseIterator.__init__(self, pipelines, size, reader_name, auto_reset, fill_last_batch, last_batch_padded, last_batch_policy)
+        _DaliBaseIterator.__init__(self, pipelines, size, reader_name, auto_reset, fill_last_batch,
+                                   last_batch_padded, last_batch_policy, zero_copy,
+                                   num_outstanding_batches, parallel_gather)
         self._dynamic_shape = dynamic_shape
 
         # Use double-buffering of data batches
@@ -179,62 +198,17 @@ class DALIGenericIterator(_DaliBaseIterator):
 
         # Gather outputs
         outputs = self._get_outputs()
-
-        for i in range(self._num_gpus):
-            dev_id = self._pipes[i].device_id
-            # initialize dict for all output categories
-            category_outputs = dict()
-            # segregate outputs into categories
-            for j, out in enumerate(outputs[i]):
-                category_outputs[self.output_map[j]] = out
-
-            # Change DALI TensorLists into Tensors
-            category_tensors = dict()
-            category_shapes = dict()
-            for category, out in category_outputs.items():
-                category_tensors[category] = out.as_tensor()
-                category_shapes[category] = category_tensors[category].shape()
-
-            # If we did not yet allocate memory for that batch, do it now
-            if self._data_batches[i] is None:
-                category_torch_type = dict()
-                category_device = dict()
-                torch_gpu_device = None
-                torch_cpu_device = torch.device('cpu')
-                # check category and device
-                for category in self._output_categories:
-                    category_torch_type[category] = to_torch_type[np.dtype(category_tensors[category].dtype())]
-                    if type(category_tensors[category]) is TensorGPU:
-                        if not torch_gpu_device:
-                            torch_gpu_device = torch.device('cuda', dev_id)
-                        category_device[category] = torch_gpu_device
-                    else:
-                        category_device[category] = torch_cpu_device
-
-                pyt_tensors = dict()
-                for category in self._output_categories:
-                    pyt_tensors[category] = torch.empty(category_shapes[category],
-                                                        dtype=category_torch_type[category],
-                                                        device=category_device[category])
-
-                self._data_batches[i] = pyt_tensors
-            else:
-                pyt_tensors = self._data_batches[i]
-
-            # Copy data from DALI Tensors to torch tensors
-            for category, tensor in category_tensors.items():
-                if self._dynamic_shape and tensor.shape() != list(pyt_tensors[category].size()):
-                    pyt_tensors[category] = torch.empty(category_shapes[category],
-                                                        dtype=pyt_tensors[category].dtype,
-                                                        device=pyt_tensors[category].device)
-                if isinstance(tensor, (TensorGPU, TensorListGPU)):
-                    # Using same cuda_stream used by torch.zeros to set the memory
-                    stream = torch.cuda.current_stream(device=pyt_tensors[category].device)
-                    feed_ndarray(tensor, pyt_tensors[category], cuda_stream=stream)
-                else:
-                    feed_ndarray(tensor, pyt_tensors[category])
-
-        self._schedule_runs()
+        # the current CUDA streams are thread-local, so they are obtained on the calling thread;
+        # only the pipelines with GPU outputs need them, so CPU-only ones do not initialize CUDA
+        streams = {p.device_id: torch.cuda.current_stream(device=p.device_id)
+                   for p, pipe_outputs in zip(self._pipes, outputs)
+                   if any(isinstance(out, TensorListGPU) for out in pipe_outputs)}
+        dali_tensors = self._map_pipes(lambda i: self._convert_outputs(i, outputs[i], streams))
+
+        if self._zero_copy:
+            self._hold_outputs((outputs, dali_tensors), list(self._data_batches))
+        else:
+            self._schedule_runs()
 
         self._advance_and_check_drop_last()
 
@@ -252,13 +226,13 @@ class DALIGenericIterator(_DaliBaseIterator):
         else:
             if self._last_batch_policy == LastBatchPolicy.PARTIAL and (self._counter > self._size) and self._size > 0:
                 # First calculate how much data is required to return exactly self._size entries.
-                diff = self._num_gpus * self.batch_size - (self._counter - self._size)
+                diff = self._num_gpus * self._current_batch_size - (self._counter - self._size)
                 # Figure out how many GPUs to grab from.
-                numGPUs_tograb = int(np.ceil(diff/self.batch_size))
+                numGPUs_tograb = int(np.ceil(diff/self._current_batch_size))
                 # Figure out how many results to grab from the last GPU (as a fractional GPU batch may be required to
                 # bring us right up to self._size).
-                mod_diff = diff % self.batch_size
-                data_fromlastGPU = mod_diff if mod_diff else self.batch_size
+                mod_diff = diff % self._current_batch_size
+                data_fromlastGPU = mod_diff if mod_diff else self._current_batch_size
 
                 # Grab the relevant data.
                 # 1) Grab everything from the relevant GPUs.
@@ -272,6 +246,78 @@ class DALIGenericIterator(_DaliBaseIterator):
 
         return self._data_batches
 
+    def _convert_outputs(self, i, pipe_outputs, streams):
+        """
+        Converts the outputs of the i-th pipeline to PyTorch's Tensors in ``self._data_batches[i]``
+        and returns the DALI Tensors they were converted from
+        """
+        dev_id = self._pipes[i].device_id
+        # initialize dict for all output categories
+        category_outputs = dict()
+        # segregate outputs into categories
+        for j, out in enumerate(pipe_outputs):
+            category_outputs[self.output_map[j]] = out
+
+        # Change DALI TensorLists into Tensors
+        category_tensors = dict()
+        category_shapes = dict()
+        for category, out in category_outputs.items():
+            category_tensors[category] = out.as_tensor()
+            category_shapes[category] = category_tensors[category].shape()
+
+        if self._zero_copy:
+            # View the DALI buffers, which are kept until the Tensors are no longer valid
+            pyt_tensors = dict()
+            for category, tensor in category_tensors.items():
+                pyt_tensors[category] = torch_dlpack.from_dlpack(tensor._expose_dlpack_capsule())
+            self._data_batches[i] = pyt_tensors
+            return category_tensors
+
+        # If we did not yet allocate memory for that batch, do it now
+        if self._data_batches[i] is None:
+            category_torch_type = dict()
+            category_device = dict()
+            torch_gpu_device = None
+            torch_cpu_device = torch.device('cpu')
+            # check category and device
+            for category in self._output_categories:
+                category_torch_type[category] = to_torch_type[np.dtype(category_tensors[category].dtype())]
+                if type(category_tensors[category]) is TensorGPU:
+                    if not torch_gpu_device:
+                        torch_gpu_device = torch.device('cuda', dev_id)
+                    category_device[category] = torch_gpu_device
+                else:
+                    category_device[category] = torch_cpu_device
+
+            pyt_tensors = dict()
+            for category in self._output_categories:
+                pyt_tensors[category] = torch.empty(category_shapes[category],
+                                                    dtype=category_torch_type[category],
+                                                    device=category_device[category])
+
+            self._data_batches[i] = pyt_tensors
+        else:
+            pyt_tensors = self._data_batches[i]
+
+        # Copy data from DALI Tensors to torch tensors
+        for category, tensor in category_tensors.items():
+            if self._dynamic_shape and tensor.shape() != list(pyt_tensors[category].size()):
+                pyt_tensors[category] = torch.empty(category_shapes[category],
+                                                    dtype=pyt_tensors[category].dtype,
+                                                    device=pyt_tensors[category].device)
+            if isinstance(tensor, (TensorGPU, TensorListGPU)):
+                # Using same cuda_stream used by torch.zeros to set the memory
+                feed_ndarray(tensor, pyt_tensors[category], cuda_stream=streams[dev_id])
+            else:
+                feed_ndarray(tensor, pyt_tensors[category])
+        return category_tensors
+
+    def _wait_for_consumers(self, tensors):
+        for batch in tensors:
+            for tensor in batch.values():
+                if tensor.is_cuda:
+                    torch.cuda.current_stream(device=tensor.device).synchronize()
+
 class DALIClassificationIterator(DALIGenericIterator):
     """
     DALI iterator for classification tasks for PyTorch. It returns 2 outputs
@@ -340,6 +386,20 @@ class DALIClassificationIterator(DALIGenericIterator):
                 True next epoch would be the same length as the first one. For this to happen,
                 the option `pad_last_batch` in the reader needs to be set to True as well.
                 It is overwritten when `reader_name` argument is provided
+    zero_copy : bool, optional, default = False
+                Whether to return PyTorch's Tensors viewing the output buffers of DALI
+                (through DLPack), instead of copying the outputs to Tensors owned by
+                the iterator. The returned Tensors are valid until ``num_outstanding_batches``
+                more batches are requested or the iterator is reset. Before the buffers are
+                returned to DALI, the current CUDA stream of the device is synchronized.
+    num_outstanding_batches : int, optional, default = 1
+                The number of the most recent batches kept valid in the ``zero_copy`` mode.
+                It cannot be greater than the prefetch queue depth of the pipelines.
+    parallel_gather : bool, optional, default = False
+                Whether to wait for the outputs of the pipelines, convert them, and schedule
+                the next runs of the pipelines concurrently, using one thread per pipeline.
+                It only has effect if there is more than one pipeline. The input callbacks of
+                different pipelines may be called concurrently in this mode.
 
     Example
     -------
@@ -365,14 +425,20 @@ class DALIClassificationIterator(DALIGenericIterator):
                  fill_last_batch=None,
                  dynamic_shape=False,
                  last_batch_padded=False,
-                 last_batch_policy=LastBatchPolicy.FILL):
+                 last_batch_policy=LastBatchPolicy.FILL,
+                 zero_copy=False,
+                 num_outstanding_batches=1,
+                 parallel_gather=False):
         super(DALIClassificationIterator, self).__init__(pipelines, ["data", "label"],
                                                          size, reader_name=reader_name,
                                                          auto_reset = auto_reset,
                                                          fill_last_batch = fill_last_batch,
                                                          dynamic_shape = dynamic_shape,
                                                          last_batch_padded = last_batch_padded,
-                                                         last_batch_policy = last_batch_policy)
+                                                         last_batch_policy = last_batch_policy,
+                                                         zero_copy = zero_copy,
+                                                         num_outstanding_batches = num_outstanding_batches,
+                                                         parallel_gather = parallel_gather)
 
 
 class TorchPythonFunction(ops.PythonFunctionBase):
@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 
 #ifndef DALI_TEST_DALI_TEST_DECODER_H_
 #define DALI_TEST_DALI_TEST_DECODER_H_
@@ -77,21 +77,30 @@ class GenericDecoderTest : public DALISingleOpTest<ImgType> {
     this->RunOperator(DecodingOp(), eps);
   }
 
-  void RunTestDecode(const ImgSetDescr &imgs, float eps = 5e-2) {
+  void RunTestDecode(const ImgSetDescr &imgs, float eps = 5e-2, bool in_place = false) {
     this->SetEps(eps);
     for (size_t imgIdx = 0; imgIdx < imgs.nImages(); ++imgIdx) {
       Tensor<CPUBackend> image;
 
       auto decoded_image = ImageFactory::CreateImage(
           imgs.data_[imgIdx], imgs.sizes_[imgIdx], this->img_type_);
-      decoded_image->Decode();
-      const auto shape = decoded_image->GetShape();
-      // resize the output tensor
-      image.Resize(shape);
-      // force allocation
-      image.mutable_data<uint8_t>();
-
-      decoded_image->GetImage(image.mutable_data<uint8_t>());
+      if (in_place) {
+        decoded_image->Decode([&image](const Image::Shape &shape) {
+          image.Resize(shape);
+          return image.mutable_data<uint8_t>();
+        });
+        EXPECT_EQ(image.shape(), decoded_image->GetShape());
+        EXPECT_THROW(decoded_image->GetImage(), std::exception);
+      } else {
+        decoded_image->Decode();
+        const auto shape = decoded_image->GetShape();
+        // resize the output tensor
+        image.Resize(shape);
+        // force allocation
+        image.mutable_data<uint8_t>();
+
+        decoded_image->GetImage(image.mutable_data<uint8_t>());
+      }
 
 #if DALI_DEBUG
       WriteHWCImage(image.data<uint8_t>(), image.dim(0), image.dim(1),
@@ -1,8 +1,10 @@
 import nvidia.dali.fn as fn
 import nvidia.dali.types as types
 import numpy as np
+import os
 from nvidia.dali.pipeline import Pipeline
 from test_utils import check_batch
+from test_utils import get_dali_extra_path
 
 def build_src_pipe(device, layout = None):
     if layout is None:
@@ -87,3 +89,60 @@ def test_scalar():
     for device in ["cpu", "gpu"]:
         for as_tensors in [False, True]:
             yield _test_scalar, device, as_tensors
+
+def _test_variable_batch_size(device):
+    max_batch_size = 8
+    batch_sizes = [8, 3, 1, 5, 8, 2]
+    def get_data(iteration):
+        bs = batch_sizes[iteration % len(batch_sizes)]
+        return [np.full((2, 3), iteration * 10 + i, dtype=np.float32) for i in range(bs)]
+
+    pipe = Pipeline(max_batch_size, 1, 0)
+    with pipe:
+        data = fn.external_source(source=get_data, device=device)
+        pipe.set_outputs(data, data * 2)
+    pipe.build()
+
+    for iteration in range(2 * len(batch_sizes)):
+        data, doubled = pipe.run()
+        ref = get_data(iteration)
+        assert len(data) == len(ref) and len(doubled) == len(ref)
+        check_batch(data, ref, len(ref))
+        check_batch(doubled, [2 * x for x in ref], len(ref))
+
+def test_variable_batch_size():
+    for device in ["cpu", "gpu"]:
+        yield _test_variable_batch_size, device
+
+def test_variable_batch_size_reader():
+    max_batch_size = 8
+    batch_sizes = [5, 8, 3, 8, 1, 7]
+    file_root = os.path.join(get_dali_extra_path(), 'db', 'single', 'jpeg')
+
+    def create_pipe(variable):
+        pipe = Pipeline(max_batch_size, 1, 0, prefetch_queue_depth=1)
+        with pipe:
+            _, labels = fn.file_reader(file_root=file_root, prefetch_queue_depth=1)
+            if variable:
+                bs = fn.external_source(source=lambda i: [np.int32(0)] * batch_sizes[i % len(batch_sizes)])
+                pipe.set_outputs(labels, bs)
+            else:
+                pipe.set_outputs(labels)
+        pipe.build()
+        return pipe
+
+    # the samples are consumed in the same order, regardless of the batch size
+    ref_pipe = create_pipe(False)
+    ref_labels = []
+    for _ in range(sum(batch_sizes) // max_batch_size + 1):
+        out, = ref_pipe.run()
+        ref_labels += [out.at(i) for i in range(len(out))]
+
+    pipe = create_pipe(True)
+    labels = []
+    for bs in batch_sizes:
+        out, _ = pipe.run()
+        assert len(out) == bs
+        labels += [out.at(i) for i in range(len(out))]
+    for label, ref in zip(labels, ref_labels):
+        np.testing.assert_array_equal(label, ref)
@@ -479,7 +479,7 @@ def test_external_source_fail():
             self.feed_input(self.batch, batch)
 
     batch_size = 3
-    pipe = ExternalSourcePipeline(batch_size, batch_size - 1, 3, 0)
+    pipe = ExternalSourcePipeline(batch_size, batch_size + 1, 3, 0)
     pipe.build()
     assert_raises(RuntimeError, pipe.run)
 
@@ -526,7 +526,7 @@ def test_external_source_fail_list():
             self.feed_input(self.batch, batch)
 
     batch_size = 3
-    pipe = ExternalSourcePipeline(batch_size, batch_size - 1, 3, 0)
+    pipe = ExternalSourcePipeline(batch_size, batch_size + 1, 3, 0)
     pipe.build()
     assert_raises(RuntimeError, pipe.run)
 
@@ -0,0 +1,117 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.fn as fn
+import numpy as np
+from nose.tools import assert_raises
+from test_utils import check_output
+
+
+def sample_callback(sample_info):
+    return np.full((sample_info.idx_in_batch + 1, 3), sample_info.idx_in_epoch, dtype=np.int32)
+
+def expected_batch(iteration, batch_size):
+    return [np.full((i + 1, 3), iteration * batch_size + i, dtype=np.int32)
+            for i in range(batch_size)]
+
+def _test_parallel(batch_size, py_num_workers, prefetch_queue_depth):
+    pipe = Pipeline(batch_size, 1, None, py_num_workers=py_num_workers)
+    with pipe:
+        out = fn.external_source(sample_callback, batch=False, parallel=True,
+                                 prefetch_queue_depth=prefetch_queue_depth)
+        pipe.set_outputs(out)
+    pipe.build()
+    for i in range(10):
+        check_output(pipe.run(), expected_batch(i, batch_size))
+
+def test_parallel():
+    for batch_size in [1, 5, 16]:
+        for py_num_workers in [1, 3]:
+            for prefetch_queue_depth in [1, 2, 3]:
+                yield _test_parallel, batch_size, py_num_workers, prefetch_queue_depth
+
+def test_parallel_multiple_outputs():
+    batch_size = 6
+    def callback(sample_info):
+        return np.int32([sample_info.idx_in_epoch]), np.float32([sample_info.iteration])
+
+    pipe = Pipeline(batch_size, 1, None, py_num_workers=2)
+    with pipe:
+        a, b = fn.external_source(callback, num_outputs=2, batch=False, parallel=True)
+        pipe.set_outputs(a, b)
+    pipe.build()
+    for i in range(5):
+        out_a, out_b = pipe.run()
+        check_output(out_a, [np.int32([i * batch_size + s]) for s in range(batch_size)])
+        check_output(out_b, [np.float32([i])] * batch_size)
+
+def test_parallel_epoch_end():
+    batch_size = 4
+    epoch_size = 3 * batch_size
+    def callback(sample_info):
+        if sample_info.idx_in_epoch >= epoch_size:
+            raise StopIteration
+        return np.int32([sample_info.idx_in_epoch])
+
+    pipe = Pipeline(batch_size, 1, None, py_num_workers=2)
+    with pipe:
+        pipe.set_outputs(fn.external_source(callback, batch=False, parallel=True,
+                                            prefetch_queue_depth=2))
+    pipe.build()
+    for _ in range(2):
+        for i in range(epoch_size // batch_size):
+            check_output(pipe.run(), [np.int32([i * batch_size + s]) for s in range(batch_size)])
+        assert_raises(StopIteration, pipe.run)
+        pipe.reset()
+
+def test_parallel_worker_error():
+    def callback(sample_info):
+        raise ValueError("Test error")
+
+    pipe = Pipeline(2, 1, None, py_num_workers=2)
+    with pipe:
+        pipe.set_outputs(fn.external_source(callback, batch=False, parallel=True))
+    pipe.build()
+    assert_raises(RuntimeError, pipe.run)
+
+def test_parallel_invalid_source():
+    def gen():
+        yield [np.int32([1])]
+
+    pipe = Pipeline(1, 1, None)
+    with pipe:
+        assert_raises(TypeError, fn.external_source, gen, batch=False, parallel=True)
+        assert_raises(ValueError, fn.external_source, sample_callback, parallel=True)
+        assert_raises(ValueError, fn.external_source, sample_callback, batch=False,
+                      prefetch_queue_depth=2)
+
+def test_parallel_pool_closed_with_pipeline():
+    import gc
+    import os
+    pipe = Pipeline(4, 1, None, py_num_workers=2)
+    with pipe:
+        pipe.set_outputs(fn.external_source(sample_callback, batch=False, parallel=True))
+    pipe.build()
+    pipe.run()
+    pool = pipe._py_pool
+    processes = list(pool._processes)
+    chunk_names = [chunk.name for chunk in pool._chunks.values()]
+    assert len(chunk_names) > 0
+    del pipe
+    gc.collect()
+    for process in processes:
+        assert not process.is_alive()
+    for name in chunk_names:
+        assert not os.path.exists(name)
@@ -0,0 +1,108 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.fn as fn
+import numpy as np
+import asyncio
+from nose.tools import assert_raises
+from test_utils import check_output
+
+
+def _test_callback_thread(py_callback_thread, prefetch_queue_depth):
+    batch_size = 3
+    epoch_size = 4
+    def batch_source(i):
+        if i >= epoch_size:
+            raise StopIteration
+        return [np.int32([i * batch_size + s]) for s in range(batch_size)]
+
+    pipe = Pipeline(batch_size, 1, None, prefetch_queue_depth=prefetch_queue_depth,
+                    py_callback_thread=py_callback_thread)
+    with pipe:
+        pipe.set_outputs(fn.external_source(batch_source))
+    pipe.build()
+    for _ in range(2):
+        for i in range(epoch_size):
+            check_output(pipe.run(), batch_source(i))
+        assert_raises(StopIteration, pipe.run)
+        pipe.reset()
+
+def test_callback_thread():
+    for py_callback_thread in [False, True]:
+        for prefetch_queue_depth in [1, 2, 3]:
+            yield _test_callback_thread, py_callback_thread, prefetch_queue_depth
+
+def _test_async_sample_source(py_callback_thread):
+    batch_size = 8
+    async def source(sample_info):
+        await asyncio.sleep(0.01)
+        return np.int32([sample_info.idx_in_epoch])
+
+    pipe = Pipeline(batch_size, 1, None, py_callback_thread=py_callback_thread)
+    with pipe:
+        pipe.set_outputs(fn.external_source(source, batch=False))
+    pipe.build()
+    for i in range(3):
+        check_output(pipe.run(), [np.int32([i * batch_size + s]) for s in range(batch_size)])
+
+def test_async_sample_source():
+    for py_callback_thread in [False, True]:
+        yield _test_async_sample_source, py_callback_thread
+
+def _test_async_generator(py_callback_thread, cycle):
+    batch_size = 2
+    async def gen():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield [np.int32([i, s]) for s in range(batch_size)]
+
+    pipe = Pipeline(batch_size, 1, None, py_callback_thread=py_callback_thread)
+    with pipe:
+        pipe.set_outputs(fn.external_source(gen, cycle=cycle))
+    pipe.build()
+    for i in range(6 if cycle else 3):
+        check_output(pipe.run(), [np.int32([i % 3, s]) for s in range(batch_size)])
+    if not cycle:
+        assert_raises(StopIteration, pipe.run)
+
+def test_async_generator():
+    for py_callback_thread in [False, True]:
+        for cycle in [False, True]:
+            yield _test_async_generator, py_callback_thread, cycle
+
+def test_callback_thread_error():
+    def source():
+        raise ValueError("Test error")
+
+    pipe = Pipeline(1, 1, None, py_callback_thread=True)
+    with pipe:
+        pipe.set_outputs(fn.external_source(source))
+    pipe.build()
+    assert_raises(ValueError, pipe.run)
+
+def test_callback_thread_profile():
+    batch_size = 2
+    iters = 4
+    pipe = Pipeline(batch_size, 1, None, py_callback_thread=True, enable_profiling=True,
+                    exec_async=False, exec_pipelined=False)
+    with pipe:
+        pipe.set_outputs(fn.external_source(lambda: [np.int32([1])] * batch_size,
+                                            name="source"))
+    pipe.build()
+    for _ in range(iters):
+        pipe.run()
+    stats = pipe.profile()["python_callback"]["source"]
+    assert stats["count"] == iters
+    assert 0 <= stats["min"] <= stats["mean"] <= stats["max"] <= stats["total"]
@@ -653,6 +653,68 @@ def test_pytorch_iterator_feed_ndarray():
         feed_ndarray(out_data, arr, cuda_stream = torch.cuda.current_stream(device=device))
         np.testing.assert_equal(arr.cpu().numpy(), outs[0].as_cpu().as_array())
 
+def create_cpu_resize_pipe(batch_size, prefetch_queue_depth, shard_id=0, num_shards=1):
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None, seed=12,
+                    prefetch_queue_depth=prefetch_queue_depth)
+    with pipe:
+        jpegs, labels = fn.file_reader(file_root=image_data_set, shard_id=shard_id,
+                                       num_shards=num_shards, name="Reader")
+        images = fn.resize(fn.image_decoder(jpegs), size=(32, 32))
+        pipe.set_outputs(images, labels)
+    return pipe
+
+def check_pytorch_iterator_zero_copy(num_outstanding_batches):
+    from nvidia.dali.plugin.pytorch import DALIClassificationIterator as PyTorchIterator
+    batch_size = 8
+    ref_iter = PyTorchIterator(create_cpu_resize_pipe(batch_size, 3), reader_name="Reader")
+    zero_copy_iter = PyTorchIterator(create_cpu_resize_pipe(batch_size, 3), reader_name="Reader",
+                                     zero_copy=True,
+                                     num_outstanding_batches=num_outstanding_batches)
+    ref_batches = []
+    batches = []
+    for _ in range(2):
+        for ref, data in zip(ref_iter, zero_copy_iter):
+            ref_batches.append({key: value.clone() for key, value in ref[0].items()})
+            batches.append(data[0])
+            # the most recent batches are still valid
+            for ref_batch, batch in zip(ref_batches[-num_outstanding_batches:],
+                                        batches[-num_outstanding_batches:]):
+                for key in ref_batch:
+                    np.testing.assert_equal(batch[key].numpy(), ref_batch[key].numpy())
+        ref_iter.reset()
+        zero_copy_iter.reset()
+
+def test_pytorch_iterator_zero_copy():
+    for num_outstanding_batches in [1, 2, 3]:
+        yield check_pytorch_iterator_zero_copy, num_outstanding_batches
+
+def test_pytorch_iterator_zero_copy_too_many_outstanding():
+    from nvidia.dali.plugin.pytorch import DALIClassificationIterator as PyTorchIterator
+    assert_raises(AssertionError, PyTorchIterator, create_cpu_resize_pipe(8, 2),
+                  reader_name="Reader", zero_copy=True, num_outstanding_batches=3)
+
+def test_pytorch_iterator_parallel_gather():
+    from nvidia.dali.plugin.pytorch import DALIClassificationIterator as PyTorchIterator
+    batch_size = 8
+    num_shards = 3
+    def create_iter(parallel_gather):
+        pipes = [create_cpu_resize_pipe(batch_size, 2, shard_id, num_shards)
+                 for shard_id in range(num_shards)]
+        return PyTorchIterator(pipes, reader_name="Reader", parallel_gather=parallel_gather)
+    ref_iter = create_iter(False)
+    parallel_iter = create_iter(True)
+    for _ in range(2):
+        num_batches = 0
+        for ref, data in zip(ref_iter, parallel_iter):
+            assert len(ref) == len(data) == num_shards
+            for ref_shard, shard in zip(ref, data):
+                for key in ref_shard:
+                    np.testing.assert_equal(shard[key].numpy(), ref_shard[key].numpy())
+            num_batches += 1
+        assert num_batches > 0
+        ref_iter.reset()
+        parallel_iter.reset()
+
 def test_mxnet_iterator_feed_ndarray():
     from nvidia.dali.plugin.mxnet import DALIGenericIterator as MXNetIterator
     from nvidia.dali.plugin.mxnet import feed_ndarray as feed_ndarray
@@ -19,6 +19,7 @@ import nvidia.dali.tfrecord as tfrec
 from timeit import default_timer as timer
 import numpy as np
 import os
+import gc
 from numpy.testing import assert_array_equal, assert_allclose
 from test_utils import get_dali_extra_path
 
@@ -69,8 +70,44 @@ def test_nvjpeg_cached():
       out_images, _ = cached_pipe.run()
       compare(ref_images, out_images)
 
+class HostDecoderPipeline(Pipeline):
+    def __init__(self, batch_size, num_threads, cache_size, policy, skip_cached_images=False):
+        super(HostDecoderPipeline, self).__init__(batch_size, num_threads, None, seed = seed)
+        self.input = ops.FileReader(file_root = image_dir, skip_cached_images = skip_cached_images)
+        self.decode = ops.ImageDecoder(device = 'cpu', output_type = types.RGB, cache_debug = False,
+                                       cache_size = cache_size, cache_type = policy)
+
+    def define_graph(self):
+        jpegs, labels = self.input(name="Reader")
+        images = self.decode(jpegs)
+        return (images, labels)
+
+def check_host_decoder_cached(cache_size, policy, skip_cached_images):
+    ref_pipe = HostDecoderPipeline(batch_size, 1, 0, None)
+    ref_pipe.build()
+    cached_pipe = HostDecoderPipeline(batch_size, 1, cache_size, policy, skip_cached_images)
+    cached_pipe.build()
+    epoch_size = ref_pipe.epoch_size("Reader")
+
+    for i in range(0, (3*epoch_size + batch_size - 1) // batch_size):
+      ref_images, _ = ref_pipe.run()
+      out_images, _ = cached_pipe.run()
+      compare(ref_images, out_images)
+    # the cache is shared by all the CPU pipelines in the process - release it before the next test
+    del ref_pipe, cached_pipe
+    gc.collect()
+
+def test_host_decoder_cached():
+    for cache_size in [1, 100]:
+        for policy in ["threshold", "largest", "lru"]:
+            skip_options = [False] if policy == "lru" else [False, True]
+            for skip_cached_images in skip_options:
+                yield check_host_decoder_cached, cache_size, policy, skip_cached_images
+
 def main():
     test_nvjpeg_cached()
+    for test in test_host_decoder_cached():
+        test[0](*test[1:])
 
 if __name__ == '__main__':
     main()
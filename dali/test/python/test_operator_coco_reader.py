@@ -155,3 +155,41 @@ def test_invalid_args():
         pipeline.set_outputs(ids)
     pipeline.build()
 
+
+def test_annotations_cache():
+    batch_size = 2
+    def run(cache_dir, cache_annotations=True):
+        pipeline = Pipeline(batch_size=batch_size, num_threads=4, device_id=0)
+        with pipeline:
+            _, boxes, labels, polygons, vertices, ids = fn.coco_reader(
+                file_root=file_root,
+                annotations_file=train_annotations,
+                polygon_masks=True,
+                image_ids=True,
+                annotations_cache_dir=cache_dir,
+                cache_annotations=cache_annotations,
+                name="reader")
+            pipeline.set_outputs(boxes, labels, polygons, vertices, ids)
+        pipeline.build()
+        outs = []
+        for _ in range(pipeline.epoch_size("reader") // batch_size):
+            out = pipeline.run()
+            outs.append([[o.at(i) for i in range(batch_size)] for o in out])
+        return outs
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ref = run(cache_dir, cache_annotations=False)
+        assert os.listdir(cache_dir) == []
+
+        created = run(cache_dir)
+        cache_files = os.listdir(cache_dir)
+        assert len(cache_files) == 1 and cache_files[0].endswith(".dali_cache")
+
+        # loaded from the cache
+        loaded = run(cache_dir)
+        assert os.listdir(cache_dir) == cache_files
+        for outs in [created, loaded]:
+            for batch, ref_batch in zip(outs, ref):
+                for out, ref_out in zip(batch, ref_batch):
+                    for sample, ref_sample in zip(out, ref_out):
+                        np.testing.assert_array_equal(sample, ref_sample)
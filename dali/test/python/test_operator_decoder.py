@@ -1,4 +1,4 @@
-# Copyright (c) 2019, NVIDIA CORPORATION. All rights reserved.
+# Copyright (c) 2019-2021, NVIDIA CORPORATION. All rights reserved.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -15,7 +15,10 @@
 from nvidia.dali.pipeline import Pipeline
 import nvidia.dali.ops as ops
 import nvidia.dali.types as types
+import numpy as np
+import cv2
 import os
+from math import ceil
 
 from test_utils import check_batch
 from test_utils import compare_pipelines
@@ -114,3 +117,55 @@ def test_image_decoder_memory_stats():
     for threads in {1, 2, 3, 4}:
         for size in {1, 10}:
             yield check, img_type, size, device, threads
+
+def expected_downscale_ratio(h, w, min_h, min_w):
+    if min_h <= 0 and min_w <= 0:
+        return 1
+    for ratio in [8, 4, 2]:
+        if h // ratio >= max(min_h, 1) and w // ratio >= max(min_w, 1):
+            return ratio
+    return 1
+
+def check_min_decoded_size(batch_size, min_decoded_size):
+    data_path = os.path.join(test_data_root, good_path, 'jpeg')
+    if isinstance(min_decoded_size, (list, tuple)):
+        min_h, min_w = min_decoded_size
+    else:
+        min_h = min_w = min_decoded_size
+    pipe = Pipeline(batch_size=batch_size, num_threads=3, device_id=None)
+    reader = ops.FileReader(file_root=data_path, shard_id=0, num_shards=1)
+    decode = ops.ImageDecoder(device='cpu', output_type=types.RGB)
+    decode_reduced = ops.ImageDecoder(device='cpu', output_type=types.RGB,
+                                      min_decoded_size=min_decoded_size)
+    decode_crop = ops.ImageDecoderCrop(device='cpu', output_type=types.RGB, crop=(64, 64),
+                                       min_decoded_size=min_decoded_size)
+    with pipe:
+        jpegs, _ = reader()
+        pipe.set_outputs(decode(jpegs), decode_reduced(jpegs), decode_crop(jpegs))
+    pipe.build()
+    for _ in range(3):
+        full, reduced, cropped = pipe.run()
+        for i in range(batch_size):
+            full_img = np.array(full.at(i))
+            reduced_img = np.array(reduced.at(i))
+            h, w, c = full_img.shape
+            ratio = expected_downscale_ratio(h, w, min_h, min_w)
+            assert reduced_img.shape == (ceil(h / ratio), ceil(w / ratio), c), \
+                "Unexpected shape {} of an image of shape {} for min_decoded_size={}".format(
+                    reduced_img.shape, full_img.shape, min_decoded_size)
+            # DCT scaling is close to averaging the pixels
+            expected = cv2.resize(full_img, (reduced_img.shape[1], reduced_img.shape[0]),
+                                  interpolation=cv2.INTER_AREA)
+            diff = np.mean(np.abs(expected.astype(np.float32) - reduced_img))
+            assert diff < 10, "Mean difference {} too large".format(diff)
+
+            crop_ratio = expected_downscale_ratio(64, 64, min_h, min_w)
+            crop_h, crop_w, _ = np.array(cropped.at(i)).shape
+            expected_crop = 64 // crop_ratio
+            assert expected_crop <= crop_h <= expected_crop + 1
+            assert expected_crop <= crop_w <= expected_crop + 1
+
+def test_min_decoded_size():
+    for batch_size in [1, 8]:
+        for min_decoded_size in [0, 8, 16, 100, (20, 50), [1000, 1]]:
+            yield check_min_decoded_size, batch_size, min_decoded_size
@@ -109,3 +109,34 @@ def test_file_reader_relpath_file_list():
             label = out_l.at(j)[0]
             index = 10000 - label
             assert contents == ref_contents(fnames[index])
+
+def _run_file_reader(num_io_threads, shuffle, pad_last_batch, batch_size, num_iters):
+    fnames = [os.path.join(g_root, f) for f in g_files]
+    pipe = Pipeline(batch_size, 1, 0)
+    files, labels = fn.file_reader(files=fnames, random_shuffle=shuffle, initial_fill=4,
+                                   pad_last_batch=pad_last_batch, num_shards=2, shard_id=1,
+                                   num_io_threads=num_io_threads, seed=123)
+    pipe.set_outputs(files, labels)
+    pipe.build()
+    result = []
+    for i in range(num_iters):
+        out_f, out_l = pipe.run()
+        for j in range(batch_size):
+            contents = bytes(out_f.at(j)).decode('utf-8')
+            label = out_l.at(j)[0]
+            assert contents == ref_contents(fnames[label])
+            result.append(label)
+    return result
+
+def _test_file_reader_io_threads(shuffle, pad_last_batch):
+    batch_size = 4
+    num_iters = 5
+    ref = _run_file_reader(1, shuffle, pad_last_batch, batch_size, num_iters)
+    for num_io_threads in [2, 3, 8]:
+        out = _run_file_reader(num_io_threads, shuffle, pad_last_batch, batch_size, num_iters)
+        assert out == ref
+
+def test_file_reader_io_threads():
+    for shuffle in [False, True]:
+        for pad_last_batch in [False, True]:
+            yield _test_file_reader_io_threads, shuffle, pad_last_batch
@@ -1,8 +1,10 @@
 import math
 from nvidia.dali.pipeline import Pipeline
 import nvidia.dali.ops as ops
+import nvidia.dali.fn as fn
 import nvidia.dali.tfrecord as tfrec
 import os.path
+import shutil
 import tempfile
 import numpy as np
 
@@ -53,6 +55,33 @@ def test_tfrecord():
             assert np.array_equal(a.as_array(), b.as_array())
         _ = pipe_org.run()
 
+def test_tfrecord_without_index():
+    tfrecord_org = os.path.join(test_data_root, 'db', 'tfrecord', 'train')
+    tfrecord_idx = os.path.join(test_data_root, 'db', 'tfrecord', 'train.idx')
+    features = {"image/encoded" : tfrec.FixedLenFeature((), tfrec.string, "")}
+    data_dir = tempfile.TemporaryDirectory()
+    tfrecord = os.path.join(data_dir.name, 'train')
+    shutil.copyfile(tfrecord_org, tfrecord)
+    cached_idx = tfrecord + '.dali.idx'
+
+    def reader_fn(**kwargs):
+        return fn.tfrecord_reader(path=tfrecord, features=features, **kwargs)["image/encoded"]
+
+    def reader_with_index_fn(**kwargs):
+        return fn.tfrecord_reader(path=tfrecord, index_path=tfrecord_idx, features=features,
+                                  **kwargs)["image/encoded"]
+
+    ref, = _read_epochs(reader_with_index_fn, 1, 1)
+    # no index is stored if caching is disabled
+    out, = _read_epochs(reader_fn, 1, 1, cache_index=False)
+    assert out == ref
+    assert not os.path.exists(cached_idx)
+    # the first reader builds the index and stores it, the next one uses the stored index
+    for _ in range(2):
+        out, = _read_epochs(reader_fn, 1, 1)
+        assert out == ref
+        assert os.path.exists(cached_idx)
+
 def test_recordio():
     class MXNetReaderPipeline(Pipeline):
         def __init__(self, batch_size, num_threads, device_id, num_gpus, data, data_idx):
@@ -83,4 +112,49 @@ def test_recordio():
         out_ref = pipe_org.run()
         for a, b in zip(out, out_ref):
             assert np.array_equal(a.as_array(), b.as_array())
-        _ = pipe_org.run()
\ No newline at end of file
+        _ = pipe_org.run()
+
+def _read_epochs(reader_fn, num_shards, epochs, **reader_args):
+    result = [[] for _ in range(epochs)]
+    for shard_id in range(num_shards):
+        pipe = Pipeline(1, 1, None)
+        with pipe:
+            pipe.set_outputs(reader_fn(shard_id=shard_id, num_shards=num_shards, name="Reader",
+                                       **reader_args))
+        pipe.build()
+        size = pipe.reader_meta("Reader")["epoch_size"]
+        shard_size = size * (shard_id + 1) // num_shards - size * shard_id // num_shards
+        for epoch in range(epochs):
+            for _ in range(shard_size):
+                out, = pipe.run()
+                result[epoch].append(out.at(0).tobytes())
+    return result
+
+def _check_shuffle_after_epoch(reader_fn):
+    ref, = _read_epochs(reader_fn, 1, 1)
+    for num_shards in [1, 3]:
+        for shuffle_block_size in [0, 4]:
+            epochs = _read_epochs(reader_fn, num_shards, 2, shuffle_after_epoch=True,
+                                  shuffle_block_size=shuffle_block_size)
+            for epoch in epochs:
+                # every record is read exactly once per epoch, in a different order
+                assert sorted(epoch) == sorted(ref)
+                assert epoch != ref
+            assert epochs[0] != epochs[1]
+
+def test_tfrecord_shuffle_after_epoch():
+    tfrecord = os.path.join(test_data_root, 'db', 'tfrecord', 'train')
+    tfrecord_idx = os.path.join(test_data_root, 'db', 'tfrecord', 'train.idx')
+    features = {"image/encoded" : tfrec.FixedLenFeature((), tfrec.string, "")}
+    def reader_fn(**kwargs):
+        return fn.tfrecord_reader(path=tfrecord, index_path=tfrecord_idx, features=features,
+                                  **kwargs)["image/encoded"]
+    _check_shuffle_after_epoch(reader_fn)
+
+def test_recordio_shuffle_after_epoch():
+    recordio = os.path.join(test_data_root, 'db', 'recordio', 'train.rec')
+    recordio_idx = os.path.join(test_data_root, 'db', 'recordio', 'train.idx')
+    def reader_fn(**kwargs):
+        images, _ = fn.mxnet_reader(path=[recordio], index_path=[recordio_idx], **kwargs)
+        return images
+    _check_shuffle_after_epoch(reader_fn)
@@ -174,3 +174,27 @@ def test_decoded_vs_generated(batch_size=3):
       # String comparison (utf-8)
       assert text_non_ascii_str == ref_text_non_ascii_literal[idx], \
           f"'{text_non_ascii_str}' != '{ref_text_non_ascii_literal[idx]}'"
+
+def test_bucket_by_duration():
+  batch_size = 4
+  repeat = 4
+  manifest = os.path.join(tmp_dir.name, "nemo_asr_manifest_bucketing.json")
+  create_manifest_file(manifest, names * repeat, lengths * repeat, rates * repeat, ref_text_literal * repeat)
+
+  pipeline = Pipeline(batch_size=batch_size, num_threads=1, device_id=0)
+  with pipeline:
+    audio = fn.nemo_asr_reader(manifest_filepaths=[manifest], dtype=types.INT16, downmix=True,
+                               read_sample_rate=False, read_text=False, bucket_by_duration=True)
+    pipeline.set_outputs(audio)
+  pipeline.build()
+
+  iters_per_epoch = len(names) * repeat // batch_size
+  for epoch in range(2):
+    batch_lengths = []
+    for _ in range(iters_per_epoch):
+      out, = pipeline.run()
+      sample_lengths = set(out.at(i).shape[0] for i in range(batch_size))
+      # each batch consists of the samples of the same duration
+      assert len(sample_lengths) == 1
+      batch_lengths.append(sample_lengths.pop())
+    assert sorted(batch_lengths) == sorted(lengths)
@@ -49,7 +49,8 @@ def is_gds_supported(device_id=0):
     return is_gds_supported_var
 
 def NumpyReaderPipeline(path, batch_size, device="cpu", file_list=None, files=None, path_filter="*.npy",
-                        num_threads=1, device_id=0, num_gpus=1, cache_header_information=False):
+                        num_threads=1, device_id=0, num_gpus=1, cache_header_information=False,
+                        header_index_dir=None):
     pipe = Pipeline(batch_size=batch_size, num_threads=num_threads, device_id=0)
     data = fn.numpy_reader(device = device,
                            file_list = file_list,
@@ -58,7 +59,8 @@ def NumpyReaderPipeline(path, batch_size, device="cpu", file_list=None, files=No
                            file_filter = path_filter,
                            shard_id = 0,
                            num_shards = 1,
-                           cache_header_information = cache_header_information)
+                           cache_header_information = cache_header_information,
+                           header_index_dir = header_index_dir)
     pipe.set_outputs(data)
     return pipe
 
@@ -315,3 +317,61 @@ def check_array(filename, shape, typ, device, fortran_order=False):
 
     # delete temp files
     delete_numpy_file(filename)
+
+def check_samples(pipe, arrays, device):
+    pipe.build()
+    for arr_np in arrays:
+        pipe_out = pipe.run()
+        if device == "cpu":
+            arr_rd = pipe_out[0].at(0)
+        else:
+            arr_rd = pipe_out[0].as_cpu().at(0)
+        assert_array_equal(arr_rd, arr_np)
+
+def check_npz(device):
+    with tempfile.TemporaryDirectory(prefix = gds_data_root) as test_data_root:
+        arrays = [rng.random_sample((3, i + 1)).astype(np.float32) for i in range(5)]
+        np.savez(os.path.join(test_data_root, "a.npz"), x=arrays[0], y=arrays[1])
+        np.savez(os.path.join(test_data_root, "b.npz"), *arrays[2:])
+        # every array in the archives is a separate sample
+        pipe = NumpyReaderPipeline(path = test_data_root,
+                                   device = device,
+                                   path_filter = "*.npz",
+                                   batch_size = 1)
+        check_samples(pipe, arrays, device)
+
+def test_npz():
+    for device in ["cpu", "gpu"] if is_gds_supported() else ["cpu"]:
+        yield check_npz, device
+
+def check_header_index(device):
+    with tempfile.TemporaryDirectory(prefix = gds_data_root) as test_data_root, \
+         tempfile.TemporaryDirectory() as index_dir:
+        arrays = []
+        for index in range(8):
+            filename = os.path.join(test_data_root, "test_{:02d}.npy".format(index))
+            create_numpy_file(filename, (index + 1, 4), np.int16, index % 2 == 1)
+            arrays.append(np.load(filename))
+
+        for _ in range(2):
+            # the index is built by the first pipeline and reused by the second one
+            pipe = NumpyReaderPipeline(path = test_data_root,
+                                       device = device,
+                                       batch_size = 1,
+                                       header_index_dir = index_dir)
+            check_samples(pipe, arrays, device)
+            assert len(os.listdir(index_dir)) == 1
+
+        # the headers of the modified files are parsed again
+        filename = os.path.join(test_data_root, "test_00.npy")
+        create_numpy_file(filename, (3, 5, 2), np.float32, False)
+        arrays[0] = np.load(filename)
+        pipe = NumpyReaderPipeline(path = test_data_root,
+                                   device = device,
+                                   batch_size = 1,
+                                   header_index_dir = index_dir)
+        check_samples(pipe, arrays, device)
+
+def test_header_index():
+    for device in ["cpu", "gpu"] if is_gds_supported() else ["cpu"]:
+        yield check_header_index, device
@@ -485,10 +485,38 @@ class AsyncPipeline(Pipeline):
     def define_graph(self):
         return self.op()
 
-@raises(RuntimeError)
-def test_wrong_pipeline():
+def test_async_pipeline():
     pipe = AsyncPipeline(BATCH_SIZE, NUM_WORKERS, DEVICE_ID, SEED)
     pipe.build()
+    for it in range(ITERS):
+        out, = pipe.run()
+        for i in range(len(out)):
+            assert numpy.array_equal(out.at(i), numpy.zeros([2, 2, 2]))
+
+def run_file_reader_pipeline(function, exec_async=True, pool=None):
+    pipe = Pipeline(BATCH_SIZE, NUM_WORKERS, DEVICE_ID, SEED, exec_async=exec_async,
+                    exec_pipelined=exec_async, prefetch_queue_depth=3)
+    with pipe:
+        jpegs, _ = fn.file_reader(file_root=images_dir, seed=SEED)
+        images = fn.image_decoder(jpegs, device='cpu', output_type=types.RGB)
+        pipe.set_outputs(fn.python_function(images, function=function, pool=pool))
+    pipe.build()
+    return [pipe.run()[0] for _ in range(ITERS)]
+
+def compare_outputs(outputs1, outputs2):
+    for out1, out2 in zip(outputs1, outputs2):
+        for i in range(len(out1)):
+            assert numpy.array_equal(out1.at(i), out2.at(i))
+
+def test_async_pipeline_file_reader():
+    compare_outputs(run_file_reader_pipeline(bias, exec_async=False),
+                    run_file_reader_pipeline(bias, exec_async=True))
+
+def test_process_pool():
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(2) as pool:
+        compare_outputs(run_file_reader_pipeline(one_channel_normalize),
+                        run_file_reader_pipeline(one_channel_normalize, pool=pool))
 
 def test_output_layout():
     pipe = CommonPipeline(1, 1, 0, 999, images_dir)
@@ -1,4 +1,4 @@
-# Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+# Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -1576,6 +1576,52 @@ def test_executor_meta():
             assert(calc_avg_max(v["reserved_memory_size"]) == v["max_reserved_memory_size"])
 
 
+def test_pipeline_profile():
+    batch_size = 4
+    iters = 5
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None,
+                    exec_async=False, exec_pipelined=False, enable_profiling=True)
+    with pipe:
+        jpegs, _ = fn.caffe_reader(path=caffe_db_folder, name="reader")
+        images = fn.image_decoder(jpegs, name="decoder")
+        data = fn.external_source(lambda: [np.ones((2, 2), dtype=np.float32)] * batch_size,
+                                  name="source")
+        doubled = fn.python_function(data, function=lambda x: x * 2, name="double")
+        pipe.set_outputs(images, doubled)
+    pipe.build()
+    for _ in range(iters):
+        pipe.run()
+
+    profile = pipe.profile()
+    for name in ["reader", "decoder", "source", "double"]:
+        stats = profile["operators"][name]
+        assert stats["stage"] == "cpu"
+        assert stats["count"] == iters
+        assert 0 <= stats["min"] <= stats["mean"] <= stats["max"] <= stats["total"]
+    assert profile["queue_wait"]["cpu"]["count"] == iters
+    assert profile["reader_stall"]["reader"]["count"] == iters
+    assert profile["python_callback"]["double"]["count"] == iters
+    assert profile["python_callback"]["source"]["count"] == iters
+    assert [it["iteration"] for it in profile["iterations"]] == list(range(iters))
+    for it in profile["iterations"]:
+        # the reader waits for the data inside of its own run
+        assert it["reader_stall"]["reader"] <= it["operators"]["reader"]
+
+    trace_file = "/tmp/dali_pipeline_profile_trace.json"
+    pipe.export_chrome_trace(trace_file)
+    import json
+    with open(trace_file) as f:
+        trace = json.load(f)["traceEvents"]
+    os.remove(trace_file)
+    assert len(trace) == sum(len(it[category]) for it in profile["iterations"]
+                             for category in profile if category != "iterations")
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace)
+
+    profile = pipe.profile(reset=True)
+    assert profile["operators"]
+    profile = pipe.profile()
+    assert not profile["operators"] and not profile["iterations"]
+
 def trigger_output_dtype_deprecated_warning():
     batch_size = 10
     shape = (120, 60, 3)
@@ -1718,3 +1764,191 @@ def test_return_constants():
     for i, o in enumerate(other):
         assert o.at(0) == types[i](42)
         assert o.at(0).dtype == types[i]
+
+def check_reader_state_restore(reader_args):
+    batch_size = 5
+    file_root = os.path.join(test_data_root, 'db', 'single', 'jpeg')
+    def create_pipe():
+        pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None, seed=123,
+                        enable_checkpointing=True)
+        with pipe:
+            jpegs, labels = fn.file_reader(file_root=file_root, initial_fill=16, name="reader",
+                                           **reader_args)
+            pipe.set_outputs(jpegs, labels)
+        pipe.build()
+        return pipe
+
+    pipe = create_pipe()
+    for _ in range(7):
+        pipe.run()
+    state = pipe.reader_state()
+    assert list(state.keys()) == ["reader"]
+    expected = []
+    for _ in range(40):
+        # copy the outputs, as the buffers of the pipeline are reused
+        expected.append([[np.array(out.at(i)) for i in range(batch_size)]
+                         for out in pipe.run()])
+
+    restored = create_pipe()
+    restored.restore_reader_state(state)
+    for ref_jpegs, ref_labels in expected:
+        jpegs, labels = restored.run()
+        for i in range(batch_size):
+            assert_array_equal(jpegs.at(i), ref_jpegs[i])
+            assert_array_equal(labels.at(i), ref_labels[i])
+
+def test_reader_state_restore():
+    for reader_args in [{}, {"random_shuffle": True}, {"shuffle_after_epoch": True},
+                        {"pad_last_batch": True, "random_shuffle": True}]:
+        yield check_reader_state_restore, reader_args
+
+def check_reader_state_every_iteration(pipe_args):
+    batch_size = 3
+    iters = 10
+    file_root = os.path.join(test_data_root, 'db', 'single', 'jpeg')
+    def create_pipe():
+        pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None, seed=123,
+                        enable_checkpointing=True, **pipe_args)
+        with pipe:
+            # with a single prefetched batch, the state of the next iteration is saved
+            # only after the batch of the current one is consumed
+            jpegs, _ = fn.file_reader(file_root=file_root, random_shuffle=True, initial_fill=8,
+                                      prefetch_queue_depth=1, name="reader")
+            pipe.set_outputs(jpegs)
+        pipe.build()
+        return pipe
+
+    pipe = create_pipe()
+    states = []
+    outputs = []
+    for _ in range(iters):
+        jpegs, = pipe.run()
+        outputs.append([np.array(jpegs.at(i)) for i in range(batch_size)])
+        states.append(pipe.reader_state("reader"))
+
+    # the state taken after an iteration continues with the batch of the next one
+    for it in [0, iters // 2, iters - 2]:
+        restored = create_pipe()
+        restored.restore_reader_state(states[it], "reader")
+        jpegs, = restored.run()
+        for i in range(batch_size):
+            assert_array_equal(jpegs.at(i), outputs[it + 1][i])
+
+def test_reader_state_every_iteration():
+    for pipe_args in [{}, {"exec_pipelined": False, "exec_async": False}]:
+        yield check_reader_state_every_iteration, pipe_args
+
+def test_reader_state_restore_after_run():
+    pipe = Pipeline(batch_size=2, num_threads=2, device_id=None, enable_checkpointing=True)
+    with pipe:
+        jpegs, _ = fn.file_reader(file_root=os.path.join(test_data_root, 'db', 'single', 'jpeg'),
+                                  name="reader")
+        pipe.set_outputs(jpegs)
+    pipe.build()
+    state = pipe.reader_state("reader")
+    pipe.run()
+    assert_raises(RuntimeError, pipe.restore_reader_state, state, "reader")
+
+def test_reader_state_requires_checkpointing():
+    pipe = Pipeline(batch_size=2, num_threads=2, device_id=None)
+    with pipe:
+        jpegs, _ = fn.file_reader(file_root=os.path.join(test_data_root, 'db', 'single', 'jpeg'),
+                                  name="reader")
+        pipe.set_outputs(jpegs)
+    pipe.build()
+    pipe.run()
+    assert_raises(RuntimeError, pipe.reader_state, "reader")
+
+def cpu_branches_pipeline(batch_size, **pipe_args):
+    pipe = Pipeline(batch_size=batch_size, num_threads=4, device_id=None, seed=1234, **pipe_args)
+    with pipe:
+        jpegs, labels = fn.caffe_reader(path=caffe_db_folder, random_shuffle=True)
+        images = fn.image_decoder(jpegs)
+        # independent branches consuming the same inputs
+        resized = fn.resize(images, resize_x=64, resize_y=64)
+        flipped = fn.flip(images, horizontal=fn.coin_flip())
+        mirrored = fn.crop_mirror_normalize(images, crop=(32, 32), dtype=types.FLOAT,
+                                            mirror=fn.coin_flip())
+        shapes = fn.shapes(images)
+        scale = fn.random.uniform(range=[0.5, 2.0])
+        labels = fn.cast(labels, dtype=types.FLOAT) * scale
+        pipe.set_outputs(resized, flipped, mirrored, shapes, labels)
+    return pipe
+
+def check_cpu_op_concurrency(cpu_op_concurrency):
+    batch_size = 8
+    compare_pipelines(cpu_branches_pipeline(batch_size),
+                      cpu_branches_pipeline(batch_size, cpu_op_concurrency=cpu_op_concurrency),
+                      batch_size, 5)
+
+def test_cpu_op_concurrency():
+    for cpu_op_concurrency in [2, 4, 16]:
+        yield check_cpu_op_concurrency, cpu_op_concurrency
+
+def check_cpu_iteration_overlap(prefetch_queue_depth, cpu_op_concurrency):
+    batch_size = 8
+    compare_pipelines(cpu_branches_pipeline(batch_size),
+                      cpu_branches_pipeline(batch_size, prefetch_queue_depth=prefetch_queue_depth,
+                                            cpu_op_concurrency=cpu_op_concurrency,
+                                            cpu_iteration_overlap=True),
+                      batch_size, 10)
+
+def test_cpu_iteration_overlap():
+    for prefetch_queue_depth in [1, 2, 3]:
+        for cpu_op_concurrency in [1, 4]:
+            yield check_cpu_iteration_overlap, prefetch_queue_depth, cpu_op_concurrency
+
+def test_cpu_iteration_overlap_error():
+    batch_size = 2
+    def fail_on_third(x):
+        fail_on_third.calls += 1
+        if fail_on_third.calls == 3:
+            raise ValueError("Test error")
+        return x
+    fail_on_third.calls = 0
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None,
+                    cpu_iteration_overlap=True)
+    with pipe:
+        data = fn.external_source(lambda: [np.ones((2, 2), dtype=np.float32)] * batch_size)
+        pipe.set_outputs(fn.python_function(data, function=fail_on_third), fn.shapes(data))
+    pipe.build()
+    pipe.run()
+    assert_raises(RuntimeError, lambda: [pipe.run() for _ in range(5)])
+
+@raises(RuntimeError)
+def test_cpu_iteration_overlap_sync():
+    pipe = Pipeline(batch_size=2, num_threads=2, device_id=None, exec_async=False,
+                    exec_pipelined=False, cpu_iteration_overlap=True)
+    with pipe:
+        pipe.set_outputs(fn.random.uniform(range=[0, 1]))
+    pipe.build()
+
+def check_host_memory_pool(hugepages):
+    batch_size = 8
+    iters = 5
+    assert not dali.backend.IsHostMemoryPoolEnabled()
+    ref_pipe = cpu_branches_pipeline(batch_size)
+    ref_pipe.build()
+    ref_outs = []
+    for _ in range(iters):
+        # copy the outputs, as the buffers of the pipeline are reused
+        ref_outs.append([[np.array(out.at(i)) for i in range(batch_size)]
+                         for out in ref_pipe.run()])
+    try:
+        dali.backend.SetHostMemoryPool(True, hugepages)
+        pipe = cpu_branches_pipeline(batch_size)
+        pipe.build()
+        for ref in ref_outs:
+            for out, ref_out in zip(pipe.run(), ref):
+                check_batch(out, ref_out, batch_size)
+        stats = dali.backend.GetHostMemoryPoolStats()
+        assert stats["allocations"] > 0
+        assert stats["upstream_blocks"] > 0
+        assert stats["bytes_in_use"] <= stats["peak_bytes_in_use"] <= stats["upstream_bytes"]
+    finally:
+        dali.backend.SetHostMemoryPool(False)
+    assert dali.backend.GetHostMemoryPoolStats()["allocations"] == 0
+
+def test_host_memory_pool():
+    for hugepages in [False, True]:
+        yield check_host_memory_pool, hugepages
@@ -0,0 +1,56 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.types as types
+from timeit import default_timer as timer
+import numpy as np
+
+NUM_NODES = 10000
+
+def build_large_graph(num_nodes):
+    # Every node is consumed by the two following ones - the graph has many shared subgraphs,
+    # which a naive traversal would visit exponentially many times.
+    nodes = [types.Constant(np.float32([1, 2, 3]), device="cpu")]
+    nodes.append(nodes[0] * 1)
+    while len(nodes) < num_nodes:
+        nodes.append(nodes[-1] - nodes[-2])
+    return nodes[-1]
+
+def expected_output(num_nodes):
+    values = [np.float32([1, 2, 3])] * 2
+    while len(values) < num_nodes:
+        values.append(values[-1] - values[-2])
+    return values[-1]
+
+def test_build_time_large_graph():
+    pipe = Pipeline(batch_size=2, num_threads=1, device_id=None)
+    with pipe:
+        pipe.set_outputs(build_large_graph(NUM_NODES))
+
+    start = timer()
+    pipe._prepare_graph()
+    prepare_time = timer() - start
+    start = timer()
+    pipe.build()
+    build_time = timer() - start
+    print("Graph of {} operators prepared in {:.3f} s, built in {:.3f} s".format(
+        len(pipe._ops), prepare_time, build_time))
+    assert len(pipe._ops) == NUM_NODES
+    # the graph is linear in size, so preparing it should take a fraction of a second
+    assert prepare_time < 10, "Preparing the graph took {:.3f} s".format(prepare_time)
+
+    out, = pipe.run()
+    for i in range(len(out)):
+        assert np.array_equal(out.at(i), expected_output(NUM_NODES))
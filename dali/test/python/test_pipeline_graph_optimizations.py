@@ -0,0 +1,96 @@
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.fn as fn
+import nvidia.dali.types as types
+import nvidia.dali.math as math
+import numpy as np
+from test_utils import check_batch
+
+batch_size = 4
+
+def input_data():
+    return [np.full((2, 3), i, dtype=np.float32) for i in range(batch_size)]
+
+def normalization_pipeline(merge_duplicate_ops, num_branches = 10):
+    pipe = Pipeline(batch_size, 1, None, merge_duplicate_ops=merge_duplicate_ops)
+    with pipe:
+        x = fn.external_source(input_data)
+        branches = [(x - 128) / 64 for _ in range(num_branches)]
+        out = branches[0]
+        for branch in branches[1:]:
+            out = out + branch
+        pipe.set_outputs(out, branches[-1])
+    pipe.build()
+    return pipe
+
+def test_merge_duplicate_ops():
+    ref_pipe = normalization_pipeline(False)
+    pipe = normalization_pipeline(True)
+    # input, the shared subtraction and division, the division producing the pipeline output
+    # and the sums
+    assert len(pipe._ops) < len(ref_pipe._ops)
+    assert len(pipe._ops) == 1 + 2 + 9 + 1, len(pipe._ops)
+    for _ in range(3):
+        ref_out = ref_pipe.run()
+        out = pipe.run()
+        for ref, tested in zip(ref_out, out):
+            check_batch(tested, ref, batch_size)
+
+def test_merge_duplicate_constants():
+    pipe = Pipeline(batch_size, 1, None, merge_duplicate_ops=True)
+    with pipe:
+        a = types.Constant(np.float32([1, 2, 3]), device="cpu")
+        b = types.Constant(np.float32([1, 2, 3]), device="cpu")
+        c = types.Constant(np.float32([1, 2, 3.5]), device="cpu")
+        pipe.set_outputs(a + b + c)
+    pipe.build()
+    assert len(pipe._ops) == 4, len(pipe._ops)
+    out, = pipe.run()
+    for i in range(batch_size):
+        assert np.array_equal(out.at(i), np.float32([3, 6, 9.5]))
+
+def test_random_ops_not_merged():
+    pipe = Pipeline(batch_size, 1, None, merge_duplicate_ops=True)
+    with pipe:
+        a = fn.uniform(range=[0, 1], shape=[10])
+        b = fn.uniform(range=[0, 1], shape=[10])
+        pipe.set_outputs(a - b)
+    pipe.build()
+    out, = pipe.run()
+    assert any(np.any(out.at(i) != 0) for i in range(batch_size))
+
+def arithmetic_pipeline(fuse_arithmetic_ops):
+    pipe = Pipeline(batch_size, 1, None, fuse_arithmetic_ops=fuse_arithmetic_ops)
+    with pipe:
+        x = fn.external_source(input_data)
+        m = fn.external_source(lambda: [np.float32([1, 2, 3])] * batch_size)
+        normalized = math.clamp((x - m) * 0.5, 0, 1)
+        squared = normalized * normalized
+        pipe.set_outputs(squared + 1, normalized, -(x + 3) / 4)
+    pipe.build()
+    return pipe
+
+def test_fuse_arithmetic_ops():
+    ref_pipe = arithmetic_pipeline(False)
+    pipe = arithmetic_pipeline(True)
+    # two inputs, `normalized` (used twice, pipeline output), `squared + 1` and the last output
+    assert len(ref_pipe._ops) == 10, len(ref_pipe._ops)
+    assert len(pipe._ops) == 5, len(pipe._ops)
+    for _ in range(3):
+        ref_out = ref_pipe.run()
+        out = pipe.run()
+        for ref, tested in zip(ref_out, out):
+            check_batch(tested, ref, batch_size)
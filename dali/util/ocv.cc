@@ -1,4 +1,4 @@
-// Copyright (c) 2017-2018, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2017-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -150,11 +150,15 @@ template <DALIImageType input_type, DALIImageType output_type>
 inline void custom_conversion(const cv::Mat& img, cv::Mat& output_img) {
   const std::size_t input_C = img.elemSize();
   const std::size_t output_C = output_img.elemSize();
-  const std::size_t total_size = img.rows * img.cols;
-  for (std::size_t i = 0; i < total_size; i ++) {
-    custom_conversion_pixel<input_type, output_type>(
-      img.data + i*input_C,
-      output_img.data + i*output_C);
+  // the input can be a region of a larger image, so the rows are not necessarily contiguous
+  for (int y = 0; y < img.rows; y++) {
+    const uint8_t *in_row = img.ptr<uint8_t>(y);
+    uint8_t *out_row = output_img.ptr<uint8_t>(y);
+    for (int x = 0; x < img.cols; x++) {
+      custom_conversion_pixel<input_type, output_type>(
+        in_row + x*input_C,
+        out_row + x*output_C);
+    }
   }
 }
 
@@ -1,4 +1,4 @@
-// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+// Copyright (c) 2020-2021, NVIDIA CORPORATION. All rights reserved.
 //
 // Licensed under the Apache License, Version 2.0 (the "License");
 // you may not use this file except in compliance with the License.
@@ -99,7 +99,6 @@ class pool_resource_base : public memory_resource<kind, order> {
         return new_block;
       } else {
         // we've allocated an oversized block - put the remainder in the free list
-        lock_guard guard(lock_);
         free_list_.put(static_cast<char *>(new_block) + bytes, blk_size - bytes);
         return new_block;
       }
@@ -115,7 +114,11 @@ class pool_resource_base : public memory_resource<kind, order> {
   }
 
   void *get_upstream_block(size_t &blk_size, size_t min_bytes, size_t alignment) {
-    blk_size = next_block_size(min_bytes);
+    {
+      // the upstream allocation is done without the lock, but the block size must not be
+      lock_guard guard(lock_);
+      blk_size = next_block_size(min_bytes);
+    }
     for (;;) {
       try {
         return upstream_->allocate(blk_size, alignment);
@@ -127,6 +130,11 @@ class pool_resource_base : public memory_resource<kind, order> {
     }
   }
 
+  /**
+   * @brief Returns the size of the next upstream block and updates the growth state.
+   *
+   * Must be called with `lock_` held.
+   */
   size_t next_block_size(size_t upcoming_allocation_size) {
     size_t actual_block_size = std::max(upcoming_allocation_size, next_block_size_);
     next_block_size_ = std::min<size_t>(actual_block_size * options_.growth_factor,
@@ -0,0 +1,113 @@
+// Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_CORE_MM_SIZE_CLASS_POOL_RESOURCE_H_
+#define DALI_CORE_MM_SIZE_CLASS_POOL_RESOURCE_H_
+
+#include <atomic>
+#include <mutex>
+#include "dali/core/mm/pool_resource.h"
+#include "dali/core/util.h"
+
+namespace dali {
+namespace mm {
+
+struct pool_stats {
+  /// Number of allocations served by the pool
+  size_t allocations = 0;
+  /// Number of deallocations returned to the pool
+  size_t deallocations = 0;
+  /// Total size of the live allocations, rounded up to the size classes
+  size_t bytes_in_use = 0;
+  /// The highest value of `bytes_in_use` so far
+  size_t peak_bytes_in_use = 0;
+  /// Number of blocks obtained from the upstream resource
+  size_t upstream_blocks = 0;
+  /// Total size of the blocks obtained from the upstream resource
+  size_t upstream_bytes = 0;
+};
+
+/**
+ * @brief A pool which rounds the requested sizes up to a set of size classes and gathers
+ *        the usage statistics.
+ *
+ * There are `kClassesPerPow2` size classes between consecutive powers of two (i.e. the rounding
+ * wastes at most 1/kClassesPerPow2 of the requested size), with the smallest class being
+ * `kMinSizeClass`. Since the blocks of similar sizes end up with the same size, a freed block
+ * can be reused by a subsequent allocation of a slightly different size without fragmenting
+ * the free list.
+ */
+template <memory_kind kind, allocation_order order, class FreeList = free_tree,
+          class LockType = std::mutex>
+class size_class_pool_resource : public pool_resource_base<kind, order, FreeList, LockType> {
+  using base = pool_resource_base<kind, order, FreeList, LockType>;
+
+ public:
+  static constexpr int kClassesPerPow2 = 4;
+  static constexpr size_t kMinSizeClass = 256;
+
+  explicit size_class_pool_resource(memory_resource<kind, order> *upstream,
+                                    const pool_options &opt = {})
+  : base(upstream, opt) {}
+
+  static size_t size_class(size_t bytes) {
+    if (bytes <= kMinSizeClass)
+      return kMinSizeClass;
+    size_t pow2 = size_t(1) << ilog2(bytes - 1);
+    return align_up(bytes, pow2 / kClassesPerPow2);
+  }
+
+  pool_stats get_stats() {
+    pool_stats stats;
+    stats.allocations = allocations_;
+    stats.deallocations = deallocations_;
+    stats.bytes_in_use = bytes_in_use_;
+    stats.peak_bytes_in_use = peak_bytes_in_use_;
+    typename base::lock_guard guard(this->lock_);
+    stats.upstream_blocks = this->blocks_.size();
+    for (auto &block : this->blocks_)
+      stats.upstream_bytes += block.bytes;
+    return stats;
+  }
+
+ protected:
+  void *do_allocate(size_t bytes, size_t alignment) override {
+    if (!bytes)
+      return nullptr;
+    bytes = size_class(bytes);
+    void *ptr = base::do_allocate(bytes, alignment);
+    allocations_++;
+    size_t in_use = bytes_in_use_ += bytes;
+    size_t peak = peak_bytes_in_use_;
+    while (in_use > peak && !peak_bytes_in_use_.compare_exchange_weak(peak, in_use)) {}
+    return ptr;
+  }
+
+  void do_deallocate(void *ptr, size_t bytes, size_t alignment) override {
+    if (!ptr)
+      return;
+    bytes = size_class(bytes);
+    base::do_deallocate(ptr, bytes, alignment);
+    deallocations_++;
+    bytes_in_use_ -= bytes;
+  }
+
+  std::atomic<size_t> allocations_{0}, deallocations_{0};
+  std::atomic<size_t> bytes_in_use_{0}, peak_bytes_in_use_{0};
+};
+
+}  // namespace mm
+}  // namespace dali
+
+#endif  // DALI_CORE_MM_SIZE_CLASS_POOL_RESOURCE_H_
@@ -15,23 +15,34 @@
 # specific language governing permissions and limitations
 # under the License.
 
-import os
-import time
-import ctypes
-from mxnet.base import _LIB
-from mxnet.base import check_call
-import mxnet as mx
 import argparse
+import array
+import mmap
+import os
+import struct
+import sys
+
+# Layout of the binary index, see dali/operators/reader/loader/record_index.h
+INDEX_MAGIC = b'DALIIDX1'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<8sIIQ')
 
-class IndexCreator(mx.recordio.MXRecordIO):
+# Every chunk of a RecordIO file starts with the magic number and lrecord - the upper 3 bits of
+# lrecord are the continuation flag, the lower 29 bits are the length of the chunk data, which is
+# padded to 4 bytes
+RECORDIO_MAGIC = 0xced7230a
+RECORDIO_CHUNK_HEADER = struct.Struct('<II')
+
+
+class IndexCreator(object):
     """Reads `RecordIO` data format, and creates index file
     that enables random access.
 
     Example usage:
     ----------
     >>> creator = IndexCreator('data/test.rec','data/test.idx')
-    >>> record.create_index()
-    >>> record.close()
+    >>> creator.create_index()
+    >>> creator.close()
     >>> !ls data/
     test.rec  test.idx
 
@@ -43,48 +54,67 @@ class IndexCreator(mx.recordio.MXRecordIO):
         Path to the index file, that will be created/overwritten.
     key_type : type
         Data type for keys (optional, default = int).
+    binary : bool
+        Write the binary index, which is memory-mapped by DALI, instead of the MXNet text index
+        (`key<TAB>offset` lines). The binary index can be read only by DALI
+        (optional, default = False).
     """
-    def __init__(self, uri, idx_path, key_type=int):
-        self.key_type = key_type
-        self.fidx = None
+    def __init__(self, uri, idx_path, key_type=int, binary=False):
+        self.uri = uri
         self.idx_path = idx_path
-        super(IndexCreator, self).__init__(uri, 'r')
-
-    def open(self):
-        super(IndexCreator, self).open()
-        self.fidx = open(self.idx_path, 'w')
+        self.key_type = key_type
+        self.binary = binary
 
     def close(self):
-        """Closes the record and index files."""
-        if not self.is_open:
-            return
-        super(IndexCreator, self).close()
-        self.fidx.close()
+        """Kept for compatibility - the files are closed by `create_index`."""
+        pass
 
-    def tell(self):
-        """Returns the current position of read head.
-        """
-        pos = ctypes.c_size_t()
-        check_call(_LIB.MXRecordIOReaderTell(self.handle, ctypes.byref(pos)))
-        return pos.value
+    def scan(self):
+        """Returns the offsets of the records in the record file and its size."""
+        offsets = array.array('q')
+        with open(self.uri, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file
+                return offsets, 0
+            with data:
+                file_size = len(data)
+                unpack_header = RECORDIO_CHUNK_HEADER.unpack_from
+                pos = 0
+                while pos + RECORDIO_CHUNK_HEADER.size <= file_size:
+                    magic, lrecord = unpack_header(data, pos)
+                    if magic != RECORDIO_MAGIC:
+                        raise ValueError("Invalid RecordIO file {} at offset {}".format(
+                            self.uri, pos))
+                    cflag = lrecord >> 29
+                    length = lrecord & ((1 << 29) - 1)
+                    # only the chunks starting a record are indexed
+                    if cflag == 0 or cflag == 1:
+                        offsets.append(pos)
+                    pos += RECORDIO_CHUNK_HEADER.size + ((length + 3) & ~3)
+        return offsets, file_size
 
     def create_index(self):
-        """Creates the index file from open record file
+        """Creates the index file from the record file
         """
-        self.reset()
-        counter = 0
-        pre_time = time.time()
-        while True:
-            if counter % 1000 == 0:
-                cur_time = time.time()
-                print('time:', cur_time - pre_time, ' count:', counter)
-            pos = self.tell()
-            cont = self.read()
-            if cont is None:
-                break
-            key = self.key_type(counter)
-            self.fidx.write('%s\t%d\n'%(str(key), pos))
-            counter = counter + 1
+        offsets, file_size = self.scan()
+        if not self.binary:
+            with open(self.idx_path, 'w') as fidx:
+                fidx.writelines('%s\t%d\n' % (str(self.key_type(counter)), pos)
+                                for counter, pos in enumerate(offsets))
+            return
+        # the sizes follow the semantics of the text index - a record spans up to the next one
+        sizes = array.array('q', (b - a for a, b in zip(offsets, offsets[1:])))
+        if offsets:
+            sizes.append(file_size - offsets[-1])
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            sizes.byteswap()
+        with open(self.idx_path, 'wb') as fidx:
+            fidx.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(offsets)))
+            offsets.tofile(fidx)
+            sizes.tofile(fidx)
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -92,6 +122,9 @@ def parse_args():
         description='Create an index file from .rec file')
     parser.add_argument('record', help='path to .rec file.')
     parser.add_argument('index', help='path to index file.')
+    parser.add_argument('--binary', action='store_true',
+                        help='write the binary index, which can be read only by DALI, '
+                             'instead of the MXNet text one.')
     args = parser.parse_args()
     args.record = os.path.abspath(args.record)
     args.index = os.path.abspath(args.index)
@@ -99,7 +132,7 @@ def parse_args():
 
 def main():
     args = parse_args()
-    creator = IndexCreator(args.record, args.index)
+    creator = IndexCreator(args.record, args.index, binary=args.binary)
     creator.create_index()
     creator.close()
 